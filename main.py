@@ -1,6 +1,4 @@
 import streamlit as st
-import importlib
-import sys
 import pandas as pd
 import numpy as np
 
@@ -59,38 +57,52 @@ if not check_password():
 import os
 os.environ["STREAMLIT_SERVER_MAX_UPLOAD_SIZE"] = "500"
 
-# 캐싱 최적화 설정
-if 'cache_initialized' not in st.session_state:
-    st.session_state['cache_initialized'] = True
-    # 메모리 사용량 최적화를 위한 설정
-    st.cache_data.clear()
+# Dashboard에 필요한 모듈만 시작 시 import (모듈별 import 시간 기록)
+from src.lazy_modules import (is_dev_reload_enabled, lazy_function, preload, print_import_report,
+                              reload_dev_modules, render_import_report)
+
+preload([
+    'src.cached_data_loader',
+    'src.artifact_prefetch',
+    'src.result_cache',
+    'src.tab_navigation',
+    'src.building_setup',
+    'src.data_input',
+    'src.time_index',
+    'src.heatmap_raster',
+    'src.chart_downsample',
+    'src.job_runner',
+    'src.tracing',
+    'src.session_memory',
+    'src.date_partitions',
+])
 
-# CachedDataLoader import
 from src.cached_data_loader import CachedDataLoader, find_available_datasets
-
-# 모든 모듈을 상단에서 import
+from src.artifact_prefetch import prefetch_for_session, render_prefetch_status
+from src.result_cache import PROCESSING_DATASET_ID, cached_result, invalidate_dataset, set_dataset_context
+from src.tab_navigation import fragment, render_lazy_tabs_toggle, render_tabs
 from src.building_setup import render_building_setup, load_sward_config
 from src.data_input import render_data_input
-from src import tward_type31_processing
-
-# Type 41 모듈들을 강제 reload (Processing Mode에서만 필요)
-modules_to_reload = [
-    'src.tward_type41_operation',
-    'src.tward_type41_dwell_time', 
-    'src.tward_type41_journey_map',
+from src.time_index import ten_minute_bin
+from src.heatmap_raster import render_code_heatmap
+from src.chart_downsample import add_downsampled_trace, shared_indices, zoom_window
+from src.job_runner import render_job_table
+from src.tracing import is_session_tracing_enabled, is_tracing_enabled, render_trace_panel, trace_rerun
+from src.session_memory import render_memory_panel, track_session
+from src.batch_reports import split_dataset_name
+from src.date_partitions import render_site_trends
+
+# Processing / Report 모듈은 처음 사용할 때 import
+# (IRFM_DEV_RELOAD=1 이면 이미 로드된 모듈을 rerun마다 reload)
+render_tward41_operation = lazy_function('src.tward_type41_operation', 'render_tward41_operation')
+render_tward41_dwell_time = lazy_function('src.tward_type41_dwell_time', 'render_tward41_dwell_time')
+render_tward41_journey_map = lazy_function('src.tward_type41_journey_map', 'render_tward41_journey_map')
+
+reload_dev_modules([
     'src.tward_type41_location_analysis',
     'src.tward_type41_heatmap_analysis'
-]
-
-for module_name in modules_to_reload:
-    if module_name in sys.modules:
-        importlib.reload(sys.modules[module_name])
-        print(f"🔄 Reloaded module: {module_name}")
-
-# Type 41 모듈들 import
-from src.tward_type41_operation import render_tward41_operation
-from src.tward_type41_dwell_time import render_tward41_dwell_time
-from src.tward_type41_journey_map import render_tward41_journey_map
+])
+print_import_report(once=True)
 
 st.title("Hy-con & IRFM by TJLABS")
 
@@ -99,6 +111,7 @@ st.title("Hy-con & IRFM by TJLABS")
 # Common T41 Worker Calculation (shared between Overview and T41 tab)
 # ============================================================================
 
+@cached_result
 def calculate_t41_worker_stats_10min(t41_data: pd.DataFrame) -> pd.DataFrame:
     """
     T41 작업자 수를 10분 단위로 계산하는 공통 함수
@@ -114,10 +127,8 @@ def calculate_t41_worker_stats_10min(t41_data: pd.DataFrame) -> pd.DataFrame:
     if t41_data is None or t41_data.empty:
         return pd.DataFrame({'Time Bin': range(144), 'Total': 0, 'Active': 0, 'Inactive': 0})
     
-    t41_copy = t41_data.copy()
-    t41_copy['time'] = pd.to_datetime(t41_copy['time'])
-    t41_copy['minute_bin'] = t41_copy['time'].dt.floor('1min')
-    t41_copy['time_bin'] = (t41_copy['time'].dt.hour * 6 + t41_copy['time'].dt.minute // 10)
+    # 10분 bin index는 minute_of_day 정수 나눗셈 (전체 복사/datetime 연산 없음)
+    t41_copy = pd.DataFrame({'mac': t41_data['mac'].to_numpy(), 'time_bin': ten_minute_bin(t41_data)})
     
     # 10분 단위로 직접 신호 수 계산
     bin_signal = t41_copy.groupby(['mac', 'time_bin']).size().reset_index(name='signals')
@@ -236,6 +247,9 @@ def render_dashboard_mode():
     # Selected dataset info
     selected_dataset = next(d for d in datasets if d['name'] == selected_name)
     
+    # 탭 네비게이션 모드 (선택된 탭만 실행)
+    render_lazy_tabs_toggle()
+    
     # Display dataset info
     st.sidebar.markdown("### 📋 Dataset Info")
     st.sidebar.info(f"""
@@ -244,19 +258,41 @@ def render_dashboard_mode():
     **T31**: {selected_dataset['t31_records']:,} records
     **T41**: {selected_dataset['t41_records']:,} records  
     **Flow**: {selected_dataset['flow_records']:,} records
+    **Cache**: {selected_dataset.get('total_bytes', 0) / 1e6:.1f} MB ({selected_dataset.get('artifact_count', 0)} artifacts)
     """)
     
-    # CachedDataLoader 초기화
-    cache_loader = CachedDataLoader(selected_dataset['cache_path'])
+    # 데이터셋 내용 버전 (증분 추가 / 파티션 재작성 시 metadata.json의 updated_at이 바뀜)
+    dataset_version = selected_dataset.get('updated_at') or selected_dataset['created_at']
+    same_dataset = st.session_state.get('_dashboard_dataset') == selected_name
+    dataset_changed = not same_dataset or st.session_state.get('_dashboard_dataset_version') != dataset_version
+    if same_dataset and dataset_changed:
+        # 같은 데이터셋이 갱신됨 → 이전 버전으로 계산한 결과 삭제
+        invalidate_dataset(selected_name)
+    
+    # CachedDataLoader 초기화 (같은 데이터셋 / 버전이면 rerun 간 재사용 → prefetch된 메모리 캐시 유지)
+    cache_loader = st.session_state.get('cache_loader')
+    if (
+        not isinstance(cache_loader, CachedDataLoader)
+        or dataset_changed
+        or os.path.abspath(cache_loader.cache_folder) != os.path.abspath(selected_dataset['cache_path'])
+    ):
+        cache_loader = CachedDataLoader(selected_dataset['cache_path'])
     
     if not cache_loader.is_valid():
         st.error("Cache data is invalid. Please run precompute.py again.")
         return
     
+    # 첫 화면 / 탭 artifact 병렬 warm-up (데이터셋이 바뀌면 이전 prefetch 취소)
+    prefetch_job = prefetch_for_session(st, selected_name, cache_loader)
+    render_prefetch_status(st, prefetch_job)
+    
+    # 결과 캐시 context (데이터셋 + config_hash + 버전, 재생성 / 갱신된 데이터셋은 이전 결과 무효화)
+    set_dataset_context(selected_name, cache_loader.get_metadata().get('config_hash'), dataset_version)
+    
     # 원본 데이터를 session_state에 로드 (기존 분석 기능 사용을 위해)
     # T31 데이터 로드 (레코드가 있으면)
     if selected_dataset.get('t31_records', 0) > 0:
-        if 'tward31_data' not in st.session_state or st.session_state.get('_dashboard_dataset') != selected_name:
+        if 'tward31_data' not in st.session_state or dataset_changed:
             try:
                 st.session_state['tward31_data'] = cache_loader.load_raw_t31()
             except:
@@ -264,7 +300,7 @@ def render_dashboard_mode():
     
     # T41 데이터 로드 (레코드가 있으면)
     if selected_dataset.get('t41_records', 0) > 0:
-        if 'tward41_data' not in st.session_state or st.session_state.get('_dashboard_dataset') != selected_name:
+        if 'tward41_data' not in st.session_state or dataset_changed:
             try:
                 st.session_state['tward41_data'] = cache_loader.load_raw_t41()
                 # Journey Heatmap용 activity_analysis 로드
@@ -280,7 +316,7 @@ def render_dashboard_mode():
     
     # Flow 데이터 로드 (레코드가 있으면)
     if selected_dataset.get('flow_records', 0) > 0:
-        if 'flow_data' not in st.session_state or st.session_state.get('_dashboard_dataset') != selected_name:
+        if 'flow_data' not in st.session_state or dataset_changed:
             try:
                 st.session_state['flow_data'] = cache_loader.load_raw_flow()
             except:
@@ -290,7 +326,7 @@ def render_dashboard_mode():
     raw_data_status = cache_loader.has_raw_data()
     
     if raw_data_status.get('sward_config', False):
-        if 'sward_config' not in st.session_state or st.session_state.get('_dashboard_dataset') != selected_name:
+        if 'sward_config' not in st.session_state or dataset_changed:
             st.session_state['sward_config'] = cache_loader.load_raw_sward_config()
             # building/level 목록 설정
             sward_config = st.session_state['sward_config']
@@ -306,8 +342,9 @@ def render_dashboard_mode():
                         st.session_state['level'] = levels[0]
                         st.session_state['_last_level'] = levels[0]
     
-    # 현재 데이터셋 기록
+    # 현재 데이터셋 / 버전 기록
     st.session_state['_dashboard_dataset'] = selected_name
+    st.session_state['_dashboard_dataset_version'] = dataset_version
     
     # cache_loader를 session_state에 저장 (다른 탭에서 사용)
     st.session_state['cache_loader'] = cache_loader
@@ -316,34 +353,31 @@ def render_dashboard_mode():
     # ==========================================================================
     # 메인 탭 구조: Overview | T-Ward Type 31 | T-Ward Type 41 | MobilePhone
     # ==========================================================================
-    main_tabs = st.tabs([
-        "📊 Overview", 
-        "🔧 T-Ward Type 31", 
-        "👷 T-Ward Type 41", 
-        "📱 MobilePhone"
-    ])
-    
-    with main_tabs[0]:  # Overview
-        render_dashboard_overview(cache_loader, selected_dataset)
-    
-    with main_tabs[1]:  # T-Ward Type 31
+    def render_t31_main_tab():
         # Check if data exists (Raw or Cache)
         if selected_dataset.get('t31_records', 0) > 0 or raw_data_status.get('t31', False):
             render_dashboard_t31_tab()
         else:
             st.warning("⚠️ No T31 data available.")
     
-    with main_tabs[2]:  # T-Ward Type 41
+    def render_t41_main_tab():
         if selected_dataset.get('t41_records', 0) > 0 or raw_data_status.get('t41', False):
             render_dashboard_t41_tab()
         else:
             st.warning("⚠️ No T41 data available.")
     
-    with main_tabs[3]:  # MobilePhone
+    def render_mobilephone_main_tab():
         if selected_dataset.get('flow_records', 0) > 0 or raw_data_status.get('flow', False):
             render_dashboard_mobilephone_tab()
         else:
             st.warning("⚠️ No MobilePhone(Flow) data available.")
+    
+    render_tabs(
+        ["📊 Overview", "🔧 T-Ward Type 31", "👷 T-Ward Type 41", "📱 MobilePhone"],
+        [lambda: render_dashboard_overview(cache_loader, selected_dataset),
+         render_t31_main_tab, render_t41_main_tab, render_mobilephone_main_tab],
+        key="dashboard_main_tab"
+    )
 
 
 # ============================================================================
@@ -534,6 +568,10 @@ def render_dashboard_overview(cache_loader, selected_dataset):
     else:
         st.info("Cache loader not initialized.")
     
+    # 같은 site의 여러 날짜 rollup (python -m src.date_partitions rollup --site <site>)
+    site, _ = split_dataset_name(selected_dataset['name'])
+    render_site_trends(st, site, os.path.dirname(os.path.dirname(os.path.abspath(selected_dataset['cache_path']))))
+    
     st.markdown("---")
     st.info("💡 **Tip**: Check detailed analysis results in each tab.")
 
@@ -551,24 +589,12 @@ def render_dashboard_t31_tab():
         return
     
     # T31 sub-tabs: Overview, Location Analysis, Operation Heatmap, AI Insight & Report
-    sub_tabs = st.tabs([
-        "📊 Overview", 
-        "📍 Location Analysis", 
-        "🗺️ Operation Heatmap",
-        "🤖 AI Insight & Report"
-    ])
-    
-    with sub_tabs[0]:  # Overview
-        render_t31_overview()
-    
-    with sub_tabs[1]:  # Location Analysis
-        render_t31_location_analysis()
-    
-    with sub_tabs[2]:  # Operation Heatmap
-        render_t31_operation_heatmap()
-    
-    with sub_tabs[3]:  # AI Insight & Report
-        render_t31_ai_insight_report()
+    render_tabs(
+        ["📊 Overview", "📍 Location Analysis", "🗺️ Operation Heatmap", "🤖 AI Insight & Report"],
+        [render_t31_overview, render_t31_location_analysis,
+         render_t31_operation_heatmap, render_t31_ai_insight_report],
+        key="dashboard_t31_tab"
+    )
 
 
 def render_dashboard_t41_tab():
@@ -606,24 +632,12 @@ def render_dashboard_t41_tab():
     st.session_state['tward41_min_dwell_time'] = min_dwell_time if enable_filter else 0
     
     # T41 서브탭: Overview, Location Analysis, Journey Heatmap, AI Insight & Report
-    sub_tabs = st.tabs([
-        "📊 Overview", 
-        "📍 Location Analysis", 
-        "🗺️ Journey Heatmap",
-        "🤖 AI Insight & Report"
-    ])
-    
-    with sub_tabs[0]:  # Overview
-        render_t41_overview()
-    
-    with sub_tabs[1]:  # Location Analysis (Video)
-        render_t41_location_analysis()
-    
-    with sub_tabs[2]:  # Journey Heatmap
-        render_t41_journey_heatmap()
-    
-    with sub_tabs[3]:  # AI Insight & Report
-        render_t41_ai_insight_report()
+    render_tabs(
+        ["📊 Overview", "📍 Location Analysis", "🗺️ Journey Heatmap", "🤖 AI Insight & Report"],
+        [render_t41_overview, render_t41_location_analysis,  # Location Analysis (Video)
+         render_t41_journey_heatmap, render_t41_ai_insight_report],
+        key="dashboard_t41_tab"
+    )
 
 
 def render_dashboard_mobilephone_tab():
@@ -640,22 +654,16 @@ def render_dashboard_mobilephone_tab():
     sward_config = st.session_state.get('sward_config')
     
     # Flow 서브탭 - 개편된 구조
-    sub_tabs = st.tabs([
-        "📊 Device Counting", 
-        "🔄 T-Ward vs Mobile",
-        "📈 Apple vs Android"
-    ])
-    
-    with sub_tabs[0]:  # Device Counting
-        _render_device_counting_tab(flow_data, sward_config, cache_loader)
-    
-    with sub_tabs[1]:  # T-Ward vs Mobile
-        _render_tward_vs_mobile_tab(flow_data, sward_config, cache_loader)
-        
-    with sub_tabs[2]:  # Apple vs Android
-        _render_apple_vs_android_tab(flow_data, cache_loader)
+    render_tabs(
+        ["📊 Device Counting", "🔄 T-Ward vs Mobile", "📈 Apple vs Android"],
+        [lambda: _render_device_counting_tab(flow_data, sward_config, cache_loader),
+         lambda: _render_tward_vs_mobile_tab(flow_data, sward_config, cache_loader),
+         lambda: _render_apple_vs_android_tab(flow_data, cache_loader)],
+        key="dashboard_mobile_tab"
+    )
 
 
+@fragment
 def _render_device_counting_tab(flow_data, sward_config, cache_loader=None):
     """Device Counting 탭 - 캐시 데이터만 사용"""
     import plotly.graph_objects as go
@@ -715,14 +723,17 @@ def _render_device_counting_tab(flow_data, sward_config, cache_loader=None):
     if unit_time_data is not None and not unit_time_data.empty:
         # bin_index와 unique_devices 사용
         fig_total = go.Figure()
-        fig_total.add_trace(go.Scatter(
-            x=unit_time_data['bin_index'],
-            y=unit_time_data['unique_devices'],
+        add_downsampled_trace(
+            fig_total,
+            unit_time_data['bin_index'],
+            unit_time_data['unique_devices'],
+            window=zoom_window(unit_time_data['time_label'] if 'time_label' in unit_time_data.columns
+                               else unit_time_data['bin_index'], key="overview_flow_zoom"),
             mode='lines+markers',
             name='Total Devices',
             line=dict(color='#1f77b4', width=3),
             marker=dict(size=6)
-        ))
+        )
         fig_total.update_layout(
             title=f'전체 디바이스 수 (UnitTime 단위)',
             xaxis_title='Time (bin_index)',
@@ -871,14 +882,16 @@ def _render_device_counting_tab(flow_data, sward_config, cache_loader=None):
                         # 차트 (UnitTime 기준)
                         import plotly.graph_objects as go
                         fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=unit_time_plot['bin_index'],
-                            y=unit_time_plot['adjusted_devices'],
+                        add_downsampled_trace(
+                            fig,
+                            unit_time_plot['bin_index'],
+                            unit_time_plot['adjusted_devices'],
+                            window=zoom_window(unit_time_plot['bin_index'], key="flow_device_counting_zoom"),
                             mode='lines+markers',
                             name='Unique Devices',
                             line=dict(color='#2196F3', width=3),
                             marker=dict(size=6)
-                        ))
+                        )
                         
                         title_suffix = ""
                         if selected_building != "All":
@@ -921,9 +934,9 @@ def _render_device_counting_tab(flow_data, sward_config, cache_loader=None):
         st.error(f"Error loading building/floor data: {e}")
 
 
+@fragment
 def _render_tward_vs_mobile_tab(flow_data, sward_config, cache_loader=None):
     """T-Ward vs Mobile 탭: T41 인원수와 Mobile 디바이스 수 비교 (캐시 전용)"""
-    import plotly.graph_objects as go
     from plotly.subplots import make_subplots
     
     st.subheader("🔄 T-Ward vs Mobile Device Count")
@@ -991,30 +1004,35 @@ def _render_tward_vs_mobile_tab(flow_data, sward_config, cache_loader=None):
                         row_heights=[0.6, 0.4],
                         vertical_spacing=0.15)
     
-    fig.add_trace(go.Scatter(
-        x=merged['time_label'],
-        y=merged['t41_count'],
+    # 긴 시계열은 화면 포인트 예산으로 decimation (구간 선택 시 원본 해상도)
+    # 세 trace가 같은 time_label 표본을 쓰도록 위치 index를 T41 series 기준으로 한 번만 선택
+    window = zoom_window(merged['time_label'], key="tvm_zoom")
+    positions = shared_indices(merged['t41_count'], window=window, fig=fig)
+    
+    add_downsampled_trace(
+        fig, merged['time_label'], merged['t41_count'], window=window, indices=positions,
         mode='lines+markers',
         name='T-Ward (T41)',
         line=dict(color='#2E86AB', width=3),
-        marker=dict(size=8)
-    ), row=1, col=1)
+        marker=dict(size=8),
+        row=1, col=1
+    )
     
-    fig.add_trace(go.Scatter(
-        x=merged['time_label'],
-        y=merged['mobile_count'],
+    add_downsampled_trace(
+        fig, merged['time_label'], merged['mobile_count'], window=window, indices=positions,
         mode='lines+markers',
         name='Mobile Phone',
         line=dict(color='#E94F37', width=3),
-        marker=dict(size=8)
-    ), row=1, col=1)
+        marker=dict(size=8),
+        row=1, col=1
+    )
     
-    fig.add_trace(go.Bar(
-        x=merged['time_label'],
-        y=merged['ratio'],
+    add_downsampled_trace(
+        fig, merged['time_label'], merged['ratio'], window=window, indices=positions, trace_type='bar',
         name='T-Ward / Mobile (%)',
-        marker_color='#5C946E'
-    ), row=2, col=1)
+        marker_color='#5C946E',
+        row=2, col=1
+    )
     
     fig.update_layout(
         height=650,
@@ -1458,16 +1476,30 @@ def main():
     
     st.sidebar.markdown("---")
     
-    if mode == "📊 Dashboard (Auto-load)":
-        # Dashboard Mode
-        render_dashboard_mode()
-    else:
-        # Processing Mode (기존 방식)
-        render_processing_mode()
+    # rerun 1회 = trace 1개 (IRFM_TRACE=1: 모든 세션 / trace 패널 토글: 이 세션만)
+    mode_name = 'dashboard' if mode == "📊 Dashboard (Auto-load)" else 'processing'
+    with trace_rerun(mode_name, enabled=is_session_tracing_enabled(st.session_state)):
+        if mode == "📊 Dashboard (Auto-load)":
+            # Dashboard Mode
+            render_dashboard_mode()
+        else:
+            # Processing Mode (기존 방식)
+            render_processing_mode()
+        
+        # 세션 메모리 측정 → 한도 초과 시 다시 만들 수 있는 entry부터 제거 (IRFM_SESSION_MEMORY_MB)
+        track_session(st.session_state, mode_name)
+    
+    # 모듈별 import 시간 / pipeline trace / 세션 메모리 (dev 모드)
+    if is_dev_reload_enabled():
+        render_import_report(st)
+    if is_dev_reload_enabled() or is_tracing_enabled():
+        render_trace_panel(st)
+        render_memory_panel(st)
 
 
 def render_processing_mode():
     """Processing Mode: 기존 업로드 방식"""
+    set_dataset_context(PROCESSING_DATASET_ID)
     
     menu = st.sidebar.radio(
         "Main Menu",
@@ -1532,6 +1564,14 @@ def render_processing_mode():
             key="data_type_select"
         )
         
+        # 무거운 분석은 background job(별도 프로세스)으로 실행
+        st.sidebar.checkbox(
+            "🧵 Run analyses in background jobs",
+            value=True,
+            key="processing_background_jobs",
+            help="Analyses run in a separate process; progress is polled and results survive reruns."
+        )
+        
         # 데이터 상태 표시
         st.sidebar.markdown("### 📊 Uploaded Data Status")
         if has_tward31:
@@ -1559,6 +1599,10 @@ def render_processing_mode():
             render_tward31_41()
         elif data_type == "Flow Data Processing":
             render_flow()
+        
+        # Background job table (상태 / 진행률 / 결과 위치)
+        with st.expander("🧵 Background Jobs", expanded=False):
+            render_job_table(st)
 
 
 # ============================================================================
@@ -1701,6 +1745,7 @@ def render_t31_overview():
     st.info(ai_comment)
 
 
+@fragment
 def render_t31_location_analysis():
     """T31 Location Analysis: Equipment location on map (Cache Version)"""
     st.subheader("📍 T31 Location Analysis")
@@ -2008,36 +2053,45 @@ def _display_t31_heatmap_from_cache(heatmap_data):
         x_labels = [global_config.get_time_label_from_bin(i) for i in range(num_bins)]
         unit_time_minutes = global_config.UNIT_TIME_MINUTES
         
-        fig = go.Figure(data=go.Heatmap(
-            z=z_data,
-            x=x_labels,
-            y=y_labels,
-            colorscale=colorscale,
-            zmin=0,
-            zmax=7,
-            showscale=True,
-            colorbar=dict(
-                tickvals=[0, 1, 2, 3, 4, 5, 6, 7],
-                ticktext=['No Signal', 'Inactive', 'WWT-1F', 'WWT-B1F', 'FAB', 'CUB-1F', 'CUB-B1F', 'Cluster']
+        title = f'T31 Equipment Operation Heatmap ({unit_time_minutes}-min intervals) - Building-Level Colors'
+        
+        def build_interactive_figure():
+            fig = go.Figure(data=go.Heatmap(
+                z=z_data,
+                x=x_labels,
+                y=y_labels,
+                colorscale=colorscale,
+                zmin=0,
+                zmax=7,
+                showscale=True,
+                colorbar=dict(
+                    tickvals=[0, 1, 2, 3, 4, 5, 6, 7],
+                    ticktext=['No Signal', 'Inactive', 'WWT-1F', 'WWT-B1F', 'FAB', 'CUB-1F', 'CUB-B1F', 'Cluster']
+                )
+            ))
+            fig.update_layout(
+                title=title,
+                xaxis_title='Time',
+                yaxis_title='Equipment (Building-Level)',
+                height=max(400, len(heatmap_data) * 20)
             )
-        ))
-        fig.update_layout(
-            title=f'T31 Equipment Operation Heatmap ({unit_time_minutes}-min intervals) - Building-Level Colors',
-            xaxis_title='Time',
-            yaxis_title='Equipment (Building-Level)',
-            height=max(400, len(heatmap_data) * 20)
+            return fig
+        
+        render_code_heatmap(
+            z_data, [str(label) for label in y_labels], x_labels, title=title,
+            key="t31_cached_heatmap", interactive_figure=build_interactive_figure,
+            row_height_px=20, min_height=400,
+            xaxis_title='Time', yaxis_title='Equipment (Building-Level)',
+            x_dtick=max(1, global_config.bins_per_hour())
         )
-        st.plotly_chart(fig, use_container_width=True)
         
         # 범례 표시
         _display_building_level_legend()
 
 
-def _display_t31_heatmap_realtime(t31_data, sward_config):
-    """실시간 계산하여 히트맵 표시 - Building-Level 색상 사용"""
-    import plotly.graph_objects as go
-    from src.colors import COLOR_HEX_MAP, BUILDING_LEVEL_COLORS
-    
+@cached_result
+def _build_t31_heatmap_realtime(t31_data, sward_config):
+    """T31 실시간 히트맵 데이터 계산 (MAC x 144 time bin, Building-Level 색상 index)"""
     # Building-Level 색상 매핑
     bl_to_color_idx = {
         'WWT-1F': 2, 'WWT-B1F': 3, 'WWT-2F': 2,
@@ -2049,7 +2103,7 @@ def _display_t31_heatmap_realtime(t31_data, sward_config):
     # 데이터 전처리
     t31_copy = t31_data.copy()
     t31_copy['time'] = pd.to_datetime(t31_copy['time'])
-    t31_copy['time_bin'] = (t31_copy['time'].dt.hour * 6 + t31_copy['time'].dt.minute // 10)
+    t31_copy['time_bin'] = ten_minute_bin(t31_copy)
     
     # S-Ward config와 조인
     if sward_config is not None:
@@ -2108,6 +2162,19 @@ def _display_t31_heatmap_realtime(t31_data, sward_config):
     # Y축 라벨: location + MAC 앞 8자리
     y_labels = [f"{mac_loc_map.get(mac, 'Unknown')} | {mac[:8]}" for mac in mac_list]
     
+    return {'z_data': z_data, 'y_labels': y_labels, 'mac_list': mac_list}
+
+
+def _display_t31_heatmap_realtime(t31_data, sward_config):
+    """실시간 계산하여 히트맵 표시 - Building-Level 색상 사용"""
+    import plotly.graph_objects as go
+    from src.colors import COLOR_HEX_MAP, BUILDING_LEVEL_COLORS
+    
+    heatmap = _build_t31_heatmap_realtime(t31_data, sward_config)
+    z_data = heatmap['z_data']
+    y_labels = heatmap['y_labels']
+    n_equipment = len(heatmap['mac_list'])
+    
     # Discrete colorscale 생성 (0-7 정수 매핑)
     # 0=No Signal, 1=Inactive, 2=WWT-1F, 3=WWT-B1F, 4=FAB, 5=CUB-1F, 6=CUB-B1F, 7=Cluster
     colorscale = [
@@ -2121,42 +2188,53 @@ def _display_t31_heatmap_realtime(t31_data, sward_config):
         [7/7, COLOR_HEX_MAP[7]],  # 7: Cluster - Purple
     ]
     
-    # 히트맵 생성
-    fig = go.Figure(data=go.Heatmap(
-        z=z_data,
-        x=[f"{i//6:02d}:{(i%6)*10:02d}" for i in range(144)],
-        y=y_labels,
-        colorscale=colorscale,
-        zmin=0,
-        zmax=7,
-        showscale=True,
-        colorbar=dict(
-            tickvals=[0, 1, 2, 3, 4, 5, 6, 7],
-            ticktext=['No Signal', 'Inactive', 'WWT-1F', 'WWT-B1F', 'FAB', 'CUB-1F', 'CUB-B1F', 'Cluster']
-        ),
-        hovertemplate='Time: %{x}<br>Equipment: %{y}<br>Status: %{z}<extra></extra>'
-    ))
+    x_labels = [f"{i//6:02d}:{(i%6)*10:02d}" for i in range(144)]
+    title = 'T31 Equipment Operation Heatmap (10-min intervals) - Building-Level Colors'
     
-    fig.update_layout(
-        title='T31 Equipment Operation Heatmap (10-min intervals) - Building-Level Colors',
-        xaxis_title='Time',
-        yaxis_title='Equipment (Building-Level | MAC)',
-        height=max(500, len(pivot_df) * 15),
-        xaxis=dict(tickangle=45, dtick=6)
+    # 히트맵 생성
+    def build_interactive_figure():
+        fig = go.Figure(data=go.Heatmap(
+            z=z_data,
+            x=x_labels,
+            y=y_labels,
+            colorscale=colorscale,
+            zmin=0,
+            zmax=7,
+            showscale=True,
+            colorbar=dict(
+                tickvals=[0, 1, 2, 3, 4, 5, 6, 7],
+                ticktext=['No Signal', 'Inactive', 'WWT-1F', 'WWT-B1F', 'FAB', 'CUB-1F', 'CUB-B1F', 'Cluster']
+            ),
+            hovertemplate='Time: %{x}<br>Equipment: %{y}<br>Status: %{z}<extra></extra>'
+        ))
+        
+        fig.update_layout(
+            title=title,
+            xaxis_title='Time',
+            yaxis_title='Equipment (Building-Level | MAC)',
+            height=max(500, n_equipment * 15),
+            xaxis=dict(tickangle=45, dtick=6)
+        )
+        return fig
+    
+    # 대형 히트맵은 서버 측 PNG로 렌더링 (행 단위 hover, 행렬 fingerprint별 캐시)
+    render_code_heatmap(
+        z_data, y_labels, x_labels, title=title,
+        key="t31_realtime_heatmap", interactive_figure=build_interactive_figure,
+        row_height_px=15, min_height=500,
+        xaxis_title='Time', yaxis_title='Equipment (Building-Level | MAC)'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
-    
     # 범례 표시
     _display_building_level_legend()
     
     # 통계 표시
     total_active_cells = (z_data > 1).sum()  # color index > 1 = active
-    total_cells = len(pivot_df) * 144
+    total_cells = n_equipment * 144
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Equipment", len(pivot_df))
+        st.metric("Total Equipment", n_equipment)
     with col2:
         st.metric("Active Time Slots", f"{total_active_cells:,}")
     with col3:
@@ -2444,6 +2522,37 @@ def render_t41_overview():
     except Exception as e:
         st.error(f"Error loading chart data: {e}")
     
+    # 1분 단위 동시 재실 인원 (presence bitset, activity_analysis를 다시 집계하지 않음)
+    try:
+        presence_index = loader.load_t41_presence_index()
+    except Exception as e:
+        presence_index = None
+        st.caption(f"1-min occupancy not available: {e}")
+    if presence_index is not None:
+        building_filter = None if selected_building == "All" else selected_building
+        level_filter = None if selected_level == "All" else selected_level
+        present_curve = presence_index.occupancy_curve(building_filter, level_filter, statuses=['Active', 'Present'])
+        active_curve = presence_index.occupancy_curve(building_filter, level_filter, statuses=['Active'])
+        
+        st.markdown("#### 👥 Peak Occupancy (1-min resolution)")
+        peak_cols = st.columns(2)
+        for col, label, curve in ((peak_cols[0], "Peak Present Workers", present_curve),
+                                  (peak_cols[1], "Peak Active Workers", active_curve)):
+            minute = int(curve.argmax())
+            col.metric(label, f"{int(curve[minute]):,}", f"at {minute // 60:02d}:{minute % 60:02d}", delta_color="off")
+        
+        # 1,440분 series → 화면 포인트 예산으로 decimation (Present / Active가 같은 분 표본 사용)
+        import plotly.graph_objects as go
+        hours = np.arange(len(present_curve)) / 60
+        fig3 = go.Figure()
+        fig3.update_layout(height=300, title=f'Workers on Site by Minute - {selected_building} {selected_level}',
+                           xaxis_title='Hour', yaxis_title='Workers', xaxis=dict(range=[0, 24], dtick=2))
+        positions = shared_indices(present_curve, fig=fig3)
+        for name, curve, color in (('Present', present_curve, '#2196F3'), ('Active', active_curve, '#4CAF50')):
+            add_downsampled_trace(fig3, hours, curve, indices=positions, mode='lines', name=name,
+                                  line=dict(color=color))
+        st.plotly_chart(fig3, use_container_width=True)
+    
     st.markdown("---")
     
     # =========================================================================
@@ -2503,6 +2612,7 @@ def render_t41_overview():
     st.info(ai_comment)
 
 
+@fragment
 def render_t41_location_analysis():
     """T41 Location Analysis: Worker location heatmap (Cache Version)"""
     st.subheader("📍 T41 Location Analysis - Position Heatmap")
@@ -0,0 +1,357 @@
+"""
+Artifact Graph Module
+캐시 artifact 의존성 그래프 - 파일이 없으면 가장 가까운 parent에서 계산 (compute-on-miss)
+
+각 artifact는 (입력 artifact, builder 함수) recipe 목록으로 선언되며, 가까운(저렴한) parent 순으로 정렬됩니다.
+
+    raw_flow.parquet ─┬→ flow_results_two_min_unique_mac ──→ flow_results_hourly_avg_from_2min
+                      ├→ flow_results_hourly_flow ─────────→ dashboard_results_flow_hourly_devices
+                      └→ flow_results_unit_time_unique / ten_min_unique / device_stats / ...
+
+CachedDataLoader._load_parquet에서 파일이 없으면 derive_artifact()가
+    1. 입력이 모두 있거나(재귀적으로) 계산 가능한 recipe를 가까운 parent 순으로 선택
+    2. 입력 로드 (없는 입력은 같은 방식으로 계산) → builder 실행 (실패하면 다음 recipe)
+    3. tmp 파일에 쓰고 rename (atomic), metadata.json의 saved_files / derived_artifacts에 기록
+하여 일부만 있는 캐시가 필요한 artifact를 점진적으로 채웁니다.
+
+고유 MAC 수(distinct count)는 작은 bin의 합/평균으로 만들 수 없으므로
+10분 / 시간 단위 고유 수는 원본(raw)에서만 계산하고,
+1분 / 2분 고유 수의 시간대별 평균 / 최대 / 최소처럼 합성 가능한 집계만 중간 artifact에서 계산합니다.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.dataset_catalog import refresh_dataset
+from src.time_index import minute_of_day
+
+try:
+    import fcntl
+except ImportError:     # Windows: 프로세스 내 lock만 사용
+    fcntl = None
+
+RAW_SOURCES = ('raw_t31.parquet', 'raw_t41.parquet', 'raw_flow.parquet')
+DEFAULT_UNIT_TIME_MINUTES = 5
+
+METADATA_LOCK_FILE = '.metadata.json.lock'     # '.' 파일은 catalog artifact 목록에서 제외
+
+_metadata_lock = threading.Lock()
+
+
+class ArtifactRecipe:
+    """artifact 1개를 만드는 방법 (입력 artifact 목록 + builder)"""
+
+    def __init__(self, inputs: Sequence[str], build: Callable[..., pd.DataFrame]):
+        self.inputs = tuple(inputs)
+        self.build = build
+
+    @property
+    def name(self) -> str:
+        return self.build.__name__
+
+
+# ========== Builder: 원본 → 고유 MAC 수 ==========
+
+def _valid_rows(raw: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """시간 값이 있는 행만 (minute_of_day = -1 제외)"""
+    minutes = minute_of_day(raw)
+    return raw.loc[minutes >= 0], minutes[minutes >= 0]
+
+
+def _unique_per_window(raw: pd.DataFrame, minutes_per_bin: int, count_col: str) -> pd.DataFrame:
+    """(일자, bin 시작 분)별 고유 MAC 수 → [day, start_minute, count_col]"""
+    rows, minutes = _valid_rows(raw)
+    frame = pd.DataFrame({
+        'day': rows['day'].to_numpy(),
+        'start_minute': (minutes.astype('int32') // minutes_per_bin) * minutes_per_bin,
+        'mac': rows['mac'].to_numpy(),
+    })
+    return frame.groupby(['day', 'start_minute'], observed=True)['mac'].nunique().reset_index(name=count_col)
+
+
+def _with_bin_columns(counts: pd.DataFrame, bin_col: str) -> pd.DataFrame:
+    counts[bin_col] = counts['day'] + pd.to_timedelta(counts['start_minute'], unit='m')
+    counts['date'] = counts['day'].dt.strftime('%Y-%m-%d')
+    counts['hour'] = (counts['start_minute'] // 60).astype('int32')
+    return counts
+
+
+def build_one_min_unique_mac(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    counts = _with_bin_columns(_unique_per_window(raw, 1, 'unique_mac_count'), 'one_min_bin')
+    return counts[['date', 'one_min_bin', 'unique_mac_count', 'hour']]
+
+
+def build_two_min_unique_mac(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    counts = _with_bin_columns(_unique_per_window(raw, 2, 'unique_mac_count'), 'two_min_bin')
+    return counts[['date', 'two_min_bin', 'unique_mac_count', 'hour']]
+
+
+def build_flow_ten_min_unique(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    counts = _with_bin_columns(_unique_per_window(raw, 10, 'unique_devices'), 'ten_min_bin')
+    return counts[['date', 'ten_min_bin', 'unique_devices']]
+
+
+def build_flow_unit_time_unique(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    unit = int(config.get('unit_time_minutes', DEFAULT_UNIT_TIME_MINUTES))
+    counts = _with_bin_columns(_unique_per_window(raw, unit, 'unique_devices'), 'unit_time_bin')
+    counts['bin_index'] = (counts['start_minute'] // unit).astype('int32')
+    counts['time_label'] = counts['unit_time_bin'].dt.strftime('%H:%M')
+    return counts[['date', 'unit_time_bin', 'unique_devices', 'bin_index', 'time_label']]
+
+
+def build_flow_hourly_flow(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    counts = _with_bin_columns(_unique_per_window(raw, 60, 'unique_devices'), 'hour_bin')
+    return counts[['date', 'hour', 'unique_devices']]
+
+
+def build_device_type_stats(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    stats = raw.groupby('type', observed=True)['mac'].nunique().reset_index(name='unique_devices')
+    stats = stats.rename(columns={'type': 'device_type'})
+    stats['device_type'] = stats['device_type'].astype('int64')
+    return stats
+
+
+def build_device_stats(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """MAC별 첫/마지막 수신, 레코드 수, S-Ward 수, 평균 RSSI, 체류 시간(분)"""
+    stats = raw.groupby('mac', observed=True).agg(
+        first_seen=('time', 'min'),
+        last_seen=('time', 'max'),
+        record_count=('time', 'size'),
+        sward_count=('sward_id', 'nunique'),
+        avg_rssi=('rssi', 'mean'),
+    ).reset_index()
+    stats['mac'] = stats['mac'].astype(str)
+    stats['duration_minutes'] = (stats['last_seen'] - stats['first_seen']).dt.total_seconds() / 60
+    return stats
+
+
+def build_worker_dwell(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """작업자별 체류 시간 = 신호가 있는 1분 bin 수 (activity_analysis의 MAC별 행 수와 같은 정의)"""
+    rows, minutes = _valid_rows(raw)
+    frame = pd.DataFrame({
+        'mac': rows['mac'].astype(str).to_numpy(),
+        'minute': minutes,
+        'time': rows['time'].to_numpy(),
+        'sward_id': rows['sward_id'].to_numpy(),
+        'rssi': rows['rssi'].to_numpy(),
+    })
+    return frame.groupby('mac').agg(
+        dwell_time_minutes=('minute', 'nunique'),
+        first_seen=('time', 'min'),
+        last_seen=('time', 'max'),
+        record_count=('time', 'size'),
+        sward_count=('sward_id', 'nunique'),
+        avg_rssi=('rssi', 'mean'),
+    ).reset_index()
+
+
+def build_t31_hourly_activity(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    rows, minutes = _valid_rows(raw)
+    frame = pd.DataFrame({
+        'date': rows['day'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'hour': (minutes.astype('int32') // 60),
+        'mac': rows['mac'].to_numpy(),
+        'sward_id': rows['sward_id'].to_numpy(),
+        'rssi': rows['rssi'].to_numpy(),
+    })
+    return frame.groupby(['date', 'hour'], observed=True).agg(
+        active_devices=('mac', 'nunique'),
+        active_swards=('sward_id', 'nunique'),
+        avg_rssi=('rssi', 'mean'),
+    ).reset_index()
+
+
+# ========== Builder: 중간 artifact → 시간대 집계 (합성 가능한 집계만) ==========
+
+def build_t41_hourly_avg_from_1min(one_min: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    return one_min.groupby(['date', 'hour'], observed=True)['unique_mac_count'].agg(
+        avg_workers='mean', max_workers='max', min_workers='min', one_min_bin_count='count'
+    ).reset_index()
+
+
+def build_t41_hourly_avg_from_2min(two_min: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    return two_min.groupby(['date', 'hour'], observed=True)['unique_mac_count'].agg(
+        avg_workers='mean', max_workers='max', min_workers='min', two_min_bin_count='count'
+    ).reset_index()
+
+
+def build_flow_hourly_avg_from_2min(two_min: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    return two_min.groupby(['date', 'hour'], observed=True)['unique_mac_count'].agg(
+        avg_unique_mac='mean', max_unique_mac='max', min_unique_mac='min',
+        sum_unique_mac='sum', two_min_bin_count='count'
+    ).reset_index()
+
+
+def build_flow_hourly_devices(hourly_flow: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """일자 구분 없는 시간대별 고유 기기 수 (단일 일자 캐시는 hourly_flow와 동일)"""
+    if hourly_flow['date'].nunique() <= 1:
+        return hourly_flow[['hour', 'unique_devices']].reset_index(drop=True)
+    raise ValueError("hourly devices across multiple days need raw data")
+
+
+def build_flow_hourly_devices_from_raw(raw: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    rows, minutes = _valid_rows(raw)
+    frame = pd.DataFrame({'hour': (minutes.astype('int32') // 60), 'mac': rows['mac'].to_numpy()})
+    return frame.groupby('hour', observed=True)['mac'].nunique().reset_index(name='unique_devices')
+
+
+# ========== 그래프 선언 (recipe는 가까운 parent 순) ==========
+
+ARTIFACT_GRAPH: Dict[str, List[ArtifactRecipe]] = {
+    # T41
+    't41_results_one_min_unique_mac.parquet': [ArtifactRecipe(['raw_t41.parquet'], build_one_min_unique_mac)],
+    't41_results_two_min_unique_mac.parquet': [ArtifactRecipe(['raw_t41.parquet'], build_two_min_unique_mac)],
+    't41_results_hourly_avg_from_1min.parquet': [
+        ArtifactRecipe(['t41_results_one_min_unique_mac.parquet'], build_t41_hourly_avg_from_1min),
+    ],
+    't41_results_hourly_avg_from_2min.parquet': [
+        ArtifactRecipe(['t41_results_two_min_unique_mac.parquet'], build_t41_hourly_avg_from_2min),
+    ],
+    't41_results_worker_dwell.parquet': [ArtifactRecipe(['raw_t41.parquet'], build_worker_dwell)],
+    # Flow
+    'flow_results_two_min_unique_mac.parquet': [ArtifactRecipe(['raw_flow.parquet'], build_two_min_unique_mac)],
+    'flow_results_hourly_avg_from_2min.parquet': [
+        ArtifactRecipe(['flow_results_two_min_unique_mac.parquet'], build_flow_hourly_avg_from_2min),
+    ],
+    'flow_results_unit_time_unique.parquet': [ArtifactRecipe(['raw_flow.parquet'], build_flow_unit_time_unique)],
+    'flow_results_ten_min_unique.parquet': [ArtifactRecipe(['raw_flow.parquet'], build_flow_ten_min_unique)],
+    'flow_results_hourly_flow.parquet': [ArtifactRecipe(['raw_flow.parquet'], build_flow_hourly_flow)],
+    'dashboard_results_flow_hourly_devices.parquet': [
+        ArtifactRecipe(['flow_results_hourly_flow.parquet'], build_flow_hourly_devices),
+        ArtifactRecipe(['raw_flow.parquet'], build_flow_hourly_devices_from_raw),
+    ],
+    'flow_results_device_type_stats.parquet': [ArtifactRecipe(['raw_flow.parquet'], build_device_type_stats)],
+    'flow_results_device_stats.parquet': [ArtifactRecipe(['raw_flow.parquet'], build_device_stats)],
+    # T31
+    't31_results_two_min_unique_mac.parquet': [ArtifactRecipe(['raw_t31.parquet'], build_two_min_unique_mac)],
+    't31_results_hourly_activity.parquet': [ArtifactRecipe(['raw_t31.parquet'], build_t31_hourly_activity)],
+    't31_results_device_stats.parquet': [ArtifactRecipe(['raw_t31.parquet'], build_device_stats)],
+}
+
+
+# ========== 계획 / 실행 ==========
+
+def _is_available(cache_folder, filename: str, visiting: set) -> bool:
+    """파일이 있거나 재귀적으로 계산 가능한지"""
+    if (Path(cache_folder) / filename).exists():
+        return True
+    if filename in visiting:
+        return False
+    visiting.add(filename)
+    try:
+        return bool(plan_recipes(cache_folder, filename, visiting))
+    finally:
+        visiting.discard(filename)
+
+
+def plan_recipes(cache_folder, filename: str, _visiting: Optional[set] = None) -> List[ArtifactRecipe]:
+    """입력이 모두 있거나 계산 가능한 recipe 목록 (가까운 parent 순)"""
+    visiting = {filename} if _visiting is None else _visiting
+    return [
+        recipe for recipe in ARTIFACT_GRAPH.get(filename, [])
+        if all(_is_available(cache_folder, name, visiting) for name in recipe.inputs)
+    ]
+
+
+def write_parquet_atomic(df: pd.DataFrame, path: Path):
+    tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}.{threading.get_ident()}")
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@contextmanager
+def _metadata_file_lock(cache_folder):
+    """metadata.json 갱신 lock - 프로세스 내 thread lock + metadata.json 옆 lock 파일 (fcntl.flock)
+
+    batch report / 일자 요약 worker process들이 같은 metadata.json을 동시에 read-modify-write 해도
+    서로의 saved_files / derived_artifacts 갱신을 덮어쓰지 않도록 합니다.
+    """
+    with _metadata_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(Path(cache_folder) / METADATA_LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def update_metadata(cache_folder, update: Callable[[Dict], None]) -> Dict:
+    """metadata.json read → update(metadata) → atomic write (프로세스 간 파일 lock)"""
+    metadata_path = Path(cache_folder) / "metadata.json"
+    with _metadata_file_lock(cache_folder):
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+        update(metadata)
+        tmp_path = metadata_path.with_name(f".metadata.json.tmp{os.getpid()}")
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_path, metadata_path)
+    return metadata
+
+
+def record_in_metadata(cache_folder, filename: str, recipe: ArtifactRecipe):
+    """metadata.json의 saved_files / derived_artifacts에 기록 (atomic write)"""
+    def update(metadata):
+        saved_files = metadata.setdefault('saved_files', [])
+        if filename not in saved_files:
+            saved_files.append(filename)
+        metadata.setdefault('derived_artifacts', {})[filename] = {
+            'inputs': list(recipe.inputs),
+            'builder': recipe.name,
+            'created_at': datetime.now().isoformat(),
+        }
+    update_metadata(cache_folder, update)
+
+
+def derive_artifact(loader, filename: str) -> Optional[pd.DataFrame]:
+    """없는 artifact 계산 → 저장 (실패 / 계산 불가 시 None)
+
+    입력은 loader를 통해 로드하므로 없는 입력도 재귀적으로 계산되며 메모리 캐시에 남습니다.
+    """
+    cache_folder = loader.cache_folder
+    config = loader.get_metadata().get('config', {})
+
+    result, recipe = None, None
+    for candidate in plan_recipes(cache_folder, filename):
+        inputs = []
+        for name in candidate.inputs:
+            frame = loader._load_raw_parquet(name) if name in RAW_SOURCES else loader._load_parquet(name)
+            if frame is None or frame.empty:
+                break
+            inputs.append(frame)
+        else:
+            try:
+                result = candidate.build(*inputs, config)
+            except Exception as e:
+                print(f"⚠️ Could not derive {filename} via {candidate.name}: {e}")
+                continue
+            if result is not None and not result.empty:
+                recipe = candidate
+                break
+    if recipe is None:
+        return None
+
+    try:
+        write_parquet_atomic(result, Path(cache_folder) / filename)
+        record_in_metadata(cache_folder, filename, recipe)
+        loader._metadata = None
+        refresh_dataset(cache_folder)
+        print(f"🧩 Derived {filename} from {', '.join(recipe.inputs)} ({len(result):,} rows)")
+    except OSError as e:
+        print(f"⚠️ Derived {filename} kept in memory only: {e}")
+    return result
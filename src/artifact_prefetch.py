@@ -0,0 +1,261 @@
+"""
+Artifact Prefetch Module
+데이터셋 선택 시 Dashboard 캐시 artifact를 thread pool에서 미리 읽기 (warm-up)
+
+Dashboard 탭은 CachedDataLoader의 load_* 함수를 script thread에서 하나씩 호출하므로
+parquet 읽기가 순서대로 blocking 됩니다. pyarrow는 parquet 디코딩 중 GIL을 해제하므로
+여러 파일을 thread pool에서 동시에 읽으면 대기 시간이 겹쳐집니다.
+
+    job = artifact_prefetcher.start(selected_name, cache_loader)   # 데이터셋 선택 시
+    job.cancel()                                                  # 다른 데이터셋 선택 시
+
+우선순위:
+    0 (PRIORITY_INITIAL)   - 첫 화면: Overview + session_state 원본 데이터
+    1 (PRIORITY_TABS)      - 각 탭의 기본 화면 (T31 / T41 / MobilePhone)
+    2 (PRIORITY_FILTERS)   - Building/Level 필터별 artifact, AI insight
+
+읽은 결과는 CachedDataLoader의 메모리 캐시(_cache)에 저장되며,
+script thread가 같은 파일을 요청하면 진행 중인 읽기가 끝날 때까지 기다린 후 결과를 공유합니다.
+취소된 작업의 대기 중 task는 실행되지 않습니다 (이미 읽는 중인 파일은 완료 후 버려짐).
+"""
+
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+PREFETCH_WORKERS = 4
+PREFETCH_SESSION_KEY = '_artifact_prefetch'
+
+PRIORITY_INITIAL = 0
+PRIORITY_TABS = 1
+PRIORITY_FILTERS = 2
+
+# (label, loader method, args)
+INITIAL_VIEW_ARTIFACTS: List[Tuple[str, str, tuple]] = [
+    ("raw_t31", "load_raw_t31", ()),
+    ("raw_t41", "load_raw_t41", ()),
+    ("t41_activity_analysis", "load_t41_activity_analysis", ()),
+    ("t41_journey_heatmap", "load_t41_journey_heatmap", ()),
+    ("raw_flow", "load_raw_flow", ()),
+    ("raw_sward_config", "load_raw_sward_config", ()),
+    ("t31_ten_min_operation_rate", "load_t31_ten_min_operation_rate", ()),
+    ("t41_stats_10min", "load_t41_stats_10min", ("All", "All")),
+    ("flow_hourly_avg_from_2min", "load_flow_hourly_avg_from_2min", ()),
+]
+
+TAB_ARTIFACTS: List[Tuple[str, str, tuple]] = [
+    # T31 Overview / Equipment Positions / Operation Heatmap
+    ("t31_mac_primary_location", "load_t31_mac_primary_location", ()),
+    ("t31_building_level_equipment", "load_t31_building_level_equipment", ()),
+    ("t31_equipment_positions", "load_t31_equipment_positions", ()),
+    ("t31_operation_heatmap", "load_t31_operation_heatmap", ()),
+    # T41 Overview / Journey Heatmap
+    ("t41_worker_counts", "get_t41_worker_counts", ()),
+    ("t41_busiest_location", "get_t41_busiest_location", ()),
+    ("t41_building_level_workers", "load_t41_building_level_workers", ()),
+    ("t41_worker_dwell", "load_t41_worker_dwell", ()),
+    ("t41_presence_index", "load_t41_presence_index", ()),
+    ("journey_heatmap_ai_200", "load_journey_heatmap_sorted", ("ai", 200)),
+    # MobilePhone Device Counting / T-Ward vs Mobile / Apple vs Android
+    ("flow_summary", "get_summary", ()),
+    ("flow_unit_time_unique", "load_flow_unit_time_unique", ()),
+    ("flow_sward", "load_flow_sward", ()),
+    ("tvm_comparison", "load_tvm_comparison", ("All", "All")),
+    ("flow_device_type_stats", "load_flow_device_type_stats", ()),
+]
+
+
+def _filter_args(filter_name: str) -> Tuple[str, str]:
+    """get_available_t41_stats_filters 항목 → (building, level) ("WWT-1F" → ("WWT", "1F"))"""
+    building, _, level = filter_name.partition('-')
+    return building, level or "All"
+
+
+def build_prefetch_plan(loader) -> List[Tuple[int, str, Callable]]:
+    """우선순위 순 (priority, label, 함수) 목록"""
+    plan = []
+    for priority, artifacts in ((PRIORITY_INITIAL, INITIAL_VIEW_ARTIFACTS), (PRIORITY_TABS, TAB_ARTIFACTS)):
+        for label, method, args in artifacts:
+            if hasattr(loader, method):
+                plan.append((priority, label, lambda m=getattr(loader, method), a=args: m(*a)))
+
+    # Building/Level 필터별 10분 Stats / T-Ward vs Mobile 비교
+    try:
+        filters = [f for f in loader.get_available_t41_stats_filters() if f != "All"]
+    except Exception:
+        filters = []
+    for filter_name in filters:
+        args = _filter_args(filter_name)
+        plan.append((PRIORITY_FILTERS, f"t41_stats_10min:{filter_name}",
+                     lambda a=args: loader.load_t41_stats_10min(*a)))
+        plan.append((PRIORITY_FILTERS, f"tvm_comparison:{filter_name}",
+                     lambda a=args: loader.load_tvm_comparison(*a)))
+
+    for data_type in ('t31', 't41', 'flow'):
+        plan.append((PRIORITY_FILTERS, f"ai_insights:{data_type}",
+                     lambda d=data_type: loader.load_ai_insights(d)))
+    return plan
+
+
+# ========== Prefetch 작업 (데이터셋 1개) ==========
+
+class PrefetchJob:
+    """데이터셋 1개의 warm-up 작업 상태"""
+
+    def __init__(self, dataset: str, loader, n_tasks: int):
+        self.dataset = dataset
+        self.loader = loader
+        self.n_tasks = n_tasks
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.completed: Dict[str, float] = {}    # label → 읽기 시간(초)
+        self.failed: Dict[str, str] = {}         # label → 오류 메시지
+        self.skipped = 0
+        self._cancelled = threading.Event()
+        self._initial_pending = 0
+        self._initial_done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """대기 중인 task 취소 (다른 데이터셋 선택 시)"""
+        if not self._cancelled.is_set():
+            self._cancelled.set()
+            self._initial_done.set()
+            print(f"⏹️ Prefetch cancelled: {self.dataset} ({len(self.completed)}/{self.n_tasks} warmed)")
+
+    def wait_initial(self, timeout: Optional[float] = None) -> bool:
+        """첫 화면 artifact (PRIORITY_INITIAL)가 모두 로드될 때까지 대기"""
+        return self._initial_done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self.cancelled or self.finished_at is not None
+
+    def _record(self, priority: int, label: str, seconds: Optional[float] = None, error: Optional[str] = None):
+        with self._lock:
+            if error is not None:
+                self.failed[label] = error
+            elif seconds is not None:
+                self.completed[label] = seconds
+            else:
+                self.skipped += 1
+            if priority == PRIORITY_INITIAL:
+                self._initial_pending -= 1
+                if self._initial_pending <= 0:
+                    self._initial_done.set()
+            if len(self.completed) + len(self.failed) + self.skipped >= self.n_tasks:
+                self.finished_at = time.time()
+                if not self.cancelled:
+                    elapsed = self.finished_at - self.started_at
+                    print(f"🔥 Prefetch complete: {self.dataset} - {len(self.completed)} artifacts in {elapsed:.2f}s"
+                          + (f" ({len(self.failed)} failed)" if self.failed else ""))
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'dataset': self.dataset,
+                'total': self.n_tasks,
+                'completed': len(self.completed),
+                'failed': len(self.failed),
+                'skipped': self.skipped,
+                'cancelled': self.cancelled,
+                'done': self.done,
+                'elapsed': (self.finished_at or time.time()) - self.started_at,
+                'read_seconds': sum(self.completed.values()),
+            }
+
+
+# ========== Prefetcher (프로세스 전체 공유 thread pool) ==========
+
+class ArtifactPrefetcher:
+    """우선순위 queue 기반 artifact warm-up thread pool
+
+    모든 세션이 worker thread를 공유하며, 우선순위가 낮은 task(필터별 artifact)는
+    다른 세션의 첫 화면 task보다 늦게 실행됩니다.
+    """
+
+    def __init__(self, max_workers: int = PREFETCH_WORKERS):
+        self.max_workers = max_workers
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._workers = [w for w in self._workers if w.is_alive()]
+            for i in range(len(self._workers), self.max_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"artifact-prefetch-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _worker_loop(self):
+        while True:
+            priority, _, job, label, task = self._queue.get()
+            try:
+                if job.cancelled:
+                    job._record(priority, label)
+                    continue
+                start = time.perf_counter()
+                try:
+                    task()
+                except Exception as e:
+                    job._record(priority, label, error=str(e))
+                else:
+                    job._record(priority, label, seconds=time.perf_counter() - start)
+            finally:
+                self._queue.task_done()
+
+    def start(self, dataset: str, loader) -> PrefetchJob:
+        """데이터셋 warm-up 시작 → PrefetchJob"""
+        plan = build_prefetch_plan(loader)
+        job = PrefetchJob(dataset, loader, len(plan))
+        job._initial_pending = sum(1 for priority, _, _ in plan if priority == PRIORITY_INITIAL)
+        if job._initial_pending == 0:
+            job._initial_done.set()
+        if not plan:
+            job.finished_at = job.started_at
+            return job
+
+        self._ensure_workers()
+        for priority, label, task in plan:
+            self._queue.put((priority, next(self._sequence), job, label, task))
+        print(f"🔥 Prefetch started: {dataset} ({len(plan)} artifacts, {self.max_workers} threads)")
+        return job
+
+
+artifact_prefetcher = ArtifactPrefetcher()
+
+
+# ========== Streamlit 연동 ==========
+
+def prefetch_for_session(st, dataset: str, loader) -> PrefetchJob:
+    """세션의 현재 데이터셋 warm-up (데이터셋이 바뀌면 이전 작업 취소 후 새로 시작)"""
+    job = st.session_state.get(PREFETCH_SESSION_KEY)
+    if job is not None and job.dataset == dataset and job.loader is loader:
+        return job
+    if job is not None:
+        job.cancel()
+    job = artifact_prefetcher.start(dataset, loader)
+    st.session_state[PREFETCH_SESSION_KEY] = job
+    return job
+
+
+def render_prefetch_status(st, job: Optional[PrefetchJob]):
+    """사이드바 warm-up 진행 상태"""
+    if job is None:
+        return
+    status = job.status()
+    if status['done']:
+        st.sidebar.caption(
+            f"⚡ Prefetched {status['completed']}/{status['total']} artifacts in {status['elapsed']:.1f}s"
+            + (f" ({status['failed']} failed)" if status['failed'] else "")
+        )
+    else:
+        st.sidebar.caption(f"⏳ Prefetching artifacts... {status['completed']}/{status['total']}")
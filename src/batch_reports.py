@@ -0,0 +1,228 @@
+"""
+Batch Reports Module
+사전 처리된 캐시 집계에서 T31 / T41 PDF 보고서를 일괄 생성하는 headless CLI
+
+Streamlit 실행 없이 (사이트, 일자, 보고서 종류) job을 process pool에서 병렬 실행하고
+결과를 manifest.json에 기록합니다. 야간 배치 (예: 주간 보고서) 용도입니다.
+
+    python -m src.batch_reports --types t31 t41 --sites "Yongin_*" --start 20250901 --end 20250907
+    python -m src.batch_reports --workers 8 --output output/reports --force
+
+출력: <output>/<site>/<day>/<site>_<day>_<type>.pdf, <output>/manifest.json
+이미 생성된 보고서가 캐시(metadata.json)보다 새로우면 건너뜁니다 (--force로 재생성).
+"""
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_OUTPUT_DIR = Path('./output/reports')
+MANIFEST_FILE = 'manifest.json'
+
+# report type → (생성 함수, 필요한 레코드 수 metadata key)
+REPORT_TYPES = {
+    't31': ('generate_cached_t31_report', 't31_records'),
+    't41': ('generate_cached_t41_report', 't41_records'),
+}
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+STATUS_UP_TO_DATE = 'up_to_date'
+
+_DATASET_NAME = re.compile(r'^(?P<site>.+)_(?P<day>\d{8})$')
+
+
+def split_dataset_name(name: str):
+    """데이터셋 폴더명 → (site, day) ("Yongin_Cluster_20250909" → ("Yongin_Cluster", "20250909"))"""
+    match = _DATASET_NAME.match(name)
+    if match:
+        return match.group('site'), match.group('day')
+    return name, ''
+
+
+# ========== Job 목록 ==========
+
+def build_jobs(datasets: List[Dict], report_types: List[str], output_dir: Path,
+               sites: Optional[List[str]] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> List[Dict]:
+    """catalog 데이터셋 × 보고서 종류 → job 목록 (사이트 glob / 일자 범위 필터)"""
+    jobs = []
+    for dataset in datasets:
+        site, day = split_dataset_name(dataset['name'])
+        if sites and not any(fnmatch.fnmatch(site, pattern) or fnmatch.fnmatch(dataset['name'], pattern)
+                             for pattern in sites):
+            continue
+        if day and ((start and day < start) or (end and day > end)):
+            continue
+        for report_type in report_types:
+            _, records_key = REPORT_TYPES[report_type]
+            stem = f"{site}_{day}_{report_type}" if day else f"{site}_{report_type}"
+            jobs.append({
+                'dataset': dataset['name'],
+                'site': site,
+                'day': day,
+                'report_type': report_type,
+                'cache_path': dataset['cache_path'],
+                'records': dataset.get(records_key, 0),
+                'output': str(output_dir / site / (day or 'all') / f"{stem}.pdf"),
+            })
+    return jobs
+
+
+def _is_up_to_date(job: Dict) -> bool:
+    """보고서 파일이 캐시 metadata.json보다 새로운지"""
+    try:
+        return os.stat(job['output']).st_mtime >= os.stat(Path(job['cache_path']) / 'metadata.json').st_mtime
+    except OSError:
+        return False
+
+
+# ========== Job 실행 (worker 프로세스) ==========
+
+def run_report_job(job: Dict) -> Dict:
+    """보고서 1개 생성 (process pool에서 실행, Streamlit 미사용)"""
+    from src.cached_data_loader import CachedDataLoader
+    from src import report_generator
+
+    entry = {key: job[key] for key in ('dataset', 'site', 'day', 'report_type', 'output')}
+    start = time.perf_counter()
+    try:
+        function_name, _ = REPORT_TYPES[job['report_type']]
+        loader = CachedDataLoader(job['cache_path'])
+        if not loader.is_valid():
+            raise FileNotFoundError(f"metadata.json not found in {job['cache_path']}")
+        label = f"{job['site']} {job['day']}".strip()
+        pdf_bytes = getattr(report_generator, function_name)(loader, dataset_label=label)
+
+        output = Path(job['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output.with_name(f".{output.name}.tmp{os.getpid()}")
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, output)
+        entry.update(status=STATUS_DONE, bytes=len(pdf_bytes))
+    except Exception as e:
+        entry.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}",
+                     traceback=traceback.format_exc(limit=5))
+    entry['seconds'] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+# ========== Manifest ==========
+
+def write_manifest(output_dir: Path, manifest: Dict):
+    """manifest.json atomic write (job 완료마다 갱신 - 중단되어도 진행 상황 유지)"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / MANIFEST_FILE
+    tmp_path = path.with_name(f".{MANIFEST_FILE}.tmp{os.getpid()}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def run_batch(jobs: List[Dict], output_dir: Path, workers: int = 2, force: bool = False,
+              options: Optional[Dict] = None) -> Dict:
+    """job 목록 실행 → manifest"""
+    manifest = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'finished_at': None,
+        'options': options or {},
+        'jobs': [],
+    }
+    pending = []
+    for job in jobs:
+        if not job['records']:
+            manifest['jobs'].append({**{k: job[k] for k in ('dataset', 'site', 'day', 'report_type', 'output')},
+                                     'status': STATUS_SKIPPED, 'error': 'no records for this report type'})
+        elif not force and _is_up_to_date(job):
+            manifest['jobs'].append({**{k: job[k] for k in ('dataset', 'site', 'day', 'report_type', 'output')},
+                                     'status': STATUS_UP_TO_DATE})
+        else:
+            pending.append(job)
+
+    print(f"🗂️ {len(jobs)} report jobs: {len(pending)} to run, {len(jobs) - len(pending)} skipped / up to date")
+    write_manifest(output_dir, manifest)
+
+    if pending:
+        # spawn: worker가 부모 프로세스 상태(thread / 대용량 DataFrame)를 복제하지 않도록
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context) as executor:
+            futures = [executor.submit(run_report_job, job) for job in pending]
+            for i, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                manifest['jobs'].append(entry)
+                icon = '✅' if entry['status'] == STATUS_DONE else '❌'
+                print(f"{icon} [{i}/{len(pending)}] {entry['dataset']} {entry['report_type']} "
+                      f"({entry['seconds']:.1f}s){' - ' + entry['error'] if 'error' in entry else ''}")
+                write_manifest(output_dir, manifest)
+
+    manifest['jobs'].sort(key=lambda e: (e['site'], e['day'], e['report_type']))
+    manifest['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    manifest['summary'] = {
+        status: sum(1 for e in manifest['jobs'] if e['status'] == status)
+        for status in (STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED, STATUS_UP_TO_DATE)
+    }
+    write_manifest(output_dir, manifest)
+    return manifest
+
+
+# ========== CLI ==========
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.batch_reports',
+        description='Generate T31/T41 PDF reports from pre-processed caches (no Streamlit).'
+    )
+    parser.add_argument('--data', default=None, help='Rawdata folder (default: Datafile/Rawdata)')
+    parser.add_argument('--types', nargs='+', choices=sorted(REPORT_TYPES), default=sorted(REPORT_TYPES),
+                        help='Report types to generate')
+    parser.add_argument('--sites', nargs='+', default=None, help='Site / dataset name glob patterns')
+    parser.add_argument('--start', default=None, help='First day (YYYYMMDD, inclusive)')
+    parser.add_argument('--end', default=None, help='Last day (YYYYMMDD, inclusive)')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT_DIR), help='Output folder')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Worker processes')
+    parser.add_argument('--force', action='store_true', help='Regenerate reports that are up to date')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.dataset_catalog import list_datasets
+    from src.report_generator import check_reportlab_available
+
+    args = parse_args(argv)
+    if not check_reportlab_available():
+        print("❌ reportlab is required for PDF generation (pip install reportlab)")
+        return 2
+
+    output_dir = Path(args.output)
+    jobs = build_jobs(list_datasets(args.data), args.types, output_dir,
+                      sites=args.sites, start=args.start, end=args.end)
+    if not jobs:
+        print("⚠️ No datasets match the given filters.")
+        return 1
+
+    manifest = run_batch(jobs, output_dir, workers=args.workers, force=args.force, options={
+        'types': args.types, 'sites': args.sites, 'start': args.start, 'end': args.end,
+        'workers': args.workers, 'force': args.force,
+    })
+    summary = manifest['summary']
+    print(f"📄 Reports: {summary[STATUS_DONE]} done, {summary[STATUS_FAILED]} failed, "
+          f"{summary[STATUS_SKIPPED]} skipped, {summary[STATUS_UP_TO_DATE]} up to date "
+          f"→ {output_dir / MANIFEST_FILE}")
+    return 1 if summary[STATUS_FAILED] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,540 @@
+"""
+Benchmark Suite Module
+핫 분석 함수의 실행 시간 / peak 메모리를 여러 데이터 규모에서 측정하고 baseline 대비 회귀를 표시
+
+입력은 src.synthetic_data로 생성한 seed 고정 raw 데이터 (규모별 1회 생성 후 parquet fixture 재사용)이며,
+CachedDataLoader 경로는 번들된 캐시 폴더를 사용합니다.
+
+    python -m src.benchmark_suite                                  # 기본 규모 (w100_d1, w1k_d1)
+    python -m src.benchmark_suite --scales w100_d1 w1k_d1 w10k_d1 w1k_d7 --repeats 5
+    python -m src.benchmark_suite --save-baseline                  # 결과를 baseline으로 저장
+    python -m src.benchmark_suite --fail-on-regression             # 회귀가 있으면 exit code 1
+    python -m src.benchmark_suite --equivalence-only               # legacy 구현 대비 출력 동일성만 확인
+
+측정:
+    - 시간: 케이스마다 repeats회 실행 (입력 복사 등 준비는 측정 제외) → min / median wall, CPU 시간
+    - 메모리: 별도 1회 실행을 tracemalloc으로 추적한 Python / numpy 할당 peak (MB)
+    - @cached_result 함수는 결과 캐시를 거치지 않고 원본 함수를 측정
+    - 일 단위 함수 (1440분 / 144 bin)에 여러 날을 넣으면 시각 기준으로 합쳐 계산되며, 비용 측정에는 그대로 사용
+
+결과: output/benchmarks/results/<timestamp>.json, baseline: output/benchmarks/baseline.json
+baseline은 같은 장비에서 측정한 값끼리만 비교하십시오 (environment 항목 참고).
+
+규모마다 (및 번들 캐시의 실제 데이터로 1회) src.golden_equivalence의 legacy 구현 대비 출력 비교를 함께 실행하며,
+불일치가 있으면 --fail-on-regression 여부와 관계없이 exit code 1입니다.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.golden_equivalence import (
+    SAMPLE_MACS, STATUS_DIVERGED, STATUS_EQUAL, CachedActivitySource, format_divergence, run_equivalence,
+)
+from src.synthetic_data import MANIFEST_FILE, SyntheticConfig, dataset_name, write_dataset
+
+BENCHMARK_DIR = Path('./output/benchmarks')
+DEFAULT_BASELINE = BENCHMARK_DIR / 'baseline.json'
+DEFAULT_CACHE_FOLDER = Path(__file__).resolve().parent.parent / 'Datafile' / 'Rawdata' / 'Yongin_Cluster_20250909' / 'cache'
+
+# 규모: 작업자 수 × 일수 (장비 / 휴대폰은 기준 사이트 비율로 함께 증가)
+SCALES = {
+    'w100_d1': {'n_workers': 100, 'days': 1},
+    'w1k_d1': {'n_workers': 1000, 'days': 1},
+    'w10k_d1': {'n_workers': 10000, 'days': 1},
+    'w100_d7': {'n_workers': 100, 'days': 7},
+    'w1k_d7': {'n_workers': 1000, 'days': 7},
+    'w10k_d7': {'n_workers': 10000, 'days': 7},
+}
+DEFAULT_SCALES = ['w100_d1', 'w1k_d1']
+
+TIME_TOLERANCE = 0.25       # baseline 대비 25% 이상 느려지면 회귀
+MEMORY_TOLERANCE = 0.20     # baseline 대비 peak 메모리 20% 이상 증가하면 회귀
+MIN_SECONDS = 0.05          # 이보다 짧은 케이스의 시간 변화는 noise로 간주
+
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+
+def _uncached(fn: Callable) -> Callable:
+    """@cached_result wrapper를 벗긴 원본 함수 (tracing / timer wrapper는 유지)"""
+    return fn.__wrapped__ if hasattr(fn, 'cache_function_name') else fn
+
+
+# ========== Fixtures ==========
+
+class Fixtures:
+    """규모별 입력 데이터 (처음 사용할 때 생성 / 계산하여 재사용)"""
+
+    def __init__(self, scale: str, seed: int = 42, cache_folder=None, fixture_dir: Optional[Path] = None):
+        spec = SCALES[scale]
+        ratio = spec['n_workers'] / SyntheticConfig._field_defaults['n_workers']
+        self.scale = scale
+        self.config = SyntheticConfig.scaled(ratio, site=f"Bench_{scale}", days=spec['days'], seed=seed,
+                                             n_workers=spec['n_workers'])
+        self.cache_folder = Path(cache_folder) if cache_folder is not None else DEFAULT_CACHE_FOLDER
+        self.fixture_dir = (fixture_dir or BENCHMARK_DIR / 'fixtures') / f"{scale}_s{seed}"
+        self._values: Dict[str, Any] = {}
+
+    def _get(self, name: str, build: Callable[[], Any]) -> Any:
+        if name not in self._values:
+            self._values[name] = build()
+        return self._values[name]
+
+    def _fixture_current(self) -> bool:
+        expected = json.loads(json.dumps(self.config._asdict()))
+        for day in self.config.day_list():
+            try:
+                with open(self.fixture_dir / dataset_name(self.config, day) / MANIFEST_FILE, 'r') as f:
+                    if json.load(f).get('config') != expected:
+                        return False
+            except (OSError, ValueError):
+                return False
+        return True
+
+    def _load_stream(self, stream: str) -> pd.DataFrame:
+        if not self._fixture_current():
+            print(f"🧪 Generating fixture {self.scale} → {self.fixture_dir}")
+            write_dataset(self.config, self.fixture_dir, fmt='parquet')
+        frames = []
+        for day in self.config.day_list():
+            folder = self.fixture_dir / dataset_name(self.config, day)
+            for path in sorted(folder.glob(f"*_{dataset_name(self.config, day)}.parquet")):
+                if path.name.startswith({'t41': 'T41_', 't31': 'T31_', 'flow': 'TMobile_'}[stream]):
+                    frames.append(pd.read_parquet(path))
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not data.empty:
+            from src.time_index import add_time_columns, time_index_10s
+            add_time_columns(data)
+            data['time_index'] = time_index_10s(data)
+        return data
+
+    # raw 스트림 (type 필터 + 정수 시간 컬럼, 업로드 후 처리와 같은 형태)
+    @property
+    def t41(self) -> pd.DataFrame:
+        return self._get('t41', lambda: self._load_stream('t41'))
+
+    @property
+    def t31(self) -> pd.DataFrame:
+        return self._get('t31', lambda: self._load_stream('t31'))
+
+    @property
+    def flow(self) -> pd.DataFrame:
+        return self._get('flow', lambda: self._load_stream('flow'))
+
+    @property
+    def sward_config(self) -> pd.DataFrame:
+        from src.synthetic_data import DEFAULT_SWARD_CONFIG
+        return self._get('sward_config', lambda: pd.read_csv(DEFAULT_SWARD_CONFIG))
+
+    @property
+    def t41_with_space(self) -> pd.DataFrame:
+        def build():
+            from src.tward_type41_operation import build_sward_dict, recognize_building_level_type41
+            return recognize_building_level_type41(self.t41, build_sward_dict(self.sward_config))
+        return self._get('t41_with_space', build)
+
+    @property
+    def activity(self) -> pd.DataFrame:
+        def build():
+            from src.tward_type41_operation import analyze_worker_activity
+            return analyze_worker_activity(self.t41_with_space.copy())
+        return self._get('activity', build)
+
+    @property
+    def journey_data(self) -> pd.DataFrame:
+        """사전 계산 journey_heatmap 캐시와 같은 형태 (mac × 10분 bin, 최다 Building-Level, color_code)"""
+        def build():
+            from src.tward_type41_journey_map import JOURNEY_COLORS
+            activity = self.activity
+            occupied = activity[activity['signal_count'] > 0]
+            frame = pd.DataFrame({
+                'mac': occupied['mac'].astype(str).to_numpy(),
+                'bin_index': ((occupied['minute_bin'].to_numpy().astype(np.int32) - 1) // 10),
+                'building': occupied['building'].astype(str).to_numpy(),
+                'level': occupied['level'].astype(str).to_numpy(),
+                'signal_count': occupied['signal_count'].to_numpy().astype(np.int64),
+            })
+            frame['building_level'] = frame['building'] + '-' + frame['level']
+            counts = frame.groupby(['mac', 'bin_index', 'building_level', 'building', 'level'],
+                                   sort=False)['signal_count'].sum().reset_index()
+            journey = counts.sort_values('signal_count', ascending=False).drop_duplicates(['mac', 'bin_index'])
+            journey = journey.drop(columns='signal_count').merge(
+                counts.groupby(['mac', 'bin_index'])['signal_count'].sum().reset_index(), on=['mac', 'bin_index'])
+            active = journey['signal_count'] >= 11
+            journey['color_code'] = np.where(
+                active, journey['building_level'].map(JOURNEY_COLORS).fillna(JOURNEY_COLORS['present_inactive']),
+                JOURNEY_COLORS['present_inactive']).astype(np.int64)
+            return journey.sort_values(['mac', 'bin_index']).reset_index(drop=True)[
+                ['mac', 'bin_index', 'building_level', 'signal_count', 'building', 'level', 'color_code']]
+        return self._get('journey_data', build)
+
+    def first_macs(self, frame: pd.DataFrame, n: int, column: str = 'mac') -> pd.DataFrame:
+        """정렬 기준 앞쪽 n개 MAC만 (Python loop 기반 함수의 입력 제한)"""
+        macs = np.sort(frame[column].unique())[:n]
+        return frame[frame[column].isin(macs)]
+
+
+# ========== Benchmark cases ==========
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    prepare: Callable[[Fixtures], Callable[[], Any]]   # 측정 제외 준비 → 측정할 thunk
+    mac_limit: Optional[int] = None                    # 입력 MAC 수 제한 (느린 Python loop 함수)
+    scale_independent: bool = False                    # 첫 규모에서만 실행
+
+
+BENCHMARK_CASES: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark_case(name: str, mac_limit: Optional[int] = None, scale_independent: bool = False):
+    """benchmark 케이스 등록 decorator (prepare(fixtures) → 측정할 zero-arg callable)"""
+    def decorator(prepare):
+        BENCHMARK_CASES[name] = BenchmarkCase(name, prepare, mac_limit, scale_independent)
+        return prepare
+    return decorator
+
+
+@benchmark_case('analyze_worker_activity')
+def _analyze_worker_activity(fx: Fixtures):
+    from src.tward_type41_operation import analyze_worker_activity
+    data = fx.t41_with_space.copy()
+    return lambda: analyze_worker_activity(data)
+
+
+@benchmark_case('generate_integrated_journey_heatmap')
+def _integrated_journey_heatmap(fx: Fixtures):
+    from src.tward_type41_journey_map import generate_integrated_journey_heatmap
+    fn, data = _uncached(generate_integrated_journey_heatmap), fx.activity
+    return lambda: fn(data, 'building_level', False, 200)
+
+
+@benchmark_case('generate_journey_heatmap_from_cache')
+def _journey_heatmap_from_cache(fx: Fixtures):
+    from src.tward_type41_journey_map import generate_journey_heatmap_from_cache
+    fn, data = _uncached(generate_journey_heatmap_from_cache), fx.journey_data
+    return lambda: fn(data, 200, False)
+
+
+@benchmark_case('analyze_dwell_times')
+def _analyze_dwell_times(fx: Fixtures):
+    from src.tward_type41_dwell_time import analyze_dwell_times
+    fn, data = _uncached(analyze_dwell_times), fx.activity.copy()
+    return lambda: fn(data)
+
+
+@benchmark_case('unified_tward31_analysis')
+def _unified_tward31_analysis(fx: Fixtures):
+    from src.tward_type31_processing import unified_tward31_analysis
+    data, sward_config = fx.t31.copy(), fx.sward_config
+    return lambda: unified_tward31_analysis(data, sward_config)
+
+
+@benchmark_case('calculate_positions_by_timebin', mac_limit=200)
+def _calculate_positions_by_timebin(fx: Fixtures):
+    from src.tward_type31_location_operation import calculate_positions_by_timebin
+    data, sward_config = fx.first_macs(fx.t31, 200).copy(), fx.sward_config
+    return lambda: calculate_positions_by_timebin(data, sward_config)
+
+
+@benchmark_case('LocationAnalyzer.process_location_data', mac_limit=10)
+def _process_location_data(fx: Fixtures):
+    from src.tward_type41_location_analysis import LocationAnalyzer
+    data, sward_config = fx.first_macs(fx.t41, 10).copy(), fx.sward_config
+    return lambda: LocationAnalyzer().process_location_data(data, sward_config)
+
+
+@benchmark_case('analyze_flow_by_time')
+def _analyze_flow_by_time(fx: Fixtures):
+    from src.flow_analysis import analyze_flow_by_time
+    data = fx.flow.copy()
+    return lambda: analyze_flow_by_time(data, 30)
+
+
+@benchmark_case('calculate_t41_worker_stats_10min')
+def _t41_worker_stats_10min(fx: Fixtures):
+    from main import calculate_t41_worker_stats_10min
+    fn, data = _uncached(calculate_t41_worker_stats_10min), fx.t41
+    return lambda: fn(data)
+
+
+# CachedDataLoader: 번들 캐시 폴더의 기존 artifact만 읽음 (compute-on-miss로 캐시 폴더에 쓰지 않도록)
+LOADER_METHODS = [
+    ('load_t41_activity_analysis', ()), ('load_t41_journey_heatmap', ()), ('load_t41_stats_10min', ()),
+    ('load_t31_operation_heatmap', ()), ('load_flow_two_min_unique', ()), ('get_t41_worker_counts', ()),
+]
+
+
+def _loader_thunk(fx: Fixtures, methods, warm: bool):
+    from src.cached_data_loader import CachedDataLoader
+    loader = CachedDataLoader(str(fx.cache_folder))
+    if warm:
+        for method, args in methods:
+            getattr(loader, method)(*args)
+
+    def run():
+        return [getattr(loader, method)(*args) for method, args in methods]
+    return run
+
+
+@benchmark_case('CachedDataLoader.load_t41_activity_analysis (cold)', scale_independent=True)
+def _loader_activity_cold(fx: Fixtures):
+    return _loader_thunk(fx, [('load_t41_activity_analysis', ())], warm=False)
+
+
+@benchmark_case('CachedDataLoader.dashboard_artifacts (cold)', scale_independent=True)
+def _loader_cold(fx: Fixtures):
+    return _loader_thunk(fx, LOADER_METHODS, warm=False)
+
+
+@benchmark_case('CachedDataLoader.dashboard_artifacts (warm)', scale_independent=True)
+def _loader_warm(fx: Fixtures):
+    return _loader_thunk(fx, LOADER_METHODS, warm=True)
+
+
+# ========== 실행 ==========
+
+def _rows(value: Any) -> Optional[int]:
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(v) for v in value.values() if isinstance(v, pd.DataFrame)) or None
+    return None
+
+
+def run_case(case: BenchmarkCase, fx: Fixtures, repeats: int = 3, measure_memory: bool = True) -> Dict:
+    """케이스 1개 측정 → 결과 dict (status / seconds_min / seconds_median / cpu_seconds / peak_mb)"""
+    entry: Dict[str, Any] = {'status': STATUS_OK, 'repeats': repeats}
+    if case.mac_limit:
+        entry['mac_limit'] = case.mac_limit
+    try:
+        walls, cpus = [], []
+        for _ in range(max(1, repeats)):
+            thunk = case.prepare(fx)
+            gc.collect()
+            cpu_start, start = time.process_time(), time.perf_counter()
+            result = thunk()
+            walls.append(time.perf_counter() - start)
+            cpus.append(time.process_time() - cpu_start)
+            entry['rows_out'] = _rows(result)
+            del result, thunk
+        entry['seconds_min'] = round(min(walls), 4)
+        entry['seconds_median'] = round(statistics.median(walls), 4)
+        entry['cpu_seconds'] = round(statistics.median(cpus), 4)
+
+        if measure_memory:
+            thunk = case.prepare(fx)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                thunk()     # peak는 결과가 해제된 뒤에도 유지됨
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            entry['peak_mb'] = round(peak / 1024 / 1024, 2)
+            del thunk
+    except ModuleNotFoundError as e:
+        entry = {'status': STATUS_SKIPPED, 'error': f"optional dependency missing: {e.name}"}
+    except Exception as e:
+        entry = {'status': STATUS_FAILED, 'error': f"{type(e).__name__}: {e}",
+                 'traceback': traceback.format_exc(limit=5)}
+    gc.collect()
+    return entry
+
+
+def environment_info() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.node(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def run_suite(scales: List[str], cases: Optional[List[str]] = None, repeats: int = 3, seed: int = 42,
+              measure_memory: bool = True, cache_folder=None, equivalence: bool = True,
+              equivalence_macs: int = SAMPLE_MACS) -> Dict:
+    """규모 × 케이스 측정 (+ 규모별 golden equivalence) → 결과 dict"""
+    selected = [BENCHMARK_CASES[name] for name in (BENCHMARK_CASES if cases is None else cases)]
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'options': {'repeats': repeats, 'seed': seed, 'memory': measure_memory,
+                    'equivalence_macs': equivalence_macs if equivalence else None},
+        'results': {},
+    }
+    if equivalence:
+        report['equivalence'] = {}
+        _run_equivalence(report, 'cache', CachedActivitySource(cache_folder or DEFAULT_CACHE_FOLDER),
+                         equivalence_macs)
+    for scale_idx, scale in enumerate(scales):
+        fx = Fixtures(scale, seed, cache_folder)
+        results = report['results'].setdefault(scale, {})
+        print(f"\n📏 Scale {scale}: {fx.config.n_workers:,} workers / {fx.config.n_equipment:,} equipment / "
+              f"{fx.config.n_phones:,} phones × {fx.config.days} day(s)")
+        for case in selected:
+            if case.scale_independent and scale_idx > 0:
+                continue
+            entry = run_case(case, fx, repeats, measure_memory)
+            results[case.name] = entry
+            if entry['status'] == STATUS_OK:
+                memory = f", peak {entry['peak_mb']:.1f}MB" if 'peak_mb' in entry else ''
+                print(f"   ⏱️ {case.name:<55} {entry['seconds_median']:>9.3f}s{memory}")
+            else:
+                icon = '⏭️' if entry['status'] == STATUS_SKIPPED else '❌'
+                print(f"   {icon} {case.name:<55} {entry['error']}")
+        if equivalence:
+            _run_equivalence(report, scale, fx, equivalence_macs)
+        del fx
+        gc.collect()
+    return report
+
+
+def _run_equivalence(report: Dict, label: str, source, sample_macs: int):
+    print(f"   🔍 Golden equivalence ({label}, {sample_macs} MACs)")
+    results = run_equivalence(source, sample_macs=sample_macs)
+    report['equivalence'][label] = results
+    for name, result in results.items():
+        if result['status'] == STATUS_EQUAL:
+            print(f"      ✅ {name:<52} {result['rows_legacy']:,} rows identical")
+        elif result['status'] == STATUS_DIVERGED:
+            print(f"      🚨 {format_divergence(name, result)}")
+        else:
+            icon = '⏭️' if result['status'] == STATUS_SKIPPED else '❌'
+            print(f"      {icon} {name:<52} {result['error']}")
+
+
+def equivalence_failures(report: Dict) -> List[str]:
+    """출력이 legacy와 다르거나 비교 자체가 실패한 check 목록 ('<label>/<check>')"""
+    return [f"{label}/{name}" for label, results in report.get('equivalence', {}).items()
+            for name, result in results.items() if result['status'] in (STATUS_DIVERGED, STATUS_FAILED)]
+
+
+# ========== Baseline 비교 ==========
+
+def compare_results(report: Dict, baseline: Dict, time_tolerance: float = TIME_TOLERANCE,
+                    memory_tolerance: float = MEMORY_TOLERANCE, min_seconds: float = MIN_SECONDS) -> List[Dict]:
+    """baseline 대비 회귀 목록 (시간: median, 메모리: peak_mb)"""
+    regressions = []
+    for scale, results in report['results'].items():
+        for name, entry in results.items():
+            base = baseline.get('results', {}).get(scale, {}).get(name)
+            if not base or entry.get('status') != STATUS_OK or base.get('status') != STATUS_OK:
+                continue
+            checks = [('seconds_median', time_tolerance, min_seconds), ('peak_mb', memory_tolerance, 1.0)]
+            for metric, tolerance, floor in checks:
+                current, previous = entry.get(metric), base.get(metric)
+                if current is None or previous is None:
+                    continue
+                if current > previous * (1 + tolerance) and current - previous > floor:
+                    regressions.append({
+                        'scale': scale, 'case': name, 'metric': metric,
+                        'baseline': previous, 'current': current,
+                        'ratio': round(current / previous, 2) if previous else None,
+                    })
+    return regressions
+
+
+def _write_json(path: Path, data: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_baseline(path) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ========== CLI ==========
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.benchmark_suite',
+        description='Benchmark hot analysis functions on seeded synthetic data',
+    )
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=DEFAULT_SCALES, help='Data scales')
+    parser.add_argument('--cases', nargs='+', choices=list(BENCHMARK_CASES), default=None,
+                        help='Benchmark cases (default: all)')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per case')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak memory run')
+    parser.add_argument('--cache-folder', default=None, help='Cache folder for CachedDataLoader cases')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE,
+                        help='Allowed slowdown ratio before flagging (0.25 = 25%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE,
+                        help='Allowed peak memory growth ratio before flagging')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with code 1 on regressions')
+    parser.add_argument('--no-equivalence', action='store_true', help='Skip the golden equivalence checks')
+    parser.add_argument('--equivalence-only', action='store_true', help='Run only the golden equivalence checks')
+    parser.add_argument('--equivalence-macs', type=int, default=SAMPLE_MACS,
+                        help='MACs compared against the (slow) legacy implementations')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    # bare mode (ScriptRunContext 없음) 경고 생략 - streamlit이 logger level을 다시 설정하므로 filter 사용
+    import logging
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(lambda record: False)
+
+    cases = [] if args.equivalence_only else args.cases
+    report = run_suite(args.scales, cases, args.repeats, args.seed, not args.no_memory, args.cache_folder,
+                       not args.no_equivalence, args.equivalence_macs)
+    results_path = BENCHMARK_DIR / 'results' / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    baseline = load_baseline(args.baseline)
+    regressions = []
+    if baseline is not None:
+        regressions = compare_results(report, baseline, args.time_tolerance, args.memory_tolerance)
+        report['baseline'] = {'path': args.baseline, 'created_at': baseline.get('created_at'),
+                              'same_environment': baseline.get('environment') == report['environment']}
+        report['regressions'] = regressions
+        if not report['baseline']['same_environment']:
+            print("⚠️ Baseline was recorded in a different environment - comparison may be misleading")
+        if regressions:
+            print(f"\n🚨 {len(regressions)} regression(s) vs baseline {baseline.get('created_at')}:")
+            for r in regressions:
+                print(f"   {r['scale']} {r['case']} {r['metric']}: {r['baseline']} → {r['current']} (×{r['ratio']})")
+        else:
+            print(f"\n✅ No regressions vs baseline {baseline.get('created_at')}")
+
+    failures = equivalence_failures(report)
+    if failures:
+        print(f"\n🚨 Optimized output differs from legacy: {', '.join(failures)}")
+    elif report.get('equivalence'):
+        print("\n✅ Optimized outputs match legacy implementations")
+
+    _write_json(results_path, report)
+    print(f"📝 Results: {results_path}")
+    if args.save_baseline:
+        _write_json(Path(args.baseline), report)
+        print(f"📌 Baseline saved: {args.baseline}")
+    return 1 if failures or (regressions and args.fail_on_regression) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
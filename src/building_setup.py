@@ -6,6 +6,8 @@ from PIL import Image
 import plotly.express as px
 import plotly.graph_objects as go
 
+from src.frame_fingerprint import register_file
+
 CONFIG_PATH = './Datafile/sward_configuration.csv'
 MAP_IMAGE_DIR = './Datafile/Map_Image/'
 
@@ -19,7 +21,7 @@ def save_sward_config(df):
 
 def load_sward_config():
     if os.path.exists(CONFIG_PATH):
-        return pd.read_csv(CONFIG_PATH)
+        return register_file(pd.read_csv(CONFIG_PATH), CONFIG_PATH)
     return pd.DataFrame(columns=SWARD_COLUMNS)
 
 def load_building_config():
@@ -7,11 +7,20 @@ Dashboard Mode에서 빠른 데이터 접근을 위해 사용
 """
 
 import json
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 import pandas as pd
 
+from src.artifact_graph import derive_artifact
+from src.dataset_catalog import cache_folder_index, list_datasets, refresh_dataset
+from src.presence_bitset import PRESENCE_FILE_PREFIX, PresenceIndex
+from src.frame_fingerprint import fingerprint, register_derived, register_file
+from src.time_index import add_time_columns, has_time_columns
+from src.tracing import span
+from src.t41_schema import compact_activity_frame, compact_journey_frame
+
 
 class CachedDataLoader:
     """캐시된 분석 데이터 로더"""
@@ -20,6 +29,13 @@ class CachedDataLoader:
         self.cache_folder = Path(cache_folder)
         self._cache: Dict[str, Any] = {}
         self._metadata: Optional[Dict] = None
+        # 파일별 lock: prefetch thread와 script thread가 같은 파일을 중복으로 읽지 않도록
+        self._locks_guard = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+    
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._key_locks.setdefault(key, threading.Lock())
     
     def is_valid(self) -> bool:
         """캐시가 유효한지 확인"""
@@ -38,25 +54,64 @@ class CachedDataLoader:
         return self._metadata
     
     def _load_parquet(self, filename: str) -> pd.DataFrame:
-        """Parquet 파일 로드 (캐싱)"""
-        if filename not in self._cache:
-            path = self.cache_folder / filename
-            if path.exists():
-                self._cache[filename] = pd.read_parquet(path)
+        """Parquet 파일 로드 (캐싱, 파일이 없으면 artifact_graph로 계산)"""
+        with span('load_parquet', artifact=filename) as s:
+            if filename in self._cache:
+                s.cache_hit()
+            else:
+                s.cache_miss()
+                with self._key_lock(filename):
+                    if filename not in self._cache:
+                        path = self.cache_folder / filename
+                        if path.exists():
+                            self._cache[filename] = register_file(pd.read_parquet(path), path)
+                        else:
+                            # 없는 artifact는 의존성 그래프의 가까운 parent에서 계산 후 저장
+                            derived = derive_artifact(self, filename)
+                            self._cache[filename] = derived if derived is not None else pd.DataFrame()
+            df = self._cache[filename]
+            s.set_rows(rows_out=len(df))
+            return df
+    
+    def _load_compact_parquet(self, filename: str, compact) -> pd.DataFrame:
+        """Parquet 파일 로드 후 압축 스키마(category / 소형 정수)로 변환하여 캐싱
+        
+        원본(object 문자열) DataFrame은 메모리 캐시에 남기지 않습니다.
+        """
+        key = f"compact:{filename}"
+        with span('load_compact_parquet', artifact=filename) as s:
+            if key in self._cache:
+                s.cache_hit()
             else:
-                self._cache[filename] = pd.DataFrame()
-        return self._cache[filename]
+                s.cache_miss()
+                with self._key_lock(key):
+                    if key not in self._cache:
+                        source = self._load_parquet(filename)
+                        compacted = compact(source)
+                        if compacted is not source:
+                            register_derived(compacted, source, compact.__name__)
+                        self._cache[key] = compacted
+                        self._cache.pop(filename, None)
+            df = self._cache[key]
+            s.set_rows(rows_out=len(df))
+            return df
     
     def _load_json(self, filename: str) -> Any:
         """JSON 파일 로드 (캐싱)"""
-        if filename not in self._cache:
-            path = self.cache_folder / filename
-            if path.exists():
-                with open(path, 'r') as f:
-                    self._cache[filename] = json.load(f)
+        with span('load_json', artifact=filename) as s:
+            if filename in self._cache:
+                s.cache_hit()
             else:
-                self._cache[filename] = {}
-        return self._cache[filename]
+                s.cache_miss()
+                with self._key_lock(filename):
+                    if filename not in self._cache:
+                        path = self.cache_folder / filename
+                        if path.exists():
+                            with open(path, 'r') as f:
+                                self._cache[filename] = json.load(f)
+                        else:
+                            self._cache[filename] = {}
+            return self._cache[filename]
     
     # ========== T31 (장비) 데이터 ==========
     
@@ -103,16 +158,46 @@ class CachedDataLoader:
         return self._load_parquet("t41_results_journey_data.parquet")
     
     def load_t41_activity_analysis(self) -> pd.DataFrame:
-        """T41 1분 단위 활동 분석 (Journey Heatmap용)"""
-        return self._load_parquet("t41_results_activity_analysis.parquet")
+        """T41 1분 단위 활동 분석 (Journey Heatmap용, 압축 스키마)"""
+        return self._load_compact_parquet("t41_results_activity_analysis.parquet", compact_activity_frame)
+    
+    def load_t41_presence_index(self) -> Optional[PresenceIndex]:
+        """T41 작업자 × 공간 × 상태 presence bitset (memory-mapped)
+        
+        캐시 폴더에 bitset 파일이 없거나 activity_analysis보다 오래된 경우
+        activity_analysis로부터 생성하여 저장합니다.
+        """
+        key = 'presence_index'
+        if key not in self._cache:
+            source = self.cache_folder / "t41_results_activity_analysis.parquet"
+            bits_path = self.cache_folder / f"{PRESENCE_FILE_PREFIX}_bits.npy"
+            index = None
+            if PresenceIndex.exists(self.cache_folder) and (
+                    not source.exists() or bits_path.stat().st_mtime >= source.stat().st_mtime):
+                try:
+                    index = PresenceIndex.load(self.cache_folder, mmap=True)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Presence bitset 로드 실패 (다시 생성): {e}")
+            if index is None:
+                activity = self.load_t41_activity_analysis()
+                if not activity.empty:
+                    index = PresenceIndex.from_activity(activity)
+                    try:
+                        index.save(self.cache_folder)
+                        refresh_dataset(self.cache_folder)
+                    except OSError as e:
+                        print(f"⚠️ Presence bitset 저장 실패: {e}")
+            self._cache[key] = index
+        return self._cache[key]
     
     def load_t41_journey_heatmap(self) -> pd.DataFrame:
         """T41 Journey Heatmap 전용 precomputed 데이터 (10분 단위)
         
         Returns:
             DataFrame with columns: mac, bin_index, building_level, building, level, signal_count, color_code
+            (압축 스키마: category / 소형 정수)
         """
-        return self._load_parquet("t41_results_journey_heatmap.parquet")
+        return self._load_compact_parquet("t41_results_journey_heatmap.parquet", compact_journey_frame)
     
     def load_t41_two_min_unique(self) -> pd.DataFrame:
         """T41 2분 단위 unique MAC 카운트"""
@@ -246,12 +331,7 @@ class CachedDataLoader:
     
     def get_available_t41_stats_filters(self) -> List[str]:
         """사용 가능한 T41 Stats 필터 목록"""
-        filters = ["All"]
-        for f in self.cache_folder.glob("dashboard_results_t41_stats_10min_*.parquet"):
-            name = f.stem.replace("dashboard_results_t41_stats_10min_", "")
-            if name != "all":
-                filters.append(name.replace("_", "-"))
-        return sorted(filters)
+        return list(cache_folder_index(self.cache_folder)['t41_stats_filters'])
 
     # ========== T-Ward vs Mobile 비교 데이터 ==========
     
@@ -285,24 +365,12 @@ class CachedDataLoader:
             DataFrame with worker order and color codes
         """
         filename = f"dashboard_results_journey_heatmap_{sort_option}_{max_workers}.parquet"
-        return self._load_parquet(filename)
+        return self._load_compact_parquet(filename, compact_journey_frame)
     
     def get_available_journey_options(self) -> Dict:
         """사용 가능한 Journey Heatmap 옵션"""
-        sort_options = []
-        max_workers_options = []
-        
-        for f in self.cache_folder.glob("dashboard_results_journey_heatmap_*.parquet"):
-            name = f.stem.replace("dashboard_results_journey_heatmap_", "")
-            parts = name.rsplit("_", 1)
-            if len(parts) == 2:
-                sort_options.append(parts[0])
-                max_workers_options.append(int(parts[1]))
-        
-        return {
-            'sort_options': list(set(sort_options)),
-            'max_workers': sorted(list(set(max_workers_options)))
-        }
+        options = cache_folder_index(self.cache_folder)['journey_options']
+        return {'sort_options': list(options['sort_options']), 'max_workers': list(options['max_workers'])}
 
     def load_flow_hourly_devices(self) -> pd.DataFrame:
         """Flow 시간대별 유동인구"""
@@ -372,32 +440,35 @@ class CachedDataLoader:
     
     def get_available_heatmaps(self) -> List[Dict[str, str]]:
         """사용 가능한 히트맵 목록"""
-        heatmaps = []
-        for f in self.cache_folder.glob("heatmap_results_heatmap_t41_*.parquet"):
-            # 파일명에서 building, level 추출
-            name = f.stem.replace("heatmap_results_heatmap_t41_", "")
-            parts = name.rsplit("_", 1)
-            if len(parts) == 2:
-                heatmaps.append({
-                    'building': parts[0],
-                    'level': parts[1],
-                    'filename': f.name
-                })
-        return heatmaps
+        return [dict(h) for h in cache_folder_index(self.cache_folder)['heatmaps']]
     
     # ========== 원본 데이터 로드 (기존 분석 기능 사용을 위해) ==========
     
+    def _load_raw_parquet(self, filename: str) -> pd.DataFrame:
+        """원본 데이터 로드 + 정수 시간 컬럼 (day / sec_of_day / minute_of_day) 보장
+        
+        정수 시간 컬럼 없이 저장된 이전 캐시는 로드 시 1회 계산하여 메모리 캐시에 유지
+        """
+        df = self._load_parquet(filename)
+        if not df.empty and 'time' in df.columns and not has_time_columns(df):
+            with self._key_lock(f"raw:{filename}"):
+                if not has_time_columns(df):
+                    source_id = fingerprint(df)
+                    add_time_columns(df)
+                    register_derived(df, source_id, 'add_time_columns')
+        return df
+    
     def load_raw_t31(self) -> pd.DataFrame:
         """원본 T31 데이터 로드"""
-        return self._load_parquet("raw_t31.parquet")
+        return self._load_raw_parquet("raw_t31.parquet")
     
     def load_raw_t41(self) -> pd.DataFrame:
         """원본 T41 데이터 로드"""
-        return self._load_parquet("raw_t41.parquet")
+        return self._load_raw_parquet("raw_t41.parquet")
     
     def load_raw_flow(self) -> pd.DataFrame:
         """원본 Flow 데이터 로드"""
-        return self._load_parquet("raw_flow.parquet")
+        return self._load_raw_parquet("raw_flow.parquet")
     
     def load_raw_sward_config(self) -> pd.DataFrame:
         """원본 S-Ward 설정 로드"""
@@ -416,40 +487,20 @@ class CachedDataLoader:
         """메모리 캐시 초기화"""
         self._cache.clear()
         self._metadata = None
+    
+    def cache_entries(self) -> Dict[str, Any]:
+        """메모리 캐시 snapshot (key → 로드된 객체, 메모리 측정용)"""
+        return dict(self._cache)
+    
+    def evict(self, key: str) -> bool:
+        """메모리 캐시 entry 1개 제거 (다음 load_* 호출 시 캐시 폴더에서 다시 로드)"""
+        with self._key_lock(key):
+            return self._cache.pop(key, None) is not None
 
 
 def find_available_datasets(base_folder: str = None) -> List[Dict]:
-    """사용 가능한 데이터셋 (캐시 있는) 목록"""
-    datasets = []
-    
-    # 기본 경로: 이 파일 기준으로 상대 경로 계산
-    if base_folder is None:
-        # src/cached_data_loader.py 기준으로 상위 폴더의 Datafile/Rawdata
-        current_file = Path(__file__).resolve()
-        base_path = current_file.parent.parent / "Datafile" / "Rawdata"
-    else:
-        base_path = Path(base_folder)
-    
-    if not base_path.exists():
-        return datasets
-    
-    for folder in base_path.iterdir():
-        if folder.is_dir():
-            cache_folder = folder / "cache"
-            metadata_path = cache_folder / "metadata.json"
-            
-            if metadata_path.exists():
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                
-                datasets.append({
-                    'name': folder.name,
-                    'path': str(folder),
-                    'cache_path': str(cache_folder),
-                    'created_at': metadata.get('created_at', 'Unknown'),
-                    't31_records': metadata.get('t31_records', 0),
-                    't41_records': metadata.get('t41_records', 0),
-                    'flow_records': metadata.get('flow_records', 0),
-                })
-    
-    return datasets
+    """사용 가능한 데이터셋 (캐시 있는) 목록
+    
+    Rawdata 폴더를 매번 순회하지 않고 dataset catalog (mtime 기준 무효화)를 사용
+    """
+    return list_datasets(base_folder)
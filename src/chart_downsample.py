@@ -0,0 +1,241 @@
+"""
+Chart Downsample Module
+긴 시계열 차트의 전송 포인트 수를 화면 픽셀 예산으로 제한
+
+    add_downsampled_trace(fig, df['bin_index'], df['unique_devices'], name='Total Devices', ...)
+
+- LTTB (Largest-Triangle-Three-Buckets): 선 모양 보존 (기본)
+- min/max: bucket별 최소 / 최대값 보존 (peak 누락 방지)
+
+예산은 차트의 plot 영역 폭(px)에서 계산합니다 (figure에 width가 없으면 wide layout 기본 폭).
+포인트 수가 예산 이하이면 원본을 그대로 사용하므로 단일 일자(288 bin) 차트는 변하지 않습니다.
+선택 결과(index 배열)는 (series 내용 해시, 예산, 방법)별로 캐시됩니다.
+줌: `zoom_window()`로 구간을 선택하면 해당 구간만 다시 decimation되어,
+구간 포인트 수가 예산 이하가 되면 원본 해상도로 표시됩니다.
+같은 x를 공유하는 여러 trace는 `shared_indices()`로 한 번 선택한 위치를 `indices=`로 넘겨
+모든 trace가 같은 x 표본을 사용하도록 합니다 (범주형 x 축에서 trace별 표본이 어긋나지 않도록).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHART_WIDTH_PX = 1400   # layout="wide" 본문 폭 (figure에 width가 없을 때)
+DEFAULT_MARGIN_PX = 80          # plotly 기본 좌 / 우 margin
+POINTS_PER_PIXEL = 1.0          # LTTB: 1 포인트/px (min/max는 bucket당 2 포인트)
+MIN_MAX_POINTS = 100
+DEFAULT_MAX_POINTS = int((DEFAULT_CHART_WIDTH_PX - 2 * DEFAULT_MARGIN_PX) * POINTS_PER_PIXEL)
+INDEX_CACHE_SIZE = 256
+
+_index_cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+# ========== 포인트 예산 ==========
+
+def plot_width_px(fig=None, width_px: Optional[int] = None) -> int:
+    """차트 plot 영역 폭 (figure width - 좌우 margin)"""
+    width = width_px
+    margin_l = margin_r = None
+    if fig is not None:
+        width = width or fig.layout.width
+        margin_l, margin_r = fig.layout.margin.l, fig.layout.margin.r
+    width = width or DEFAULT_CHART_WIDTH_PX
+    margins = (DEFAULT_MARGIN_PX if margin_l is None else margin_l) + (DEFAULT_MARGIN_PX if margin_r is None else margin_r)
+    return max(1, int(width - margins))
+
+
+def point_budget(fig=None, width_px: Optional[int] = None, method: str = 'lttb') -> int:
+    """차트 폭 기준 표시 포인트 수 (px당 POINTS_PER_PIXEL, min/max는 bucket당 2 포인트)"""
+    per_pixel = POINTS_PER_PIXEL * (2 if method == 'minmax' else 1)
+    return max(MIN_MAX_POINTS, int(plot_width_px(fig, width_px) * per_pixel))
+
+
+# ========== Decimation ==========
+
+def _numeric_x(x) -> np.ndarray:
+    """x 값 → 숫자 (datetime은 ns, 문자열 / 범주형은 위치 index)"""
+    values = np.asarray(x)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return np.arange(len(values), dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB로 선택할 포인트 index (첫 / 마지막 포인트 포함)"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # NaN은 0으로 대체하여 면적 계산 (선택된 포인트는 원본 값 사용)
+    y = np.nan_to_num(y.astype(float))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """bucket별 최소 / 최대 포인트 index (시간 순서 유지)"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = n_out // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    values = np.nan_to_num(y.astype(float))
+    picks = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = values[start:end]
+        picks.append(start + int(bucket.argmin()))
+        picks.append(start + int(bucket.argmax()))
+    return np.unique(np.array(picks, dtype=np.int64))
+
+
+def _series_key(x, y) -> str:
+    digest = hashlib.sha1()
+    for values in (x, y):
+        array = np.asarray(values)
+        if array.dtype == object:
+            digest.update(pd.util.hash_array(array.astype(str)).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(str(array.shape).encode())
+    return digest.hexdigest()[:16]
+
+
+def downsample_indices(x, y, max_points: int = DEFAULT_MAX_POINTS, method: str = 'lttb') -> np.ndarray:
+    """표시할 포인트 index ((series, max_points, method)별 캐시)"""
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    key = (_series_key(x, y), max_points, method)
+    with _cache_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+
+    y_values = np.asarray(y, dtype=float)
+    if method == 'minmax':
+        indices = minmax_indices(y_values, max_points)
+    else:
+        indices = lttb_indices(_numeric_x(x), y_values, max_points)
+
+    with _cache_lock:
+        _index_cache[key] = indices
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return indices
+
+
+def downsample_series(x, y, max_points: int = DEFAULT_MAX_POINTS, method: str = 'lttb'):
+    """(x, y) → decimation된 (x, y) numpy 배열"""
+    x_values, y_values = np.asarray(x), np.asarray(y)
+    indices = downsample_indices(x_values, y_values, max_points, method)
+    return x_values[indices], y_values[indices]
+
+
+def shared_indices(y, max_points: Optional[int] = None, window: Optional[Tuple[int, int]] = None,
+                   fig=None, method: str = 'lttb') -> np.ndarray:
+    """여러 trace가 공유할 원본 위치 index - 0..n-1 숫자 index 위에서 y (기준 series)로 한 번 선택
+
+    window: (start, end) 위치 구간 (zoom_window 결과) - 구간 안에서만 선택
+    """
+    y_values = np.asarray(y, dtype=float)
+    start, end = window if window is not None else (0, len(y_values))
+    if max_points is None:
+        max_points = point_budget(fig, method=method)
+    positions = np.arange(end - start)
+    return downsample_indices(positions, y_values[start:end], max_points, method) + start
+
+
+# ========== Plotly / Streamlit ==========
+
+def add_downsampled_trace(fig, x, y, max_points: Optional[int] = None, method: str = 'lttb',
+                          window: Optional[Tuple[int, int]] = None, trace_type: str = 'scatter',
+                          row: Optional[int] = None, col: Optional[int] = None,
+                          indices: Optional[np.ndarray] = None, **trace_kwargs):
+    """decimation한 trace 추가 - 포인트가 줄어든 경우 marker 생략 ('lines+markers' → 'lines')
+
+    Args:
+        max_points: None이면 figure 폭으로 계산 (point_budget)
+        window: (start, end) 위치 구간 (zoom_window 결과) - 구간 내에서만 decimation
+        trace_type: 'scatter' 또는 'bar' (bar는 min/max 방식 사용)
+        indices: shared_indices 결과 (원본 위치) - 주어지면 window / max_points 대신 이 위치만 표시
+    """
+    import plotly.graph_objects as go
+
+    x_values, y_values = np.asarray(x), np.asarray(y)
+    if indices is not None:
+        n_shown = len(x_values) if window is None else window[1] - window[0]
+        x_plot, y_plot = x_values[indices], y_values[indices]
+        reduced = len(indices) < n_shown
+    else:
+        if window is not None:
+            x_values, y_values = x_values[window[0]:window[1]], y_values[window[0]:window[1]]
+        if trace_type == 'bar':
+            method = 'minmax'
+        if max_points is None:
+            max_points = point_budget(fig, method=method)
+        x_plot, y_plot = downsample_series(x_values, y_values, max_points, method)
+        reduced = len(x_plot) < len(x_values)
+
+    if trace_type == 'bar':
+        trace = go.Bar(x=x_plot, y=y_plot, **trace_kwargs)
+    else:
+        if reduced and trace_kwargs.get('mode') == 'lines+markers':
+            trace_kwargs = {**trace_kwargs, 'mode': 'lines'}
+        trace = go.Scatter(x=x_plot, y=y_plot, **trace_kwargs)
+
+    if row is not None:
+        fig.add_trace(trace, row=row, col=col)
+    else:
+        fig.add_trace(trace)
+    return reduced
+
+
+def zoom_window(labels: Sequence, key: str, max_points: Optional[int] = None,
+                width_px: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """포인트가 예산보다 많은 경우 구간 선택 slider 표시 → (start, end) 위치 구간
+
+    선택 구간이 예산 이하이면 원본 해상도로 표시됩니다. 예산 이하 series는 None 반환.
+    slider는 정수 위치만 전송하고, 선택 구간의 라벨은 slider 아래에 표시합니다.
+    """
+    import streamlit as st
+
+    if max_points is None:
+        max_points = point_budget(width_px=width_px)
+    labels = np.asarray(labels)
+    n = len(labels)
+    if n <= max_points:
+        return None
+    # 위치 index로 선택 (다일자 데이터는 시간 라벨이 반복됨)
+    start, end = st.slider(
+        "🔍 Zoom (time range)", min_value=0, max_value=n - 1, value=(0, n - 1), key=key,
+        help=f"Charts are downsampled to {max_points} points; narrow the range for full resolution."
+    )
+    st.caption(f"{labels[start]} → {labels[end]} ({end - start + 1:,} of {n:,} points)")
+    return start, end + 1
@@ -0,0 +1,430 @@
+"""
+Chart Render Module
+보고서 / 대시보드 matplotlib 차트의 병렬 rasterization + 결과 캐시
+
+T31 / T41 보고서는 그룹별 히트맵, 평균 위치 지도 등 수십 개의 figure를
+script thread에서 하나씩 그린 후 savefig(dpi=150~300) 합니다. 차트 생성 코드를
+등록된 renderer (데이터 + 파라미터 → Figure)로 분리하면 아래가 가능합니다.
+
+    - 같은 (차트 종류, 데이터 fingerprint, 크기, dpi, 형식, 파라미터)는 다시 그리지 않음
+      (메모리 LRU → output/chart_cache 디스크 캐시)
+    - 캐시에 없는 차트는 spawn worker 프로세스에서 동시에 렌더링
+      (worker마다 독립된 matplotlib Agg backend, GIL / pyplot 전역 상태 공유 없음)
+
+    png = render_chart('t31_operation_heatmap_page', data, figsize=(14, 12), dpi=200, title=...)
+    pngs = render_charts([ChartRequest(...), ChartRequest(...)])   # 요청 순서대로 bytes
+
+renderer는 이 모듈에 정의되어 worker에서 import 가능해야 합니다 (Streamlit 미사용).
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+CHART_RENDER_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+MIN_PARALLEL_CHARTS = 2             # 캐시 miss가 이 이상일 때만 worker 프로세스 사용
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+CHART_CACHE_DIR = Path('./output/chart_cache')
+DISK_CACHE_BYTES = 512 * 1024 * 1024        # 디스크 캐시 상한 (초과 시 오래 쓰이지 않은 파일부터 삭제)
+DISK_CACHE_MAX_AGE_SEC = 7 * 24 * 3600      # 이보다 오래 쓰이지 않은 파일은 삭제
+CHART_CACHE_VERSION = 1             # renderer 출력이 바뀌면 증가 (기존 디스크 캐시 무효화)
+
+_RENDERERS: Dict[str, Tuple[Callable, Dict]] = {}
+
+
+class ChartRequest(NamedTuple):
+    chart_type: str
+    data: Any
+    figsize: Tuple[float, float]
+    dpi: int = 150
+    fmt: str = 'png'
+    params: Dict = {}
+
+
+def register_chart(chart_type: str, **savefig_kwargs):
+    """renderer 등록 decorator: fn(data, figsize, **params) → matplotlib Figure"""
+    def decorator(fn):
+        _RENDERERS[chart_type] = (fn, savefig_kwargs)
+        return fn
+    return decorator
+
+
+# ========== 렌더링 (worker / in-process 공용) ==========
+
+def _use_agg_backend():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_bytes(chart_type: str, data, figsize, dpi: int, fmt: str, params: Dict) -> bytes:
+    """renderer 실행 → savefig bytes"""
+    import matplotlib.pyplot as plt
+
+    fn, savefig_kwargs = _RENDERERS[chart_type]
+    fig = fn(data, figsize, **params)
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi, **savefig_kwargs)
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+# ========== 캐시 ==========
+
+def chart_key(request: ChartRequest) -> str:
+    """(차트 종류, 데이터 fingerprint, 크기, dpi, 형식, 파라미터) → 캐시 key"""
+    from src.result_cache import fingerprint_value
+
+    parts = [
+        f"v{CHART_CACHE_VERSION}", request.chart_type, fingerprint_value(request.data),
+        repr(tuple(round(float(v), 3) for v in request.figsize)), str(request.dpi), request.fmt,
+        fingerprint_value(dict(request.params)),
+    ]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+class ChartCache:
+    """메모리 LRU (byte 상한) + 디스크 캐시 (byte / 나이 상한, 파일 mtime = 마지막 사용 시각)"""
+
+    def __init__(self, cache_dir: Optional[Path] = CHART_CACHE_DIR, max_bytes: int = MEMORY_CACHE_BYTES,
+                 max_disk_bytes: int = DISK_CACHE_BYTES, max_disk_age_sec: float = DISK_CACHE_MAX_AGE_SEC):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_age_sec = max_disk_age_sec
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._disk_written: Optional[int] = None     # 마지막 정리 이후 디스크에 쓴 byte (None = 아직 정리 안 함)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str, request: ChartRequest) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / request.chart_type / f"{key}.{request.fmt}"
+
+    def _remember(self, key: str, payload: bytes):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get(self, key: str, request: ChartRequest) -> Optional[bytes]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+        path = self._path(key, request)
+        if path is not None:
+            try:
+                payload = path.read_bytes()
+            except OSError:
+                payload = None
+            if payload:
+                self.disk_hits += 1
+                self._remember(key, payload)
+                try:
+                    os.utime(path)      # 최근 사용 표시 (정리 순서)
+                except OSError:
+                    pass
+                return payload
+        self.misses += 1
+        return None
+
+    def put(self, key: str, request: ChartRequest, payload: bytes):
+        self._remember(key, payload)
+        path = self._path(key, request)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Chart cache not saved: {e}")
+            return
+        # 처음 쓸 때와 상한의 1/10을 더 쓸 때마다 정리
+        with self._lock:
+            written = (self._disk_written or 0) + len(payload)
+            due = self._disk_written is None or written >= self.max_disk_bytes // 10
+            self._disk_written = 0 if due else written
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self, max_bytes: Optional[int] = None, max_age_sec: Optional[float] = None) -> int:
+        """디스크 캐시 정리 - max_age_sec보다 오래 쓰이지 않은 파일 삭제 후, 합계가 max_bytes 이하가 되도록
+        오래 쓰이지 않은 파일부터 삭제
+
+        Returns:
+            삭제한 파일 수
+        """
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return 0
+        max_bytes = self.max_disk_bytes if max_bytes is None else max_bytes
+        max_age_sec = self.max_disk_age_sec if max_age_sec is None else max_age_sec
+        files = []
+        for path in self.cache_dir.glob('*/*'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file() and not path.name.startswith('.'):
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort(reverse=True)
+
+        cutoff = time.time() - max_age_sec
+        total, removed = 0, 0
+        for mtime, size, path in files:
+            total += size
+            if mtime >= cutoff and total <= max_bytes:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes,
+                    'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
+
+
+chart_cache = ChartCache()
+
+
+# ========== Worker pool ==========
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """프로세스 공유 worker pool (spawn: Streamlit thread / 대용량 DataFrame을 복제하지 않음)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            context = multiprocessing.get_context('spawn')
+            _pool = ProcessPoolExecutor(max_workers=CHART_RENDER_WORKERS, mp_context=context,
+                                        initializer=_use_agg_backend)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def render_charts(requests: List[ChartRequest], parallel: bool = True) -> List[bytes]:
+    """여러 차트 렌더링 → 요청 순서대로 bytes (캐시 hit 제외한 나머지는 worker에서 동시에)"""
+    results: List[Optional[bytes]] = [None] * len(requests)
+    missing: Dict[str, List[int]] = {}
+    for i, request in enumerate(requests):
+        key = chart_key(request)
+        payload = chart_cache.get(key, request)
+        if payload is not None:
+            results[i] = payload
+        else:
+            missing.setdefault(key, []).append(i)
+
+    pending = [(key, requests[indexes[0]]) for key, indexes in missing.items()]
+    rendered: Dict[str, bytes] = {}
+    if parallel and len(pending) >= MIN_PARALLEL_CHARTS and CHART_RENDER_WORKERS > 1:
+        try:
+            pool = _get_pool()
+            futures = {key: pool.submit(_render_bytes, r.chart_type, r.data, tuple(r.figsize),
+                                        r.dpi, r.fmt, dict(r.params))
+                       for key, r in pending}
+            rendered = {key: future.result() for key, future in futures.items()}
+        except BrokenProcessPool as e:
+            print(f"⚠️ Chart worker pool failed, rendering in-process: {e}")
+            _reset_pool()
+            rendered = {}
+
+    for key, request in pending:
+        if key not in rendered:
+            _use_agg_backend()
+            rendered[key] = _render_bytes(request.chart_type, request.data, tuple(request.figsize),
+                                          request.dpi, request.fmt, dict(request.params))
+        chart_cache.put(key, request, rendered[key])
+        for i in missing[key]:
+            results[i] = rendered[key]
+    return results
+
+
+def render_chart(chart_type: str, data, figsize, dpi: int = 150, fmt: str = 'png', **params) -> bytes:
+    """차트 1개 렌더링 (캐시 우선)"""
+    return render_charts([ChartRequest(chart_type, data, tuple(figsize), dpi, fmt, params)], parallel=False)[0]
+
+
+def add_image_page(pdf, png_bytes: bytes, dpi: int):
+    """렌더링된 PNG를 원본 크기 그대로 PdfPages 한 페이지로 추가"""
+    import matplotlib.pyplot as plt
+    from PIL import Image
+
+    # uint8 RGB로 decode (imread의 float32 RGBA 대비 1/5 메모리)
+    with Image.open(io.BytesIO(png_bytes)) as png:
+        image = np.asarray(png.convert('RGB'))
+    height, width = image.shape[:2]
+    fig = plt.figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    try:
+        # interpolation='none': PDF에 원본 픽셀 그대로 기록 (figimage는 float 재샘플링으로 메모리 급증)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis('off')
+        ax.imshow(image, interpolation='none', aspect='auto')
+        pdf.savefig(fig, dpi=dpi)
+    finally:
+        plt.close(fig)
+
+
+# ========== 등록된 차트 ==========
+
+@register_chart('integrated_operation_heatmap_group', bbox_inches='tight')
+def _integrated_operation_heatmap_group(data, figsize, group_idx: int, start_idx: int, end_idx: int,
+                                        colors: List[str]):
+    """T31 통합 Operation Heatmap 그룹 (50개 T-Ward) - data: {'matrix', 'y_labels'}"""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.imshow(data['matrix'], cmap=ListedColormap(colors), aspect='auto', interpolation='nearest', vmin=0, vmax=7)
+
+    ax.set_xlabel('Time (10min intervals)', fontsize=12)
+    ax.set_ylabel(f'T-Ward Rank #{start_idx + 1} ~ #{end_idx}', fontsize=12)
+    ax.set_title(f'T-Ward Operation Heatmap - Group {group_idx + 1}\n(Black: No Signal, Gray: Inactive, Colors: Building-Level)', fontsize=14, pad=20)
+
+    ax.set_xticks(list(range(0, 144, 12)))
+    ax.set_xticklabels([f"{i*2:02d}:00" for i in range(0, 12)])
+    ax.set_yticks(list(range(len(data['y_labels']))))
+    ax.set_yticklabels(data['y_labels'], fontsize=9)
+
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+@register_chart('t31_operation_heatmap_page', bbox_inches='tight', pad_inches=0.5)
+def _t31_operation_heatmap_page(data, figsize, title: str):
+    """T31 PDF 보고서 Operation Heatmap 페이지 - data: {'matrix' (T-Ward × 144, 0/1), 'y_labels'}"""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+
+    activity_matrix = np.asarray(data['matrix'])
+    y_labels = data['y_labels']
+    num_twards = len(y_labels)
+
+    fig = plt.figure(figsize=figsize)
+    ax = plt.subplot2grid((14, 1), (0, 0), rowspan=9, fig=fig)
+    ax_explanation = plt.subplot2grid((14, 1), (11, 0), rowspan=3, fig=fig)
+    ax_explanation.axis('off')
+
+    # Custom colormap (same as dashboard): light gray, lime green
+    im = ax.imshow(activity_matrix, cmap=ListedColormap(['#D3D3D3', '#32CD32']), aspect='auto', vmin=0, vmax=1)
+
+    ax.set_yticks(range(num_twards))
+    ax.set_yticklabels(y_labels, fontsize=max(8, min(12, 150/num_twards)))
+
+    tick_positions = list(range(0, 144, 6))  # Every hour
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels([f"{i // 6:02d}:00" for i in tick_positions], rotation=45, fontsize=11)
+    ax.set_xlabel('Time (Hours)', fontsize=14)
+    ax.set_ylabel('T-Ward MAC Address', fontsize=14)
+
+    for i in range(12, 144, 12):  # Every 2 hours
+        ax.axvline(x=i-0.5, color='black', linestyle='--', alpha=0.3, linewidth=0.8)
+    for i in range(36, 144, 36):  # Every 6 hours
+        ax.axvline(x=i-0.5, color='black', linestyle='--', alpha=0.6, linewidth=1.2)
+    for i in range(1, num_twards):
+        ax.axhline(y=i-0.5, color='gray', linestyle='-', alpha=0.2, linewidth=0.5)
+
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+
+    cbar = plt.colorbar(im, ax=ax)
+    cbar.set_label('Operation Status', fontsize=12)
+    cbar.set_ticks([0, 1])
+    cbar.set_ticklabels(['Inactive (Gray)', 'Active (Green)'])
+
+    explanation_text = f"""Operation Heatmap - {title} ({num_twards} devices):
+
+Y-axis: MAC addresses (ranked by operation time) | X-axis: Time (hourly intervals)
+Colors: Green = Active | Gray = Inactive | Grid: 2hr/6hr reference lines
+Analysis: Horizontal patterns = device operation, Vertical patterns = simultaneous usage"""
+
+    ax_explanation.text(0.0, 0.8, explanation_text, fontsize=11, alpha=0.8,
+                        verticalalignment='top', transform=ax_explanation.transAxes,
+                        bbox=dict(boxstyle="round,pad=0.8", facecolor="lightgreen", alpha=0.2))
+    return fig
+
+
+@register_chart('tward_average_positions', bbox_inches='tight')
+def _tward_average_positions(data, figsize, map_image_path: str, building: str, level: str):
+    """T-Ward 평균 위치 지도 - data: {'avg_positions' (mac, calculated_x/y), 'swards' (sward_id, x, y), 'map_mtime'}"""
+    import cv2
+    import matplotlib.pyplot as plt
+
+    avg_positions = data['avg_positions']
+    swards = data['swards']
+
+    map_image = cv2.cvtColor(cv2.imread(map_image_path), cv2.COLOR_BGR2RGB)
+
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.imshow(map_image, extent=[0, map_image.shape[1], map_image.shape[0], 0])
+
+    # S-Ward 위치 (노란색 네모 박스)
+    for i, (_, sward) in enumerate(swards.iterrows()):
+        ax.scatter(sward['x'], sward['y'], c='yellow', s=80, marker='s',
+                   alpha=0.8, edgecolors='orange', linewidth=1,
+                   label='S-Ward' if i == 0 else "")
+        ax.annotate(f"S-{int(sward['sward_id'])}",
+                    (sward['x'], sward['y']),
+                    xytext=(5, -12), textcoords='offset points',
+                    fontsize=5, color='darkorange', fontweight='bold')
+
+    # T-Ward 평균 위치 (파란색 원)
+    for i, (_, row) in enumerate(avg_positions.iterrows()):
+        ax.scatter(row['calculated_x'], row['calculated_y'],
+                   c='blue', s=120, alpha=0.8,
+                   edgecolors='navy', linewidth=1,
+                   label='T-Ward Average' if i == 0 else "")
+        ax.annotate(f"{row['mac']}",
+                    (row['calculated_x'], row['calculated_y']),
+                    xytext=(8, 8), textcoords='offset points',
+                    fontsize=4.5, fontweight='bold', color='navy')
+
+    ax.set_title(f"T-Ward Average Positions - {building} {level}\n(Total {len(avg_positions)} T-Wards)")
+    ax.set_xlabel('X Position (pixels)')
+    ax.set_ylabel('Y Position (pixels)')
+    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
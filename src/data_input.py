@@ -3,6 +3,9 @@ import os
 import shutil
 import pandas as pd
 
+from src.frame_fingerprint import register_file
+from src.time_index import add_time_columns
+
 DATA_OUTPUT_DIR = './output/'
 
 # 파일 저장 함수
@@ -41,6 +44,8 @@ def render_data_input():
                 tward31_data = pd.read_csv(tward31_path, names=['sward_id', 'mac', 'type', 'rssi', 'time'])
             
             tward31_data['time'] = pd.to_datetime(tward31_data['time'])
+            add_time_columns(tward31_data)  # day / sec_of_day / minute_of_day (정수 시간 컬럼)
+            register_file(tward31_data, tward31_path, 'load_csv')
             st.session_state['tward31_data'] = tward31_data
             st.success(f"✅ 업로드 완료: {tward31_file.name} ({len(tward31_data):,} records, {file_size_mb:.1f}MB)")
         except Exception as e:
@@ -70,6 +75,8 @@ def render_data_input():
                 tward41_data = pd.read_csv(tward41_path, names=['sward_id', 'mac', 'type', 'rssi', 'time'])
             
             tward41_data['time'] = pd.to_datetime(tward41_data['time'])
+            add_time_columns(tward41_data)  # day / sec_of_day / minute_of_day (정수 시간 컬럼)
+            register_file(tward41_data, tward41_path, 'load_csv')
             st.session_state['tward41_data'] = tward41_data
             st.success(f"✅ 업로드 완료: {tward41_file.name} ({len(tward41_data):,} records, {file_size_mb:.1f}MB)")
         except Exception as e:
@@ -99,6 +106,8 @@ def render_data_input():
                 flow_data = pd.read_csv(flow_path, names=['sward_id', 'mac', 'type', 'rssi', 'time'])
             
             flow_data['time'] = pd.to_datetime(flow_data['time'])
+            add_time_columns(flow_data)  # day / sec_of_day / minute_of_day (정수 시간 컬럼)
+            register_file(flow_data, flow_path, 'load_csv')
             st.session_state['flow_data'] = flow_data
             st.success(f"✅ 업로드 완료: {flow_file.name} ({len(flow_data):,} records, {file_size_mb:.1f}MB)")
         except Exception as e:
@@ -0,0 +1,292 @@
+"""
+Dataset Catalog Module
+사전 처리된 데이터셋 / 캐시 artifact 목록 index (JSON manifest + 프로세스 내 memo)
+
+매 rerun마다 Datafile/Rawdata를 순회하고 모든 metadata.json을 파싱하거나,
+캐시 폴더를 glob하여 필터 목록을 만드는 대신 catalog를 사용합니다.
+
+    datasets = list_datasets()                        # find_available_datasets()와 같은 형식
+    index = cache_folder_index(loader.cache_folder)   # artifact / 필터 / 크기
+
+무효화 기준 (파일 내용은 다시 읽지 않음):
+    - Rawdata 폴더 mtime        → 데이터셋 폴더 추가 / 삭제
+    - 캐시 폴더 mtime            → artifact 추가 / 삭제 / rename (atomic write 포함)
+    - metadata.json mtime       → 캐시 재생성
+    - 캐시가 아직 없는 폴더의 캐시 폴더 mtime (pending) → 나중에 생성된 캐시
+
+catalog는 Rawdata/.catalog/dataset_catalog.json에 저장되어 프로세스 재시작 후에도 재사용되며,
+변경된 데이터셋만 다시 스캔합니다. 캐시를 생성 / 갱신한 코드는
+refresh_dataset(cache_folder)를 호출하여 catalog를 즉시 갱신합니다.
+"""
+
+import fnmatch
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CATALOG_DIR = ".catalog"           # 하위 폴더에 저장 (catalog 쓰기가 Rawdata 폴더 mtime을 바꾸지 않도록)
+CATALOG_FILENAME = "dataset_catalog.json"
+CATALOG_VERSION = 2
+
+T41_STATS_PATTERN = "dashboard_results_t41_stats_10min_*.parquet"
+JOURNEY_HEATMAP_PATTERN = "dashboard_results_journey_heatmap_*.parquet"
+HEATMAP_PATTERN = "heatmap_results_heatmap_t41_*.parquet"
+
+_lock = threading.Lock()
+_folder_index: Dict[str, Dict] = {}      # cache folder → index (mtime 포함)
+_catalogs: Dict[str, Dict] = {}          # Rawdata 폴더 → catalog
+
+
+_DEFAULT_BASE_PATH = Path(__file__).resolve().parent.parent / "Datafile" / "Rawdata"
+
+
+def default_base_path() -> Path:
+    """기본 Rawdata 경로 (src/ 기준 상위 폴더의 Datafile/Rawdata)"""
+    return _DEFAULT_BASE_PATH
+
+
+def _mtime(path) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# ========== 캐시 폴더 index ==========
+
+def _stem(filename: str) -> str:
+    return filename.rsplit('.', 1)[0]
+
+
+def _t41_stats_filters(names: List[str]) -> List[str]:
+    filters = ["All"]
+    for name in fnmatch.filter(names, T41_STATS_PATTERN):
+        key = _stem(name).replace("dashboard_results_t41_stats_10min_", "")
+        if key != "all":
+            filters.append(key.replace("_", "-"))
+    return sorted(filters)
+
+
+def _journey_options(names: List[str]) -> Dict:
+    sort_options, max_workers_options = set(), set()
+    for name in fnmatch.filter(names, JOURNEY_HEATMAP_PATTERN):
+        parts = _stem(name).replace("dashboard_results_journey_heatmap_", "").rsplit("_", 1)
+        if len(parts) == 2 and parts[1].isdigit():
+            sort_options.add(parts[0])
+            max_workers_options.add(int(parts[1]))
+    return {'sort_options': sorted(sort_options), 'max_workers': sorted(max_workers_options)}
+
+
+def _heatmaps(names: List[str]) -> List[Dict[str, str]]:
+    heatmaps = []
+    for name in sorted(fnmatch.filter(names, HEATMAP_PATTERN)):
+        parts = _stem(name).replace("heatmap_results_heatmap_t41_", "").rsplit("_", 1)
+        if len(parts) == 2:
+            heatmaps.append({'building': parts[0], 'level': parts[1], 'filename': name})
+    return heatmaps
+
+
+def scan_cache_folder(cache_folder) -> Dict:
+    """캐시 폴더 1회 스캔 → artifact 크기 / 필터 목록 / metadata 요약"""
+    cache_folder = Path(cache_folder)
+    artifacts: Dict[str, int] = {}
+    try:
+        with os.scandir(cache_folder) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith('.'):
+                    artifacts[entry.name] = entry.stat().st_size
+    except OSError:
+        pass
+
+    metadata_path = cache_folder / "metadata.json"
+    metadata = {}
+    if metadata_path.exists():
+        try:
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            metadata = {}
+
+    names = sorted(artifacts)
+    return {
+        'cache_mtime': _mtime(cache_folder),
+        'metadata_mtime': _mtime(metadata_path),
+        'metadata': {
+            key: metadata.get(key, default) for key, default in (
+                ('created_at', 'Unknown'), ('updated_at', None), ('config_hash', None),
+                ('t31_records', 0), ('t41_records', 0), ('flow_records', 0),
+            )
+        },
+        'has_metadata': metadata_path.exists(),
+        'artifacts': {name: artifacts[name] for name in names},
+        'total_bytes': sum(artifacts.values()),
+        't41_stats_filters': _t41_stats_filters(names),
+        'journey_options': _journey_options(names),
+        'heatmaps': _heatmaps(names),
+    }
+
+
+def _is_current(index: Optional[Dict], cache_folder) -> bool:
+    return (
+        index is not None
+        and index.get('cache_mtime') == _mtime(cache_folder)
+        and index.get('metadata_mtime') == _mtime(os.path.join(cache_folder, "metadata.json"))
+    )
+
+
+def cache_folder_index(cache_folder) -> Dict:
+    """캐시 폴더 index (폴더 / metadata.json mtime이 바뀐 경우에만 다시 스캔)"""
+    key = os.path.abspath(cache_folder)
+    index = _folder_index.get(key)
+    if not _is_current(index, key):
+        index = scan_cache_folder(cache_folder)
+        with _lock:
+            _folder_index[key] = index
+    return index
+
+
+# ========== 데이터셋 catalog (Rawdata 폴더) ==========
+
+def _catalog_path(base_path: Path) -> Path:
+    return base_path / CATALOG_DIR / CATALOG_FILENAME
+
+
+def _read_catalog_file(base_path: Path) -> Dict:
+    try:
+        with open(_catalog_path(base_path), 'r') as f:
+            catalog = json.load(f)
+        if catalog.get('version') == CATALOG_VERSION:
+            return catalog
+    except (OSError, ValueError):
+        pass
+    return {'version': CATALOG_VERSION, 'datasets': {}}
+
+
+def _write_catalog_file(base_path: Path, catalog: Dict):
+    """atomic write (tmp 파일 → rename), 쓰기 권한이 없으면 메모리에만 유지"""
+    path = _catalog_path(base_path)
+    tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(catalog, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Dataset catalog not saved: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _dataset_folders(base_path: Path) -> List[Path]:
+    try:
+        return sorted(p for p in base_path.iterdir() if p.is_dir() and not p.name.startswith('.'))
+    except OSError:
+        return []
+
+
+def load_catalog(base_folder=None) -> Dict:
+    """Rawdata 폴더 catalog (프로세스 memo → JSON manifest → 변경된 데이터셋만 스캔)"""
+    base_path = Path(base_folder) if base_folder is not None else _DEFAULT_BASE_PATH
+    key = os.path.abspath(base_path)
+    with _lock:
+        catalog = _catalogs.get(key)
+    if catalog is None and os.path.isdir(key):
+        # catalog 폴더를 먼저 만든 후 mtime 확인 (폴더 생성이 Rawdata mtime을 바꾸므로)
+        try:
+            _catalog_path(base_path).parent.mkdir(exist_ok=True)
+        except OSError:
+            pass
+    base_mtime = _mtime(key)
+    if base_mtime is None:
+        return {'version': CATALOG_VERSION, 'datasets': {}}
+
+    # 빠른 경로: 폴더 mtime만 확인 (rerun마다 호출)
+    if (
+        catalog is not None and catalog.get('base_mtime') == base_mtime
+        and all(_is_current(entry['index'], entry['cache_path']) for entry in catalog['datasets'].values())
+        and all(_mtime(path) == mtime for path, mtime in catalog.get('pending', {}).items())
+    ):
+        return catalog
+
+    if catalog is None:
+        catalog = _read_catalog_file(base_path)
+
+    # pending: 캐시(metadata.json)가 아직 없는 데이터셋 폴더 → 캐시 폴더 mtime
+    # (폴더를 먼저 만들고 캐시를 나중에 쓰면 Rawdata mtime은 바뀌지 않으므로 이 폴더들도 다시 확인)
+    changed = catalog.get('base_mtime') != base_mtime
+    if changed:
+        folders = _dataset_folders(base_path)
+    else:
+        folders = [base_path / name for name in catalog['datasets']]
+        folders += [Path(path).parent for path, mtime in catalog.get('pending', {}).items() if _mtime(path) != mtime]
+
+    datasets = {}
+    pending = {} if changed else dict(catalog.get('pending', {}))
+    for folder in folders:
+        cache_folder = folder / "cache"
+        entry = catalog['datasets'].get(folder.name)
+        if entry is not None and _is_current(entry.get('index'), cache_folder):
+            datasets[folder.name] = {**entry, 'path': str(folder), 'cache_path': str(cache_folder)}
+            continue
+        if not (cache_folder / "metadata.json").exists():
+            pending[os.path.abspath(cache_folder)] = _mtime(cache_folder)
+            continue
+        pending.pop(os.path.abspath(cache_folder), None)
+        index = cache_folder_index(cache_folder)
+        datasets[folder.name] = {'path': str(folder), 'cache_path': str(cache_folder), 'index': index}
+        changed = True
+
+    if changed or set(datasets) != set(catalog['datasets']) or pending != catalog.get('pending', {}):
+        catalog = {'version': CATALOG_VERSION, 'base_mtime': base_mtime, 'datasets': datasets, 'pending': pending}
+        print(f"📇 Dataset catalog updated: {len(datasets)} datasets")
+        _write_catalog_file(base_path, catalog)
+
+    with _lock:
+        _catalogs[key] = catalog
+        # 폴더 index memo도 catalog 항목으로 채움 (loader의 필터 조회가 다시 스캔하지 않도록)
+        for entry in catalog['datasets'].values():
+            _folder_index.setdefault(os.path.abspath(entry['cache_path']), entry['index'])
+    return catalog
+
+
+def list_datasets(base_folder=None) -> List[Dict]:
+    """사용 가능한 데이터셋 (캐시 있는) 목록"""
+    datasets = []
+    for name, entry in sorted(load_catalog(base_folder)['datasets'].items()):
+        index = entry['index']
+        datasets.append({
+            'name': name,
+            'path': entry['path'],
+            'cache_path': entry['cache_path'],
+            **index['metadata'],
+            'artifact_count': len(index['artifacts']),
+            'total_bytes': index['total_bytes'],
+        })
+    return datasets
+
+
+def refresh_dataset(cache_folder, base_folder=None) -> Dict:
+    """캐시 생성 / 갱신 후 호출 - 해당 데이터셋 index를 다시 스캔하여 catalog에 반영"""
+    cache_folder = Path(cache_folder)
+    index = scan_cache_folder(cache_folder)
+    with _lock:
+        _folder_index[os.path.abspath(cache_folder)] = index
+
+    base_path = Path(base_folder) if base_folder is not None else cache_folder.parent.parent
+    if (cache_folder / "metadata.json").exists() and base_path.exists():
+        catalog = dict(load_catalog(base_path))
+        catalog['datasets'] = {
+            **catalog['datasets'],
+            cache_folder.parent.name: {
+                'path': str(cache_folder.parent), 'cache_path': str(cache_folder), 'index': index,
+            },
+        }
+        catalog['pending'] = {path: mtime for path, mtime in catalog.get('pending', {}).items()
+                              if path != os.path.abspath(cache_folder)}
+        _write_catalog_file(base_path, catalog)
+        with _lock:
+            _catalogs[os.path.abspath(base_path)] = catalog
+    return index
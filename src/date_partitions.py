@@ -0,0 +1,698 @@
+"""
+Date Partitions Module
+일자 단위 파티션 저장소 + 일자별 요약 (병렬) + 다일(multi-day) rollup (증분)
+
+분석 파이프라인은 하루 단위를 가정합니다 (dt.normalize() 기준 시각, 하루 144 / 288 / 1440 bin).
+연속 수집된 raw 데이터를 일자별 데이터셋 폴더(<site>_<YYYYMMDD>)로 나누어 저장하면
+기존 하루 단위 분석 / Dashboard / artifact_graph (compute-on-miss)를 그대로 사용할 수 있고,
+주간 / 월간 뷰는 일자별 요약만으로 계산합니다.
+
+    Datafile/Rawdata/
+    ├── Yongin_Cluster_20250909/cache/      # 일자 파티션 = 기존 데이터셋 폴더
+    │   ├── raw_t31.parquet / raw_t41.parquet / raw_flow.parquet / raw_sward_config.parquet
+    │   ├── daily_summary.parquet           # (stream, hour) 고유 MAC / 활성 작업자 / 신호 수
+    │   ├── daily_summary_macs.parquet      # T31 / T41 일자별 MAC 목록 (기간 고유 수 계산용)
+    │   └── metadata.json                   # partition / daily_summary (입력 파일 mtime) / watermarks (stream별 시각 범위, 파일별 행 수)
+    ├── Yongin_Cluster_20250910/cache/
+    └── .rollups/Yongin_Cluster/            # site rollup (catalog는 '.' 폴더를 데이터셋으로 보지 않음)
+        ├── daily_summaries.parquet         # 모든 일자의 요약 (일자별 stamp)
+        ├── daily_trends.parquet / weekday_profile.parquet / weekly_rollup.parquet / monthly_rollup.parquet
+        └── rollup_manifest.json
+
+    python -m src.date_partitions ingest raw_folder/ --site Yongin_Cluster    # raw → 일자 파티션
+    python -m src.date_partitions rollup --site Yongin_Cluster --workers 4    # 요약 + rollup 갱신
+    python -m src.incremental_append new_raw/ --site Yongin_Cluster --rollup  # 기존 파티션에 새 시간대 / 일자 추가
+
+rollup 갱신은 새로 생기거나 바뀐 일자의 요약만 계산하고 (process pool, 일자별 독립),
+rollup 표는 일자별 요약 표에서 다시 만듭니다. 기간 고유 MAC 수는 바뀐 일자가 속한 주 / 월만 다시 합칩니다.
+raw가 없는 파티션 (사전 계산 캐시만 있는 데이터셋)은 캐시 집계에서 요약을 만듭니다 (기간 고유 수 제외).
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.artifact_graph import update_metadata, write_parquet_atomic
+from src.batch_reports import split_dataset_name
+from src.dataset_catalog import default_base_path, list_datasets, refresh_dataset
+from src.time_index import add_time_columns, minute_of_day
+from src.tracing import get_logger
+
+log = get_logger(__name__)
+
+RAW_COLUMNS = ['sward_id', 'mac', 'type', 'rssi', 'time']
+STREAMS = ('t31', 't41', 'flow')
+STREAM_ARTIFACTS = {'t31': 'raw_t31.parquet', 't41': 'raw_t41.parquet', 'flow': 'raw_flow.parquet'}
+FILE_PREFIXES = {'T31': 't31', 'T41': 't41', 'TMobile': 'flow'}     # raw 파일명 접두어 → stream
+SWARD_CONFIG_ARTIFACT = 'raw_sward_config.parquet'
+DEFAULT_SWARD_CONFIG = Path(__file__).resolve().parent.parent / 'Datafile' / 'sward_configuration.csv'
+
+# 사전 계산 캐시와 같은 config (config_hash = md5(sorted JSON)[:8])
+PARTITION_CONFIG = {
+    'time_unit_seconds': 10,
+    'unit_time_minutes': 5,
+    'min_dwell_time_minutes': 30,
+    'occupancy_time_unit_minutes': 5,
+    'heatmap_time_slot_minutes': 5,
+}
+
+SUMMARY_ARTIFACT = 'daily_summary.parquet'
+SUMMARY_MACS_ARTIFACT = 'daily_summary_macs.parquet'
+SUMMARY_COLUMNS = ['date', 'stream', 'hour', 'unique_macs', 'active_macs', 'signals']
+DAY_TOTAL_HOUR = -1                 # hour = -1 행은 하루 전체
+DISTINCT_STREAMS = ('t31', 't41')   # Flow는 MAC이 주기적으로 바뀌므로 기간 고유 수를 계산하지 않음
+T41_ACTIVE_SIGNALS_10MIN = 11       # 10분에 11회 이상 = Active (calculate_t41_worker_stats_10min과 같은 규칙)
+
+ROLLUP_DIR = '.rollups'
+ROLLUP_MANIFEST = 'rollup_manifest.json'
+SUMMARIES_FILE = 'daily_summaries.parquet'
+ROLLUP_FILES = {
+    'daily_trends': 'daily_trends.parquet',
+    'weekday_profile': 'weekday_profile.parquet',
+    'weekly': 'weekly_rollup.parquet',
+    'monthly': 'monthly_rollup.parquet',
+}
+PERIODS = {'weekly': 'W-SUN', 'monthly': 'M'}
+
+STATUS_WRITTEN = 'written'
+STATUS_EXISTS = 'exists'
+STATUS_DONE = 'done'
+STATUS_CURRENT = 'current'
+STATUS_FAILED = 'failed'
+
+
+def config_hash(config: Dict) -> str:
+    return hashlib.md5(json.dumps(config, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def partition_name(site: str, day) -> str:
+    """site + 일자 → 데이터셋 폴더명 ("Yongin_Cluster", 2025-09-09 → "Yongin_Cluster_20250909")"""
+    return f"{site}_{pd.Timestamp(day):%Y%m%d}"
+
+
+def _write_json(path: Path, data: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ========== Raw → 일자 파티션 ==========
+
+def stream_of(path: Path) -> Optional[str]:
+    """raw 파일명 접두어로 stream 판별 (T31_*.csv → t31, TMobile_*.parquet → flow)"""
+    prefix = path.name.split('_', 1)[0]
+    return FILE_PREFIXES.get(prefix)
+
+
+def collect_raw_files(paths: Iterable) -> Dict[str, List[Path]]:
+    """파일 / 폴더 목록 → stream별 raw 파일 (폴더는 하위 폴더까지 검색)"""
+    files: Dict[str, List[Path]] = {stream: [] for stream in STREAMS}
+    for path in map(Path, paths):
+        candidates = sorted(path.rglob('*')) if path.is_dir() else [path]
+        for candidate in candidates:
+            stream = stream_of(candidate)
+            if stream and candidate.suffix in ('.csv', '.parquet') and candidate.is_file():
+                files[stream].append(candidate)
+    return files
+
+
+def read_raw_file(path: Path) -> pd.DataFrame:
+    """headerless CSV 또는 parquet raw 파일 → [sward_id, mac, type, rssi, time]"""
+    if path.suffix == '.parquet':
+        frame = pd.read_parquet(path, columns=RAW_COLUMNS)
+    else:
+        frame = pd.read_csv(path, names=RAW_COLUMNS, header=None)
+    frame['time'] = pd.to_datetime(frame['time'])
+    return frame
+
+
+def _partition_metadata(site: str, day: pd.Timestamp, data_folder: Path) -> Dict:
+    return {
+        'created_at': datetime.now().isoformat(),
+        'data_folder': str(data_folder),
+        'config': dict(PARTITION_CONFIG),
+        'config_hash': config_hash(PARTITION_CONFIG),
+        'partition': {'site': site, 'day': f"{day:%Y%m%d}"},
+        'saved_files': [],
+        't31_records': 0,
+        't41_records': 0,
+        'flow_records': 0,
+    }
+
+
+def ensure_partition(base_path: Path, site: str, day: pd.Timestamp,
+                     sward_config: Optional[pd.DataFrame] = None) -> Path:
+    """일자 파티션 캐시 폴더 + metadata.json (+ S-Ward config) 준비 → 캐시 폴더"""
+    folder = Path(base_path) / partition_name(site, day)
+    cache_folder = folder / 'cache'
+    cache_folder.mkdir(parents=True, exist_ok=True)
+    metadata_path = cache_folder / 'metadata.json'
+    if not metadata_path.exists():
+        _write_json(metadata_path, _partition_metadata(site, day, folder))
+    if sward_config is not None and not (cache_folder / SWARD_CONFIG_ARTIFACT).exists():
+        write_parquet_atomic(sward_config, cache_folder / SWARD_CONFIG_ARTIFACT)
+    return cache_folder
+
+
+def derived_from(derived: Dict[str, Dict], artifact: str) -> List[str]:
+    """metadata derived_artifacts 중 artifact에서 (재귀적으로) 파생된 것 (입력이 먼저 오는 순서)"""
+    sources, ordered = {artifact}, []
+    while True:
+        found = [name for name, info in derived.items()
+                 if name not in sources and sources.intersection(info.get('inputs', []))]
+        if not found:
+            return ordered
+        sources.update(found)
+        ordered.extend(found)
+
+
+def write_partition(base_path: Path, site: str, day: pd.Timestamp, stream: str, rows: pd.DataFrame,
+                    sward_config: Optional[pd.DataFrame] = None, replace: bool = False,
+                    files: Optional[Dict[str, Dict]] = None) -> str:
+    """일자 1개 × stream 1개 raw를 파티션 캐시 폴더에 저장 → STATUS_WRITTEN / STATUS_EXISTS
+
+    이미 같은 stream raw가 있는 파티션은 replace=True일 때만 덮어씁니다
+    (덮어쓴 stream에서 파생된 artifact / 일자 요약은 삭제되어 다음 사용 시 다시 계산됩니다).
+    files: raw 파일별 watermark ({절대 경로: {size, mtime, rows}}) - incremental_append가 이미 반영된 행을 건너뜀
+    """
+    cache_folder = base_path / partition_name(site, day) / 'cache'
+    artifact = STREAM_ARTIFACTS[stream]
+    if (cache_folder / artifact).exists() and not replace:
+        return STATUS_EXISTS
+
+    ensure_partition(base_path, site, day, sward_config)
+    rows = rows.sort_values('time', kind='stable').reset_index(drop=True)
+    write_parquet_atomic(rows, cache_folder / artifact)
+
+    stale = []
+
+    def update(metadata):
+        saved_files = metadata.setdefault('saved_files', [])
+        for name in (artifact, SWARD_CONFIG_ARTIFACT):
+            if name not in saved_files and (cache_folder / name).exists():
+                saved_files.append(name)
+        metadata[f"{stream}_records"] = len(rows)
+        metadata['updated_at'] = datetime.now().isoformat()
+        metadata.setdefault('watermarks', {})[stream] = {
+            'min_time': rows['time'].min().isoformat(),
+            'max_time': rows['time'].max().isoformat(),
+            'rows': len(rows),
+            'appends': 0,
+            'updated_at': datetime.now().isoformat(),
+            'files': files or {},
+        }
+        # 덮어쓴 raw에서 (재귀적으로) 파생된 artifact
+        derived = metadata.get('derived_artifacts', {})
+        for name in derived_from(derived, artifact):
+            stale.append(name)
+            del derived[name]
+        if metadata.pop('daily_summary', None) is not None:
+            stale.extend([SUMMARY_ARTIFACT, SUMMARY_MACS_ARTIFACT])
+        metadata['saved_files'] = [name for name in saved_files if name not in stale]
+    update_metadata(cache_folder, update)
+    for name in stale:
+        try:
+            (cache_folder / name).unlink()
+        except OSError:
+            pass
+    return STATUS_WRITTEN
+
+
+def ingest_raw(paths: Iterable, site: str, base_path=None, sward_config=None,
+               replace: bool = False) -> List[Dict]:
+    """raw 파일 (여러 일자 포함 가능) → 일자별 파티션 저장 → (partition, stream, rows, status) 목록
+
+    stream 단위로 읽고 일자별로 나누어 쓰므로 동시에 메모리에 있는 raw는 stream 1개분입니다.
+    """
+    base_path = Path(base_path) if base_path is not None else default_base_path()
+    sward_path = Path(sward_config) if sward_config is not None else DEFAULT_SWARD_CONFIG
+    sward_frame = pd.read_csv(sward_path) if sward_path.exists() else None
+
+    results = []
+    touched = set()
+    for stream, files in collect_raw_files(paths).items():
+        if not files:
+            continue
+        started = time.perf_counter()
+        frames, file_days = [], []
+        for path in files:
+            frame = read_raw_file(path)
+            add_time_columns(frame)
+            stat = path.stat()
+            file_days.append((str(path.resolve()), {'size': stat.st_size, 'mtime': stat.st_mtime},
+                              frame.groupby('day').size()))
+            frames.append(frame)
+        raw = pd.concat(frames, ignore_index=True)
+        del frames
+        for day, rows in raw.groupby('day', sort=True):
+            day_files = {key: {**info, 'rows': int(counts[day])}
+                         for key, info, counts in file_days if day in counts.index}
+            status = write_partition(base_path, site, day, stream, rows, sward_frame, replace, day_files)
+            name = partition_name(site, day)
+            touched.add(name)
+            results.append({'partition': name, 'stream': stream, 'rows': len(rows), 'status': status})
+            log.info(f"{'💾' if status == STATUS_WRITTEN else '⏭️'} {name} {stream}: {len(rows):,} rows ({status})")
+        log.info(f"📥 {stream}: {len(files)} file(s), {len(raw):,} rows ({time.perf_counter() - started:.1f}s)")
+        del raw
+
+    for name in sorted(touched):
+        refresh_dataset(base_path / name / 'cache', base_path)
+    return results
+
+
+# ========== 일자별 요약 ==========
+
+def _hourly_from_raw(raw: pd.DataFrame, stream: str, date: str) -> Tuple[pd.DataFrame, np.ndarray]:
+    """raw 1일 → (stream, hour) 고유 MAC / 신호 수 (+ T41 활성 작업자), MAC 목록"""
+    minutes = minute_of_day(raw)
+    valid = minutes >= 0
+    macs = raw['mac'].to_numpy()[valid]
+    minutes = minutes[valid].astype('int32')
+    frame = pd.DataFrame({'mac': macs, 'hour': minutes // 60})
+    hourly = frame.groupby('hour').agg(unique_macs=('mac', 'nunique'), signals=('mac', 'size'))
+    day_total = {'unique_macs': frame['mac'].nunique(), 'signals': len(frame), 'active_macs': np.nan}
+    hourly['active_macs'] = np.nan
+    if stream == 't41' and len(frame):
+        bins = pd.DataFrame({'mac': macs, 'bin': minutes // 10}).groupby(['mac', 'bin']).size()
+        active = bins[bins >= T41_ACTIVE_SIGNALS_10MIN].reset_index()
+        hourly['active_macs'] = active.groupby(active['bin'] // 6)['mac'].nunique().reindex(hourly.index).fillna(0)
+        day_total['active_macs'] = active['mac'].nunique()
+    rows = hourly.reset_index()
+    rows = pd.concat([rows, pd.DataFrame([{'hour': DAY_TOTAL_HOUR, **day_total}])], ignore_index=True)
+    rows.insert(0, 'stream', stream)
+    rows.insert(0, 'date', date)
+    return rows[SUMMARY_COLUMNS], pd.unique(macs.astype(str))
+
+
+def _hourly_from_cache(loader, stream: str, date: str) -> Optional[pd.DataFrame]:
+    """raw 없는 캐시 → 사전 계산된 시간대 집계에서 요약 (신호 수 / MAC 목록 없음)"""
+    if stream == 't41':
+        hourly = loader._load_parquet('dashboard_results_t41_hourly_workers.parquet')
+        value, total = 'worker_count', loader._load_json('t41_results_total_worker_count.json')
+    elif stream == 't31':
+        hourly = loader._load_parquet('t31_results_hourly_activity.parquet')
+        value, total = 'active_devices', len(loader._load_parquet('t31_results_device_stats.parquet')) or None
+    else:
+        hourly = loader._load_parquet('flow_results_hourly_flow.parquet')
+        value, total = 'unique_devices', len(loader._load_parquet('flow_results_device_stats.parquet')) or None
+    if hourly.empty or value not in hourly.columns:
+        return None
+    rows = pd.DataFrame({'hour': hourly['hour'].astype(int), 'unique_macs': hourly[value].astype(float)})
+    total = total if isinstance(total, (int, float)) else None
+    rows = pd.concat([rows, pd.DataFrame([{'hour': DAY_TOTAL_HOUR, 'unique_macs': total}])], ignore_index=True)
+    rows['active_macs'] = np.nan
+    rows['signals'] = np.nan
+    rows.insert(0, 'stream', stream)
+    rows.insert(0, 'date', date)
+    return rows[SUMMARY_COLUMNS]
+
+
+def _source_stamps(cache_folder: Path) -> Dict[str, float]:
+    """요약 입력 파일 mtime (raw가 있으면 raw, 없으면 metadata.json 이외의 캐시 생성 시각)"""
+    stamps = {}
+    for artifact in STREAM_ARTIFACTS.values():
+        path = cache_folder / artifact
+        if path.exists():
+            stamps[artifact] = path.stat().st_mtime
+    if not stamps:
+        with open(cache_folder / 'metadata.json', 'r') as f:
+            stamps['created_at'] = json.load(f).get('created_at')
+    return stamps
+
+
+def partition_stamp(cache_folder) -> str:
+    """파티션 입력이 바뀌었는지 비교하는 문자열 (rollup이 일자별로 기록)"""
+    return json.dumps(_source_stamps(Path(cache_folder)), sort_keys=True)
+
+
+def summarize_partition(cache_path: str, force: bool = False) -> Dict:
+    """일자 파티션 1개 요약 → daily_summary.parquet (process pool에서 일자별 독립 실행)
+
+    metadata.json의 daily_summary.sources가 현재 입력 mtime과 같으면 저장된 요약을 재사용합니다.
+    """
+    from src.cached_data_loader import CachedDataLoader
+
+    cache_folder = Path(cache_path)
+    started = time.perf_counter()
+    entry = {'cache_path': cache_path, 'dataset': cache_folder.parent.name}
+    try:
+        loader = CachedDataLoader(cache_path)
+        metadata = loader.get_metadata()
+        stamps = _source_stamps(cache_folder)
+        entry['stamp'] = json.dumps(stamps, sort_keys=True)
+        recorded = metadata.get('daily_summary', {})
+        if not force and recorded.get('sources') == stamps and (cache_folder / SUMMARY_ARTIFACT).exists():
+            entry.update(status=STATUS_CURRENT, seconds=round(time.perf_counter() - started, 3))
+            return entry
+
+        site, day = split_dataset_name(cache_folder.parent.name)
+        day = metadata.get('partition', {}).get('day', day)
+        date = f"{day[:4]}-{day[4:6]}-{day[6:8]}" if day else ''
+        frames, macs = [], []
+        for stream, artifact in STREAM_ARTIFACTS.items():
+            if (cache_folder / artifact).exists():
+                raw = loader._load_raw_parquet(artifact)
+                if raw.empty:
+                    continue
+                rows, stream_macs = _hourly_from_raw(raw, stream, date)
+                if stream in DISTINCT_STREAMS:
+                    macs.append(pd.DataFrame({'stream': stream, 'mac': stream_macs}))
+                loader.clear_cache()
+            elif metadata.get(f"{stream}_records", 0):
+                rows = _hourly_from_cache(loader, stream, date)
+            else:
+                rows = None
+            if rows is not None:
+                frames.append(rows)
+        summary = (pd.concat(frames, ignore_index=True) if frames
+                   else pd.DataFrame(columns=SUMMARY_COLUMNS))
+        write_parquet_atomic(summary, cache_folder / SUMMARY_ARTIFACT)
+        saved = [SUMMARY_ARTIFACT]
+        if macs:
+            write_parquet_atomic(pd.concat(macs, ignore_index=True), cache_folder / SUMMARY_MACS_ARTIFACT)
+            saved.append(SUMMARY_MACS_ARTIFACT)
+
+        def update(metadata):
+            saved_files = metadata.setdefault('saved_files', [])
+            saved_files.extend(name for name in saved if name not in saved_files)
+            metadata['daily_summary'] = {'sources': stamps, 'created_at': datetime.now().isoformat(),
+                                         'has_macs': bool(macs)}
+        update_metadata(cache_folder, update)
+        entry.update(status=STATUS_DONE, rows=len(summary))
+    except Exception as e:
+        entry.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}",
+                     traceback=traceback.format_exc(limit=5))
+    entry['seconds'] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def summarize_partitions(cache_paths: Sequence[str], workers: int = 2, force: bool = False) -> List[Dict]:
+    """여러 일자 요약을 process pool에서 병렬 계산 (일자 간 의존성 없음)"""
+    if not cache_paths:
+        return []
+    if workers <= 1 or len(cache_paths) == 1:
+        entries = [summarize_partition(path, force) for path in cache_paths]
+    else:
+        entries = []
+        # spawn: worker가 부모 프로세스 상태(thread / 대용량 DataFrame)를 복제하지 않도록
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(cache_paths)), mp_context=context) as executor:
+            futures = [executor.submit(summarize_partition, path, force) for path in cache_paths]
+            for future in as_completed(futures):
+                entries.append(future.result())
+    # catalog 갱신은 부모 프로세스에서 한 번씩 (worker끼리 catalog 파일을 덮어쓰지 않도록)
+    for entry in entries:
+        if entry['status'] == STATUS_DONE:
+            refresh_dataset(entry['cache_path'])
+    return entries
+
+
+# ========== Site rollup (증분) ==========
+
+def site_partitions(site: str, base_path=None) -> Dict[str, Dict]:
+    """catalog에서 site의 일자 파티션 (YYYYMMDD → 데이터셋)"""
+    partitions = {}
+    for dataset in list_datasets(base_path):
+        dataset_site, day = split_dataset_name(dataset['name'])
+        if dataset_site == site and day:
+            partitions[day] = dataset
+    return partitions
+
+
+def rollup_folder(site: str, base_path=None) -> Path:
+    base_path = Path(base_path) if base_path is not None else default_base_path()
+    return base_path / ROLLUP_DIR / site
+
+
+def _read_parquet(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        return pd.DataFrame(columns=columns or [])
+
+
+def build_daily_trends(summaries: pd.DataFrame) -> pd.DataFrame:
+    """일자 × stream: 하루 고유 MAC / 활성 작업자 / 신호 수, 시간대 최대 / 평균 (일별 추이)"""
+    day_rows = summaries[summaries['hour'] == DAY_TOTAL_HOUR].set_index(['date', 'stream'])
+    hourly = summaries[summaries['hour'] != DAY_TOTAL_HOUR].groupby(['date', 'stream'])['unique_macs']
+    trends = pd.DataFrame({
+        'unique_macs': day_rows['unique_macs'],
+        'active_macs': day_rows['active_macs'],
+        'signals': day_rows['signals'],
+        'peak_hourly_macs': hourly.max(),
+        'avg_hourly_macs': hourly.sum() / 24,       # 데이터 없는 시간 = 0 (하루 평균 점유)
+    }).reset_index()
+    dates = pd.to_datetime(trends['date'])
+    trends['weekday'] = dates.dt.weekday
+    trends['weekday_name'] = dates.dt.day_name()
+    return trends.sort_values(['stream', 'date']).reset_index(drop=True)
+
+
+def build_weekday_profile(summaries: pd.DataFrame) -> pd.DataFrame:
+    """stream × 요일 × 시간: 같은 요일 일자들의 시간대 고유 MAC 평균 (요일 패턴)"""
+    hourly = summaries[summaries['hour'] != DAY_TOTAL_HOUR].copy()
+    hourly['weekday'] = pd.to_datetime(hourly['date']).dt.weekday
+    days = summaries.assign(weekday=pd.to_datetime(summaries['date']).dt.weekday) \
+        .groupby(['stream', 'weekday'])['date'].nunique().rename('days')
+    totals = hourly.groupby(['stream', 'weekday', 'hour']).agg(
+        sum_macs=('unique_macs', 'sum'), sum_active=('active_macs', lambda v: v.sum(min_count=1)))
+    profile = totals.join(days, on=['stream', 'weekday'])
+    profile['avg_unique_macs'] = profile['sum_macs'] / profile['days']
+    profile['avg_active_macs'] = profile['sum_active'] / profile['days']
+    return profile.drop(columns=['sum_macs', 'sum_active']).reset_index()
+
+
+def _period_distinct(partitions: Dict[str, Dict], period: str,
+                     periods: Iterable[pd.Period]) -> pd.DataFrame:
+    """기간별 고유 MAC 수 = 기간 안 일자별 MAC 목록의 합집합 (T31 / T41)"""
+    rows = []
+    for value in periods:
+        days = [day for day in partitions if pd.Timestamp(day).to_period(PERIODS[period]) == value]
+        frames = []
+        for day in days:
+            path = Path(partitions[day]['cache_path']) / SUMMARY_MACS_ARTIFACT
+            if path.exists():
+                frames.append(pd.read_parquet(path))
+        if not frames:
+            continue
+        macs = pd.concat(frames, ignore_index=True)
+        for stream, count in macs.groupby('stream')['mac'].nunique().items():
+            rows.append({'period': str(value), 'stream': stream, 'distinct_macs': int(count),
+                         'distinct_days': len(frames)})
+    return pd.DataFrame(rows, columns=['period', 'stream', 'distinct_macs', 'distinct_days'])
+
+
+def build_period_rollup(trends: pd.DataFrame, distinct: pd.DataFrame, period: str) -> pd.DataFrame:
+    """stream × 주 / 월: 일평균 고유 MAC / 평균 점유 / 활성 작업자 + 기간 고유 수 + 이전 기간 대비 변화율"""
+    frame = trends.copy()
+    frame['period'] = pd.to_datetime(frame['date']).dt.to_period(PERIODS[period]).astype(str)
+    rollup = frame.groupby(['stream', 'period']).agg(
+        days=('date', 'nunique'),
+        avg_daily_macs=('unique_macs', 'mean'),
+        avg_hourly_occupancy=('avg_hourly_macs', 'mean'),
+        peak_hourly_macs=('peak_hourly_macs', 'max'),
+        avg_active_macs=('active_macs', 'mean'),
+        signals=('signals', 'sum'),
+    ).reset_index()
+    rollup = rollup.merge(distinct, on=['period', 'stream'], how='left')
+    rollup = rollup.sort_values(['stream', 'period']).reset_index(drop=True)
+    for col in ('avg_hourly_occupancy', 'avg_daily_macs'):
+        previous = rollup.groupby('stream')[col].shift(1)
+        rollup[f"{col}_change_pct"] = ((rollup[col] - previous) / previous * 100).round(1)
+    return rollup
+
+
+def update_site_rollups(site: str, base_path=None, workers: int = 2, force: bool = False) -> Dict:
+    """site 일자 파티션 → 바뀐 일자만 요약 → rollup 표 갱신 → manifest
+
+    Returns: {'site', 'days', 'entries', 'summarized', 'removed', 'failed', 'files'}
+    """
+    partitions = site_partitions(site, base_path)
+    folder = rollup_folder(site, base_path)
+    manifest_path = folder / ROLLUP_MANIFEST
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {'site': site, 'days': {}}
+    summaries = _read_parquet(folder / SUMMARIES_FILE, SUMMARY_COLUMNS)
+    if force:
+        manifest['days'], summaries = {}, pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    recorded = manifest.get('days', {})
+    stamps = {day: partition_stamp(dataset['cache_path']) for day, dataset in partitions.items()}
+    changed = sorted(day for day in partitions if recorded.get(day) != stamps[day])
+    removed = sorted(set(recorded) - set(partitions))
+    log.info(f"📅 {site}: {len(partitions)} day(s), {len(changed)} new / changed, {len(removed)} removed")
+
+    entries = summarize_partitions([partitions[day]['cache_path'] for day in changed], workers, force)
+    failed = [e for e in entries if e['status'] == STATUS_FAILED]
+    for entry in failed:
+        log.warning(f"❌ {entry['dataset']} summary failed: {entry['error']}\n{entry['traceback']}")
+
+    refreshed = [day for day in changed if day not in {split_dataset_name(e['dataset'])[1] for e in failed}]
+    refreshed_dates = {f"{d[:4]}-{d[4:6]}-{d[6:8]}" for d in refreshed + removed}
+    summaries = summaries[~summaries['date'].isin(refreshed_dates)] if len(summaries) else summaries
+    frames = [summaries] if len(summaries) else []
+    for day in refreshed:
+        frames.append(pd.read_parquet(Path(partitions[day]['cache_path']) / SUMMARY_ARTIFACT))
+    summaries = (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SUMMARY_COLUMNS))
+    summaries = summaries.sort_values(['date', 'stream', 'hour']).reset_index(drop=True)
+
+    folder.mkdir(parents=True, exist_ok=True)
+    write_parquet_atomic(summaries, folder / SUMMARIES_FILE)
+    outputs = {}
+    if len(summaries):
+        trends = build_daily_trends(summaries)
+        outputs['daily_trends'] = trends
+        outputs['weekday_profile'] = build_weekday_profile(summaries)
+        for period in PERIODS:
+            # 기간 고유 수: 바뀐 / 삭제된 일자가 속한 기간만 다시 합치고 나머지는 이전 값 재사용
+            previous = _read_parquet(folder / ROLLUP_FILES[period])
+            affected = {pd.Timestamp(day).to_period(PERIODS[period]) for day in refreshed + removed}
+            if force or previous.empty or 'distinct_macs' not in previous.columns:
+                affected = {pd.Timestamp(day).to_period(PERIODS[period]) for day in partitions}
+                kept = pd.DataFrame(columns=['period', 'stream', 'distinct_macs', 'distinct_days'])
+            else:
+                kept = previous[~previous['period'].isin({str(p) for p in affected})]
+                kept = kept[['period', 'stream', 'distinct_macs', 'distinct_days']].dropna(subset=['distinct_macs'])
+            distinct = pd.concat([kept, _period_distinct(partitions, period, sorted(affected))],
+                                 ignore_index=True)
+            outputs[period] = build_period_rollup(trends, distinct, period)
+    for name, frame in outputs.items():
+        write_parquet_atomic(frame, folder / ROLLUP_FILES[name])
+    # 일자가 모두 없어지면 이전 rollup 표 삭제 (삭제된 일자가 추이 패널에 남지 않도록)
+    for name, filename in ROLLUP_FILES.items():
+        if name not in outputs:
+            try:
+                (folder / filename).unlink()
+            except FileNotFoundError:
+                pass
+
+    # 실패한 일자는 이전 stamp 유지 → 다음 실행에서 다시 요약
+    days = {day: stamp for day, stamp in recorded.items() if day in partitions}
+    days.update({day: stamps[day] for day in refreshed})
+    manifest.update({'site': site, 'updated_at': datetime.now().isoformat(timespec='seconds'), 'days': days})
+    _write_json(manifest_path, manifest)
+    return {
+        'site': site,
+        'days': len(partitions),
+        'entries': entries,
+        'summarized': refreshed,
+        'removed': removed,
+        'failed': failed,
+        'files': {name: str(folder / ROLLUP_FILES[name]) for name in outputs},
+    }
+
+
+def load_site_rollups(site: str, base_path=None) -> Dict[str, pd.DataFrame]:
+    """저장된 site rollup 표 (없으면 빈 dict)"""
+    folder = rollup_folder(site, base_path)
+    return {name: pd.read_parquet(folder / filename) for name, filename in ROLLUP_FILES.items()
+            if (folder / filename).exists()}
+
+
+# ========== Dashboard 패널 ==========
+
+def render_site_trends(st, site: str, base_path=None):
+    """site rollup (2일 이상)의 일별 추이 / 주간 / 월간 / 요일 패턴 패널"""
+    rollups = load_site_rollups(site, base_path)
+    trends = rollups.get('daily_trends')
+    if trends is None or trends['date'].nunique() < 2:
+        return
+    import plotly.express as px
+
+    with st.expander(f"📅 Multi-day trends - {site} ({trends['date'].nunique()} days)", expanded=False):
+        streams = sorted(trends['stream'].unique())
+        stream = st.radio("Stream", streams, horizontal=True, key=f"_rollup_stream_{site}",
+                          index=streams.index('t41') if 't41' in streams else 0)
+        daily = trends[trends['stream'] == stream]
+        st.plotly_chart(px.line(daily, x='date', y=['unique_macs', 'avg_hourly_macs', 'peak_hourly_macs'],
+                                markers=True, title='Daily trend'), use_container_width=True)
+        view = st.radio("Period", ['weekly', 'monthly'], horizontal=True, key=f"_rollup_period_{site}")
+        table = rollups.get(view)
+        if table is not None:
+            st.dataframe(table[table['stream'] == stream].drop(columns=['stream']),
+                         use_container_width=True, hide_index=True)
+        profile = rollups.get('weekday_profile')
+        if profile is not None:
+            pivot = profile[profile['stream'] == stream].pivot(index='weekday', columns='hour',
+                                                                values='avg_unique_macs')
+            pivot.index = [['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'][i] for i in pivot.index]
+            st.plotly_chart(px.imshow(pivot, aspect='auto', title='Weekday profile (avg unique MACs)'),
+                            use_container_width=True)
+
+
+# ========== CLI ==========
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.date_partitions',
+        description='Date-partitioned raw storage, per-day summaries and incremental multi-day rollups',
+    )
+    parser.add_argument('--data', default=None, help='Rawdata folder (default: Datafile/Rawdata)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help='Split raw files (T31_/T41_/TMobile_ csv or parquet) into day partitions')
+    ingest.add_argument('paths', nargs='+', help='Raw files or folders')
+    ingest.add_argument('--site', required=True, help='Site name (partition folder = <site>_<YYYYMMDD>)')
+    ingest.add_argument('--sward-config', default=None, help='S-Ward configuration CSV')
+    ingest.add_argument('--replace', action='store_true', help='Overwrite streams already in a partition')
+    ingest.add_argument('--rollup', action='store_true', help='Update site rollups after ingesting')
+    ingest.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Worker processes for per-day summaries')
+
+    rollup = sub.add_parser('rollup', help='Summarize new/changed days and update site rollups')
+    rollup.add_argument('--site', required=True, help='Site name')
+    rollup.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Worker processes for per-day summaries')
+    rollup.add_argument('--force', action='store_true', help='Recompute every day')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command == 'ingest':
+        results = ingest_raw(args.paths, args.site, args.data, args.sward_config, args.replace)
+        if not results:
+            print("⚠️ No raw files found (expected T31_* / T41_* / TMobile_* .csv or .parquet)")
+            return 1
+        for r in results:
+            print(f"{'💾' if r['status'] == STATUS_WRITTEN else '⏭️'} {r['partition']} {r['stream']}: "
+                  f"{r['rows']:,} rows ({r['status']})")
+        written = sum(1 for r in results if r['status'] == STATUS_WRITTEN)
+        print(f"🗂️ {written} partition stream(s) written, {len(results) - written} already present")
+        if not args.rollup:
+            return 0
+
+    report = update_site_rollups(args.site, args.data, args.workers, getattr(args, 'force', False))
+    if not report['days']:
+        print(f"⚠️ No partitions for site {args.site}")
+        return 1
+    print(f"📅 {args.site}: {report['days']} day(s), {len(report['entries'])} new / changed, "
+          f"{len(report['removed'])} removed")
+    for entry in report['entries']:
+        icon = '❌' if entry['status'] == STATUS_FAILED else '🧮'
+        print(f"   {icon} {entry['dataset']} {entry['status']} ({entry['seconds']:.1f}s)"
+              f"{' - ' + entry['error'] if 'error' in entry else ''}")
+    print(f"📈 Rollups: {len(report['summarized'])} day(s) summarized, {len(report['failed'])} failed "
+          f"→ {rollup_folder(args.site, args.data)}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+MAC Event Store Module
+MAC별 이벤트 저장소 (CSR 구조)
+
+원시 이벤트를 (mac, time) 순으로 한 번만 정렬하고, dense MAC id별 시작 위치(offsets)를
+보관하여 작업자별 데이터를 O(1) 슬라이스로 접근합니다.
+
+기존의 `for mac in df['mac'].unique(): df[df['mac'] == mac]` 패턴은
+MAC 수 × 전체 행 수 만큼 비용이 들지만, 이 저장소를 사용하면 정렬 1회 + 슬라이스로 끝납니다.
+
+사용 예:
+    store = MacEventStore.from_frame(df, time_col='time')
+    for mac, mac_data in store.iter_macs():
+        ...
+    active_counts = store.segment_sum(store.column('signal_count') >= 3)
+"""
+
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class MacEventStore:
+    """(mac, time) 정렬 + MAC별 offsets 배열을 갖는 CSR 형태의 이벤트 저장소"""
+
+    def __init__(self, frame: pd.DataFrame, macs: np.ndarray, offsets: np.ndarray,
+                 source_positions: Optional[np.ndarray] = None, mac_col: str = 'mac',
+                 time_col: Optional[str] = None, n_source: Optional[int] = None):
+        """
+        Args:
+            frame: MAC 순으로 연속 배치된 DataFrame (RangeIndex)
+            macs: dense MAC id → MAC 주소 (원본 첫 등장 순서)
+            offsets: 길이 len(macs) + 1, MAC i의 행 범위는 [offsets[i], offsets[i+1])
+            source_positions: 정렬된 행 → 원본 DataFrame 행 위치
+            n_source: 원본 DataFrame 행 수 (결측 MAC 행 포함)
+        """
+        self.frame = frame
+        self.macs = macs
+        self.offsets = offsets
+        self._source_positions = (np.arange(len(frame)) if source_positions is None
+                                  else source_positions)
+        self.mac_col = mac_col
+        self.time_col = time_col
+        self.n_source = len(frame) if n_source is None else n_source
+        self._mac_index: Optional[Dict[str, int]] = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    # ========== 생성 ==========
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, mac_col: str = 'mac',
+                   time_col: Optional[str] = None) -> 'MacEventStore':
+        """DataFrame으로부터 저장소 생성
+
+        MAC id는 원본 첫 등장 순서(`df['mac'].unique()`와 동일)로 부여됩니다.
+        time_col이 None이면 MAC 내부의 원래 행 순서를 유지합니다 (stable sort).
+        """
+        n_source = len(df)
+        codes, uniques = pd.factorize(df[mac_col], sort=False)
+        codes = np.asarray(codes)
+        n_macs = len(uniques)
+
+        # 결측 MAC(-1)은 제외 (기존 unique() 루프에서도 mac == NaN 필터는 빈 결과)
+        valid = codes >= 0
+        if not valid.all():
+            df = df[valid]
+            codes = codes[valid]
+
+        if time_col is not None and time_col in df.columns:
+            order = np.lexsort((df[time_col].to_numpy(), codes))
+        else:
+            order = np.argsort(codes, kind='stable')
+
+        frame = df.iloc[order].reset_index(drop=True)
+        source_positions = np.flatnonzero(valid)[order] if not valid.all() else order
+
+        counts = np.bincount(codes, minlength=n_macs)
+        offsets = np.zeros(n_macs + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return cls(frame, np.asarray(uniques, dtype=object), offsets, source_positions,
+                   mac_col=mac_col, time_col=time_col, n_source=n_source)
+
+    @classmethod
+    def ensure(cls, data: Union[pd.DataFrame, 'MacEventStore'], mac_col: str = 'mac',
+               time_col: Optional[str] = None) -> 'MacEventStore':
+        """DataFrame이면 저장소를 생성하고, 이미 저장소면 그대로 반환"""
+        if isinstance(data, cls):
+            return data
+        return cls.from_frame(data, mac_col=mac_col, time_col=time_col)
+
+    # ========== 기본 정보 ==========
+
+    def __len__(self) -> int:
+        return len(self.macs)
+
+    @property
+    def n_events(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def counts(self) -> np.ndarray:
+        """MAC별 이벤트 수"""
+        return np.diff(self.offsets)
+
+    @property
+    def mac_ids(self) -> np.ndarray:
+        """정렬된 행별 dense MAC id"""
+        if '_mac_id' not in self._columns:
+            self._columns['_mac_id'] = np.repeat(np.arange(len(self.macs)), self.counts)
+        return self._columns['_mac_id']
+
+    def mac_index(self, mac) -> Optional[int]:
+        """MAC 주소 → dense id (없으면 None)"""
+        if self._mac_index is None:
+            self._mac_index = {m: i for i, m in enumerate(self.macs)}
+        return self._mac_index.get(mac)
+
+    # ========== 슬라이스 접근 ==========
+
+    def bounds(self, mac_id: int) -> Tuple[int, int]:
+        """MAC id의 행 범위 [start, end)"""
+        return int(self.offsets[mac_id]), int(self.offsets[mac_id + 1])
+
+    def slice(self, mac_id: int) -> pd.DataFrame:
+        """MAC id의 이벤트 (O(1) 슬라이스)"""
+        start, end = self.bounds(mac_id)
+        return self.frame.iloc[start:end]
+
+    def get(self, mac) -> pd.DataFrame:
+        """MAC 주소의 이벤트 (없으면 빈 DataFrame)"""
+        mac_id = self.mac_index(mac)
+        if mac_id is None:
+            return self.frame.iloc[0:0]
+        return self.slice(mac_id)
+
+    def column(self, name: str) -> np.ndarray:
+        """정렬된 컬럼의 numpy 배열 (캐시)"""
+        if name not in self._columns:
+            self._columns[name] = self.frame[name].to_numpy()
+        return self._columns[name]
+
+    def values(self, name: str, mac_id: int) -> np.ndarray:
+        """MAC id의 컬럼 값 (numpy view)"""
+        start, end = self.bounds(mac_id)
+        return self.column(name)[start:end]
+
+    def source_positions(self) -> np.ndarray:
+        """정렬된 행 → 원본 DataFrame 행 위치"""
+        return self._source_positions
+
+    # ========== 반복 ==========
+
+    def iter_macs(self) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """(mac, mac_data) 순회 - 원본 첫 등장 순서"""
+        for mac_id, mac in enumerate(self.macs):
+            yield mac, self.slice(mac_id)
+
+    def iter_batches(self, batch_size: int = 256) -> Iterator[Tuple[np.ndarray, pd.DataFrame]]:
+        """연속된 MAC 묶음 단위 순회 (batch_size개 MAC씩)"""
+        n_macs = len(self.macs)
+        for first in range(0, n_macs, batch_size):
+            last = min(first + batch_size, n_macs)
+            start, end = int(self.offsets[first]), int(self.offsets[last])
+            yield self.macs[first:last], self.frame.iloc[start:end]
+
+    # ========== Segmented reduction ==========
+
+    def _reduceat(self, ufunc, values, empty_value) -> np.ndarray:
+        values = np.asarray(values)
+        result = np.full(len(self.macs), empty_value,
+                         dtype=np.result_type(values.dtype, type(empty_value)))
+        non_empty = self.counts > 0
+        if values.size and non_empty.any():
+            result[non_empty] = ufunc.reduceat(values, self.offsets[:-1][non_empty])
+        return result
+
+    def segment_sum(self, values) -> np.ndarray:
+        """MAC별 합계 (bool 배열이면 MAC별 True 개수)"""
+        values = np.asarray(values)
+        if values.dtype == bool:
+            values = values.astype(np.int64)
+        return self._reduceat(np.add, values, 0)
+
+    def segment_count(self, mask=None) -> np.ndarray:
+        """MAC별 행 수 (mask가 주어지면 True 개수)"""
+        if mask is None:
+            return self.counts
+        return self.segment_sum(np.asarray(mask, dtype=bool))
+
+    def segment_max(self, values) -> np.ndarray:
+        """MAC별 최대값"""
+        return self._reduceat(np.maximum, np.asarray(values, dtype=float), np.nan)
+
+    def segment_min(self, values) -> np.ndarray:
+        """MAC별 최소값"""
+        return self._reduceat(np.minimum, np.asarray(values, dtype=float), np.nan)
+
+    def segment_mean(self, values) -> np.ndarray:
+        """MAC별 평균"""
+        counts = self.counts
+        sums = self.segment_sum(np.asarray(values, dtype=float))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def segment_first(self, values) -> np.ndarray:
+        """MAC별 첫 번째 값"""
+        values = np.asarray(values)
+        return values[self.offsets[:-1][self.counts > 0]]
+
+    def segment_last(self, values) -> np.ndarray:
+        """MAC별 마지막 값"""
+        values = np.asarray(values)
+        return values[self.offsets[1:][self.counts > 0] - 1]
+
+    def broadcast(self, per_mac_values) -> np.ndarray:
+        """MAC별 값을 행 단위로 펼침"""
+        return np.repeat(np.asarray(per_mac_values), self.counts)
+
+    def scatter_to_source(self, sorted_values, fill_value=np.nan) -> np.ndarray:
+        """정렬 순서의 값을 원본 행 순서로 되돌림 (결측 MAC 행은 fill_value)"""
+        sorted_values = np.asarray(sorted_values)
+        if self.n_source == self.n_events:
+            result = np.empty(self.n_source, dtype=sorted_values.dtype)
+        else:
+            result = np.full(self.n_source, fill_value,
+                             dtype=np.result_type(sorted_values.dtype, type(fill_value)))
+        result[self.source_positions()] = sorted_values
+        return result
@@ -0,0 +1,148 @@
+"""
+Frame Fingerprint Module
+DataFrame content id (fingerprint) 관리
+
+캐시 key를 만들 때마다 수백만 행 DataFrame 전체를 해싱하지 않도록,
+로드 / 파생 시점에 한 번 정해진 content id를 DataFrame에 연결해 둡니다.
+
+    - 캐시 파일: 경로 + 크기 + mtime + parquet 통계(행 수, 컬럼별 min/max/null 수)
+    - 파생 프레임: 부모 id + 연산 이름 + 파라미터
+    - 등록되지 않은 프레임: 최초 1회 내용 해시 후 등록
+
+    df = register(pd.read_parquet(path), file_fingerprint(path))
+    filtered = register_derived(df[mask], df, 'filter_macs', min_dwell=30)
+    key = fingerprint(filtered)
+
+등록된 DataFrame은 불변으로 취급합니다. 조회 시 구조(행 수 / 컬럼 / dtype)와 표본 행(최대 SAMPLE_ROWS행)의
+내용 해시를 등록 시점과 비교하므로, 컬럼 추가 / 교체나 표본 행에 걸친 in-place 수정은 등록을 무효화합니다.
+표본 밖의 행만 수정하는 경우는 감지하지 못하므로, 값을 수정한 경우 다시 등록해야 합니다.
+"""
+
+import hashlib
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_ROWS = 32    # 등록 검증에 쓰는 표본 행 수 (처음 / 끝 포함, 균등 간격)
+
+_registry: Dict[int, Tuple[weakref.ref, str, Tuple]] = {}
+_lock = threading.Lock()
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:16]
+
+
+def _signature(df) -> Tuple:
+    """구조 + 표본 행 내용 해시 (수백만 행에서도 표본 행만 해싱)"""
+    if isinstance(df, pd.DataFrame):
+        structure = df.shape, tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes)
+    else:
+        structure = (len(df),), (df.name,), (str(df.dtype),)
+    positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), SAMPLE_ROWS)).astype(np.int64))
+    try:
+        sample = pd.util.hash_pandas_object(df.iloc[positions], index=True).to_numpy()
+    except TypeError:   # 해싱할 수 없는 값 (list / dict 셀 등) → 구조만 비교
+        return structure
+    return structure + (hashlib.sha1(sample.tobytes()).hexdigest(),)
+
+
+# ========== Fingerprint 계산 ==========
+
+def _parquet_statistics(path: Path) -> str:
+    """parquet footer 통계 (행 수, row group별 컬럼 min/max/null 수) - 데이터 페이지는 읽지 않음"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return ''
+    try:
+        metadata = pq.ParquetFile(path).metadata
+    except Exception:
+        return ''
+    parts = [metadata.num_rows, metadata.num_row_groups, metadata.num_columns]
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for col in range(row_group.num_columns):
+            stats = row_group.column(col).statistics
+            if stats is not None and stats.has_min_max:
+                parts.append((col, stats.min, stats.max, stats.null_count))
+    return _digest(*parts)
+
+
+def file_fingerprint(path) -> str:
+    """파일 content id (경로 + 크기 + mtime + parquet 통계)"""
+    path = Path(path)
+    stat = os.stat(path)
+    parquet_stats = _parquet_statistics(path) if path.suffix == '.parquet' else ''
+    return _digest('file', path.resolve(), stat.st_size, stat.st_mtime_ns, parquet_stats)
+
+
+def content_fingerprint(df) -> str:
+    """내용 해시 (등록되지 않은 프레임용, 전체 데이터를 한 번 읽음)"""
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    columns = list(df.columns) if isinstance(df, pd.DataFrame) else [df.name]
+    return _digest('content', df.shape, columns, hashlib.sha1(hashed.tobytes()).hexdigest())
+
+
+def derived_fingerprint(parent: Any, operation: str, **params) -> str:
+    """부모 id + 연산 + 파라미터로 파생 프레임 id 생성 (parent: id 문자열 또는 DataFrame)"""
+    parent_id = parent if isinstance(parent, str) else fingerprint(parent)
+    return _digest('derived', parent_id, operation, sorted((k, repr(v)) for k, v in params.items()))
+
+
+# ========== 등록 / 조회 ==========
+
+def register(df, fingerprint_id: str):
+    """DataFrame에 content id 연결 (같은 객체 반환)"""
+    if df is None:
+        return df
+    key = id(df)
+
+    def _forget(_, key=key):
+        with _lock:
+            entry = _registry.get(key)
+            if entry is not None and entry[0]() is None:
+                del _registry[key]
+
+    with _lock:
+        _registry[key] = (weakref.ref(df, _forget), fingerprint_id, _signature(df))
+    return df
+
+
+def register_file(df, path, operation: Optional[str] = None, **params):
+    """파일에서 로드한 DataFrame 등록 (로드 후 변환이 있으면 operation으로 구분)"""
+    file_id = file_fingerprint(path)
+    if operation is not None:
+        file_id = derived_fingerprint(file_id, operation, **params)
+    return register(df, file_id)
+
+
+def register_derived(df, parent, operation: str, **params):
+    """파생 DataFrame 등록 (부모 id + 연산 파라미터)"""
+    return register(df, derived_fingerprint(parent, operation, **params))
+
+
+def registered_fingerprint(df) -> Optional[str]:
+    """등록된 content id (없거나 구조 / 표본 행이 바뀌었으면 None)"""
+    with _lock:
+        entry = _registry.get(id(df))
+    if entry is None:
+        return None
+    ref, fingerprint_id, signature = entry
+    if ref() is not df or signature != _signature(df):
+        return None
+    return fingerprint_id
+
+
+def fingerprint(df) -> str:
+    """DataFrame content id - 등록된 id 우선, 없으면 내용 해시 후 등록"""
+    fingerprint_id = registered_fingerprint(df)
+    if fingerprint_id is None:
+        fingerprint_id = content_fingerprint(df)
+        register(df, fingerprint_id)
+    return fingerprint_id
@@ -0,0 +1,605 @@
+"""
+Golden Equivalence Module
+최적화된 분석 엔진과 기존(legacy) 구현의 출력을 나란히 실행하여 비교하는 harness
+
+최적화 과정에서 대시보드 숫자가 조용히 바뀌지 않도록, 아래 규칙을 담은 함수마다 원본 구현을 그대로
+보존하고 같은 입력에 대한 출력을 컬럼별 허용 오차 규칙으로 비교합니다.
+
+    - analyze_worker_activity: 1분 ≥3 signals = Active, ≥1 = Present, 1분 최빈 Building / Level / Space Type
+    - generate_integrated_journey_heatmap: Cluster 90% / 그 외 60% 확신 규칙, 검정 7분 / Cluster 5분 규칙
+    - calculate_t41_worker_stats_10min: 10분 signals >= 11 = Active
+    - unified_tward31_analysis 층 고정: MAC별 최빈 층 (동률이면 먼저 수신된 층)
+    - calculate_positions_by_timebin: time_bin별 S-Ward 평균 RSSI 위치, 빈 bin은 가까운 위치, 0.99 / 0.01 smoothing
+    - analyze_dwell_times: Active 1분 = 1분, Building / Building-Level / Cluster Space Type별 체류시간
+    - generate_journey_heatmap_from_cache: 작업자 × bin color_code (0~7 클램핑, 같은 bin은 마지막 레코드)
+
+    results = run_equivalence(fixtures)        # src.benchmark_suite.Fixtures 또는 CachedActivitySource
+    results['analyze_worker_activity']['first_divergence']
+    # {'key': {'mac': 'C0:06:...', 'minute_bin': 481}, 'column': 'activity_status', 'legacy': 'Active', ...}
+
+benchmark suite (python -m src.benchmark_suite)가 규모마다 실행하며, 불일치가 있으면 exit code 1입니다.
+legacy 구현은 MAC × 분 Python loop이므로 앞쪽 sample_macs개 MAC만 비교합니다.
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_MACS = 20
+
+STATUS_EQUAL = 'equal'
+STATUS_DIVERGED = 'diverged'
+STATUS_SKIPPED = 'skipped'
+STATUS_FAILED = 'failed'
+
+
+class MissingInput(LookupError):
+    """입력 데이터 소스에 해당 입력이 없음 (예: 캐시 데이터셋에는 raw 데이터가 없음)"""
+
+
+# ========== Legacy 구현 (최적화 이전 원본 로직) ==========
+
+def legacy_analyze_worker_activity(location_data: pd.DataFrame) -> pd.DataFrame:
+    """작업자 활동 상태 분석 - MAC / 1분 groupby + value_counts 원본 구현"""
+    location_data = location_data.copy()
+    location_data['minute_bin'] = ((location_data['time'] - location_data['time'].dt.normalize())
+                                   / pd.Timedelta(minutes=1)).astype(int) + 1
+
+    activity_results = []
+    for mac, mac_data in location_data.groupby('mac', observed=True):
+        mac_activity = {}
+        for minute_bin, minute_data in mac_data.groupby('minute_bin'):
+            building_counts = minute_data['building'].value_counts()
+            level_counts = minute_data['level'].value_counts()
+            space_type_counts = minute_data['space_type'].value_counts()
+            signal_count = len(minute_data)
+            if signal_count >= 3:
+                activity_status = 'Active'
+            elif signal_count >= 1:
+                activity_status = 'Present'
+            else:
+                activity_status = 'Absent'
+            mac_activity[minute_bin] = {
+                'building': building_counts.index[0] if not building_counts.empty else 'Unknown',
+                'level': level_counts.index[0] if not level_counts.empty else 'Unknown',
+                'space_type': space_type_counts.index[0] if not space_type_counts.empty else 'Unknown',
+                'signal_count': signal_count,
+                'activity_status': activity_status,
+            }
+        for minute_bin in range(1, 1441):
+            data = mac_activity.get(minute_bin)
+            if data is not None:
+                activity_results.append({'mac': mac, 'minute_bin': minute_bin, **data})
+            else:
+                activity_results.append({
+                    'mac': mac, 'minute_bin': minute_bin, 'building': None, 'level': None,
+                    'space_type': None, 'signal_count': 0, 'activity_status': 'Absent',
+                })
+    return pd.DataFrame(activity_results)
+
+
+def _legacy_minute_color(minute_data: pd.DataFrame, colors: Dict) -> int:
+    """1분 색상 - signal_count >= 3 활성 데이터의 최다 Building-Level (Cluster 90%, 그 외 60%)"""
+    if minute_data.empty:
+        return colors['no_signal']
+    if 'signal_count' in minute_data.columns:
+        active_rows = minute_data[minute_data['signal_count'] >= 3]
+    else:
+        active_rows = minute_data[minute_data['activity_status'] == 'Active']
+    if active_rows.empty:
+        return colors['present_inactive']
+
+    building_level_counts = {}
+    for _, data_row in active_rows.iterrows():
+        bl_key = f"{data_row.get('building', 'Unknown')}-{data_row.get('level', 'Unknown')}"
+        building_level_counts[bl_key] = building_level_counts.get(bl_key, 0) + 1
+    dominant_bl = max(building_level_counts, key=building_level_counts.get)
+    dominant_count = building_level_counts[dominant_bl]
+    total_count = sum(building_level_counts.values())
+    if 'Cluster' in dominant_bl:
+        return colors[dominant_bl] if dominant_count >= total_count * 0.9 else colors['present_inactive']
+    if dominant_bl in colors and dominant_count >= total_count * 0.6:
+        return colors[dominant_bl]
+    return colors['present_inactive']
+
+
+def legacy_integrated_journey_heatmap(data: pd.DataFrame, max_workers: int = 200) -> Optional[pd.DataFrame]:
+    """Journey Heatmap - 작업자 × bin × 1분 Python loop 원본 구현 → heatmap_df"""
+    from config import config as global_config
+    from src.tward_type41_journey_map import JOURNEY_COLORS as colors
+
+    if data is None or data.empty:
+        return None
+    active_data = data[data['activity_status'] == 'Active']
+    tward_activity_time = active_data.groupby('mac', observed=True)['minute_bin'].nunique().reset_index()
+    tward_activity_time.columns = ['mac', 'active_minutes']
+    tward_activity_time = tward_activity_time[tward_activity_time['active_minutes'] > 0]
+    tward_activity_time = tward_activity_time.sort_values('active_minutes', ascending=False).reset_index(drop=True)
+    if len(tward_activity_time) > max_workers:
+        tward_activity_time = tward_activity_time.head(max_workers)
+    if tward_activity_time.empty:
+        return None
+
+    unit_time_minutes = global_config.UNIT_TIME_MINUTES
+    num_bins = global_config.bins_per_day()
+    cluster_colors = {colors['Cluster-1F'], colors.get('Cluster-2F', -1), colors.get('Cluster-B1F', -1)}
+
+    rows = []
+    for _, row in tward_activity_time.iterrows():
+        mac_data = data[data['mac'] == row['mac']]
+        tward_row = []
+        for bin_idx in range(num_bins):
+            start_minute = bin_idx * unit_time_minutes
+            minute_colors = [
+                _legacy_minute_color(mac_data[mac_data['minute_bin'] == start_minute + offset], colors)
+                for offset in range(unit_time_minutes)
+            ]
+            color_counter = Counter(minute_colors)
+            if color_counter.get(colors['no_signal'], 0) >= 7:
+                final_color = colors['no_signal']
+            else:
+                non_inactive = {color: count for color, count in color_counter.items()
+                                if color not in (colors['no_signal'], colors['present_inactive'])}
+                if non_inactive:
+                    final_color = max(non_inactive, key=non_inactive.get)
+                    if final_color in cluster_colors and non_inactive[final_color] < 5:
+                        final_color = colors['present_inactive']
+                else:
+                    final_color = colors['present_inactive']
+            tward_row.append(final_color)
+        rows.append([row['mac'], int(row['active_minutes'])] + tward_row)
+
+    columns = ['MAC Address', 'Activity Time (min)'] + [f"T{i:03d}" for i in range(num_bins)]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def legacy_t41_worker_stats_10min(t41_data: pd.DataFrame) -> pd.DataFrame:
+    """T41 10분 작업자 수 - datetime floor / hour·minute 기반 원본 구현 (signals >= 11 = Active)"""
+    t41_copy = t41_data.copy()
+    t41_copy['time'] = pd.to_datetime(t41_copy['time'])
+    t41_copy['time_bin'] = (t41_copy['time'].dt.hour * 6 + t41_copy['time'].dt.minute // 10)
+
+    bin_signal = t41_copy.groupby(['mac', 'time_bin']).size().reset_index(name='signals')
+    bin_signal['is_active'] = bin_signal['signals'] >= 11
+    mac_bin_activity = bin_signal[['mac', 'time_bin', 'is_active']]
+
+    bin_total = bin_signal.groupby('time_bin')['mac'].nunique().reset_index()
+    bin_total.columns = ['Time Bin', 'Total']
+    bin_active = mac_bin_activity[mac_bin_activity['is_active']].groupby('time_bin')['mac'].nunique().reset_index()
+    bin_active.columns = ['Time Bin', 'Active']
+    bin_inactive = mac_bin_activity[~mac_bin_activity['is_active']].groupby('time_bin')['mac'].nunique().reset_index()
+    bin_inactive.columns = ['Time Bin', 'Inactive']
+
+    bin_stats = pd.DataFrame({'Time Bin': range(144)})
+    for frame in (bin_total, bin_active, bin_inactive):
+        bin_stats = bin_stats.merge(frame, on='Time Bin', how='left').fillna(0)
+    for col in ('Total', 'Active', 'Inactive'):
+        bin_stats[col] = bin_stats[col].astype(int)
+    bin_stats['Time Label'] = bin_stats['Time Bin'].apply(lambda x: f"{x // 6:02d}:{(x % 6) * 10:02d}")
+    bin_stats['Hour'] = bin_stats['Time Bin'] // 6
+    return bin_stats
+
+
+def legacy_floor_fix(df: pd.DataFrame) -> pd.DataFrame:
+    """T31 층 고정 - MAC별 value_counts().idxmax() 원본 구현 → [mac, fixed_level]"""
+    def get_most_frequent_level(x):
+        if len(x) == 0:
+            return None
+        value_counts = x.value_counts()
+        if len(value_counts) == 0:
+            return None
+        return value_counts.idxmax()
+
+    floor_fix = df.groupby('mac')['level'].agg(get_most_frequent_level).reset_index()
+    floor_fix.columns = ['mac', 'fixed_level']
+    return floor_fix.dropna(subset=['fixed_level'])
+
+
+def legacy_positions_by_timebin(location_data: pd.DataFrame, sward_config: pd.DataFrame) -> pd.DataFrame:
+    """T31 time_bin 위치 - MAC별 필터 + time_bin 1~144 loop 원본 구현 (st 디버그 출력 제외)"""
+    from src.tward_type31_location_operation import calculate_position_by_algorithm
+
+    sward_dict = {int(sward['sward_id']): {'x': sward['x'], 'y': sward['y'], 'building': sward['building'],
+                                           'level': sward['level']}
+                  for _, sward in sward_config.iterrows()}
+    position_results = []
+    for mac in location_data['mac'].unique():
+        mac_data = location_data[location_data['mac'] == mac]
+        most_common_sward = mac_data.groupby('sward_id').size().idxmax()
+        if most_common_sward in sward_dict:
+            fixed_building = sward_dict[most_common_sward]['building']
+            fixed_level = sward_dict[most_common_sward]['level']
+        else:
+            fixed_building, fixed_level = 'WWT', '1F'
+
+        calculated_positions = {}
+        for time_bin in range(1, 145):
+            time_data = mac_data[mac_data['time_bin'] == time_bin]
+            sward_data_list = []
+            for sward_id, sward_group in time_data.groupby('sward_id'):
+                if sward_id in sward_dict:
+                    avg_rssi = sward_group['rssi'].mean()
+                    if avg_rssi < 0:
+                        sward_data_list.append({'sward_id': sward_id, 'rssi': avg_rssi,
+                                                'x': sward_dict[sward_id]['x'], 'y': sward_dict[sward_id]['y']})
+            if sward_data_list:
+                x_pos, y_pos = calculate_position_by_algorithm(pd.DataFrame(sward_data_list))
+                if x_pos is not None and y_pos is not None:
+                    calculated_positions[time_bin] = (x_pos, y_pos)
+
+        # 신호 없는 bin: 가장 가까운 이전 위치 (없으면 이후 위치) → 이전 * 0.99 + 현재 * 0.01
+        calculated_time_bins = sorted(calculated_positions)
+        smoothed_positions = {}
+        prev_x, prev_y = None, None
+        if calculated_time_bins:
+            for time_bin in range(1, 145):
+                prev_time_bins = [t for t in calculated_time_bins if t <= time_bin]
+                current_x, current_y = calculated_positions[max(prev_time_bins) if prev_time_bins
+                                                            else calculated_time_bins[0]]
+                if prev_x is not None:
+                    current_x, current_y = prev_x * 0.99 + current_x * 0.01, prev_y * 0.99 + current_y * 0.01
+                smoothed_positions[time_bin] = (current_x, current_y)
+                prev_x, prev_y = current_x, current_y
+
+        for time_bin in range(1, 145):
+            is_active = time_bin in calculated_positions
+            x_pos, y_pos = smoothed_positions.get(time_bin, (None, None))
+            position_results.append({
+                'mac': mac, 'time_bin': time_bin, 'building': fixed_building, 'level': fixed_level,
+                'calculated_x': x_pos, 'calculated_y': y_pos, 'is_active': is_active,
+                'sward_count': len(calculated_positions) if is_active else 0,
+            })
+    return pd.DataFrame(position_results)
+
+
+def legacy_dwell_times(activity_analysis: pd.DataFrame) -> pd.DataFrame:
+    """체류시간 - MAC별 필터 + Active 행 iterrows 누적 원본 구현 → dwell_df"""
+    dwell_data = []
+    for mac in activity_analysis['mac'].unique():
+        mac_data = activity_analysis[activity_analysis['mac'] == mac]
+        occupied_data = mac_data[mac_data['activity_status'] == 'Active']
+        building_dwell, level_dwell, spacetype_dwell = {}, {}, {}
+        for _, row in occupied_data.iterrows():
+            building = row['building']
+            level = row['level']
+            space_type = row.get('space_type', 'Unknown')
+            if pd.notna(building) and str(building) != 'Unknown':
+                building_dwell[building] = building_dwell.get(building, 0) + 1
+            if pd.notna(building) and pd.notna(level) and str(building) != 'Unknown' and str(level) != 'Unknown':
+                level_key = f"{building}-{level}"
+                level_dwell[level_key] = level_dwell.get(level_key, 0) + 1
+            if pd.notna(space_type) and str(space_type) != 'Unknown' and building == 'Cluster':
+                spacetype_key = f"{building}-{space_type}"
+                spacetype_dwell[spacetype_key] = spacetype_dwell.get(spacetype_key, 0) + 1
+
+        for space_type, dwell in (('Building', building_dwell), ('Level', level_dwell),
+                                  ('Space_Type', spacetype_dwell)):
+            for space, minutes in dwell.items():
+                dwell_data.append({'mac': mac, 'space': space, 'space_type': space_type,
+                                   'dwell_minutes': minutes, 'dwell_hours': round(minutes / 60, 2)})
+    return pd.DataFrame(dwell_data, columns=['mac', 'space', 'space_type', 'dwell_minutes', 'dwell_hours'])
+
+
+def legacy_journey_matrix(filtered_data: pd.DataFrame, selected_macs: Sequence) -> np.ndarray:
+    """캐시 Journey Heatmap 매트릭스 - MAC별 필터 + iterrows 원본 구현 (작업자 × bin color_code)"""
+    max_bin = int(filtered_data['bin_index'].max()) if not filtered_data.empty else 287
+    num_bins = max_bin + 1
+    heatmap_matrix = []
+    for mac in selected_macs:
+        mac_data = filtered_data[filtered_data['mac'] == mac]
+        row = [0] * num_bins
+        for _, record in mac_data.iterrows():
+            bin_idx = int(record['bin_index'])
+            if 0 <= bin_idx < num_bins:
+                row[bin_idx] = min(max(int(record['color_code']), 0), 7)
+        heatmap_matrix.append(row)
+    return np.array(heatmap_matrix, dtype=np.int64).reshape(len(heatmap_matrix), num_bins)
+
+
+# ========== 출력 비교 ==========
+
+class ColumnRule(NamedTuple):
+    """컬럼 비교 규칙: exact (결측끼리는 같음) / abs (|a-b| <= tolerance) / rel (상대 오차)"""
+    kind: str = 'exact'
+    tolerance: float = 0.0
+
+
+EXACT = ColumnRule()
+
+
+def _normalize(frame: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """categorical / string dtype 차이를 제거 (값 비교는 object, 결측은 None)"""
+    out = pd.DataFrame(index=range(len(frame)))
+    for col in columns:
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(values):
+            values = values.astype(object).where(values.notna(), None)
+        out[col] = values.to_numpy()
+    return out
+
+
+def _to_json_value(value: Any) -> Any:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value if isinstance(value, (bool, int, float, str)) else str(value)
+
+
+def diff_frames(legacy: pd.DataFrame, optimized: pd.DataFrame, keys: Sequence[str],
+                rules: Optional[Dict[str, ColumnRule]] = None) -> Dict:
+    """key 기준 outer join → 컬럼별 규칙 비교 → 불일치 셀 수 / key 정렬 순서상 첫 불일치 셀"""
+    keys = list(keys)
+    rules = rules or {}
+    columns = [c for c in legacy.columns if c not in keys and c in optimized.columns]
+    merged = _normalize(legacy, keys + columns).merge(
+        _normalize(optimized, keys + columns), on=keys, how='outer', suffixes=('_legacy', '_optimized'),
+        indicator=True)
+    merged = merged.sort_values(keys, kind='stable', na_position='last').reset_index(drop=True)
+
+    mismatch_positions: Dict[str, np.ndarray] = {}
+    row_missing = (merged['_merge'] != 'both').to_numpy()
+    if row_missing.any():
+        mismatch_positions['(row)'] = np.flatnonzero(row_missing)
+
+    both = ~row_missing
+    for col in columns:
+        rule = rules.get(col, EXACT)
+        a, b = merged[f"{col}_legacy"], merged[f"{col}_optimized"]
+        if rule.kind == 'exact':
+            same = (a == b).fillna(False).to_numpy(dtype=bool) | (a.isna() & b.isna()).to_numpy()
+        else:
+            a_num, b_num = pd.to_numeric(a, errors='coerce'), pd.to_numeric(b, errors='coerce')
+            allowed = rule.tolerance
+            if rule.kind == 'rel':
+                allowed = rule.tolerance * np.maximum(a_num.abs(), b_num.abs())
+            same = ((a_num - b_num).abs() <= allowed).fillna(False).to_numpy() | (a.isna() & b.isna()).to_numpy()
+        bad = np.flatnonzero(both & ~same)
+        if len(bad):
+            mismatch_positions[col] = bad
+
+    result = {
+        'status': STATUS_EQUAL if not mismatch_positions else STATUS_DIVERGED,
+        'rows_legacy': len(legacy),
+        'rows_optimized': len(optimized),
+        'mismatched_cells': {col: int(len(pos)) for col, pos in mismatch_positions.items()},
+    }
+    if mismatch_positions:
+        column, positions = min(mismatch_positions.items(), key=lambda item: item[1][0])
+        row = merged.iloc[int(positions[0])]
+        divergence = {'key': {k: _to_json_value(row[k]) for k in keys}, 'column': column}
+        if column == '(row)':
+            divergence['missing_in'] = 'optimized' if row['_merge'] == 'left_only' else 'legacy'
+        else:
+            divergence['legacy'] = _to_json_value(row[f"{column}_legacy"])
+            divergence['optimized'] = _to_json_value(row[f"{column}_optimized"])
+        result['first_divergence'] = divergence
+    return result
+
+
+# ========== Equivalence checks ==========
+
+class EquivalenceCheck(NamedTuple):
+    name: str
+    rule: str                                                     # 보존해야 하는 규칙 설명
+    run: Callable[[Any, int], Tuple[pd.DataFrame, pd.DataFrame]]  # (source, sample_macs) → (legacy, optimized)
+    keys: Tuple[str, ...]
+    rules: Dict[str, ColumnRule] = {}
+
+
+EQUIVALENCE_CHECKS: Dict[str, EquivalenceCheck] = {}
+
+
+def equivalence_check(name: str, rule: str, keys: Sequence[str], rules: Optional[Dict[str, ColumnRule]] = None):
+    """equivalence check 등록 decorator (run(source, sample_macs) → (legacy, optimized))"""
+    def decorator(run):
+        EQUIVALENCE_CHECKS[name] = EquivalenceCheck(name, rule, run, tuple(keys), rules or {})
+        return run
+    return decorator
+
+
+def _input(source, name: str):
+    value = getattr(source, name, None)
+    if value is None or (isinstance(value, pd.DataFrame) and value.empty):
+        raise MissingInput(name)
+    return value
+
+
+def _sample(frame: pd.DataFrame, n: int, column: str = 'mac') -> pd.DataFrame:
+    macs = np.sort(frame[column].dropna().astype(str).unique())[:n]
+    return frame[frame[column].astype(str).isin(macs)]
+
+
+@equivalence_check('analyze_worker_activity', 'Active >= 3 signals/min, modal building/level/space per minute',
+                   keys=('mac', 'minute_bin'))
+def _check_worker_activity(source, sample_macs: int):
+    from src.tward_type41_operation import analyze_worker_activity
+    data = _sample(_input(source, 't41_with_space'), sample_macs)
+    legacy = legacy_analyze_worker_activity(data)
+    optimized = analyze_worker_activity(data.copy())
+    optimized = optimized.assign(mac=optimized['mac'].astype(str), minute_bin=optimized['minute_bin'].astype(int),
+                                 signal_count=optimized['signal_count'].astype(int))
+    return legacy.assign(mac=legacy['mac'].astype(str)), optimized
+
+
+def _heatmap_cells(heatmap_df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """heatmap_df (MAC × T### 컬럼) → (mac, bin, color) + 작업자 Activity Time (bin = -1)"""
+    if heatmap_df is None:
+        return pd.DataFrame(columns=['mac', 'bin', 'value'])
+    bins = [c for c in heatmap_df.columns if c.startswith('T') and c[1:].isdigit()]
+    cells = heatmap_df.melt(id_vars=['MAC Address'], value_vars=bins, var_name='bin', value_name='value')
+    cells['bin'] = cells['bin'].str[1:].astype(int)
+    activity = pd.DataFrame({'MAC Address': heatmap_df['MAC Address'], 'bin': -1,
+                             'value': heatmap_df['Activity Time (min)']})
+    cells = pd.concat([activity, cells], ignore_index=True).rename(columns={'MAC Address': 'mac'})
+    cells['mac'] = cells['mac'].astype(str)
+    cells['value'] = cells['value'].astype(int)
+    return cells
+
+
+@equivalence_check('generate_integrated_journey_heatmap', 'Cluster 90% / other 60% minute rule, 7-min black, 5-min Cluster',
+                   keys=('mac', 'bin'))
+def _check_journey_heatmap(source, sample_macs: int):
+    from src.tward_type41_journey_map import generate_integrated_journey_heatmap
+    data = _sample(_input(source, 'activity'), sample_macs)
+    optimized_fn = getattr(generate_integrated_journey_heatmap, '__wrapped__', generate_integrated_journey_heatmap)
+    optimized = optimized_fn(data, 'building_level', False, sample_macs)
+    legacy = legacy_integrated_journey_heatmap(data, sample_macs)
+    return _heatmap_cells(legacy), _heatmap_cells(optimized['heatmap_df'] if optimized else None)
+
+
+@equivalence_check('calculate_t41_worker_stats_10min', 'signals >= 11 per 10 min = Active', keys=('Time Bin',))
+def _check_t41_stats_10min(source, sample_macs: int):
+    from main import calculate_t41_worker_stats_10min
+    data = _input(source, 't41')
+    optimized_fn = getattr(calculate_t41_worker_stats_10min, '__wrapped__', calculate_t41_worker_stats_10min)
+    return legacy_t41_worker_stats_10min(data), optimized_fn(data)
+
+
+@equivalence_check('t31_floor_fix', 'T31 level fixed to modal level per MAC (first received on ties)', keys=('mac',))
+def _check_floor_fix(source, sample_macs: int):
+    from src.tward_type31_processing import modal_level_by_mac
+    t31 = _input(source, 't31')
+    df = t31.merge(_input(source, 'sward_config')[['sward_id', 'building', 'level']], on='sward_id', how='left')
+    modal = modal_level_by_mac(df)
+    optimized = pd.DataFrame({'mac': modal.index.astype(str), 'fixed_level': modal.to_numpy()})
+    legacy = legacy_floor_fix(df)
+    return legacy.assign(mac=legacy['mac'].astype(str)), optimized
+
+
+@equivalence_check('calculate_positions_by_timebin',
+                   'per time_bin mean RSSI position, nearest fill, 0.99 / 0.01 smoothing',
+                   keys=('mac', 'time_bin'),
+                   rules={'calculated_x': ColumnRule('rel', 1e-9), 'calculated_y': ColumnRule('rel', 1e-9)})
+def _check_positions_by_timebin(source, sample_macs: int):
+    from src.time_index import time_index_10s
+    from src.tward_type31_location_operation import calculate_positions_by_timebin
+    data = _sample(_input(source, 't31'), sample_macs).copy()
+    sward_config = _input(source, 'sward_config')
+    if 'time_bin' not in data.columns:
+        data['time_bin'] = (time_index_10s(data) - 1) // 60 + 1
+    # S-Ward 1개 bin은 반경 내 랜덤 위치 → 같은 seed, 같은 호출 순서
+    np.random.seed(0)
+    legacy = legacy_positions_by_timebin(data, sward_config)
+    np.random.seed(0)
+    optimized = calculate_positions_by_timebin(data.copy(), sward_config)
+    return legacy.assign(mac=legacy['mac'].astype(str)), optimized.assign(mac=optimized['mac'].astype(str))
+
+
+@equivalence_check('analyze_dwell_times', 'Active minute = 1 dwell minute per Building / Building-Level / Cluster space type',
+                   keys=('mac', 'space_type', 'space'))
+def _check_dwell_times(source, sample_macs: int):
+    from src.tward_type41_dwell_time import analyze_dwell_times
+    data = _sample(_input(source, 'activity'), sample_macs)
+    legacy = legacy_dwell_times(data)
+    optimized_fn = getattr(analyze_dwell_times, '__wrapped__', analyze_dwell_times)
+    result = optimized_fn(data.copy())
+    optimized = result['dwell_df'] if result else legacy.iloc[0:0]
+    return (legacy.assign(mac=legacy['mac'].astype(str), space=legacy['space'].astype(str)),
+            optimized.assign(mac=optimized['mac'].astype(str), space=optimized['space'].astype(str)))
+
+
+def _matrix_cells(matrix: np.ndarray, macs: Sequence) -> pd.DataFrame:
+    """작업자 × bin 매트릭스 → (row, mac, bin, value)"""
+    rows, bins = np.indices(matrix.shape)
+    return pd.DataFrame({'row': rows.ravel(), 'mac': np.asarray(macs, dtype=object).astype(str)[rows.ravel()],
+                         'bin': bins.ravel(), 'value': matrix.ravel().astype(np.int64)})
+
+
+@equivalence_check('generate_journey_heatmap_from_cache', 'cached color_code per worker × bin, clamped 0-7, last record wins',
+                   keys=('row', 'bin'))
+def _check_journey_from_cache(source, sample_macs: int):
+    from src.tward_type41_journey_map import generate_journey_heatmap_from_cache
+    data = _sample(_input(source, 'journey_data'), sample_macs)
+    optimized_fn = getattr(generate_journey_heatmap_from_cache, '__wrapped__', generate_journey_heatmap_from_cache)
+    optimized = optimized_fn(data, sample_macs, False)
+    macs = optimized['mac_order'] if optimized else []
+    legacy = legacy_journey_matrix(data[data['mac'].isin(macs)], macs)
+    return (_matrix_cells(legacy, macs),
+            _matrix_cells(optimized['heatmap_data'] if optimized else legacy, macs))
+
+
+def _split_for_append(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """하루 raw → (오전, 오후 + 늦게 도착한 오전 행 10%) - 증분 append 순서 재현"""
+    hours = data['time'].dt.hour
+    late = data[hours < 12].iloc[::10]
+    return data[hours < 12].drop(late.index), pd.concat([data[hours >= 12], late])
+
+
+@equivalence_check('incremental_worker_dwell', 'append state merge == full-day worker dwell (1-min bins, first/last, swards)',
+                   keys=('mac',), rules={'avg_rssi': ColumnRule('rel', 1e-9)})
+def _check_incremental_dwell(source, sample_macs: int):
+    from src.artifact_graph import build_worker_dwell
+    from src.incremental_append import build_state, merge_states, stats_from_state
+    data = _sample(_input(source, 't41'), sample_macs)
+    first, rest = _split_for_append(data)
+    merged = merge_states(build_state(first, 't41'), build_state(rest, 't41'))
+    return build_worker_dwell(data, {}), stats_from_state(merged, 't41')
+
+
+@equivalence_check('incremental_daily_summary', 'append state merge == full-day hourly unique / active (>= 11 per 10 min) / signals',
+                   keys=('hour',))
+def _check_incremental_summary(source, sample_macs: int):
+    from src.date_partitions import _hourly_from_raw
+    from src.incremental_append import build_state, merge_states, summary_rows
+    data = _sample(_input(source, 't41'), sample_macs)
+    first, rest = _split_for_append(data)
+    merged = merge_states(build_state(first, 't41'), build_state(rest, 't41'))
+    legacy, _ = _hourly_from_raw(data, 't41', '')
+    return legacy, summary_rows(merged, 't41', '')
+
+
+def run_equivalence(source, checks: Optional[Sequence[str]] = None, sample_macs: int = SAMPLE_MACS) -> Dict[str, Dict]:
+    """입력 소스에 대해 check 실행 → check별 결과 (status / mismatched_cells / first_divergence)"""
+    results = {}
+    for name in (checks or EQUIVALENCE_CHECKS):
+        check = EQUIVALENCE_CHECKS[name]
+        try:
+            legacy, optimized = check.run(source, sample_macs)
+            result = diff_frames(legacy, optimized, check.keys, check.rules)
+        except MissingInput as e:
+            result = {'status': STATUS_SKIPPED, 'error': f"input not available: {e}"}
+        except ModuleNotFoundError as e:
+            result = {'status': STATUS_SKIPPED, 'error': f"optional dependency missing: {e.name}"}
+        except Exception as e:
+            result = {'status': STATUS_FAILED, 'error': f"{type(e).__name__}: {e}"}
+        results[name] = {'rule': check.rule, **result}
+    return results
+
+
+def format_divergence(name: str, result: Dict) -> str:
+    """불일치 요약 1줄"""
+    first = result.get('first_divergence', {})
+    key = ', '.join(f"{k}={v}" for k, v in first.get('key', {}).items())
+    if first.get('column') == '(row)':
+        return f"{name}: row ({key}) missing in {first.get('missing_in')}"
+    return (f"{name}: first divergence at ({key}) column {first.get('column')!r} "
+            f"legacy={first.get('legacy')!r} optimized={first.get('optimized')!r} "
+            f"[{sum(result.get('mismatched_cells', {}).values())} cells]")
+
+
+# ========== 실제 데이터 소스 ==========
+
+class CachedActivitySource:
+    """사전 처리된 캐시 데이터셋의 실제 T41 활동 데이터 (raw 입력 check는 건너뜀)"""
+
+    def __init__(self, cache_folder):
+        self.cache_folder = cache_folder
+        self._activity: Optional[pd.DataFrame] = None
+        self._journey_data: Optional[pd.DataFrame] = None
+
+    @property
+    def activity(self) -> Optional[pd.DataFrame]:
+        if self._activity is None:
+            from src.cached_data_loader import CachedDataLoader
+            self._activity = CachedDataLoader(str(self.cache_folder)).load_t41_activity_analysis()
+        return self._activity
+
+    @property
+    def journey_data(self) -> Optional[pd.DataFrame]:
+        if self._journey_data is None:
+            from src.cached_data_loader import CachedDataLoader
+            self._journey_data = CachedDataLoader(str(self.cache_folder)).load_t41_journey_heatmap()
+        return self._journey_data
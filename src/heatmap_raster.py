@@ -0,0 +1,227 @@
+"""
+Heatmap Raster Module
+대형 색상 코드 히트맵(작업자 × 시간 bin)의 서버 측 PNG 렌더링
+
+Plotly go.Heatmap은 z 행렬 전체와 셀별 hover 정보를 JSON으로 브라우저에 보내므로
+500명 × 288 bin 규모에서는 rerun마다 수 MB가 전송됩니다.
+Raster 모드는 uint8 색상 코드 행렬을 COLOR_HEX_MAP palette PNG로 한 번 변환하여
+Plotly 배경 이미지로 표시하고, hover는 행 단위 요약(행 수만큼의 셀)만 보냅니다.
+
+    render_code_heatmap(z_data, y_labels, x_labels, title="...", key="t31_heatmap",
+                        interactive_figure=lambda: fig)
+
+PNG는 행렬 fingerprint(내용 해시) + 셀 크기 + 페이지 범위로 캐시되며,
+행이 MAX_ROWS_PER_PAGE를 넘으면 페이지 단위로 나누어 표시합니다.
+"""
+
+import base64
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import streamlit as st
+
+from src.colors import COLOR_HEX_MAP
+
+RASTER_MIN_CELLS = 20_000       # Auto 모드: 셀 수가 이 이상이면 raster
+MAX_ROWS_PER_PAGE = 250         # 페이지당 최대 행 수
+CELL_WIDTH_PX = 4               # 시간 bin 1개당 픽셀 폭
+PNG_CACHE_SIZE = 64
+
+RENDER_MODES = ("Auto", "Raster (fast)", "Interactive")
+
+PALETTE_RGB = np.array(
+    [[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in COLOR_HEX_MAP],
+    dtype=np.uint8
+)
+
+
+# ========== 색상 코드 행렬 ==========
+
+def to_code_matrix(z, max_code: Optional[int] = None) -> np.ndarray:
+    """z 행렬 → uint8 색상 코드 (NaN → 0, palette 범위로 클램핑)"""
+    max_code = len(COLOR_HEX_MAP) - 1 if max_code is None else max_code
+    values = np.nan_to_num(np.asarray(z, dtype=float), nan=0.0)
+    return np.clip(np.rint(values), 0, max_code).astype(np.uint8)
+
+
+def matrix_fingerprint(codes: np.ndarray) -> str:
+    codes = np.ascontiguousarray(codes)
+    return hashlib.sha1(str(codes.shape).encode() + codes.tobytes()).hexdigest()[:16]
+
+
+# ========== PNG 생성 (캐시) ==========
+
+_png_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_png_lock = threading.Lock()
+
+
+def _encode_png(codes: np.ndarray, cell_width: int, cell_height: int) -> bytes:
+    """palette(P 모드) PNG - 셀을 정수 배율로 확대하여 브라우저 보간 번짐 방지"""
+    from PIL import Image
+
+    pixels = np.repeat(np.repeat(codes, cell_height, axis=0), cell_width, axis=1)
+    image = Image.fromarray(np.ascontiguousarray(pixels), mode='P')
+    image.putpalette(PALETTE_RGB.flatten().tolist())
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=False, compress_level=6)
+    return buffer.getvalue()
+
+
+def raster_data_uri(codes: np.ndarray, cell_width: int = CELL_WIDTH_PX, cell_height: int = 12,
+                    fingerprint: Optional[str] = None) -> str:
+    """색상 코드 행렬 → PNG data URI (fingerprint 기준 LRU 캐시)"""
+    key = (fingerprint or matrix_fingerprint(codes), codes.shape, cell_width, cell_height)
+    with _png_lock:
+        if key in _png_cache:
+            _png_cache.move_to_end(key)
+            return _png_cache[key]
+
+    uri = "data:image/png;base64," + base64.b64encode(
+        _encode_png(codes, cell_width, cell_height)
+    ).decode('ascii')
+
+    with _png_lock:
+        _png_cache[key] = uri
+        while len(_png_cache) > PNG_CACHE_SIZE:
+            _png_cache.popitem(last=False)
+    return uri
+
+
+# ========== Plotly figure ==========
+
+def row_summaries(codes: np.ndarray, row_labels: Sequence[str], x_labels: Sequence[str],
+                  active_min_code: int = 2) -> List[str]:
+    """행 hover 텍스트: 라벨, active slot 수, 첫/마지막 active 시간"""
+    active = codes >= active_min_code
+    counts = active.sum(axis=1)
+    has_active = counts > 0
+    first = np.where(has_active, active.argmax(axis=1), -1)
+    last = np.where(has_active, codes.shape[1] - 1 - active[:, ::-1].argmax(axis=1), -1)
+
+    summaries = []
+    for label, count, start, end in zip(row_labels, counts, first, last):
+        if count > 0:
+            summaries.append(f"{label}<br>Active slots: {count}<br>First: {x_labels[start]} / Last: {x_labels[end]}")
+        else:
+            summaries.append(f"{label}<br>Active slots: 0")
+    return summaries
+
+
+def build_raster_figure(codes: np.ndarray, row_labels: Sequence[str], x_labels: Sequence[str],
+                        title: str, row_height_px: int = 12, min_height: int = 400,
+                        max_height: Optional[int] = None, xaxis_title: str = 'Time',
+                        yaxis_title: str = '', x_dtick: int = 6, fingerprint: Optional[str] = None):
+    """PNG 배경 이미지 + 행 단위 투명 hover layer로 구성한 Plotly figure
+
+    go.Heatmap과 같이 0번 행이 아래쪽에 표시됩니다.
+    """
+    import plotly.graph_objects as go
+
+    n_rows, n_cols = codes.shape
+    # 이미지 첫 픽셀 행 = 맨 위 = 마지막 행
+    image_uri = raster_data_uri(np.ascontiguousarray(codes[::-1]), CELL_WIDTH_PX, row_height_px,
+                                fingerprint=f"{fingerprint}:flip" if fingerprint else None)
+
+    hover_text = np.array(row_summaries(codes, row_labels, x_labels), dtype=object).reshape(n_rows, 1)
+    fig = go.Figure(go.Heatmap(
+        z=np.zeros((n_rows, 1)),
+        x0=(n_cols - 1) / 2, dx=n_cols,
+        y0=0, dy=1,
+        text=hover_text,
+        hovertemplate='%{text}<extra></extra>',
+        opacity=0,
+        showscale=False
+    ))
+    fig.add_layout_image(dict(
+        source=image_uri,
+        xref='x', yref='y',
+        x=-0.5, y=n_rows - 0.5,
+        sizex=n_cols, sizey=n_rows,
+        sizing='stretch', layer='below'
+    ))
+
+    label_step = max(1, n_rows // 30)
+    tick_rows = list(range(0, n_rows, label_step))
+    height = max(min_height, n_rows * row_height_px)
+    if max_height is not None:
+        height = min(max_height, height)
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        height=height,
+        plot_bgcolor=COLOR_HEX_MAP[0],
+        xaxis=dict(
+            range=[-0.5, n_cols - 0.5], tickangle=45, showgrid=False, zeroline=False,
+            tickvals=list(range(0, n_cols, x_dtick)),
+            ticktext=[x_labels[i] for i in range(0, n_cols, x_dtick)]
+        ),
+        yaxis=dict(
+            range=[-0.5, n_rows - 0.5], showgrid=False, zeroline=False,
+            tickvals=tick_rows, ticktext=[row_labels[i] for i in tick_rows]
+        )
+    )
+    return fig
+
+
+# ========== Streamlit 표시 ==========
+
+def _select_page(n_rows: int, key: str) -> Tuple[int, int]:
+    """행이 많으면 페이지 선택 (start, end)"""
+    if n_rows <= MAX_ROWS_PER_PAGE:
+        return 0, n_rows
+    n_pages = (n_rows + MAX_ROWS_PER_PAGE - 1) // MAX_ROWS_PER_PAGE
+    page = st.number_input(
+        f"Rows page (1-{n_pages}, {MAX_ROWS_PER_PAGE} rows each)",
+        min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page"
+    )
+    start = (int(page) - 1) * MAX_ROWS_PER_PAGE
+    return start, min(n_rows, start + MAX_ROWS_PER_PAGE)
+
+
+def render_code_heatmap(z, row_labels: Sequence[str], x_labels: Sequence[str], title: str, key: str,
+                        interactive_figure: Optional[Callable] = None, row_height_px: int = 12,
+                        min_height: int = 400, max_height: Optional[int] = None,
+                        xaxis_title: str = 'Time', yaxis_title: str = '', x_dtick: int = 6):
+    """색상 코드 히트맵 표시 (Auto / Raster / Interactive)
+
+    Args:
+        z: 행 × 시간 bin 색상 코드 (COLOR_HEX_MAP index)
+        interactive_figure: Interactive 모드에서 사용할 기존 go.Heatmap figure 생성 함수
+        key: 위젯 key prefix (화면마다 고유)
+    """
+    codes = to_code_matrix(z)
+    n_rows, n_cols = codes.shape if codes.ndim == 2 else (0, 0)
+
+    modes = RENDER_MODES if interactive_figure is not None else RENDER_MODES[:2]
+    mode = st.radio("Rendering", modes, horizontal=True, key=f"{key}_render_mode",
+                    help="Raster: server-side PNG (fast for large heatmaps). Interactive: per-cell Plotly heatmap.")
+    use_raster = (
+        interactive_figure is None
+        or mode == "Raster (fast)"
+        or (mode == "Auto" and n_rows * n_cols >= RASTER_MIN_CELLS)
+    )
+
+    if not use_raster:
+        st.plotly_chart(interactive_figure(), use_container_width=True)
+        return
+
+    if n_rows == 0:
+        st.info("No heatmap rows to display.")
+        return
+
+    start, end = _select_page(n_rows, key)
+    page_codes = codes[start:end]
+    page_title = title if (start, end) == (0, n_rows) else f"{title} - rows {start + 1}-{end} of {n_rows}"
+    fig = build_raster_figure(
+        page_codes, list(row_labels[start:end]), list(x_labels), page_title,
+        row_height_px=row_height_px, min_height=min_height, max_height=max_height,
+        xaxis_title=xaxis_title, yaxis_title=yaxis_title, x_dtick=x_dtick,
+        fingerprint=matrix_fingerprint(page_codes)
+    )
+    st.plotly_chart(fig, use_container_width=True, key=f"{key}_raster")
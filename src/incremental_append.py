@@ -0,0 +1,595 @@
+"""
+Incremental Append Module
+일자 파티션 증분 추가 - 새 raw 파일 / 시간대만 반영하고 영향받는 시간대와 그 파생 집계만 다시 계산
+
+date_partitions.ingest_raw는 일자 × stream raw를 한 번에 씁니다 (이미 있으면 건너뜀, --replace는 교체 후
+파생 artifact / 일자 요약을 모두 삭제). append는 같은 파티션에 새 행을 더하고, 합칠 수 있는(mergeable)
+상태만 갱신합니다.
+
+    <site>_<YYYYMMDD>/cache/
+    ├── raw_t41.parquet                    # 기존 행 + 새 행 (하루 단위 분석 / compute-on-miss 입력)
+    ├── append_state_t41_macs.parquet      # MAC별 first/last_seen (min/max), record_count / rssi_sum (합),
+    │                                      #   S-Ward 목록 (합집합), 1분 bitmap 1440 bit (OR) → 체류 시간 / 시간대 고유 MAC
+    ├── append_state_t41_hourly.parquet    # 시간대별 신호 수 (합)
+    ├── append_state_t41_bins.parquet      # T41 MAC × 10분 bin 신호 수 (합) → 활성 작업자 (≥11)
+    └── metadata.json                      # watermarks[stream]: max_time / rows / 갱신 시간대 / 파일별 offset
+
+새 행이 들어온 stream에 대해
+    - 상태에서 바로: daily_summary (바뀐 시간대 + 하루 전체 행만 교체), daily_summary_macs,
+      t41_results_worker_dwell / t31_results_device_stats / flow_results_device_stats (MAC별 누적)
+    - 시간대 단위 파생 artifact (1분 / 2분 / 10분 / 시간대 고유 수, 시간대 평균 등):
+      새 행이 있는 시간대만 다시 계산해 기존 표에 끼워 넣음
+    - 시간대로 나눌 수 없는 파생 artifact: 삭제 (다음 사용 시 artifact_graph가 계산)
+site rollup (date_partitions.update_site_rollups)은 바뀐 일자의 요약만 다시 읽고, 그 일자가 속한 주 / 월의
+고유 MAC 수만 다시 합칩니다.
+
+파일별 watermark (절대 경로 → size / mtime / 파티션에 반영된 행 수):
+    - 처음 보는 파일: 모든 행 (이전 시간대에 늦게 도착한 행도 상태가 합산 가능하므로 그대로 반영)
+    - 커진 파일 (계속 기록 중인 raw): 이미 반영된 행 수 이후의 행만 (append-only 파일 가정)
+    - 바뀌지 않은 파일: 읽지 않음 (같은 파일을 다시 append해도 중복되지 않음)
+
+    python -m src.incremental_append T41_20250910_13.csv --site Yongin_Cluster --rollup
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.artifact_graph import ARTIFACT_GRAPH, update_metadata, write_parquet_atomic
+from src.dataset_catalog import default_base_path, refresh_dataset
+from src.date_partitions import (DAY_TOTAL_HOUR, DEFAULT_SWARD_CONFIG, DISTINCT_STREAMS, STATUS_FAILED,
+                                 STREAM_ARTIFACTS, SUMMARY_ARTIFACT, SUMMARY_COLUMNS,
+                                 SUMMARY_MACS_ARTIFACT, T41_ACTIVE_SIGNALS_10MIN, _source_stamps,
+                                 collect_raw_files, derived_from, ensure_partition, partition_name,
+                                 read_raw_file, rollup_folder, update_site_rollups)
+from src.time_index import add_time_columns, has_time_columns, minute_of_day
+from src.tracing import get_logger
+
+log = get_logger(__name__)
+
+STATE_BUILDER = 'incremental_append'
+MINUTES_PER_DAY = 1440
+BITMAP_BYTES = MINUTES_PER_DAY // 8
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.int64)
+
+# 상태에서 바로 쓰는 MAC별 집계 artifact (artifact_graph recipe와 같은 스키마)
+STAT_ARTIFACTS = {
+    't41': 't41_results_worker_dwell.parquet',
+    't31': 't31_results_device_stats.parquet',
+    'flow': 'flow_results_device_stats.parquet',
+}
+
+# 출력 행이 시간대 1개에 속하고 그 시간대 입력만으로 계산되는 builder → 바뀐 시간대만 다시 계산
+HOUR_LOCAL_BUILDERS = {
+    'build_one_min_unique_mac', 'build_two_min_unique_mac', 'build_flow_ten_min_unique',
+    'build_flow_unit_time_unique', 'build_flow_hourly_flow', 'build_t31_hourly_activity',
+    'build_t41_hourly_avg_from_1min', 'build_t41_hourly_avg_from_2min', 'build_flow_hourly_avg_from_2min',
+    'build_flow_hourly_devices', 'build_flow_hourly_devices_from_raw',
+}
+BIN_COLUMNS = ('one_min_bin', 'two_min_bin', 'ten_min_bin', 'unit_time_bin')
+
+STATUS_APPENDED = 'appended'
+STATUS_UNCHANGED = 'unchanged'
+
+
+def state_files(stream: str) -> Dict[str, str]:
+    """stream 상태 artifact (part → 파일명)"""
+    files = {
+        'macs': f"append_state_{stream}_macs.parquet",
+        'hourly': f"append_state_{stream}_hourly.parquet",
+    }
+    if stream == 't41':
+        files['bins'] = 'append_state_t41_bins.parquet'
+    return files
+
+
+# ========== 합칠 수 있는 상태 ==========
+
+def _pack_minutes(codes: np.ndarray, minutes: np.ndarray, n: int) -> np.ndarray:
+    """(MAC 코드, 분) → MAC별 1분 bitmap (n × 180 uint8, bit = 그 분에 신호 있음)"""
+    pairs = np.unique(codes.astype(np.int64) * MINUTES_PER_DAY + minutes)
+    codes, minutes = pairs // MINUTES_PER_DAY, pairs % MINUTES_PER_DAY
+    # 중복 없는 (MAC, 분)의 bit 값 합 = OR
+    flat = np.bincount(codes * BITMAP_BYTES + (minutes >> 3), weights=(128 >> (minutes & 7)),
+                       minlength=n * BITMAP_BYTES)
+    return flat.astype(np.uint8).reshape(n, BITMAP_BYTES)
+
+
+def _bitmaps(macs: pd.DataFrame) -> np.ndarray:
+    return np.frombuffer(b''.join(macs['minutes']), dtype=np.uint8).reshape(-1, BITMAP_BYTES)
+
+
+def _group_lists(codes: np.ndarray, values: np.ndarray, n: int) -> List[List[int]]:
+    """코드별 고유 값 목록 (모든 코드 0..n-1이 1번 이상 나온다고 가정)"""
+    if n == 0:
+        return []
+    pairs = pd.DataFrame({'code': codes, 'value': values}).drop_duplicates().sort_values(['code', 'value'])
+    splits = np.flatnonzero(np.diff(pairs['code'].to_numpy())) + 1
+    return [chunk.tolist() for chunk in np.split(pairs['value'].to_numpy(), splits)]
+
+
+def _mac_state(macs: np.ndarray, per_mac: pd.DataFrame, swards: List, packed: np.ndarray) -> pd.DataFrame:
+    state = pd.DataFrame({
+        'mac': macs.astype(str),
+        'first_seen': per_mac['first_seen'].to_numpy(),
+        'last_seen': per_mac['last_seen'].to_numpy(),
+        'record_count': per_mac['record_count'].to_numpy(dtype=np.int64),
+        'rssi_sum': per_mac['rssi_sum'].to_numpy(dtype=np.float64),
+    })
+    state['swards'] = swards
+    state['minutes'] = [row.tobytes() for row in packed]
+    state['dwell_minutes'] = POPCOUNT[packed].sum(axis=1) if len(packed) else np.zeros(0, dtype=np.int64)
+    return state
+
+
+def build_state(rows: pd.DataFrame, stream: str) -> Dict[str, pd.DataFrame]:
+    """raw 행 → 상태 (MAC별 누적 / 시간대 신호 수 / T41 10분 bin 신호 수)"""
+    minutes = minute_of_day(rows)
+    valid = minutes >= 0
+    rows, minutes = rows.loc[valid], minutes[valid].astype(np.int64)
+    codes, macs = pd.factorize(rows['mac'].astype(str).to_numpy())
+    per_mac = pd.DataFrame({
+        'code': codes,
+        'time': rows['time'].to_numpy(),
+        'rssi': rows['rssi'].to_numpy(dtype=np.float64),
+    }).groupby('code').agg(first_seen=('time', 'min'), last_seen=('time', 'max'),
+                           record_count=('time', 'size'), rssi_sum=('rssi', 'sum'))
+    swards = _group_lists(codes, rows['sward_id'].to_numpy(), len(macs))
+    state = {
+        'macs': _mac_state(np.asarray(macs), per_mac, swards, _pack_minutes(codes, minutes, len(macs))),
+        'hourly': pd.DataFrame({'hour': minutes // 60}).groupby('hour').size().reset_index(name='signals'),
+    }
+    if stream == 't41':
+        bins = pd.DataFrame({'mac': np.asarray(macs)[codes].astype(str), 'bin': minutes // 10})
+        state['bins'] = bins.groupby(['mac', 'bin']).size().reset_index(name='signals')
+    return state
+
+
+def merge_states(old: Dict[str, pd.DataFrame], new: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """상태 2개 합치기: 합 (신호 / 레코드 수), min / max (첫 / 마지막 수신), 합집합 (S-Ward, 1분 bitmap)
+
+    기존 MAC 순서를 유지하고 새 MAC은 뒤에 붙습니다. 새 상태에 있는 MAC 행만 다시 계산하므로
+    비용은 기존 MAC 수가 아니라 새 행 / 새 행의 MAC 수에 비례합니다 (컬럼 복사 제외).
+    """
+    added = new['macs']
+    position = pd.Index(old['macs']['mac']).get_indexer(added['mac'])
+    known = position >= 0
+    macs = pd.concat([old['macs'], added[~known]], ignore_index=True)
+    rows, updates = position[known], added[known]
+
+    if len(rows):
+        for col, combine in (('first_seen', np.minimum), ('last_seen', np.maximum),
+                             ('record_count', np.add), ('rssi_sum', np.add)):
+            values = macs[col].to_numpy().copy()
+            values[rows] = combine(values[rows], updates[col].to_numpy())
+            macs[col] = values
+        packed = _bitmaps(macs.iloc[rows]) | _bitmaps(updates)
+        minutes, swards, dwell = macs['minutes'].tolist(), macs['swards'].tolist(), macs['dwell_minutes'].to_numpy().copy()
+        for row, bitmap, new_swards in zip(rows, packed, updates['swards']):
+            minutes[row] = bitmap.tobytes()
+            swards[row] = np.union1d(np.asarray(swards[row], dtype=np.int64), np.asarray(new_swards, dtype=np.int64))
+        dwell[rows] = POPCOUNT[packed].sum(axis=1)
+        macs['minutes'], macs['swards'], macs['dwell_minutes'] = minutes, swards, dwell
+
+    merged = {
+        'macs': macs,
+        'hourly': pd.concat([old['hourly'], new['hourly']], ignore_index=True)
+        .groupby('hour', as_index=False)['signals'].sum(),
+    }
+    if 'bins' in old or 'bins' in new:
+        merged['bins'] = pd.concat([old.get('bins'), new.get('bins')], ignore_index=True) \
+            .groupby(['mac', 'bin'], as_index=False)['signals'].sum()
+    return merged
+
+
+def load_state(cache_folder: Path, stream: str) -> Optional[Dict[str, pd.DataFrame]]:
+    """저장된 stream 상태 (일부라도 없으면 None)"""
+    files = state_files(stream)
+    if not all((cache_folder / filename).exists() for filename in files.values()):
+        return None
+    return {part: pd.read_parquet(cache_folder / filename) for part, filename in files.items()}
+
+
+def save_state(cache_folder: Path, stream: str, state: Dict[str, pd.DataFrame]) -> List[str]:
+    saved = []
+    for part, filename in state_files(stream).items():
+        write_parquet_atomic(state[part], cache_folder / filename)
+        saved.append(filename)
+    return saved
+
+
+# ========== 상태 → 집계 ==========
+
+def _hour_presence(packed: np.ndarray, hours: Iterable[int]) -> Dict[int, int]:
+    """1분 bitmap → 시간대별 고유 MAC 수 (시간대에 걸친 byte만 풀어서 계산)"""
+    counts = {}
+    for hour in hours:
+        first = hour * 60
+        start = first // 8
+        bits = np.unpackbits(packed[:, start:(first + 59) // 8 + 1], axis=1)
+        counts[hour] = int(bits[:, first - start * 8:first - start * 8 + 60].any(axis=1).sum())
+    return counts
+
+
+def summary_rows(state: Dict[str, pd.DataFrame], stream: str, date: str,
+                 hours: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """상태 → daily_summary 행 (_hourly_from_raw와 같은 값, hours가 있으면 그 시간대 + 하루 전체 행만)"""
+    hourly = state['hourly'][state['hourly']['signals'] > 0]
+    day_total = {'hour': DAY_TOTAL_HOUR, 'unique_macs': len(state['macs']),
+                 'signals': int(hourly['signals'].sum()), 'active_macs': np.nan}
+    if hours is not None:
+        hourly = hourly[hourly['hour'].isin(list(hours))]
+    hour_index = hourly['hour'].to_numpy(dtype=np.int64)
+    presence = _hour_presence(_bitmaps(state['macs']), hour_index)
+    rows = pd.DataFrame({
+        'hour': hour_index,
+        'unique_macs': np.array([presence[hour] for hour in hour_index], dtype=np.int64),
+        'signals': hourly['signals'].to_numpy(dtype=np.int64),
+        'active_macs': np.nan,
+    })
+    if stream == 't41':
+        bins = state['bins']
+        active = bins[bins['signals'] >= T41_ACTIVE_SIGNALS_10MIN]
+        per_hour = active.groupby(active['bin'] // 6)['mac'].nunique()
+        rows['active_macs'] = per_hour.reindex(hour_index).fillna(0).to_numpy(dtype=np.float64)
+        day_total['active_macs'] = active['mac'].nunique()
+    rows = pd.concat([rows, pd.DataFrame([day_total])], ignore_index=True)
+    rows.insert(0, 'stream', stream)
+    rows.insert(0, 'date', date)
+    return rows[SUMMARY_COLUMNS]
+
+
+def stats_from_state(state: Dict[str, pd.DataFrame], stream: str) -> pd.DataFrame:
+    """상태 → MAC별 통계 (T41: worker_dwell 스키마, T31 / Flow: device_stats 스키마)"""
+    macs = state['macs'].sort_values('mac').reset_index(drop=True)
+    stats = pd.DataFrame({
+        'mac': macs['mac'].astype(str),
+        'first_seen': macs['first_seen'],
+        'last_seen': macs['last_seen'],
+        'record_count': macs['record_count'].astype(np.int64),
+        'sward_count': macs['swards'].map(len).astype(np.int64),
+        'avg_rssi': macs['rssi_sum'] / macs['record_count'],
+    })
+    if stream == 't41':
+        stats.insert(1, 'dwell_time_minutes', macs['dwell_minutes'].astype(np.int64))
+    else:
+        stats['duration_minutes'] = (stats['last_seen'] - stats['first_seen']).dt.total_seconds() / 60
+    return stats
+
+
+# ========== 시간대 단위 파생 artifact ==========
+
+def _hours_of(frame: pd.DataFrame) -> Optional[np.ndarray]:
+    if 'hour' in frame.columns:
+        return frame['hour'].to_numpy()
+    for col in BIN_COLUMNS:
+        if col in frame.columns:
+            return pd.to_datetime(frame[col]).dt.hour.to_numpy()
+    return None
+
+
+def _is_hour_local(builder: str, config: Dict) -> bool:
+    if builder == 'build_flow_unit_time_unique':
+        return 60 % int(config.get('unit_time_minutes', 5)) == 0
+    return builder in HOUR_LOCAL_BUILDERS
+
+
+def refresh_derived(cache_folder: Path, derived: Dict[str, Dict], artifact: str, raw_hours: pd.DataFrame,
+                    hours: List[int], config: Dict, rewritten: Iterable[str] = ()) -> Tuple[List[str], List[str]]:
+    """append한 raw에서 파생된 artifact 갱신 → (시간대만 다시 계산한 artifact, 삭제할 artifact)
+
+    raw_hours: 바뀐 시간대의 raw 전체 (기존 행 + 새 행). 입력이 먼저 오는 순서로 처리하므로
+    2단계 artifact (1분 고유 수 → 시간대 평균)도 다시 계산된 시간대 조각에서 만듭니다.
+    rewritten: 상태에서 다시 쓰는 artifact (건너뜀)
+    """
+    inputs = {artifact: raw_hours}
+    rewritten = set(rewritten)
+    spliced, stale = [], []
+    for name in derived_from(derived, artifact):
+        info = derived[name]
+        if name in rewritten or info.get('builder') == STATE_BUILDER:
+            continue
+        recipe = next((r for r in ARTIFACT_GRAPH.get(name, []) if r.name == info.get('builder')), None)
+        path = cache_folder / name
+        if (recipe is None or not _is_hour_local(recipe.name, config) or not path.exists()
+                or not all(source in inputs for source in recipe.inputs)):
+            stale.append(name)
+            continue
+        try:
+            part = recipe.build(*[inputs[source] for source in recipe.inputs], config)
+            existing = pd.read_parquet(path)
+            existing_hours = _hours_of(existing)
+            if existing_hours is None:
+                raise ValueError("no hour / bin column")
+            frames = [frame for frame in (existing[~np.isin(existing_hours, hours)], part) if len(frame)]
+            result = pd.concat(frames, ignore_index=True) if frames else part
+            order = [col for col in ('date', 'hour') + BIN_COLUMNS if col in result.columns]
+            result = result.sort_values(order, kind='stable').reset_index(drop=True)
+            write_parquet_atomic(result, path)
+        except Exception as e:
+            log.warning(f"⚠️ Could not splice {name}: {e}", exc_info=True)
+            stale.append(name)
+            continue
+        inputs[name] = part
+        spliced.append(name)
+    return spliced, stale
+
+
+# ========== 파티션 append ==========
+
+def _read_metadata(cache_folder: Path) -> Dict:
+    try:
+        with open(cache_folder / 'metadata.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _summary_is_current(cache_folder: Path, metadata: Dict) -> bool:
+    return ((cache_folder / SUMMARY_ARTIFACT).exists()
+            and metadata.get('daily_summary', {}).get('sources') == _source_stamps(cache_folder))
+
+
+def append_partition(base_path: Path, site: str, day: pd.Timestamp, stream: str, rows: pd.DataFrame,
+                     files: Dict[str, Dict], sward_config: Optional[pd.DataFrame] = None) -> Dict:
+    """일자 1개 × stream 1개에 새 raw 행 추가 → 상태 합치기 → 바뀐 시간대 / 파생 집계만 갱신
+
+    files: 새 행을 가져온 raw 파일별 watermark ({절대 경로: {size, mtime, rows}}, rows = 이번에 더한 행 수)
+    """
+    started = time.perf_counter()
+    name = partition_name(site, day)
+    entry = {'partition': name, 'stream': stream, 'rows': len(rows)}
+    try:
+        cache_folder = Path(base_path) / name / 'cache'
+        artifact = STREAM_ARTIFACTS[stream]
+        raw_path = cache_folder / artifact
+        if not raw_path.exists() and _read_metadata(cache_folder).get(f"{stream}_records", 0):
+            raise ValueError(f"precomputed cache without {artifact} - use date_partitions ingest --replace")
+        ensure_partition(base_path, site, day, sward_config)
+        metadata = _read_metadata(cache_folder)
+        summary_current = _summary_is_current(cache_folder, metadata)
+
+        # raw: 기존 행 + 새 행 (시간순)
+        existing = pd.read_parquet(raw_path) if raw_path.exists() else None
+        if existing is not None and not has_time_columns(existing):
+            add_time_columns(existing)
+        rows = rows[existing.columns] if existing is not None else rows
+        rows = rows.sort_values('time', kind='stable')
+        merged = pd.concat([existing, rows], ignore_index=True) if existing is not None else rows
+        if existing is not None and len(existing) and rows['time'].min() < existing['time'].max():
+            merged = merged.sort_values('time', kind='stable')     # 늦게 도착한 행이 있을 때만 전체 정렬
+        merged = merged.reset_index(drop=True)
+        write_parquet_atomic(merged, raw_path)
+        previous_max = existing['time'].max() if existing is not None and len(existing) else None
+        time_range = [merged['time'].min().isoformat(), merged['time'].max().isoformat()]
+
+        # 상태: 저장된 상태가 기존 raw와 맞으면 새 행만 합치고, 없거나 어긋나면 전체 raw에서 다시 만듦
+        state = load_state(cache_folder, stream)
+        existing_rows = int((minute_of_day(existing) >= 0).sum()) if existing is not None else 0
+        if state is not None and int(state['macs']['record_count'].sum()) == existing_rows:
+            state = merge_states(state, build_state(rows, stream))
+            entry['state'] = 'merged'
+        else:
+            state = build_state(merged, stream)
+            entry['state'] = 'rebuilt'
+        saved = save_state(cache_folder, stream, state)
+        stats_artifact = STAT_ARTIFACTS[stream]
+        write_parquet_atomic(stats_from_state(state, stream), cache_folder / stats_artifact)
+        saved.append(stats_artifact)
+
+        new_minutes = minute_of_day(rows)
+        hours = sorted(int(h) for h in np.unique(new_minutes[new_minutes >= 0] // 60))
+        merged_hours = merged[np.isin(minute_of_day(merged) // 60, hours)]
+        spliced, stale = refresh_derived(cache_folder, metadata.get('derived_artifacts', {}), artifact,
+                                         merged_hours, hours, metadata.get('config', {}), saved)
+        del merged, merged_hours, existing
+
+        # 일자 요약: append 전 요약이 최신이면 바뀐 시간대 + 하루 전체 행만 교체, 아니면 삭제 (rollup이 다시 계산)
+        date = f"{pd.Timestamp(day):%Y-%m-%d}"
+        summary_saved = False
+        if summary_current:
+            summary = pd.read_parquet(cache_folder / SUMMARY_ARTIFACT)
+            had_stream = bool((summary['stream'] == stream).any())
+            replaced = (summary['stream'] == stream) & (summary['hour'].isin(hours + [DAY_TOTAL_HOUR])
+                                                        if had_stream else True)
+            summary = pd.concat([summary[~replaced], summary_rows(state, stream, date, hours if had_stream else None)],
+                                ignore_index=True).sort_values(['stream', 'hour'], kind='stable')
+            write_parquet_atomic(summary.reset_index(drop=True), cache_folder / SUMMARY_ARTIFACT)
+            if stream in DISTINCT_STREAMS:
+                macs_path = cache_folder / SUMMARY_MACS_ARTIFACT
+                macs = pd.read_parquet(macs_path) if macs_path.exists() else pd.DataFrame(columns=['stream', 'mac'])
+                macs = pd.concat([macs[macs['stream'] != stream],
+                                  pd.DataFrame({'stream': stream, 'mac': state['macs']['mac'].to_numpy()})],
+                                 ignore_index=True)
+                write_parquet_atomic(macs, macs_path)
+            summary_saved = True
+        else:
+            stale.extend(name for name in (SUMMARY_ARTIFACT, SUMMARY_MACS_ARTIFACT)
+                         if (cache_folder / name).exists())
+        stamps = _source_stamps(cache_folder)
+
+        late_rows = int((rows['time'] <= previous_max).sum()) if previous_max is not None else 0
+        record_count = int(state['macs']['record_count'].sum())
+        now = datetime.now().isoformat()
+
+        def update(metadata):
+            saved_files = metadata.setdefault('saved_files', [])
+            for filename in [artifact] + saved:
+                if filename not in saved_files:
+                    saved_files.append(filename)
+            metadata['saved_files'] = [f for f in saved_files if f not in stale]
+            metadata[f"{stream}_records"] = record_count
+            metadata['updated_at'] = now
+            derived = metadata.setdefault('derived_artifacts', {})
+            for filename in stale:
+                derived.pop(filename, None)
+            for filename in saved:
+                derived[filename] = {'inputs': [artifact], 'builder': STATE_BUILDER, 'created_at': now}
+            for filename in spliced:
+                derived[filename]['updated_at'] = now
+                derived[filename]['updated_hours'] = hours
+            if summary_saved:
+                summary_info = metadata.setdefault('daily_summary', {})
+                summary_info.update(sources=stamps, updated_at=now, has_macs=(
+                    summary_info.get('has_macs', False) or stream in DISTINCT_STREAMS))
+            else:
+                metadata.pop('daily_summary', None)
+
+            # watermark: 반영된 시각 범위 / 행 수 / 이번 append의 시간대 / 늦게 도착한 행 (이전 최대 시각 이전)
+            watermark = metadata.setdefault('watermarks', {}).setdefault(stream, {'appends': 0, 'files': {}})
+            watermark.update(
+                min_time=time_range[0],
+                max_time=time_range[1],
+                rows=record_count,
+                appended_rows=len(rows),
+                late_rows=late_rows,
+                updated_hours=hours,
+                appends=watermark.get('appends', 0) + 1,
+                updated_at=now,
+            )
+            for path, info in files.items():
+                recorded = watermark['files'].get(path, {})
+                watermark['files'][path] = {**info, 'rows': recorded.get('rows', 0) + info['rows']}
+        update_metadata(cache_folder, update)
+        for filename in stale:
+            try:
+                (cache_folder / filename).unlink()
+            except OSError:
+                pass
+        entry.update(status=STATUS_APPENDED, hours=hours, spliced=spliced, stale=stale, state_rows=record_count)
+    except Exception as e:
+        entry.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}",
+                     traceback=traceback.format_exc(limit=5))
+    entry['seconds'] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+# ========== raw 파일 → 파티션별 새 행 ==========
+
+def _file_watermarks(base_path: Path, site: str, stream: str) -> Dict[str, Dict[str, Dict]]:
+    """site 파티션의 파일별 watermark (일자 YYYYMMDD → {절대 경로: {size, mtime, rows}})"""
+    watermarks = {}
+    for metadata_path in base_path.glob(f"{site}_*/cache/metadata.json"):
+        metadata = _read_metadata(metadata_path.parent)
+        day = metadata.get('partition', {}).get('day')
+        if day:
+            watermarks[day] = metadata.get('watermarks', {}).get(stream, {}).get('files', {})
+    return watermarks
+
+
+def pending_rows(files: List[Path], site: str, base_path: Path,
+                 stream: str) -> Dict[pd.Timestamp, Tuple[pd.DataFrame, Dict[str, Dict]]]:
+    """raw 파일 → 아직 반영되지 않은 행 (일자 → (행, 파일별 watermark))"""
+    watermarks = _file_watermarks(base_path, site, stream)
+    latest = {}
+    for files_seen in watermarks.values():
+        for path, info in files_seen.items():
+            if info.get('mtime', 0) >= latest.get(path, {}).get('mtime', -1):
+                latest[path] = info
+
+    pending: Dict[pd.Timestamp, Tuple[List[pd.DataFrame], Dict[str, Dict]]] = {}
+    for path in files:
+        key = str(path.resolve())
+        stat = path.stat()
+        info = {'size': stat.st_size, 'mtime': stat.st_mtime}
+        recorded = latest.get(key)
+        if recorded and recorded.get('size') == info['size'] and recorded.get('mtime') == info['mtime']:
+            continue
+        frame = read_raw_file(path)
+        add_time_columns(frame)
+        for day, day_rows in frame.groupby('day', sort=True):
+            offset = watermarks.get(f"{day:%Y%m%d}", {}).get(key, {}).get('rows', 0)
+            day_rows = day_rows.iloc[offset:]     # 커진 파일: 이미 반영된 행 이후만
+            if day_rows.empty:
+                continue
+            frames, day_files = pending.setdefault(day, ([], {}))
+            frames.append(day_rows)
+            day_files[key] = {**info, 'rows': len(day_rows)}
+    return {day: (pd.concat(frames, ignore_index=True), day_files) for day, (frames, day_files) in pending.items()}
+
+
+def append_raw(paths: Iterable, site: str, base_path=None, sward_config=None) -> List[Dict]:
+    """raw 파일 (여러 일자 / 일부 시간대 가능) → 일자 파티션에 증분 추가 → (partition, stream, status, ...) 목록"""
+    base_path = Path(base_path) if base_path is not None else default_base_path()
+    sward_path = Path(sward_config) if sward_config is not None else DEFAULT_SWARD_CONFIG
+    sward_frame = pd.read_csv(sward_path) if sward_path.exists() else None
+
+    results = []
+    touched = set()
+    for stream, files in collect_raw_files(paths).items():
+        if not files:
+            continue
+        pending = pending_rows(files, site, base_path, stream)
+        if not pending:
+            log.info(f"⏭️ {stream}: {len(files)} file(s) already appended")
+            results.append({'partition': None, 'stream': stream, 'rows': 0, 'status': STATUS_UNCHANGED})
+            continue
+        for day, (rows, day_files) in sorted(pending.items()):
+            entry = append_partition(base_path, site, day, stream, rows, day_files, sward_frame)
+            results.append(entry)
+            if entry['status'] == STATUS_FAILED:
+                log.warning(f"❌ {entry['partition']} {stream}: {entry['error']}\n{entry['traceback']}")
+                continue
+            touched.add(entry['partition'])
+            log.info(f"➕ {entry['partition']} {stream}: +{entry['rows']:,} rows, hours {entry['hours']}")
+
+    for name in sorted(touched):
+        refresh_dataset(base_path / name / 'cache', base_path)
+    return results
+
+
+# ========== CLI ==========
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.incremental_append',
+        description='Append new raw files to day partitions and update only the affected hours and aggregates',
+    )
+    parser.add_argument('paths', nargs='+', help='Raw files or folders (T31_/T41_/TMobile_ csv or parquet)')
+    parser.add_argument('--site', required=True, help='Site name (partition folder = <site>_<YYYYMMDD>)')
+    parser.add_argument('--data', default=None, help='Rawdata folder (default: Datafile/Rawdata)')
+    parser.add_argument('--sward-config', default=None, help='S-Ward configuration CSV')
+    parser.add_argument('--rollup', action='store_true', help='Update site rollups after appending')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Worker processes for per-day summaries (rollup)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = append_raw(args.paths, args.site, args.data, args.sward_config)
+    if not results:
+        print("⚠️ No raw files found (expected T31_* / T41_* / TMobile_* .csv or .parquet)")
+        return 1
+    for entry in results:
+        if entry['status'] == STATUS_UNCHANGED:
+            print(f"⏭️ {entry['stream']}: already appended")
+        elif entry['status'] == STATUS_FAILED:
+            print(f"❌ {entry['partition']} {entry['stream']}: {entry['error']}")
+        else:
+            print(f"➕ {entry['partition']} {entry['stream']}: +{entry['rows']:,} rows, hours {entry['hours']} "
+                  f"(state {entry['state']}, {len(entry['spliced'])} spliced, {len(entry['stale'])} dropped, "
+                  f"{entry['seconds']:.1f}s)")
+    appended = [r for r in results if r['status'] == STATUS_APPENDED]
+    failed = [r for r in results if r['status'] == STATUS_FAILED]
+    print(f"🗂️ {len(appended)} partition stream(s) appended "
+          f"({sum(r['rows'] for r in appended):,} rows), {len(failed)} failed")
+    if args.rollup and appended:
+        report = update_site_rollups(args.site, args.data, args.workers)
+        print(f"📈 Rollups: {len(report['summarized'])} day(s) refreshed, {len(report['failed'])} failed "
+              f"→ {rollup_folder(args.site, args.data)}")
+        failed.extend(report['failed'])
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
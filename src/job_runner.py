@@ -0,0 +1,373 @@
+"""
+Job Runner Module
+Processing 모드 분석을 별도 프로세스에서 실행하는 로컬 job runner
+
+Streamlit script thread에서 수 분씩 걸리는 분석을 직접 실행하지 않고 process pool에 제출합니다.
+job 상태는 디스크의 job table(`output/jobs/<job_id>/job.json`)에 기록되므로
+rerun / 새로고침 후에도 진행 상황을 조회하고 결과를 가져올 수 있습니다.
+
+    job_id = job_runner.submit('t41_operation', 'src.tward_type41_operation', 'compute_tward41_operation',
+                               inputs={'location_data': df, 'sward_config': config},
+                               params={'min_dwell_time': 30})
+    job_runner.get(job_id)            # {'state': 'running', 'progress': 0.4, ...}
+    job_runner.load_result(job_id)    # 완료 후 결과 (pickle)
+
+job 함수는 module-level 순수 함수여야 하며(st.* 사용 금지), `job` 인자를 받으면
+JobContext(progress / log)가 전달됩니다. 함수의 print 출력은 job log 파일에 기록됩니다.
+"""
+
+import contextlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+JOBS_DIR = Path('./output/jobs')
+JOB_FILE = 'job.json'
+LOG_FILE = 'log.txt'
+RESULT_FILE = 'result.pkl'
+INPUTS_DIR = 'inputs'
+MAX_FINISHED_JOBS = 20          # 보관할 완료 / 실패 job 수 (최근 순)
+MAX_JOB_AGE_SEC = 7 * 24 * 3600  # 이보다 오래된 완료 / 실패 job은 삭제
+
+STATE_QUEUED = 'queued'
+STATE_RUNNING = 'running'
+STATE_DONE = 'done'
+STATE_FAILED = 'failed'
+FINISHED_STATES = (STATE_DONE, STATE_FAILED)
+
+
+# ========== Job table (디스크) ==========
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _read_job(job_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(job_dir / JOB_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_job(job_dir: Path, record: Dict[str, Any]):
+    """job.json 원자적 갱신 (tmp 파일 + rename)"""
+    tmp_path = job_dir / f".{JOB_FILE}.tmp{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp_path, job_dir / JOB_FILE)
+
+
+def _update_job(job_dir: Path, **fields):
+    record = _read_job(job_dir) or {}
+    record.update(fields)
+    _write_job(job_dir, record)
+
+
+class JobContext:
+    """job 함수에 전달되는 진행률 / 로그 기록 객체 (worker 프로세스)"""
+
+    def __init__(self, job_dir: Path):
+        self.job_dir = Path(job_dir)
+
+    def progress(self, fraction: float, message: str = ''):
+        _update_job(self.job_dir, progress=round(max(0.0, min(1.0, fraction)), 3),
+                    message=message, updated_at=_now())
+        if message:
+            self.log(message)
+
+    def log(self, message: str):
+        with open(self.job_dir / LOG_FILE, 'a', encoding='utf-8') as f:
+            f.write(f"[{_now()}] {message}\n")
+
+
+# ========== Worker 실행 ==========
+
+def _execute_job(job_dir: str):
+    """worker 프로세스: 입력 로드 → 함수 실행 → 결과 저장 / 상태 기록"""
+    job_dir = Path(job_dir)
+    record = _read_job(job_dir)
+    context = JobContext(job_dir)
+    start = time.time()
+    _update_job(job_dir, state=STATE_RUNNING, started_at=_now(), pid=os.getpid(), message='Running')
+
+    try:
+        import importlib
+        module = importlib.import_module(record['module'])
+        func = getattr(module, record['function'])
+
+        kwargs = dict(record.get('params') or {})
+        for name in record.get('inputs', []):
+            kwargs[name] = pd.read_parquet(job_dir / INPUTS_DIR / f"{name}.parquet")
+        if 'job' in inspect.signature(func).parameters:
+            kwargs['job'] = context
+
+        with open(job_dir / LOG_FILE, 'a', encoding='utf-8') as log_file, \
+                contextlib.redirect_stdout(log_file):
+            result = func(**kwargs)
+
+        with open(job_dir / RESULT_FILE, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        _update_job(job_dir, state=STATE_DONE, progress=1.0, message='Completed',
+                    finished_at=_now(), elapsed_sec=round(time.time() - start, 1),
+                    result_path=str(job_dir / RESULT_FILE))
+    except Exception as e:
+        context.log(traceback.format_exc())
+        _update_job(job_dir, state=STATE_FAILED, message=f"{type(e).__name__}: {e}",
+                    finished_at=_now(), elapsed_sec=round(time.time() - start, 1))
+    finally:
+        # 입력 parquet는 실행 후 필요 없음 (job.json / log / result만 보관)
+        shutil.rmtree(job_dir / INPUTS_DIR, ignore_errors=True)
+    return str(job_dir)
+
+
+# ========== Runner ==========
+
+class JobRunner:
+    """process pool + 디스크 job table"""
+
+    def __init__(self, jobs_dir: Path = JOBS_DIR, max_workers: Optional[int] = None):
+        self.jobs_dir = Path(jobs_dir)
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: Streamlit 서버 프로세스의 thread 상태를 fork하지 않음
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def submit(self, kind: str, module: str, function: str,
+               inputs: Optional[Dict[str, pd.DataFrame]] = None,
+               params: Optional[Dict[str, Any]] = None, label: str = '') -> str:
+        """분석 job 제출 → job_id
+
+        Args:
+            kind: job 종류 (화면별 구분용, 예: 't41_operation')
+            module / function: 실행할 module-level 함수
+            inputs: DataFrame 입력 (job 디렉토리에 parquet로 저장 후 worker에서 로드)
+            params: JSON 직렬화 가능한 인자
+        """
+        self.cleanup()
+        job_id = f"{kind}-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        job_dir = self.jobs_dir / job_id
+        (job_dir / INPUTS_DIR).mkdir(parents=True, exist_ok=True)
+
+        inputs = inputs or {}
+        for name, df in inputs.items():
+            df.to_parquet(job_dir / INPUTS_DIR / f"{name}.parquet", index=False)
+
+        _write_job(job_dir, {
+            'job_id': job_id,
+            'kind': kind,
+            'label': label or kind,
+            'module': module,
+            'function': function,
+            'inputs': list(inputs),
+            'params': params or {},
+            'state': STATE_QUEUED,
+            'progress': 0.0,
+            'message': 'Queued',
+            'created_at': _now(),
+            'result_path': None,
+        })
+
+        future = self._get_executor().submit(_execute_job, str(job_dir))
+        future.add_done_callback(lambda f, job_dir=job_dir: self._on_done(job_dir, f))
+        with self._lock:
+            self._futures[job_id] = future
+        print(f"🧵 Job submitted: {job_id} ({module}.{function})")
+        return job_id
+
+    def _on_done(self, job_dir: Path, future: Future):
+        """worker 프로세스 비정상 종료 등 job 함수 밖의 오류 기록"""
+        error = future.exception()
+        if error is not None:
+            record = _read_job(job_dir) or {}
+            if record.get('state') not in FINISHED_STATES:
+                _update_job(job_dir, state=STATE_FAILED, message=f"Worker error: {error}",
+                            finished_at=_now())
+
+    def cleanup(self, max_finished: int = MAX_FINISHED_JOBS, max_age_sec: float = MAX_JOB_AGE_SEC) -> int:
+        """완료 / 실패 job 디렉토리 정리 - 최근 max_finished개만 남기고, max_age_sec보다 오래된 것은 삭제
+
+        실행 중(queued / running) job은 건드리지 않습니다.
+
+        Returns:
+            삭제한 job 수
+        """
+        if not self.jobs_dir.exists():
+            return 0
+        finished = []
+        for job_dir in self.jobs_dir.iterdir():
+            if not job_dir.is_dir():
+                continue
+            record = self.get(job_dir.name)
+            if record is None or record.get('state') in FINISHED_STATES:
+                finished.append((job_dir.stat().st_mtime, job_dir))
+        finished.sort(reverse=True)
+
+        cutoff = time.time() - max_age_sec
+        removed = 0
+        for rank, (mtime, job_dir) in enumerate(finished):
+            if rank >= max_finished or mtime < cutoff:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                with self._lock:
+                    self._futures.pop(job_dir.name, None)
+                removed += 1
+        if removed:
+            print(f"🧹 Removed {removed} old job(s) from {self.jobs_dir}")
+        return removed
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        record = _read_job(self.jobs_dir / job_id)
+        if record is not None and record.get('state') not in FINISHED_STATES:
+            with self._lock:
+                known = job_id in self._futures
+            if not known:
+                # 이 서버 프로세스가 실행한 job이 아님 (재시작 등으로 중단됨)
+                record['state'] = STATE_FAILED
+                record['message'] = 'Interrupted (server restarted)'
+        return record
+
+    def read_log(self, job_id: str, tail: int = 50) -> str:
+        try:
+            with open(self.jobs_dir / job_id / LOG_FILE, 'r', encoding='utf-8') as f:
+                return ''.join(f.readlines()[-tail:])
+        except OSError:
+            return ''
+
+    def load_result(self, job_id: str) -> Any:
+        record = self.get(job_id)
+        if record is None or record.get('state') != STATE_DONE:
+            return None
+        with open(record['result_path'], 'rb') as f:
+            return pickle.load(f)
+
+    def list_jobs(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """job table (최근 순)"""
+        if not self.jobs_dir.exists():
+            return []
+        records = []
+        for job_dir in self.jobs_dir.iterdir():
+            if job_dir.is_dir():
+                record = self.get(job_dir.name)
+                if record is not None and (kind is None or record.get('kind') == kind):
+                    records.append(record)
+        return sorted(records, key=lambda r: r.get('created_at', ''), reverse=True)
+
+
+# 프로세스 공용 인스턴스 (모든 세션 / rerun이 공유)
+job_runner = JobRunner()
+
+
+# ========== Streamlit 연동 ==========
+
+def _status_panel(st, job_id: str) -> Optional[Dict[str, Any]]:
+    record = job_runner.get(job_id)
+    if record is None:
+        st.error(f"Job not found: {job_id}")
+        return None
+    state = record.get('state')
+    if state in (STATE_QUEUED, STATE_RUNNING):
+        st.progress(float(record.get('progress') or 0.0),
+                    text=f"🧵 {record.get('label')} - {state} ({record.get('message', '')})")
+        with st.expander("Job log", expanded=False):
+            st.code(job_runner.read_log(job_id) or '(no output yet)')
+    return record
+
+
+def poll_job(st, job_id: str, poll_interval: float = 2.0) -> Optional[Dict[str, Any]]:
+    """job 진행률 표시 - 실행 중이면 주기적으로 상태만 갱신하고 완료 시 전체 rerun
+
+    Returns:
+        job record (완료 / 실패 상태일 때 결과를 가져갈 수 있음)
+    """
+    record = job_runner.get(job_id)
+    if record is None or record.get('state') in FINISHED_STATES:
+        return record
+
+    fragment = getattr(st, 'fragment', None)
+    if fragment is not None:
+        @fragment(run_every=poll_interval)
+        def _poll():
+            current = _status_panel(st, job_id)
+            if current is not None and current.get('state') in FINISHED_STATES:
+                st.rerun()
+        _poll()
+    else:
+        _status_panel(st, job_id)
+        st.button("🔄 Refresh job status", key=f"refresh_{job_id}")
+    return record
+
+
+def render_job_table(st, kind: Optional[str] = None, limit: int = 20):
+    """job table 표시 (상태 / 진행률 / 소요 시간 / 결과 위치)"""
+    records = job_runner.list_jobs(kind)[:limit]
+    if not records:
+        st.caption("No background jobs yet.")
+        return
+    columns = ['job_id', 'label', 'state', 'progress', 'message', 'created_at', 'elapsed_sec', 'result_path']
+    st.dataframe(pd.DataFrame([{col: r.get(col) for col in columns} for r in records]),
+                 use_container_width=True, hide_index=True)
+
+
+def run_job_once(st, session_key: str, signature: Any, kind: str, module: str, function: str,
+                 inputs=None, params: Optional[Dict[str, Any]] = None, label: str = ''):
+    """signature가 같은 동안 job을 한 번만 실행하고 결과를 session_state에 보관
+
+    Args:
+        session_key: job / 결과를 보관할 session_state key
+        signature: 입력 식별값 (바뀌면 새 job 제출)
+        inputs: DataFrame dict 또는 dict를 반환하는 함수 (제출할 때만 호출)
+
+    Returns:
+        (state, result) - state: 'done' | 'queued' | 'running' | 'failed'
+    """
+    entry = st.session_state.get(session_key)
+    if entry is None or entry['signature'] != signature:
+        job_inputs = inputs() if callable(inputs) else inputs
+        job_id = job_runner.submit(kind, module, function, inputs=job_inputs, params=params, label=label)
+        entry = {'signature': signature, 'job_id': job_id, 'state': STATE_QUEUED, 'result': None}
+        st.session_state[session_key] = entry
+
+    if entry['state'] == STATE_DONE:
+        return STATE_DONE, entry['result']
+
+    record = poll_job(st, entry['job_id'])
+    state = record.get('state') if record is not None else STATE_FAILED
+    if state == STATE_DONE:
+        entry['result'] = job_runner.load_result(entry['job_id'])
+        entry['state'] = STATE_DONE
+        return STATE_DONE, entry['result']
+
+    if state == STATE_FAILED:
+        entry['state'] = STATE_FAILED
+        message = record.get('message') if record is not None else 'Job not found'
+        st.error(f"❌ {label or kind} failed: {message}")
+        with st.expander("Job log", expanded=False):
+            st.code(job_runner.read_log(entry['job_id']) or '(no output)')
+        if st.button("🔁 Retry", key=f"retry_{session_key}"):
+            del st.session_state[session_key]
+            st.rerun()
+    return state, None
@@ -0,0 +1,132 @@
+"""
+Lazy Modules Module
+Processing / Report 모듈 지연 import 및 import 시간 측정
+
+Dashboard 모드에서는 필요 없는 분석 모듈(matplotlib, cv2, seaborn, reportlab 등을 import하는 모듈)을
+앱 시작 시 import하지 않고, 처음 호출될 때 import합니다.
+
+    render_tward41_operation = lazy_function('src.tward_type41_operation', 'render_tward41_operation')
+    render_tward41_operation(st)   # 이 시점에 모듈 import (1회)
+
+개발 중 코드 수정을 rerun마다 반영하려면 환경 변수 IRFM_DEV_RELOAD=1 로 실행합니다.
+(이미 로드된 등록 모듈만 rerun마다 importlib.reload)
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+DEV_RELOAD_ENV = 'IRFM_DEV_RELOAD'
+
+# module name → (import 시간(초), 단계: 'startup' | 'lazy' | 'reload')
+_import_times: Dict[str, Tuple[float, str]] = {}
+_registered: List[str] = []
+_lock = threading.Lock()
+_report_printed = False
+
+
+def is_dev_reload_enabled() -> bool:
+    return os.environ.get(DEV_RELOAD_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+# ========== Import (시간 기록) ==========
+
+def _timed_import(module_name: str, phase: str):
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    with _lock:
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed = time.perf_counter() - start
+        _import_times[module_name] = (elapsed, phase)
+        print(f"📦 Imported {module_name} ({phase}): {elapsed * 1000:.0f}ms")
+        return module
+
+
+def preload(module_names: Iterable[str]):
+    """앱 시작 시 필요한 모듈 import (모듈별 import 시간 기록)"""
+    for module_name in module_names:
+        _timed_import(module_name, 'startup')
+
+
+def lazy_import(module_name: str):
+    """모듈을 처음 사용할 때 import"""
+    if module_name not in _registered:
+        _registered.append(module_name)
+    return _timed_import(module_name, 'lazy')
+
+
+def lazy_function(module_name: str, attr: str) -> Callable:
+    """호출 시점에 모듈을 import하여 함수를 실행하는 wrapper
+
+    매 호출마다 sys.modules에서 함수를 찾으므로 dev reload 후에도 새 코드가 실행됩니다.
+    """
+    if module_name not in _registered:
+        _registered.append(module_name)
+
+    def wrapper(*args, **kwargs):
+        return getattr(lazy_import(module_name), attr)(*args, **kwargs)
+
+    wrapper.__name__ = attr
+    wrapper.__qualname__ = attr
+    wrapper.__doc__ = f"Lazy wrapper for {module_name}.{attr}"
+    return wrapper
+
+
+# ========== Dev reload ==========
+
+def reload_dev_modules(extra_modules: Iterable[str] = ()) -> List[str]:
+    """IRFM_DEV_RELOAD가 켜진 경우에만 이미 로드된 등록 모듈 reload"""
+    if not is_dev_reload_enabled():
+        return []
+    reloaded = []
+    for module_name in list(_registered) + list(extra_modules):
+        module = sys.modules.get(module_name)
+        if module is None or module_name in reloaded:
+            continue
+        start = time.perf_counter()
+        importlib.reload(module)
+        _import_times[module_name] = (time.perf_counter() - start, 'reload')
+        reloaded.append(module_name)
+        print(f"🔄 Reloaded module: {module_name}")
+    return reloaded
+
+
+# ========== Timing report ==========
+
+def import_timing_report() -> List[Dict]:
+    """모듈별 import 시간 (오래 걸린 순)"""
+    rows = [
+        {'module': name, 'seconds': seconds, 'phase': phase}
+        for name, (seconds, phase) in _import_times.items()
+    ]
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+
+def print_import_report(once: bool = False):
+    """import 시간 콘솔 출력 (once=True면 프로세스당 1회)"""
+    global _report_printed
+    if once and _report_printed:
+        return
+    _report_printed = True
+    rows = import_timing_report()
+    total = sum(row['seconds'] for row in rows)
+    print(f"⏱️ Import timing: {len(rows)} modules, {total * 1000:.0f}ms total")
+    for row in rows:
+        print(f"   {row['module']:<45} {row['seconds'] * 1000:>8.0f}ms  ({row['phase']})")
+
+
+def render_import_report(st):
+    """사이드바 import 시간 표시 (dev 모드)"""
+    rows = import_timing_report()
+    if not rows:
+        return
+    total = sum(row['seconds'] for row in rows)
+    with st.sidebar.expander(f"⏱️ Import timing ({total * 1000:.0f}ms)", expanded=False):
+        for row in rows:
+            st.caption(f"{row['module']} - {row['seconds'] * 1000:.0f}ms ({row['phase']})")
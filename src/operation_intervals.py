@@ -0,0 +1,370 @@
+"""
+Operation Interval Store Module
+T31 장비 가동 구간 저장소 (run-length interval)
+
+장비(MAC)별로 가동 중인 시간 구간을 [start, end) 정수 slot 구간 + 위치 코드로 압축 보관합니다.
+연속된 가동 slot 중 위치(building, level)가 같은 구간은 하나의 interval로 합쳐집니다.
+
+기존의 `filtered_data[(mac == ...) & (time_bin == ...) & is_active]` 반복 필터 대신
+구간 연산으로 범위 질의, 총 가동 시간, 구간 가동률, 장비 간 병합을 계산합니다.
+
+    store = OperationIntervalStore.from_bins(location_data)          # unified_tward31_analysis 결과
+    minutes = store.operating_minutes(building='WWT', level='1F')    # 장비별 가동 시간 (분)
+    matrix = store.active_matrix(144, building='WWT')               # 장비 × 10분 bin 가동 여부
+    rate = store.utilization(36, 72)                                 # 06:00~12:00 가동률
+
+slot 단위는 unit_minutes (기본 10분)이며, slot index는 0부터 시작합니다 (time_bin 1 → slot 0).
+"""
+
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.t41_schema import category_codes
+from src.time_index import unit_time_bin
+
+LOCATION_COLUMNS = ('building', 'level')
+
+
+def _location_codes(frame: pd.DataFrame, location_cols) -> Tuple[np.ndarray, List[Tuple]]:
+    """(building, level) 조합 → 위치 코드 (첫 등장 순서)"""
+    codes = np.zeros(len(frame), dtype=np.int64)
+    all_missing = np.ones(len(frame), dtype=bool)
+    columns = []
+    for col in location_cols:
+        col_codes, cats = category_codes(frame[col])
+        codes = codes * (len(cats) + 1) + (col_codes + 1)
+        all_missing &= col_codes < 0
+        columns.append(cats)
+
+    combined = np.where(all_missing, -1, codes)
+    pair_codes, uniques = pd.factorize(combined, sort=False)
+    locations = []
+    for value in uniques:
+        value = int(value)
+        if value < 0:
+            locations.append(tuple(None for _ in location_cols))
+            continue
+        labels = []
+        for cats in reversed(columns):
+            value, code = divmod(value, len(cats) + 1)
+            labels.append(cats[code - 1] if code > 0 else None)
+        locations.append(tuple(reversed(labels)))
+
+    return np.asarray(pair_codes, dtype=np.int64), locations
+
+
+class OperationIntervalStore:
+    """장비별 [start, end) 가동 구간 + 위치 코드 (CSR 구조)"""
+
+    def __init__(self, devices: np.ndarray, offsets: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                 location_codes: np.ndarray, locations: List[Tuple], unit_minutes: float = 10,
+                 location_cols: Tuple[str, ...] = LOCATION_COLUMNS):
+        """
+        Args:
+            devices: dense device id → MAC 주소 (가동 구간이 없는 장비 포함)
+            offsets: 길이 len(devices) + 1, 장비 i의 구간 범위는 [offsets[i], offsets[i+1])
+            starts / ends: 구간 시작 / 끝 slot (end 미포함), 장비 내 시작 순 정렬
+            location_codes: 구간별 위치 코드 → locations index
+            locations: 위치 코드 → (building, level)
+            unit_minutes: slot 1개의 길이 (분)
+        """
+        self.devices = np.asarray(devices, dtype=object)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.location_codes = np.asarray(location_codes, dtype=np.int64)
+        self.locations = [tuple(loc) for loc in locations]
+        self.unit_minutes = unit_minutes
+        self.location_cols = tuple(location_cols)
+        self.interval_devices = np.repeat(np.arange(len(self.devices)), np.diff(self.offsets))
+        self._device_index = None
+
+    # ========== 생성 ==========
+
+    @classmethod
+    def from_bins(cls, frame: pd.DataFrame, mac_col: str = 'mac', bin_col: str = 'time_bin',
+                  active_col: Optional[str] = 'is_active', location_cols=LOCATION_COLUMNS,
+                  bin_origin: int = 1, unit_minutes: float = 10) -> 'OperationIntervalStore':
+        """(mac, bin) 단위 가동 여부 프레임으로부터 생성
+
+        Args:
+            frame: mac / bin / 위치 컬럼 (+ 가동 여부 컬럼)을 가진 DataFrame
+            active_col: 가동 여부 컬럼 (None이면 모든 행을 가동으로 취급)
+            bin_origin: 첫 bin 번호 (time_bin 1~144 → 1, bin_index 0~143 → 0)
+
+        같은 (mac, bin)이 여러 행이면 먼저 나온 행의 위치를 사용합니다.
+        """
+        device_codes, devices = pd.factorize(frame[mac_col], sort=False)
+        device_codes = np.asarray(device_codes, dtype=np.int64)
+        location_codes, locations = _location_codes(frame, location_cols)
+
+        mask = device_codes >= 0
+        if active_col is not None:
+            mask &= frame[active_col].to_numpy() == True  # noqa: E712 (NaN → 비가동)
+        devs = device_codes[mask]
+        slots = frame[bin_col].to_numpy()[mask].astype(np.int64) - bin_origin
+        locs = location_codes[mask]
+
+        order = np.lexsort((slots, devs))
+        devs, slots, locs = devs[order], slots[order], locs[order]
+
+        # 같은 (mac, slot) 중복 제거 (먼저 나온 행 유지)
+        if len(devs):
+            keep = np.r_[True, (devs[1:] != devs[:-1]) | (slots[1:] != slots[:-1])]
+            devs, slots, locs = devs[keep], slots[keep], locs[keep]
+
+        # run 경계: 장비 변경 / slot 불연속 / 위치 변경
+        if len(devs):
+            new_run = np.r_[True, (devs[1:] != devs[:-1]) | (slots[1:] != slots[:-1] + 1)
+                            | (locs[1:] != locs[:-1])]
+            run_starts = np.flatnonzero(new_run)
+            run_ends = np.r_[run_starts[1:], len(devs)] - 1
+        else:
+            run_starts = run_ends = np.array([], dtype=np.int64)
+
+        counts = np.bincount(devs[run_starts], minlength=len(devices))
+        offsets = np.zeros(len(devices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return cls(devices, offsets, slots[run_starts], slots[run_ends] + 1, locs[run_starts],
+                   locations, unit_minutes=unit_minutes, location_cols=tuple(location_cols))
+
+    @classmethod
+    def from_signals(cls, df: pd.DataFrame, sward_config: Optional[pd.DataFrame] = None,
+                     min_signals: int = 2, unit_minutes: int = 10) -> 'OperationIntervalStore':
+        """원시 T31 신호로부터 생성 (unified_tward31_analysis와 동일한 기준)
+
+        - (mac, unit bin)별 신호 수 >= min_signals 이면 가동
+        - 위치: 해당 bin에서 RSSI가 가장 큰 S-Ward의 building / level
+        """
+        if 'building' not in df.columns and sward_config is not None:
+            df = df.merge(sward_config[['sward_id', 'building', 'level']], on='sward_id', how='left')
+
+        bins = pd.DataFrame({
+            'mac': df['mac'].to_numpy(),
+            'time_bin': unit_time_bin(df, unit_minutes),
+            'rssi': df['rssi'].to_numpy(),
+            'building': df['building'].to_numpy(),
+            'level': df['level'].to_numpy()
+        })
+        signal_count = bins.groupby(['mac', 'time_bin'], sort=False)['rssi'].transform('size')
+        bins['is_active'] = signal_count.to_numpy() >= min_signals
+
+        # bin별 최대 RSSI 행 (동률이면 먼저 나온 행)
+        bins = bins.sort_values('rssi', ascending=False, kind='mergesort')
+        bins = bins.drop_duplicates(['mac', 'time_bin']).sort_index()
+        return cls.from_bins(bins, bin_origin=0, unit_minutes=unit_minutes)
+
+    # ========== 저장 / 로드 ==========
+
+    def to_frame(self) -> pd.DataFrame:
+        """구간 테이블 (mac, start, end, building, level) - 가동 구간이 없는 장비는 start = end = -1 행"""
+        idle = np.flatnonzero(np.diff(self.offsets) == 0)
+        frame = pd.DataFrame({
+            'mac': np.r_[self.devices[self.interval_devices], self.devices[idle]],
+            'start': np.r_[self.starts, np.full(len(idle), -1)].astype(np.int32),
+            'end': np.r_[self.ends, np.full(len(idle), -1)].astype(np.int32)
+        })
+        for i, col in enumerate(self.location_cols):
+            labels = np.array([loc[i] for loc in self.locations] + [None], dtype=object)
+            frame[col] = np.r_[labels[self.location_codes], np.full(len(idle), None, dtype=object)]
+        return frame
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, unit_minutes: float = 10,
+                   location_cols=LOCATION_COLUMNS) -> 'OperationIntervalStore':
+        """to_frame() 결과로부터 복원"""
+        device_codes, devices = pd.factorize(frame['mac'], sort=False)
+        valid = (frame['end'].to_numpy() > frame['start'].to_numpy()) & (np.asarray(device_codes) >= 0)
+        intervals = frame[valid]
+        interval_devices = np.asarray(device_codes)[valid]
+        location_codes, locations = _location_codes(intervals, location_cols)
+        order = np.lexsort((intervals['start'].to_numpy(), interval_devices))
+        counts = np.bincount(interval_devices, minlength=len(devices))
+        offsets = np.zeros(len(devices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(devices, offsets, intervals['start'].to_numpy()[order], intervals['end'].to_numpy()[order],
+                   location_codes[order], locations, unit_minutes=unit_minutes,
+                   location_cols=tuple(location_cols))
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        self.to_frame().to_parquet(path, index=False)
+        return path
+
+    @classmethod
+    def load(cls, path, unit_minutes: float = 10) -> 'OperationIntervalStore':
+        return cls.from_frame(pd.read_parquet(path), unit_minutes=unit_minutes)
+
+    # ========== 기본 정보 ==========
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    @property
+    def n_intervals(self) -> int:
+        return len(self.starts)
+
+    def device_ids(self, macs: Iterable) -> np.ndarray:
+        """MAC 주소 목록 → dense device id (없으면 -1)"""
+        if self._device_index is None:
+            self._device_index = {mac: i for i, mac in enumerate(self.devices)}
+        return np.array([self._device_index.get(mac, -1) for mac in macs], dtype=np.int64)
+
+    def intervals(self, mac) -> pd.DataFrame:
+        """장비 한 대의 가동 구간"""
+        ids = self.device_ids([mac])
+        if ids[0] < 0:
+            return pd.DataFrame(columns=['start', 'end'] + list(self.location_cols))
+        start, end = self.offsets[ids[0]], self.offsets[ids[0] + 1]
+        frame = pd.DataFrame({'start': self.starts[start:end], 'end': self.ends[start:end]})
+        for i, col in enumerate(self.location_cols):
+            frame[col] = [self.locations[code][i] for code in self.location_codes[start:end]]
+        return frame
+
+    # ========== 선택 ==========
+
+    def location_mask(self, building: Optional[str] = None, level: Optional[str] = None) -> np.ndarray:
+        """구간별 위치 조건 마스크 (None이면 전체, building만 지정 시 모든 level)"""
+        if building is None and level is None:
+            return np.ones(self.n_intervals, dtype=bool)
+        ok = np.array([
+            (building is None or loc[0] == building) and (level is None or loc[1] == level)
+            for loc in self.locations
+        ] + [False], dtype=bool)
+        return ok[self.location_codes]
+
+    def _per_device(self, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        return np.bincount(self.interval_devices[mask], weights=values[mask],
+                           minlength=len(self.devices)).astype(np.int64)
+
+    # ========== 질의 ==========
+
+    def operating_slots(self, building: Optional[str] = None, level: Optional[str] = None) -> np.ndarray:
+        """장비별 총 가동 slot 수"""
+        return self._per_device(self.ends - self.starts, self.location_mask(building, level))
+
+    def operating_minutes(self, building: Optional[str] = None, level: Optional[str] = None) -> np.ndarray:
+        """장비별 총 가동 시간 (분)"""
+        return self.operating_slots(building, level) * self.unit_minutes
+
+    def overlap_slots(self, start: int, end: int, building: Optional[str] = None,
+                      level: Optional[str] = None) -> np.ndarray:
+        """장비별 [start, end) 구간과 겹치는 가동 slot 수"""
+        overlap = np.clip(np.minimum(self.ends, end) - np.maximum(self.starts, start), 0, None)
+        return self._per_device(overlap, self.location_mask(building, level))
+
+    def utilization(self, start: int, end: int, building: Optional[str] = None,
+                    level: Optional[str] = None) -> np.ndarray:
+        """장비별 [start, end) 구간 가동률 (0~1)"""
+        if end <= start:
+            return np.zeros(len(self.devices))
+        return self.overlap_slots(start, end, building, level) / (end - start)
+
+    def active_devices(self, start: int, end: int, building: Optional[str] = None,
+                       level: Optional[str] = None) -> List[str]:
+        """[start, end) 구간에 가동한 장비 목록"""
+        return list(self.devices[self.overlap_slots(start, end, building, level) > 0])
+
+    def active_matrix(self, n_slots: int, building: Optional[str] = None, level: Optional[str] = None,
+                      devices: Optional[Iterable] = None) -> np.ndarray:
+        """장비 × slot 가동 여부 (uint8, 1: 가동) - devices 순서대로 행 생성 (없는 장비는 0)"""
+        mask = self.location_mask(building, level) & (self.starts < n_slots)
+        diff = np.zeros((len(self.devices), n_slots + 1), dtype=np.int32)
+        np.add.at(diff, (self.interval_devices[mask], self.starts[mask]), 1)
+        np.add.at(diff, (self.interval_devices[mask], np.minimum(self.ends[mask], n_slots)), -1)
+        matrix = (np.cumsum(diff[:, :n_slots], axis=1) > 0).astype(np.uint8)
+        if devices is None:
+            return matrix
+        ids = self.device_ids(devices)
+        result = np.zeros((len(ids), n_slots), dtype=np.uint8)
+        result[ids >= 0] = matrix[ids[ids >= 0]]
+        return result
+
+    def active_count(self, n_slots: int, building: Optional[str] = None,
+                     level: Optional[str] = None) -> np.ndarray:
+        """slot별 가동 장비 수"""
+        mask = self.location_mask(building, level) & (self.starts < n_slots)
+        diff = np.zeros(n_slots + 1, dtype=np.int64)
+        np.add.at(diff, self.starts[mask], 1)
+        np.add.at(diff, np.minimum(self.ends[mask], n_slots), -1)
+        return np.cumsum(diff[:n_slots])
+
+    def merged_intervals(self, building: Optional[str] = None, level: Optional[str] = None,
+                         devices: Optional[Iterable] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 장비의 가동 구간 합집합 (하나 이상 가동 중인 구간) → (starts, ends)"""
+        mask = self.location_mask(building, level)
+        if devices is not None:
+            ids = self.device_ids(devices)
+            mask &= np.isin(self.interval_devices, ids[ids >= 0])
+        starts, ends = self.starts[mask], self.ends[mask]
+        if len(starts) == 0:
+            return starts, ends
+        order = np.argsort(starts, kind='stable')
+        starts, ends = starts[order], ends[order]
+        running_end = np.maximum.accumulate(ends)
+        new_group = np.r_[True, starts[1:] > running_end[:-1]]
+        group_starts = np.flatnonzero(new_group)
+        group_ends = np.r_[group_starts[1:], len(starts)] - 1
+        return starts[group_starts], running_end[group_ends]
+
+    def dominant_locations(self, n_bins: int, slots_per_bin: int) -> np.ndarray:
+        """장비 × bin 최다 위치 코드 (bin당 가동 slot이 가장 많은 위치, 동률이면 먼저 나온 위치, 없으면 -1)"""
+        result = np.full((len(self.devices), n_bins), -1, dtype=np.int64)
+        limit = n_bins * slots_per_bin
+        starts = np.minimum(self.starts, limit)
+        ends = np.minimum(self.ends, limit)
+        valid = ends > starts
+        if not valid.any():
+            return result
+
+        # 구간을 bin 경계로 분할
+        starts, ends = starts[valid], ends[valid]
+        devs, locs = self.interval_devices[valid], self.location_codes[valid]
+        first_bin = starts // slots_per_bin
+        n_pieces = (ends - 1) // slots_per_bin - first_bin + 1
+        piece_interval = np.repeat(np.arange(len(starts)), n_pieces)
+        piece_bin = first_bin[piece_interval] + (np.arange(n_pieces.sum())
+                                                 - np.repeat(np.cumsum(n_pieces) - n_pieces, n_pieces))
+        piece_start = np.maximum(starts[piece_interval], piece_bin * slots_per_bin)
+        piece_end = np.minimum(ends[piece_interval], (piece_bin + 1) * slots_per_bin)
+
+        pieces = pd.DataFrame({
+            'dev': devs[piece_interval], 'bin': piece_bin, 'loc': locs[piece_interval],
+            'length': piece_end - piece_start, 'first': piece_start
+        })
+        totals = pieces.groupby(['dev', 'bin', 'loc'], sort=False).agg(
+            length=('length', 'sum'), first=('first', 'min')).reset_index()
+        best = totals.sort_values(['dev', 'bin', 'length', 'first'],
+                                  ascending=[True, True, False, True]).drop_duplicates(['dev', 'bin'])
+        result[best['dev'].to_numpy(), best['bin'].to_numpy()] = best['loc'].to_numpy()
+        return result
+
+    def location_labels(self, separator: str = '-') -> List[str]:
+        """위치 코드 → 'building-level' 라벨"""
+        return [separator.join(str(value) for value in loc) for loc in self.locations]
+
+    def summary(self, building: Optional[str] = None, level: Optional[str] = None) -> pd.DataFrame:
+        """장비별 가동 요약 (가동 시간, 구간 수, 첫 가동 / 마지막 가동 slot)"""
+        mask = self.location_mask(building, level)
+        devs = self.interval_devices[mask]
+        first = np.full(len(self.devices), -1, dtype=np.int64)
+        last = np.full(len(self.devices), -1, dtype=np.int64)
+        if mask.any():
+            np.maximum.at(last, devs, self.ends[mask])
+            first_values = np.full(len(self.devices), np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(first_values, devs, self.starts[mask])
+            first = np.where(first_values == np.iinfo(np.int64).max, -1, first_values)
+        return pd.DataFrame({
+            'mac': self.devices,
+            'operation_minutes': self.operating_minutes(building, level),
+            'intervals': np.bincount(devs, minlength=len(self.devices)),
+            'first_slot': first,
+            'last_slot': last
+        })
+
+    def memory_usage_bytes(self) -> int:
+        return int(self.offsets.nbytes + self.starts.nbytes + self.ends.nbytes + self.location_codes.nbytes)
@@ -0,0 +1,271 @@
+"""
+Presence Bitset Index Module
+작업자 × 공간 × 상태별 1,440-bit presence 인덱스
+
+(worker, location, status) 조합마다 하루 1,440분을 1bit씩 표현한 벡터를 uint64 23개로 pack하여 보관합니다.
+공간별 점유 곡선, 두 시점 동시 재실 인원, 특정 시간 구간 재실 작업자 등의 질의를
+groupby/nunique 재스캔 대신 bit 연산 + popcount로 계산합니다.
+
+    index = PresenceIndex.from_activity(activity_analysis)
+    curve = index.occupancy_curve(building='WWT', level='1F', statuses=['Active'])
+    peak, minute = index.peak_occupancy(building='FAB')
+    both = index.co_presence(600, 900)
+
+캐시 폴더에는 .npy (bit 행렬, key 행렬) + .json (라벨) 으로 저장되며 memory-map으로 로드합니다.
+세 파일은 tmp 파일에 모두 쓴 후 rename하고 (.json이 마지막), 로드 시 행 수가 서로 맞는지 확인합니다.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.t41_schema import ACTIVITY_STATUS_CATEGORIES, category_codes, status_codes
+
+MINUTES_PER_DAY = 1440
+WORDS_PER_DAY = (MINUTES_PER_DAY + 63) // 64  # 23
+
+PRESENT_STATUSES = ('Active', 'Present')
+
+PRESENCE_FILE_PREFIX = "t41_results_presence"
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """uint64 배열의 원소별 set bit 수"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).astype(np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    counts = np.unpackbits(as_bytes, axis=-1).reshape(*words.shape, 64).sum(axis=-1)
+    return counts.astype(np.int64)
+
+
+def _unpack_minutes(bits: np.ndarray) -> np.ndarray:
+    """(n, 23) uint64 → (n, 1440) bool"""
+    as_bytes = np.ascontiguousarray(bits).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, bitorder='little')[:, :MINUTES_PER_DAY].astype(bool)
+
+
+def window_mask(start_minute: int, end_minute: int) -> np.ndarray:
+    """[start_minute, end_minute) 구간의 bit mask (23 words)"""
+    minutes = np.zeros(WORDS_PER_DAY * 64, dtype=bool)
+    minutes[max(start_minute, 0):min(end_minute, MINUTES_PER_DAY)] = True
+    return np.packbits(minutes, bitorder='little').view(np.uint64)
+
+
+class PresenceIndex:
+    """(worker, location, status)별 1,440-bit presence 인덱스"""
+
+    def __init__(self, bits: np.ndarray, keys: np.ndarray, macs: List[str],
+                 locations: List[Tuple[Optional[str], Optional[str]]], base_day: Optional[str] = None):
+        """
+        Args:
+            bits: (n_keys, 23) uint64 - key별 1분 presence bit
+            keys: (n_keys, 3) int32 - [mac_id, location_id, status_code], mac_id 순 정렬
+                  (location_id -1: 공간 정보 없음, status_code: Absent 0 / Present 1 / Active 2)
+            macs: mac_id → MAC 주소
+            locations: location_id → (building, level)
+            base_day: minute_bin이 datetime인 경우 기준 일자 (ISO 문자열), 정수 minute_bin이면 None
+        """
+        self.bits = bits
+        self.keys = keys
+        self.macs = list(macs)
+        self.locations = [tuple(loc) for loc in locations]
+        self.base_day = base_day
+
+    # ========== 생성 ==========
+
+    @classmethod
+    def from_activity(cls, activity_analysis: pd.DataFrame) -> 'PresenceIndex':
+        """activity_analysis (1분 단위, 원본 또는 압축 스키마)로부터 인덱스 생성
+
+        minute_bin은 정수(1~1440) 또는 하루 범위의 datetime이어야 합니다.
+        """
+        minute_bins = activity_analysis['minute_bin']
+        base_day = None
+        if pd.api.types.is_datetime64_any_dtype(minute_bins):
+            days = minute_bins.dt.normalize()
+            if days.nunique() > 1:
+                raise ValueError("PresenceIndex supports a single day of minute_bin values")
+            if len(days):
+                base_day = days.iloc[0].isoformat()
+            minutes = (minute_bins.dt.hour * 60 + minute_bins.dt.minute).to_numpy(dtype=np.int64)
+        else:
+            minutes = minute_bins.to_numpy(dtype=np.int64) - 1
+
+        mac_codes, macs = category_codes(activity_analysis['mac'])
+        building_codes, building_cats = category_codes(activity_analysis['building'])
+        level_codes, level_cats = category_codes(activity_analysis['level'])
+        statuses = status_codes(activity_analysis['activity_status']).astype(np.int64)
+
+        valid = (mac_codes >= 0) & (minutes >= 0) & (minutes < MINUTES_PER_DAY) & (statuses >= 0)
+        mac_codes, building_codes, level_codes = mac_codes[valid], building_codes[valid], level_codes[valid]
+        minutes, statuses = minutes[valid], statuses[valid]
+
+        # location = (building, level) 조합, building이 없으면 -1
+        n_levels = len(level_cats) + 1
+        pair = np.where(building_codes >= 0, building_codes * n_levels + (level_codes + 1), -1)
+        pair_values, location_ids = np.unique(pair, return_inverse=True)
+        location_ids = location_ids.ravel().astype(np.int64)
+        locations = []
+        if len(pair_values) and pair_values[0] == -1:
+            location_ids -= 1
+            pair_values = pair_values[1:]
+        for value in pair_values:
+            b_code, l_code = divmod(int(value), n_levels)
+            level = level_cats[l_code - 1] if l_code > 0 else None
+            locations.append((building_cats[b_code], level))
+
+        # key = (mac_id, location_id, status) → mac_id 순 정렬
+        n_locations = len(locations) + 1
+        n_statuses = len(ACTIVITY_STATUS_CATEGORIES)
+        combined = (mac_codes.astype(np.int64) * n_locations + (location_ids + 1)) * n_statuses + statuses
+        key_values, key_index = np.unique(combined, return_inverse=True)
+        key_index = key_index.ravel()
+
+        bits = np.zeros((len(key_values), WORDS_PER_DAY), dtype=np.uint64)
+        np.bitwise_or.at(bits, (key_index, minutes >> 6),
+                         np.left_shift(np.uint64(1), (minutes & 63).astype(np.uint64)))
+
+        key_mac, rest = np.divmod(key_values, n_locations * n_statuses)
+        key_location, key_status = np.divmod(rest, n_statuses)
+        keys = np.column_stack([key_mac, key_location - 1, key_status]).astype(np.int32)
+
+        mac_labels = [str(mac) for mac in macs]
+        locations = [(None if pd.isna(b) else str(b), None if l is None or pd.isna(l) else str(l))
+                     for b, l in locations]
+        return cls(bits, keys, mac_labels, locations, base_day)
+
+    # ========== 저장 / 로드 ==========
+
+    @staticmethod
+    def _paths(folder, prefix: str = PRESENCE_FILE_PREFIX):
+        folder = Path(folder)
+        return (folder / f"{prefix}_bits.npy", folder / f"{prefix}_keys.npy", folder / f"{prefix}_index.json")
+
+    @classmethod
+    def exists(cls, folder, prefix: str = PRESENCE_FILE_PREFIX) -> bool:
+        return all(path.exists() for path in cls._paths(folder, prefix))
+
+    def save(self, folder, prefix: str = PRESENCE_FILE_PREFIX) -> List[str]:
+        """캐시 폴더에 저장 (.npy + .json, tmp 파일 → atomic rename)"""
+        paths = self._paths(folder, prefix)
+        tmp_paths = [path.with_name(f".{path.name}.tmp{os.getpid()}.{threading.get_ident()}") for path in paths]
+        try:
+            for tmp_path, array in zip(tmp_paths, (self.bits, self.keys)):
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, np.ascontiguousarray(array))
+            with open(tmp_paths[2], 'w', encoding='utf-8') as f:
+                json.dump({
+                    'macs': self.macs,
+                    'locations': [list(loc) for loc in self.locations],
+                    'statuses': ACTIVITY_STATUS_CATEGORIES,
+                    'minutes': MINUTES_PER_DAY,
+                    'base_day': self.base_day,
+                    'n_keys': int(len(self.keys)),
+                }, f, ensure_ascii=False)
+            for tmp_path, path in zip(tmp_paths, paths):
+                os.replace(tmp_path, path)
+        finally:
+            for tmp_path in tmp_paths:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        return [path.name for path in paths]
+
+    @classmethod
+    def load(cls, folder, prefix: str = PRESENCE_FILE_PREFIX, mmap: bool = True) -> 'PresenceIndex':
+        """캐시 폴더에서 로드 (기본: memory-map) - 파일 간 행 수가 맞지 않으면 ValueError"""
+        bits_path, keys_path, index_path = cls._paths(folder, prefix)
+        mmap_mode = 'r' if mmap else None
+        bits = np.load(bits_path, mmap_mode=mmap_mode)
+        keys = np.load(keys_path, mmap_mode=mmap_mode)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if len(bits) != len(keys) or meta.get('n_keys', len(keys)) != len(keys):
+            raise ValueError(f"presence index files do not match ({len(bits)} bits, {len(keys)} keys, "
+                             f"{meta.get('n_keys')} recorded)")
+        return cls(bits, keys, meta['macs'], meta['locations'], meta.get('base_day'))
+
+    # ========== 선택 ==========
+
+    def select(self, building: Optional[str] = None, level: Optional[str] = None,
+               statuses: Optional[Iterable[str]] = PRESENT_STATUSES) -> np.ndarray:
+        """조건에 맞는 key 마스크
+
+        Args:
+            building / level: None이면 전체 (level만 지정 시 모든 building의 해당 level)
+            statuses: 포함할 상태 목록, None이면 전체 상태 (Absent 포함)
+        """
+        location_ok = np.array([
+            (building is None or loc[0] == building) and (level is None or loc[1] == level)
+            for loc in self.locations
+        ] + [building is None and level is None], dtype=bool)
+        mask = location_ok[self.keys[:, 1]]
+        if statuses is not None:
+            status_ok = np.array([s in set(statuses) for s in ACTIVITY_STATUS_CATEGORIES], dtype=bool)
+            mask &= status_ok[self.keys[:, 2]]
+        return mask
+
+    def worker_bits(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """선택된 key를 작업자 단위로 OR → (mac_ids, (n_workers, 23) bits)"""
+        selected = np.flatnonzero(mask)
+        if len(selected) == 0:
+            return np.array([], dtype=np.int64), np.zeros((0, WORDS_PER_DAY), dtype=np.uint64)
+        mac_ids = np.asarray(self.keys[selected, 0], dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, mac_ids[1:] != mac_ids[:-1]])
+        bits = np.bitwise_or.reduceat(np.asarray(self.bits[selected]), starts, axis=0)
+        return mac_ids[starts], bits
+
+    # ========== 질의 ==========
+
+    def occupancy_curve(self, building: Optional[str] = None, level: Optional[str] = None,
+                        statuses: Optional[Iterable[str]] = PRESENT_STATUSES) -> np.ndarray:
+        """1분별 고유 작업자 수 (길이 1440)"""
+        _, bits = self.worker_bits(self.select(building, level, statuses))
+        if len(bits) == 0:
+            return np.zeros(MINUTES_PER_DAY, dtype=np.int64)
+        return _unpack_minutes(bits).sum(axis=0).astype(np.int64)
+
+    def peak_occupancy(self, building: Optional[str] = None, level: Optional[str] = None,
+                       statuses: Optional[Iterable[str]] = PRESENT_STATUSES) -> Tuple[int, int]:
+        """(최대 동시 작업자 수, 해당 minute index 0~1439)"""
+        curve = self.occupancy_curve(building, level, statuses)
+        minute = int(curve.argmax())
+        return int(curve[minute]), minute
+
+    def workers_present(self, start_minute: int, end_minute: int, building: Optional[str] = None,
+                        level: Optional[str] = None,
+                        statuses: Optional[Iterable[str]] = PRESENT_STATUSES) -> List[str]:
+        """[start_minute, end_minute) 구간에 한 번이라도 재실한 작업자 MAC 목록"""
+        mac_ids, bits = self.worker_bits(self.select(building, level, statuses))
+        hit = (bits & window_mask(start_minute, end_minute)).any(axis=1)
+        return [self.macs[i] for i in mac_ids[hit]]
+
+    def co_presence(self, minute_a: int, minute_b: int, building: Optional[str] = None,
+                    level: Optional[str] = None,
+                    statuses: Optional[Iterable[str]] = PRESENT_STATUSES) -> int:
+        """두 시점(minute index 0~1439) 모두 재실한 작업자 수"""
+        _, bits = self.worker_bits(self.select(building, level, statuses))
+        at_a = (bits[:, minute_a >> 6] >> np.uint64(minute_a & 63)) & np.uint64(1)
+        at_b = (bits[:, minute_b >> 6] >> np.uint64(minute_b & 63)) & np.uint64(1)
+        return int(np.count_nonzero(at_a & at_b))
+
+    def worker_minutes(self, building: Optional[str] = None, level: Optional[str] = None,
+                       statuses: Optional[Iterable[str]] = PRESENT_STATUSES) -> pd.Series:
+        """작업자별 재실 분 수 (popcount)"""
+        mac_ids, bits = self.worker_bits(self.select(building, level, statuses))
+        minutes = _popcount(bits).sum(axis=1) if len(bits) else np.array([], dtype=np.int64)
+        return pd.Series(minutes, index=[self.macs[i] for i in mac_ids], name='minutes')
+
+    def minute_bin_values(self, minutes: np.ndarray):
+        """minute index (0~1439) → 원본 minute_bin 표현 (정수 1~1440 또는 datetime)"""
+        minutes = np.asarray(minutes, dtype=np.int64)
+        if self.base_day is None:
+            return minutes + 1
+        return pd.Timestamp(self.base_day) + pd.to_timedelta(minutes, unit='min')
+
+    def memory_usage_bytes(self) -> int:
+        return int(self.bits.nbytes + self.keys.nbytes)
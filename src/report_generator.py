@@ -7,6 +7,8 @@ from io import BytesIO
 from datetime import datetime
 import pandas as pd
 
+from src.time_index import ten_minute_bin
+
 try:
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4, letter
@@ -489,9 +491,7 @@ def generate_comprehensive_t31_report(t31_data: pd.DataFrame, sward_config: pd.D
     elements.append(Paragraph("Equipment Operation Time (Top 20)", heading_style))
     
     if 'time' in t31_data.columns:
-        t31_copy = t31_data.copy()
-        t31_copy['time'] = pd.to_datetime(t31_copy['time'])
-        t31_copy['time_bin'] = (t31_copy['time'].dt.hour * 6 + t31_copy['time'].dt.minute // 10)
+        t31_copy = pd.DataFrame({'mac': t31_data['mac'].to_numpy(), 'time_bin': ten_minute_bin(t31_data)})
         
         mac_operation = t31_copy.groupby('mac')['time_bin'].nunique().reset_index()
         mac_operation.columns = ['MAC Address', 'Active Bins']
@@ -682,4 +682,226 @@ def generate_comprehensive_t41_report(t41_data: pd.DataFrame, sward_config: pd.D
                               ParagraphStyle('Footer', alignment=TA_CENTER, fontSize=8, textColor=colors.grey)))
     
     doc.build(elements)
-    return buffer.getvalue()
\ No newline at end of file
+    return buffer.getvalue()
+
+# ============================================================================
+# 캐시 집계 기반 보고서 (Streamlit / 원본 데이터 없이 생성 - batch_reports에서 사용)
+# ============================================================================
+
+def _cached_table(table_data: list, col_widths: list, header_color: str, total_row: bool = False,
+                  total_color: str = None, font_size: int = 9):
+    """캐시 보고서 공통 표 스타일"""
+    table = Table(table_data, colWidths=col_widths)
+    style = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -2 if total_row else -1), [colors.white, colors.HexColor('#f5f5f5')]),
+    ]
+    if total_row:
+        style += [
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor(total_color or '#f0f4f8')),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ]
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def _insight_paragraphs(insight, normal_style) -> list:
+    """캐시된 AI 인사이트 (markdown 문자열 또는 findings / recommendations dict) → Paragraph 목록"""
+    import re
+
+    elements = []
+    if isinstance(insight, dict):
+        for finding in insight.get('findings', []):
+            elements.append(Paragraph(f"• {finding.get('title', '')}: {finding.get('description', '')}", normal_style))
+        for i, rec in enumerate(insight.get('recommendations', []), 1):
+            elements.append(Paragraph(f"{i}. {rec}", normal_style))
+    elif isinstance(insight, str):
+        for line in insight.splitlines():
+            line = line.strip()
+            if not line or line == '*':
+                continue
+            line = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', line)
+            line = re.sub(r'^- ', '• ', line)
+            # Helvetica에 없는 이모지 제거
+            line = ''.join(ch for ch in line if ord(ch) < 0x2000)
+            elements.append(Paragraph(line.strip(), normal_style))
+    return elements
+
+
+def _cached_cover(elements: list, title: str, title_color: str, dataset_label: str, summary_rows: list,
+                  summary_bg: str, styles):
+    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=22, alignment=TA_CENTER,
+                                 spaceAfter=20, textColor=colors.HexColor(title_color))
+    elements.append(Spacer(1, 1.5*inch))
+    elements.append(Paragraph(title, title_style))
+    elements.append(Paragraph(dataset_label, ParagraphStyle('Sub', alignment=TA_CENTER, textColor=colors.grey)))
+    elements.append(Spacer(1, 0.5*inch))
+
+    summary_table = Table([['Metric', 'Value']] + summary_rows, colWidths=[2.5*inch, 2.5*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(title_color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(summary_bg)),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.white),
+    ]))
+    elements.append(summary_table)
+    elements.append(PageBreak())
+
+
+def _footer(elements: list):
+    elements.append(Spacer(1, inch))
+    elements.append(Paragraph("Generated by TJLABS Hy-con & IRFM System",
+                              ParagraphStyle('Footer', alignment=TA_CENTER, fontSize=8, textColor=colors.grey)))
+
+
+def generate_cached_t31_report(cache_loader, dataset_label: str = '') -> bytes:
+    """
+    T31 Equipment 보고서 - 사전 처리된 캐시 집계만 사용 (원본 / Streamlit 불필요)
+
+    generate_comprehensive_t31_report와 같은 구성:
+    요약, Building/Level별 장비 수, 시간대별 가동률, 장비별 활동 (Top 20), AI 인사이트
+    """
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("reportlab is required for PDF generation")
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
+    styles = getSampleStyleSheet()
+    heading_style = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=14, spaceAfter=10,
+                                   spaceBefore=15, textColor=colors.HexColor('#333'))
+    normal_style = ParagraphStyle('Normal', parent=styles['Normal'], fontSize=10, spaceAfter=6, leading=12)
+    elements = []
+
+    summary = cache_loader.get_summary() or {}
+    device_stats = cache_loader.load_t31_device_stats()
+    total_equipment = summary.get('t31_devices', device_stats['mac'].nunique() if 'mac' in device_stats.columns else 0)
+    _cached_cover(elements, "T31 Equipment Analysis Report", '#1a73e8', dataset_label, [
+        ['Total Equipment', f"{total_equipment:,}"],
+        ['Total Signal Records', f"{summary.get('t31_records', 0):,}"],
+        ['Monitoring Period', ', '.join(summary.get('dates', [])) or '24 hours'],
+        ['Report Generated', datetime.now().strftime('%Y-%m-%d %H:%M')],
+    ], '#f0f4f8', styles)
+
+    # Building/Level Breakdown
+    elements.append(Paragraph("Equipment Distribution by Building & Level", heading_style))
+    building_level = cache_loader.load_t31_building_level_equipment()
+    if not building_level.empty:
+        table_data = [['Building', 'Level', 'Equipment Count']]
+        for row in building_level.itertuples(index=False):
+            table_data.append([str(row.building), str(row.level), f"{row.equipment_count:,}"])
+        table_data.append(['TOTAL', '-', f"{total_equipment:,}"])
+        elements.append(_cached_table(table_data, [2*inch, 1.5*inch, 1.5*inch], '#4CAF50',
+                                      total_row=True, total_color='#E8F5E9', font_size=10))
+    elements.append(Spacer(1, 20))
+
+    # Hourly operation rate
+    elements.append(Paragraph("Hourly Operation Rate", heading_style))
+    hourly = cache_loader.load_t31_hourly_operation_rate()
+    if not hourly.empty:
+        table_data = [['Hour', 'Active Equipment', 'Total Equipment', 'Operation Rate']]
+        for row in hourly.sort_values('hour').itertuples(index=False):
+            table_data.append([f"{int(row.hour):02d}:00", f"{row.active_equipment}", f"{row.total_equipment}",
+                               f"{row.operation_rate:.1f}%"])
+        elements.append(_cached_table(table_data, [1*inch, 1.4*inch, 1.4*inch, 1.4*inch], '#2196F3'))
+    elements.append(PageBreak())
+
+    # Equipment activity (Top 20)
+    elements.append(Paragraph("Equipment Activity (Top 20)", heading_style))
+    if not device_stats.empty:
+        top = device_stats.nlargest(20, 'record_count')
+        table_data = [['Equipment MAC', 'Signals', 'S-Wards', 'Active Span']]
+        for row in top.itertuples(index=False):
+            table_data.append([str(row.mac)[:12] + '...', f"{row.record_count:,}", f"{row.sward_count}",
+                               f"{row.duration_minutes / 60:.1f} hrs"])
+        elements.append(_cached_table(table_data, [2.2*inch, 1*inch, 1*inch, 1.2*inch], '#2196F3'))
+    elements.append(PageBreak())
+
+    # AI Insights
+    elements.append(Paragraph("AI Analysis & Recommendations", heading_style))
+    elements.extend(_insight_paragraphs(cache_loader.load_ai_insights('t31'), normal_style))
+    _footer(elements)
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def generate_cached_t41_report(cache_loader, dataset_label: str = '') -> bytes:
+    """
+    T41 Worker 보고서 - 사전 처리된 캐시 집계만 사용 (원본 / Streamlit 불필요)
+
+    generate_comprehensive_t41_report와 같은 구성:
+    요약, Building/Level별 작업자 수, 시간대별 작업자 수, 신호 수 Top 20 작업자, AI 인사이트
+    """
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("reportlab is required for PDF generation")
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
+    styles = getSampleStyleSheet()
+    heading_style = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=14, spaceAfter=10,
+                                   spaceBefore=15, textColor=colors.HexColor('#333'))
+    normal_style = ParagraphStyle('Normal', parent=styles['Normal'], fontSize=10, spaceAfter=6, leading=12)
+    elements = []
+
+    summary = cache_loader.get_summary() or {}
+    worker_dwell = cache_loader.load_t41_worker_dwell()
+    total_workers = summary.get('t41_workers', worker_dwell['mac'].nunique() if 'mac' in worker_dwell.columns else 0)
+    summary_rows = [
+        ['Total Workers', f"{total_workers:,}"],
+        ['Total Signal Records', f"{summary.get('t41_records', 0):,}"],
+        ['Monitoring Period', ', '.join(summary.get('dates', [])) or '24 hours'],
+    ]
+    congestion = cache_loader.get_t41_congestion_info()
+    if congestion:
+        summary_rows.append(['Congestion Score', str(congestion['score'])])
+    _cached_cover(elements, "T41 Worker Analysis Report", '#34a853', dataset_label, summary_rows, '#e8f5e9', styles)
+
+    # Worker Distribution by Building/Level
+    elements.append(Paragraph("Worker Distribution by Building & Level", heading_style))
+    building_level = cache_loader.load_t41_building_level_workers()
+    if not building_level.empty:
+        table_data = [['Building', 'Level', 'Worker Count']]
+        for row in building_level.itertuples(index=False):
+            table_data.append([str(row.building), str(row.level), f"{row.worker_count:,}"])
+        table_data.append(['TOTAL', '-', f"{total_workers:,}"])
+        elements.append(_cached_table(table_data, [2*inch, 1.5*inch, 1.5*inch], '#FF9800',
+                                      total_row=True, total_color='#FFF3E0', font_size=10))
+    elements.append(Spacer(1, 20))
+
+    # Hourly workers
+    elements.append(Paragraph("Workers by Hour", heading_style))
+    hourly = cache_loader.load_t41_hourly_workers()
+    if not hourly.empty:
+        table_data = [['Hour', 'Workers']]
+        for row in hourly.sort_values('hour').itertuples(index=False):
+            table_data.append([f"{int(row.hour):02d}:00", f"{row.worker_count:,}"])
+        elements.append(_cached_table(table_data, [1.5*inch, 1.5*inch], '#34a853'))
+    elements.append(PageBreak())
+
+    # Top Active Workers (record_count = 작업자별 신호 수)
+    elements.append(Paragraph("Most Active Workers (Top 20)", heading_style))
+    if not worker_dwell.empty:
+        top = worker_dwell.nlargest(20, 'record_count')
+        table_data = [['Worker MAC', 'Signal Count', 'Dwell Time']]
+        for row in top.itertuples(index=False):
+            table_data.append([str(row.mac)[:12] + '...', f"{row.record_count:,}", f"{row.dwell_time_minutes} min"])
+        elements.append(_cached_table(table_data, [2.5*inch, 1.5*inch, 1.5*inch], '#9C27B0'))
+    elements.append(PageBreak())
+
+    # AI Insights
+    elements.append(Paragraph("AI Analysis & Safety Recommendations", heading_style))
+    elements.extend(_insight_paragraphs(cache_loader.load_ai_insights('t41'), normal_style))
+    _footer(elements)
+
+    doc.build(elements)
+    return buffer.getvalue()
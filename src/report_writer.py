@@ -0,0 +1,171 @@
+"""
+Report Writer Module
+대용량 PDF 보고서를 메모리 대신 디스크로 페이지 단위 스트리밍
+
+PdfPages(io.BytesIO())는 문서 전체를 메모리에 쌓고, matplotlib PDF backend는
+imshow / figimage 이미지 데이터를 문서를 닫을 때(finalize)까지 보관합니다.
+장비 수백 대 × 여러 층의 히트맵 페이지가 있는 사이트에서는 이 두 가지가 메모리 급증의 원인입니다.
+
+    with StreamingPdfPages("T31_Report.pdf") as pdf:
+        pdf.savefig(fig, bbox_inches='tight')      # 페이지 기록 후 figure 즉시 close
+        ...
+    with open_report(pdf.path) as f:                # 다운로드용 file handle
+        st.download_button("Download", data=f, file_name=pdf.filename)
+
+    - 페이지는 output/report_files/의 임시 파일에 바로 기록되고 완료 시 atomic rename
+    - 페이지마다 이미지 XObject를 파일로 flush하고 원본 배열 참조를 해제
+      (in-flight 메모리는 페이지 1개 분량으로 제한)
+    - 오래된 보고서 파일은 REPORT_MAX_AGE_HOURS 후 정리
+"""
+
+import gc
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+REPORT_OUTPUT_DIR = Path('./output/report_files')
+REPORT_MAX_AGE_HOURS = 24
+PREVIEW_MAX_BYTES = 5 * 1024 * 1024     # 이보다 큰 PDF는 base64 iframe 미리보기 생략
+
+
+def report_file_path(filename: str, output_dir: Optional[Path] = None) -> Path:
+    """보고서 출력 경로 (폴더 생성 + 오래된 파일 정리)"""
+    output_dir = Path(output_dir) if output_dir is not None else REPORT_OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cleanup_old_reports(output_dir)
+    return output_dir / filename
+
+
+def cleanup_old_reports(output_dir: Optional[Path] = None, max_age_hours: float = REPORT_MAX_AGE_HOURS) -> int:
+    """max_age_hours보다 오래된 보고서 / 남은 임시 파일 삭제 → 삭제 개수"""
+    output_dir = Path(output_dir) if output_dir is not None else REPORT_OUTPUT_DIR
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return removed
+
+
+def open_report(path) -> Optional[object]:
+    """다운로드용 binary file handle (파일이 없으면 None)"""
+    try:
+        return open(path, 'rb')
+    except OSError:
+        return None
+
+
+# ========== matplotlib 이미지 flush ==========
+
+class _ImageFlusher:
+    """PdfFile의 보류 중인 이미지 XObject를 페이지마다 파일에 기록
+
+    matplotlib는 이미지를 id(image) key로 _images에 보관하다가 finalize()에서 기록합니다.
+    기록한 항목은 (이름, object 참조)만 남긴 placeholder key로 옮겨 finalize의 XObject 목록은
+    유지하고, 원본 배열 참조는 해제합니다. matplotlib 내부 구조가 다르면 아무것도 하지 않습니다.
+    """
+
+    def __init__(self, pdf_pages: PdfPages):
+        self._pdf_pages = pdf_pages
+        self._file = None
+        self.enabled = True
+        self.flushed = 0
+
+    def _bind(self) -> bool:
+        """PdfFile은 첫 savefig에서 생성되므로 첫 flush 시점에 연결"""
+        if self._file is None and self.enabled:
+            pdf_file = getattr(self._pdf_pages, '_file', None)
+            if pdf_file is None:
+                return False
+            self.enabled = (
+                isinstance(getattr(pdf_file, '_images', None), dict)
+                and hasattr(pdf_file, '_unpack') and hasattr(pdf_file, '_writeImg')
+            )
+            if self.enabled:
+                self._file = pdf_file
+                # finalize()의 writeImages는 아직 기록하지 않은 이미지만 처리
+                pdf_file.writeImages = self.flush
+        return self._file is not None
+
+    def flush(self):
+        if not self._bind():
+            return
+        images = self._file._images
+        for key in [k for k in images if not (isinstance(k, tuple) and k[0] == 'flushed')]:
+            img, name, ob = images.pop(key)
+            data, adata = self._file._unpack(img)
+            if adata is not None:
+                smask_object = self._file.reserveObject("smask")
+                self._file._writeImg(adata, smask_object.id)
+            else:
+                smask_object = None
+            self._file._writeImg(data, ob.id, smask_object)
+            images[('flushed', name)] = (None, name, ob)
+            self.flushed += 1
+
+
+# ========== Streaming PdfPages ==========
+
+class StreamingPdfPages:
+    """디스크로 바로 기록하는 PdfPages (savefig 호환, 페이지마다 figure / 이미지 해제)"""
+
+    def __init__(self, filename: str, output_dir: Optional[Path] = None, metadata: Optional[dict] = None):
+        self.path = report_file_path(filename, output_dir)
+        self.filename = self.path.name
+        # 같은 파일명을 여러 세션(thread)이 동시에 쓸 수 있으므로 pid + thread id로 구분
+        self._tmp_path = self.path.with_name(f".{self.filename}.tmp{os.getpid()}.{threading.get_ident()}")
+        self._metadata = metadata
+        self._pdf: Optional[PdfPages] = None
+        self._flusher: Optional[_ImageFlusher] = None
+        self.page_count = 0
+
+    def __enter__(self):
+        self._pdf = PdfPages(self._tmp_path, metadata=self._metadata)
+        self._flusher = _ImageFlusher(self._pdf)
+        return self
+
+    def savefig(self, figure=None, **kwargs):
+        """페이지 기록 → figure close → 이미지 flush → figure 순환 참조 즉시 회수"""
+        figure = figure if figure is not None else plt.gcf()
+        try:
+            self._pdf.savefig(figure, **kwargs)
+            self.page_count += 1
+        finally:
+            plt.close(figure)
+        self._flusher.flush()
+        gc.collect()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._pdf.close()
+        except Exception:
+            if exc_type is None:
+                raise
+        if exc_type is None and self.page_count:
+            os.replace(self._tmp_path, self.path)
+        else:
+            try:
+                os.unlink(self._tmp_path)
+            except OSError:
+                pass
+        return False
+
+    @property
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
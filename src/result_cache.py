@@ -0,0 +1,217 @@
+"""
+Result Cache Module
+데이터셋 단위 결과 캐시 (프로세스 공용)
+
+무거운 순수 계산 함수의 결과를 아래 key로 보관합니다.
+    (dataset id, cache config_hash, 함수 이름, 인자 fingerprint, 함수가 참조하는 session_state 값)
+
+`st.cache_data.clear()`처럼 전체 캐시를 비우지 않고, 데이터셋이 다시 생성되거나 갱신된 경우
+(config_hash / updated_at 변경) 해당 데이터셋의 결과만 무효화합니다.
+
+    @cached_result(session_keys=('tward41_min_dwell_time',))
+    def analyze_dwell_times(activity_analysis):
+        ...
+
+    set_dataset_context('Yongin_Cluster_20250909', '3d32a230', updated_at)   # 데이터셋 선택 시
+    invalidate_dataset('Yongin_Cluster_20250909')                             # 데이터셋 재생성 / 갱신 시
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.frame_fingerprint import fingerprint
+from src.tracing import get_logger, span
+
+log = get_logger(__name__)
+
+PROCESSING_DATASET_ID = 'processing'
+CONTEXT_SESSION_KEY = '_result_cache_context'
+
+
+class UnhashableArgument(TypeError):
+    """캐시 key를 만들 수 없는 인자 (캐시 없이 직접 계산)"""
+
+
+# ========== 인자 fingerprint ==========
+
+def _digest(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def fingerprint_value(value: Any) -> str:
+    """인자 값 → 캐시 key 문자열 (DataFrame / Series는 frame_fingerprint content id 사용)"""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return f"{type(value).__name__}:{value!r}"
+    if isinstance(value, pd.DataFrame):
+        return f"df:{value.shape}:{fingerprint(value)}"
+    if isinstance(value, pd.Series):
+        return f"series:{len(value)}:{value.name!r}:{fingerprint(value)}"
+    if isinstance(value, np.ndarray):
+        return f"ndarray:{value.dtype}:{value.shape}:{_digest(np.ascontiguousarray(value).tobytes())}"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}:[{','.join(fingerprint_value(v) for v in value)}]"
+    if isinstance(value, dict):
+        items = sorted((repr(k), fingerprint_value(v)) for k, v in value.items())
+        return f"dict:{{{','.join(f'{k}={v}' for k, v in items)}}}"
+    raise UnhashableArgument(f"Cannot fingerprint argument of type {type(value).__name__}")
+
+
+def _copy_result(value: Any) -> Any:
+    """캐시된 DataFrame을 호출자가 수정해도 캐시가 바뀌지 않도록 복사본 반환"""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+
+# ========== 캐시 저장소 ==========
+
+class ResultCache:
+    """(dataset_id, config_hash, function, args) → 결과 (LRU)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._config_hashes: Dict[str, Optional[str]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def register_dataset(self, dataset_id: str, config_hash: Optional[str]):
+        """데이터셋의 현재 config_hash 기록 - 변경되었으면 이전 결과 무효화"""
+        with self._lock:
+            previous = self._config_hashes.get(dataset_id, config_hash)
+            if previous != config_hash:
+                self.invalidate(dataset_id=dataset_id)
+            self._config_hashes[dataset_id] = config_hash
+
+    def invalidate(self, dataset_id: Optional[str] = None, function: Optional[str] = None) -> int:
+        """조건에 맞는 결과 삭제 (조건이 없으면 전체), 삭제 건수 반환"""
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (dataset_id is None or key[0] == dataset_id)
+                    and (function is None or key[2] == function)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def snapshot(self) -> List[Tuple[Tuple, Any]]:
+        """(key, 결과) 목록 (메모리 측정용)"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'datasets': sorted({key[0] for key in self._entries})
+            }
+
+
+# 프로세스 공용 인스턴스 (모든 세션이 공유)
+result_cache = ResultCache()
+
+
+# ========== 데이터셋 context (세션별) ==========
+
+def set_dataset_context(dataset_id: str, config_hash: Optional[str] = None, version: Optional[str] = None):
+    """현재 세션의 데이터셋 설정 (Dashboard: 선택한 데이터셋 / Processing: 'processing')
+
+    Args:
+        version: 데이터셋 내용 버전 (metadata.json의 updated_at) - 증분 추가 / 파티션 재작성 시 바뀜
+    """
+    cache_key = config_hash if version is None else f"{config_hash}@{version}"
+    result_cache.register_dataset(dataset_id, cache_key)
+    st.session_state[CONTEXT_SESSION_KEY] = (dataset_id, cache_key)
+
+
+def _session_get(key: str, default: Any = None) -> Any:
+    try:
+        return st.session_state.get(key, default)
+    except Exception:
+        # Streamlit 실행 context 밖 (스크립트 / 배치)
+        return default
+
+
+def get_dataset_context() -> Tuple[str, Optional[str]]:
+    return _session_get(CONTEXT_SESSION_KEY, (PROCESSING_DATASET_ID, None))
+
+
+def invalidate_dataset(dataset_id: str) -> int:
+    """데이터셋이 다시 생성된 경우 해당 데이터셋의 결과 삭제"""
+    return result_cache.invalidate(dataset_id=dataset_id)
+
+
+# ========== Decorator ==========
+
+def cached_result(func: Optional[Callable] = None, *, session_keys: Sequence[str] = (),
+                  cache: Optional[ResultCache] = None):
+    """함수 결과를 데이터셋 단위 결과 캐시에 보관
+
+    Args:
+        session_keys: 함수 내부에서 참조하는 st.session_state key (값이 key에 포함됨)
+        cache: 사용할 캐시 (기본: 프로세스 공용 result_cache)
+
+    None 결과(오류 등)는 저장하지 않으며, fingerprint를 만들 수 없는 인자는 캐시 없이 계산합니다.
+    """
+    def decorator(fn):
+        function_name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            store = cache or result_cache
+            dataset_id, config_hash = get_dataset_context()
+            try:
+                session_values = {key: _session_get(key) for key in session_keys}
+                args_key = _digest(fingerprint_value([list(args), kwargs, session_values]).encode())
+            except UnhashableArgument:
+                return fn(*args, **kwargs)
+
+            key: Tuple[Hashable, ...] = (dataset_id, config_hash, function_name, args_key)
+            with span(f"result_cache:{fn.__name__}") as s:
+                found, value = store.get(key)
+                if found:
+                    s.cache_hit()
+                    log.info(f"⚡ Result cache hit: {fn.__name__}")
+                    return _copy_result(value)
+
+                s.cache_miss()
+                value = fn(*args, **kwargs)
+                if value is not None:
+                    store.put(key, _copy_result(value))
+                return value
+
+        wrapper.cache_function_name = function_name
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -0,0 +1,421 @@
+"""
+Session Memory Module
+세션별 메모리 사용량 측정 (session_state key / CachedDataLoader._cache entry) + 세션 한도 초과 시 eviction
+
+Dashboard / Processing 모드는 raw frame, 분석 결과, cache_loader 등을 세션마다 st.session_state에 보관합니다.
+rerun이 끝날 때마다 현재 세션을 측정하여 프로세스 공용 registry에 기록하고,
+세션 한도를 넘으면 다시 만들 수 있는(reconstructible) entry를 실제로 해제되는 크기가 큰 순서로 제거합니다.
+
+    track_session(st.session_state, 'dashboard')    # main()에서 rerun마다
+    render_memory_panel(st)                         # admin 패널: 프로세스 / 세션 / entry별 사용량
+
+크기 측정:
+    - DataFrame / Series / Index: memory_usage(deep=True) (같은 객체는 재측정하지 않음)
+    - numpy 배열: nbytes (memory-mapped 배열은 page cache이므로 제외)
+    - dict / list / 일반 객체: 재귀 합산 (같은 객체는 1회만)
+    - 여러 entry가 같은 DataFrame을 참조하면 세션 합계에는 1회만 포함
+
+reconstructible entry (제거해도 다음 rerun / 다음 사용 시 다시 만들어짐):
+    - CachedDataLoader._cache: 모든 entry (캐시 폴더에서 다시 로드)
+    - Dashboard: tward41_data + type41_activity_analysis + type41_journey_heatmap (함께 다시 로드), tward31_data, flow_data
+    - Processing: tward41_processed_data, tward41_location_results, tward31_analysis_results (업로드 원본에서 재계산)
+업로드한 원본 (Processing 모드의 tward31_data 등)은 제거하지 않습니다.
+
+세션 한도: 세션마다 admin 패널에서 설정 (st.session_state['_memory_limit_mb']),
+설정하지 않은 세션은 환경 변수 IRFM_SESSION_MEMORY_MB (기본 2048, 0 = 제한 없음)
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+import weakref
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.tracing import get_logger, span
+
+log = get_logger(__name__)
+
+SESSION_LIMIT_ENV = 'IRFM_SESSION_MEMORY_MB'
+SESSION_LIMIT_KEY = '_memory_limit_mb'
+DEFAULT_SESSION_LIMIT_MB = 2048
+SESSION_TTL_SECONDS = 3600      # 이 시간 동안 rerun이 없는 세션은 registry에서 제거
+BLOCK_MIN_BYTES = 64 * 1024     # 이 크기 이상의 객체는 entry 간 공유 여부를 추적
+MAX_DEPTH = 8
+MB = 1024 * 1024
+
+SCOPE_SESSION = 'session_state'
+SCOPE_LOADER = 'loader_cache'
+
+# 모드별 reconstructible session_state key 묶음 (묶음 단위로 함께 제거)
+RECONSTRUCTIBLE_KEYS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    'dashboard': (
+        ('tward41_data', 'type41_activity_analysis', 'type41_journey_heatmap'),
+        ('tward31_data',),
+        ('flow_data',),
+    ),
+    'processing': (
+        ('tward41_processed_data',),
+        ('tward41_location_results',),
+        ('tward31_analysis_results',),
+    ),
+}
+
+
+def _env_limit_mb() -> int:
+    try:
+        return max(int(os.environ.get(SESSION_LIMIT_ENV, DEFAULT_SESSION_LIMIT_MB)), 0)
+    except ValueError:
+        return DEFAULT_SESSION_LIMIT_MB
+
+
+_default_limit_mb = _env_limit_mb()
+
+
+def get_session_limit_mb(session_state=None) -> int:
+    """세션 한도 (MB, 0 = 제한 없음): 이 세션의 설정값, 없으면 IRFM_SESSION_MEMORY_MB"""
+    value = session_state.get(SESSION_LIMIT_KEY) if session_state is not None else None
+    if value is None:
+        return _default_limit_mb
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return _default_limit_mb
+
+
+# ========== 크기 측정 ==========
+
+_frame_sizes: Dict[int, Tuple[Any, Tuple, int]] = {}     # id → (weakref, signature, bytes)
+_frame_sizes_lock = threading.Lock()
+
+
+def _frame_bytes(obj) -> int:
+    """DataFrame / Series / Index deep 크기 (같은 객체 + 같은 shape / 컬럼이면 이전 측정값 재사용)"""
+    signature = (obj.shape, tuple(map(str, obj.columns)) if isinstance(obj, pd.DataFrame) else None)
+    key = id(obj)
+    with _frame_sizes_lock:
+        cached = _frame_sizes.get(key)
+        if cached is not None and cached[0]() is obj and cached[1] == signature:
+            return cached[2]
+    usage = obj.memory_usage(deep=True)
+    size = int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    try:
+        ref = weakref.ref(obj, lambda _, key=key: _frame_sizes.pop(key, None))
+    except TypeError:
+        return size
+    with _frame_sizes_lock:
+        _frame_sizes[key] = (ref, signature, size)
+    return size
+
+
+def _is_loader(obj) -> bool:
+    return type(obj).__name__ == 'CachedDataLoader' and isinstance(getattr(obj, '_cache', None), dict)
+
+
+def _walk(obj, seen: set, blocks: Dict[int, int], loaders: Dict[int, Any], depth: int = 0) -> int:
+    """obj가 참조하는 메모리 합계 (seen에 있는 객체 제외), 큰 객체는 blocks에 기록"""
+    oid = id(obj)
+    if oid in seen:
+        return 0
+    seen.add(oid)
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        size = _frame_bytes(obj)
+    elif isinstance(obj, np.memmap):
+        return 0    # 파일 page cache (세션 메모리 아님)
+    elif isinstance(obj, np.ndarray):
+        size = obj.nbytes
+    elif isinstance(obj, (types.ModuleType, types.FunctionType, types.BuiltinFunctionType, type)):
+        return 0    # 코드 / 모듈은 프로세스 공용
+    elif _is_loader(obj):
+        loaders[oid] = obj      # loader cache entry는 별도로 측정
+        return sys.getsizeof(obj)
+    else:
+        size = sys.getsizeof(obj)
+        if depth < MAX_DEPTH:
+            if isinstance(obj, dict):
+                for k, v in list(obj.items()):
+                    size += _walk(k, seen, blocks, loaders, depth + 1) + _walk(v, seen, blocks, loaders, depth + 1)
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                for item in list(obj):
+                    size += _walk(item, seen, blocks, loaders, depth + 1)
+            elif not isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)):
+                attrs = getattr(obj, '__dict__', None)
+                if isinstance(attrs, dict):
+                    size += _walk(attrs, seen, blocks, loaders, depth + 1)
+        return size
+
+    if size >= BLOCK_MIN_BYTES:
+        blocks[oid] = size
+    return size
+
+
+def deep_sizeof(obj) -> int:
+    """객체 1개의 deep 크기 (bytes)"""
+    return _walk(obj, set(), {}, {})
+
+
+class MemoryEntry(NamedTuple):
+    scope: str                  # SCOPE_SESSION / SCOPE_LOADER
+    key: str
+    bytes: int
+    kind: str
+    group: Optional[str]        # eviction 단위 (None = reconstructible 아님)
+    private_bytes: int          # blocks 외 (공유 추적하지 않는) 크기
+    blocks: Dict[int, int]      # 큰 객체 id → bytes (entry 간 공유 여부 판단)
+    owner: Any = None           # SCOPE_LOADER: CachedDataLoader
+
+    @property
+    def reconstructible(self) -> bool:
+        return self.group is not None
+
+
+def _kind(value) -> str:
+    if isinstance(value, pd.DataFrame):
+        return f"DataFrame {value.shape[0]:,}×{value.shape[1]}"
+    return type(value).__name__
+
+
+def _entry(scope: str, key: str, value, group: Optional[str], loaders: Dict[int, Any], owner=None) -> MemoryEntry:
+    blocks: Dict[int, int] = {}
+    size = _walk(value, set(), blocks, loaders)
+    return MemoryEntry(scope, key, size, _kind(value), group, size - sum(blocks.values()), blocks, owner)
+
+
+def measure_session(session_state, reconstructible: Sequence[Sequence[str]] = ()) -> List[MemoryEntry]:
+    """session_state key별 + (세션이 참조하는) CachedDataLoader._cache entry별 크기"""
+    groups = {key: '+'.join(keys) for keys in reconstructible for key in keys}
+    loaders: Dict[int, Any] = {}
+    entries = [
+        _entry(SCOPE_SESSION, str(key), value, groups.get(key), loaders)
+        for key, value in list(session_state.items())
+    ]
+    for loader in loaders.values():
+        for key, value in loader.cache_entries().items():
+            entries.append(_entry(SCOPE_LOADER, key, value, f"loader:{key}", {}, owner=loader))
+    return entries
+
+
+def unique_bytes(entries: Sequence[MemoryEntry]) -> int:
+    """entry 합계 (여러 entry가 참조하는 큰 객체는 1회만)"""
+    blocks: Dict[int, int] = {}
+    for entry in entries:
+        blocks.update(entry.blocks)
+    return sum(entry.private_bytes for entry in entries) + sum(blocks.values())
+
+
+# ========== Eviction ==========
+
+def _eviction_units(entries: Sequence[MemoryEntry]) -> List[Tuple[str, ...]]:
+    """같은 큰 객체를 참조하는 reconstructible group을 하나의 제거 단위로 묶음
+
+    예: session_state의 type41_activity_analysis와 loader cache의 compact:t41_results_activity_analysis는
+    같은 DataFrame이므로 둘 중 하나만 제거하면 메모리가 해제되지 않습니다.
+    """
+    parent: Dict[str, str] = {}
+
+    def find(group):
+        while parent[group] != group:
+            parent[group] = parent[parent[group]]
+            group = parent[group]
+        return group
+
+    owner_of_block: Dict[int, str] = {}
+    for entry in entries:
+        if entry.group is None:
+            continue
+        parent.setdefault(entry.group, entry.group)
+        for block in entry.blocks:
+            other = owner_of_block.setdefault(block, entry.group)
+            parent[find(entry.group)] = find(other)
+    units: Dict[str, List[str]] = {}
+    for group in parent:
+        units.setdefault(find(group), []).append(group)
+    return [tuple(sorted(groups)) for groups in units.values()]
+
+
+def plan_eviction(entries: Sequence[MemoryEntry], limit_bytes: int) -> List[str]:
+    """한도 이하가 될 때까지 제거할 group 목록 (실제로 해제되는 크기가 큰 제거 단위부터)"""
+    remaining = list(entries)
+    units = _eviction_units(entries)
+    plan: List[str] = []
+    total = unique_bytes(remaining)
+    while total > limit_bytes and units:
+        def freed(unit):
+            return total - unique_bytes([e for e in remaining if e.group not in unit])
+        best = max(sorted(units), key=freed)
+        units.remove(best)
+        remaining = [e for e in remaining if e.group not in best]
+        plan.extend(best)
+        total = unique_bytes(remaining)
+    return plan
+
+
+def apply_eviction(session_state, entries: Sequence[MemoryEntry], plan: Sequence[str]) -> List[Dict]:
+    """plan의 group을 session_state / loader cache에서 제거 → 제거 기록"""
+    evicted = []
+    for group in plan:
+        members = [e for e in entries if e.group == group]
+        for entry in members:
+            if entry.scope == SCOPE_LOADER:
+                entry.owner.evict(entry.key)
+            else:
+                session_state.pop(entry.key, None)
+        evicted.append({
+            'group': group,
+            'keys': [f"{e.scope}:{e.key}" for e in members],
+            'bytes': sum(e.bytes for e in members),
+        })
+    return evicted
+
+
+# ========== 프로세스 공용 registry ==========
+
+class SessionMemoryRegistry:
+    """세션 id → 마지막 측정 결과"""
+
+    def __init__(self, ttl: float = SESSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._reports: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def update(self, session_id: str, report: Dict):
+        with self._lock:
+            previous = self._reports.get(session_id, {})
+            report['evictions'] = previous.get('evictions', 0) + len(report.get('evicted', []))
+            if not report.get('evicted') and previous.get('last_eviction'):
+                report['last_eviction'] = previous['last_eviction']
+            self._reports[session_id] = report
+
+    def snapshot(self) -> List[Dict]:
+        """최근 TTL 안에 측정된 세션 (오래된 세션은 제거)"""
+        now = time.time()
+        with self._lock:
+            for session_id in [s for s, r in self._reports.items() if now - r['updated'] > self.ttl]:
+                del self._reports[session_id]
+            return sorted(self._reports.values(), key=lambda r: r['total_bytes'], reverse=True)
+
+
+# 프로세스 공용 인스턴스 (모든 세션이 기록)
+session_registry = SessionMemoryRegistry()
+
+
+def _session_id() -> str:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        ctx = None
+    return ctx.session_id if ctx is not None else 'local'
+
+
+def _entry_record(entry: MemoryEntry) -> Dict:
+    return {'scope': entry.scope, 'key': entry.key, 'bytes': entry.bytes, 'kind': entry.kind,
+            'reconstructible': entry.reconstructible}
+
+
+def track_session(session_state, mode: str) -> Dict:
+    """현재 세션 측정 → 한도 초과 시 reconstructible entry 제거 → registry 기록"""
+    limit_bytes = get_session_limit_mb(session_state) * MB
+    with span('session_memory', mode=mode) as s:
+        reconstructible = RECONSTRUCTIBLE_KEYS.get(mode, ())
+        entries = measure_session(session_state, reconstructible)
+        total = unique_bytes(entries)
+        evicted = []
+        if limit_bytes and total > limit_bytes:
+            evicted = apply_eviction(session_state, entries, plan_eviction(entries, limit_bytes))
+            before = total
+            entries = measure_session(session_state, reconstructible)
+            total = unique_bytes(entries)
+            log.warning("Session memory %.0fMB > limit %dMB: evicted %s → %.0fMB", before / MB,
+                        limit_bytes // MB, [e['group'] for e in evicted] or 'nothing reconstructible', total / MB)
+        s.set(total_mb=round(total / MB, 1), evicted=len(evicted))
+
+    report = {
+        'session_id': _session_id(),
+        'mode': mode,
+        'updated': time.time(),
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+        'total_bytes': total,
+        'limit_bytes': limit_bytes,
+        'over_limit': bool(limit_bytes and total > limit_bytes),
+        'entries': [_entry_record(e) for e in sorted(entries, key=lambda e: e.bytes, reverse=True)],
+        'evicted': evicted,
+    }
+    if evicted:
+        report['last_eviction'] = {'at': report['updated_at'], 'evicted': evicted}
+    session_registry.update(report['session_id'], report)
+    return report
+
+
+def _current_rss_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def process_memory() -> Dict:
+    """프로세스 합계: RSS, 세션 수 / 합계, 프로세스 공용 결과 캐시 크기"""
+    from src.result_cache import result_cache
+    sessions = session_registry.snapshot()
+    seen: set = set()
+    return {
+        'rss_bytes': _current_rss_bytes(),
+        'sessions': len(sessions),
+        'session_bytes': sum(r['total_bytes'] for r in sessions),
+        'result_cache_bytes': sum(_walk(value, seen, {}, {}) for _, value in result_cache.snapshot()),
+    }
+
+
+# ========== Admin 패널 ==========
+
+def render_memory_panel(st):
+    """세션 메모리 패널: 이 세션의 한도 설정 + 프로세스 합계 / 세션별 / 현재 세션 entry별 사용량"""
+    with st.expander("🧠 Session memory (admin)", expanded=False):
+        st.number_input("Per-session limit for this session (MB, 0 = unlimited)", min_value=0, step=256,
+                        value=_default_limit_mb, key=SESSION_LIMIT_KEY,
+                        help=f"Applied from the next rerun. Default from {SESSION_LIMIT_ENV}.")
+
+        totals = process_memory()
+        cols = st.columns(4)
+        rss = totals['rss_bytes']
+        cols[0].metric("Process RSS", f"{rss / MB:,.0f} MB" if rss is not None else "n/a")
+        cols[1].metric("Sessions", totals['sessions'])
+        cols[2].metric("Session state", f"{totals['session_bytes'] / MB:,.0f} MB")
+        cols[3].metric("Result cache", f"{totals['result_cache_bytes'] / MB:,.0f} MB")
+
+        sessions = session_registry.snapshot()
+        if not sessions:
+            st.caption("No sessions measured yet.")
+            return
+        current_id = _session_id()
+        st.dataframe(pd.DataFrame([{
+            'session': r['session_id'][:8] + (' (this)' if r['session_id'] == current_id else ''),
+            'mode': r['mode'],
+            'total_MB': round(r['total_bytes'] / MB, 1),
+            'limit_MB': r['limit_bytes'] // MB or None,
+            'evictions': r.get('evictions', 0),
+            'updated_at': r['updated_at'],
+        } for r in sessions]), use_container_width=True, hide_index=True)
+
+        current = next((r for r in sessions if r['session_id'] == current_id), None)
+        if current is None:
+            return
+        table = pd.DataFrame(current['entries'])
+        if not table.empty:
+            table['MB'] = (table.pop('bytes') / MB).round(2)
+            st.dataframe(table[['scope', 'key', 'kind', 'MB', 'reconstructible']].head(30),
+                         use_container_width=True, hide_index=True)
+        last = current.get('last_eviction')
+        if last:
+            freed = sum(e['bytes'] for e in last['evicted']) / MB
+            st.caption(f"Last eviction {last['at']}: {', '.join(e['group'] for e in last['evicted'])} ({freed:,.0f} MB)")
+        if current.get('over_limit'):
+            st.warning("This session is over the limit but holds no reconstructible entries (uploaded data).")
@@ -0,0 +1,528 @@
+"""
+Synthetic Data Module
+sward_configuration.csv 기반 T31 / T41 / Flow raw 데이터 생성기 (seed 고정, 재현 가능)
+
+raw 파일은 저장소에 포함되지 않으므로 대규모 사이트 (예: 10× 작업자) 파이프라인 테스트용으로
+실제와 같은 [sward_id, mac, type, rssi, time] 스트림을 생성합니다.
+
+    python -m src.synthetic_data --scale 10 --days 3 --start 20250909 --format parquet
+    python -m src.synthetic_data --n-workers 5000 --n-equipment 300 --n-phones 0 --signal-rate 3
+
+    frames = generate_frames(SyntheticConfig(n_workers=200, n_phones=0))   # 메모리 내 DataFrame
+
+시뮬레이션:
+    - T41 (작업자): 주간 / 야간 교대, 출입구 → 작업 구역 체류 / 이동 (건물 / 층 간) → 점심 휴게 구역
+      헬멧 착용 시 signal_rate, 미착용 / 휴식 시 낮은 신호 빈도 (Active ≥3 signals/min 판정에 반영)
+      일부 태그는 하루 종일 한 곳에 방치 (idle tag)
+    - T31 (장비): 고정 위치, 하루 여러 번의 가동 cycle 동안만 신호
+    - Flow (휴대폰): 출퇴근 / 점심 peak 방문, Apple(1) / Android(10), MAC 주소 주기적 randomization
+    - RSSI: log-distance path loss + noise, 같은 층의 S-Ward 중 감도 이상인 상위 max_receivers개가
+      detection_rate 확률로 수신 (scan 누락)
+
+출력: <output>/<site>_<YYYYMMDD>/{T31,T41,TMobile}_<site>_<YYYYMMDD>.{csv,parquet} + synthetic_manifest.json
+CSV는 업로드 파일과 같이 header 없이 기록합니다. 같은 seed / 설정이면 일자별 내용이 항상 같습니다
+(시작일과 무관하게 날짜 기준으로 난수 stream을 분리).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+RAW_COLUMNS = ['sward_id', 'mac', 'type', 'rssi', 'time']
+DEFAULT_OUTPUT_DIR = Path('./output/synthetic')
+DEFAULT_SWARD_CONFIG = Path(__file__).resolve().parent.parent / 'Datafile' / 'sward_configuration.csv'
+MANIFEST_FILE = 'synthetic_manifest.json'
+
+STREAMS = ('t41', 't31', 'flow')
+STREAM_FILE_PREFIX = {'t31': 'T31', 't41': 'T41', 'flow': 'TMobile'}
+_STREAM_IDS = {'t41': 41, 't31': 31, 'flow': 7}
+
+TYPE_T31 = 31
+TYPE_T41 = 41
+FLOW_TYPE_APPLE = 1
+FLOW_TYPE_ANDROID = 10
+
+WINDOW_SECONDS = 15 * 60          # 시간 창 단위로 생성 / 기록 (파일 내 시간 순서 유지, 메모리 제한)
+_RECEIVE_CHUNK = 250_000          # 수신 계산 시 한 번에 처리하는 신호 수
+_DAY_SECONDS = 24 * 3600
+
+# Yongin_Cluster_20250909 규모 (scale=1): T41 1,922 MAC / 7.2M rows, T31 54 MAC, Flow 5.4M rows
+BASE_SITE = {'n_workers': 1900, 'n_equipment': 54, 'n_phones': 20000}
+
+
+class SyntheticConfig(NamedTuple):
+    """생성 설정 (rate 단위: 태그 advertisement / 분, 수신 S-Ward마다 1 row)"""
+    site: str = 'Synthetic_Site'
+    start_day: str = '20250909'
+    days: int = 1
+    n_workers: int = BASE_SITE['n_workers']
+    n_equipment: int = BASE_SITE['n_equipment']
+    n_phones: int = BASE_SITE['n_phones']
+    signal_rate: float = 3.0            # T41 헬멧 착용 시
+    rest_signal_rate: float = 0.4       # T41 미착용 / 휴식 / 방치 시
+    equipment_signal_rate: float = 1.0  # T31 가동 중
+    phone_signal_rate: float = 1.0
+    seed: int = 42
+    idle_tag_ratio: float = 0.1
+    night_shift_ratio: float = 0.15
+    helmet_off_ratio: float = 0.15      # 작업 구간 중 헬멧 미착용 비율
+    apple_ratio: float = 0.07
+    mac_rotation_minutes: float = 15.0
+    meters_per_pixel: float = 0.1
+    tx_power: float = -59.0             # 1m 기준 RSSI
+    path_loss_exponent: float = 2.2
+    rssi_noise: float = 5.0
+    rssi_floor: float = -95.0           # S-Ward 수신 감도
+    detection_rate: float = 0.5         # 범위 내 S-Ward가 advertisement를 기록할 확률 (scan duty cycle)
+    max_receivers: int = 3
+
+    @classmethod
+    def scaled(cls, scale: float, **overrides) -> 'SyntheticConfig':
+        """기준 사이트 × scale 규모 설정"""
+        counts = {key: int(round(value * scale)) for key, value in BASE_SITE.items()}
+        return cls(**{**counts, **overrides})
+
+    def day_list(self) -> List[date]:
+        first = datetime.strptime(self.start_day, '%Y%m%d').date()
+        return [first + timedelta(days=i) for i in range(self.days)]
+
+
+# ========== S-Ward layout ==========
+
+class SwardLayout(NamedTuple):
+    """S-Ward 위치 (층 단위 index)"""
+    sward_id: np.ndarray      # int64
+    x: np.ndarray             # float32 (map pixel)
+    y: np.ndarray
+    level: np.ndarray         # int16, levels의 index
+    levels: List[Tuple[str, str]]
+    work: List[np.ndarray]    # 층별 작업 구역 sward index
+    rest: List[np.ndarray]    # 층별 휴게 구역 (Rest Area / Smoking Area)
+    gate: List[np.ndarray]    # 층별 출입구 (Entrance / Exit)
+
+
+def load_sward_layout(path=None) -> SwardLayout:
+    """sward_configuration.csv → SwardLayout"""
+    config = pd.read_csv(path or DEFAULT_SWARD_CONFIG)
+    config = config.dropna(subset=['sward_id', 'x', 'y']).reset_index(drop=True)
+    keys = list(zip(config['building'].astype(str), config['level'].astype(str)))
+    levels = sorted(set(keys))
+    level = np.array([levels.index(k) for k in keys], dtype=np.int16)
+    space_type = config['space_type'].fillna('').astype(str)
+    is_rest = space_type.str.contains('Rest|Smoking', regex=True).to_numpy()
+    is_gate = space_type.isin(['Entrance', 'Exit']).to_numpy()
+    is_work = ~(is_rest | is_gate)
+
+    def per_level(mask):
+        return [np.flatnonzero(mask & (level == i)) for i in range(len(levels))]
+
+    return SwardLayout(
+        sward_id=config['sward_id'].astype(np.int64).to_numpy(),
+        x=config['x'].astype(np.float32).to_numpy(),
+        y=config['y'].astype(np.float32).to_numpy(),
+        level=level, levels=levels,
+        work=per_level(is_work), rest=per_level(is_rest), gate=per_level(is_gate),
+    )
+
+
+# ========== 난수 / MAC ==========
+
+def _rng(config: SyntheticConfig, stream: str, *keys: int) -> np.random.Generator:
+    """(seed, stream, keys...)별 독립 난수 stream"""
+    return np.random.default_rng([config.seed, _STREAM_IDS[stream], *keys])
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 배열, overflow는 wrap-around)"""
+    z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _mac_ints(config: SyntheticConfig, stream: str, keys: np.ndarray, random_static: bool = True) -> np.ndarray:
+    """결정적 48-bit MAC (random static: 첫 byte 11xxxxxx, resolvable private: 01xxxxxx)"""
+    salt = np.uint64((config.seed * 1_000_003 + _STREAM_IDS[stream]) & 0xFFFFFFFFFFFFFFFF)
+    macs = _mix64(_mix64(keys.astype(np.uint64) ^ salt)) & np.uint64(0xFFFFFFFFFFFF)
+    top = np.uint64(0xC0 << 40) if random_static else np.uint64(0x40 << 40)
+    return (macs & np.uint64(0x3FFFFFFFFFFF)) | top
+
+
+def _mac_strings(mac_ints: np.ndarray) -> np.ndarray:
+    """MAC 정수 → "C0:06:72:05:F1:85" (고유값만 포맷)"""
+    unique, inverse = np.unique(mac_ints, return_inverse=True)
+    text = np.array([':'.join(f'{int(v):012X}'[i:i + 2] for i in range(0, 12, 2)) for v in unique], dtype=object)
+    return text[inverse]
+
+
+# ========== 체류 구간 (segment) ==========
+
+class _Segments:
+    """entity별 체류 구간 목록 (위치 고정 + jitter, 구간 동안 일정 rate로 신호)"""
+
+    def __init__(self):
+        self.columns = {name: [] for name in ('entity', 'start', 'end', 'level', 'x', 'y', 'rate', 'jitter')}
+
+    def add(self, entity, start, end, level, x, y, rate, jitter):
+        if end > start and rate > 0:
+            for name, value in zip(self.columns, (entity, start, end, level, x, y, rate, jitter)):
+                self.columns[name].append(value)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        dtypes = {'entity': np.int64, 'start': np.float64, 'end': np.float64, 'level': np.int16}
+        return {name: np.asarray(values, dtype=dtypes.get(name, np.float32))
+                for name, values in self.columns.items()}
+
+
+def _pick(rng, candidates: np.ndarray, fallback: np.ndarray) -> int:
+    pool = candidates if len(candidates) else fallback
+    return int(pool[rng.integers(len(pool))])
+
+
+def _worker_segments(config: SyntheticConfig, layout: SwardLayout, day_key: int) -> Dict[str, np.ndarray]:
+    """작업자 교대 / 이동 / 휴식 → segment"""
+    static = _rng(config, 't41')
+    weights = np.array([len(w) for w in layout.work], dtype=float)
+    home_level = static.choice(len(layout.levels), size=config.n_workers, p=weights / weights.sum())
+    idle = static.random(config.n_workers) < config.idle_tag_ratio
+    night = static.random(config.n_workers) < config.night_shift_ratio
+
+    rng = _rng(config, 't41', day_key)
+    all_swards = np.arange(len(layout.sward_id))
+    segments = _Segments()
+
+    def place(sward, spread):
+        return layout.x[sward] + rng.normal(0, spread), layout.y[sward] + rng.normal(0, spread)
+
+    def shift(worker, start, end, lunch):
+        level = int(home_level[worker])
+        gate = _pick(rng, layout.gate[level], np.concatenate(layout.gate))
+        t = start + rng.uniform(180, 480)
+        segments.add(worker, start, t, layout.level[gate], *place(gate, 20), config.signal_rate, 25)
+        while t < end - 300:
+            if lunch and lunch[0] <= t < lunch[1]:
+                rest = _pick(rng, layout.rest[level], np.concatenate(layout.rest))
+                stop = min(lunch[1] + rng.uniform(-300, 600), end)
+                segments.add(worker, t, stop, layout.level[rest], *place(rest, 15), config.rest_signal_rate, 5)
+                t, lunch = stop, None
+                continue
+            if rng.random() < 0.15:       # 다른 건물 / 층으로 이동
+                level = int(rng.integers(len(layout.levels)))
+            sward = _pick(rng, layout.work[level], all_swards)
+            stop = min(t + max(180.0, rng.exponential(25 * 60)), end - 300)
+            if lunch and t < lunch[0] < stop:
+                stop = lunch[0]
+            worn = rng.random() >= config.helmet_off_ratio
+            rate = config.signal_rate if worn else config.rest_signal_rate
+            segments.add(worker, t, stop, layout.level[sward], *place(sward, 30), rate, 40 if worn else 5)
+            t = stop
+        gate = _pick(rng, layout.gate[level], np.concatenate(layout.gate))
+        segments.add(worker, t, end, layout.level[gate], *place(gate, 20), config.signal_rate, 25)
+
+    for worker in range(config.n_workers):
+        if idle[worker]:
+            sward = int(all_swards[rng.integers(len(all_swards))])
+            segments.add(worker, 0, _DAY_SECONDS, layout.level[sward], *place(sward, 10),
+                         config.rest_signal_rate, 2)
+        elif night[worker]:
+            shift(worker, 0, float(np.clip(rng.normal(5 * 3600, 1200), 3 * 3600, 7 * 3600)), None)
+            shift(worker, float(np.clip(rng.normal(19 * 3600, 1200), 17 * 3600, 21 * 3600)), _DAY_SECONDS, None)
+        else:
+            start = float(np.clip(rng.normal(7 * 3600, 1200), 5 * 3600, 9 * 3600))
+            end = float(np.clip(rng.normal(17 * 3600, 1800), 15 * 3600, 20 * 3600))
+            shift(worker, start, end, (12 * 3600, 13 * 3600))
+    return segments.arrays()
+
+
+def _equipment_segments(config: SyntheticConfig, layout: SwardLayout, day_key: int) -> Dict[str, np.ndarray]:
+    """장비 고정 위치 + 하루 가동 cycle → segment"""
+    static = _rng(config, 't31')
+    work = np.concatenate(layout.work)
+    anchor = work[static.integers(len(work), size=config.n_equipment)]
+    x = layout.x[anchor] + static.normal(0, 40, config.n_equipment)
+    y = layout.y[anchor] + static.normal(0, 40, config.n_equipment)
+
+    rng = _rng(config, 't31', day_key)
+    segments = _Segments()
+    for equipment in range(config.n_equipment):
+        for _ in range(1 + rng.poisson(2.5)):
+            start = rng.uniform(6 * 3600, 20 * 3600)
+            duration = float(np.clip(rng.lognormal(np.log(70 * 60), 0.6), 600, 6 * 3600))
+            segments.add(equipment, start, min(start + duration, _DAY_SECONDS), layout.level[anchor[equipment]],
+                         x[equipment], y[equipment], config.equipment_signal_rate, 3)
+    return segments.arrays()
+
+
+def _phone_segments(config: SyntheticConfig, layout: SwardLayout, day_key: int) -> Dict[str, np.ndarray]:
+    """휴대폰 방문 (출퇴근 / 점심 peak) → segment"""
+    rng = _rng(config, 'flow', day_key)
+    segments = _Segments()
+    n = config.n_phones
+    peak = rng.choice(4, size=n, p=[0.3, 0.2, 0.3, 0.2])
+    centers = np.array([7.5, 12.0, 17.5, 13.0]) * 3600
+    spreads = np.array([0.75, 0.75, 0.75, 4.0]) * 3600
+    arrival = np.clip(rng.normal(centers[peak], spreads[peak]), 0, _DAY_SECONDS - 600)
+    stay = np.clip(rng.lognormal(np.log(90 * 60), 0.9, n), 300, 12 * 3600)
+    for phone in range(n):
+        t, end = float(arrival[phone]), float(min(arrival[phone] + stay[phone], _DAY_SECONDS))
+        while t < end:
+            sward = int(rng.integers(len(layout.sward_id)))
+            stop = min(end, t + max(120.0, rng.exponential(40 * 60)))
+            segments.add(phone, t, stop, layout.level[sward],
+                         layout.x[sward] + rng.normal(0, 40), layout.y[sward] + rng.normal(0, 40),
+                         config.phone_signal_rate, 30)
+            t = stop
+    return segments.arrays()
+
+
+_SEGMENT_BUILDERS = {'t41': _worker_segments, 't31': _equipment_segments, 'flow': _phone_segments}
+
+
+# ========== 신호 → 수신 record ==========
+
+def _emit(segments: Dict[str, np.ndarray], t0: float, t1: float, rng) -> Dict[str, np.ndarray]:
+    """[t0, t1) 구간의 advertisement (Poisson, 구간 내 균등 시각, 위치 jitter)"""
+    start = np.maximum(segments['start'], t0)
+    end = np.minimum(segments['end'], t1)
+    overlap = np.flatnonzero(end > start)
+    counts = rng.poisson(segments['rate'][overlap] * (end[overlap] - start[overlap]) / 60.0)
+    idx = np.repeat(overlap, counts)
+    jitter = segments['jitter'][idx]
+    return {
+        'entity': segments['entity'][idx],
+        'time': start[idx] + rng.random(len(idx)) * (end[idx] - start[idx]),
+        'level': segments['level'][idx],
+        'x': segments['x'][idx] + rng.normal(0, 1, len(idx)).astype(np.float32) * jitter,
+        'y': segments['y'][idx] + rng.normal(0, 1, len(idx)).astype(np.float32) * jitter,
+    }
+
+
+def _receive(signals: Dict[str, np.ndarray], layout: SwardLayout, config: SyntheticConfig, rng):
+    """같은 층 S-Ward의 RSSI (log-distance path loss) → 감도 이상 상위 max_receivers개 중 detection_rate로 기록
+    → (신호 index, sward index, rssi)"""
+    signal_idx, sward_idx, rssi_out = [], [], []
+    for level in np.unique(signals['level']):
+        members = np.flatnonzero(signals['level'] == level)
+        swards = np.flatnonzero(layout.level == level)
+        k = min(config.max_receivers, len(swards))
+        for begin in range(0, len(members), _RECEIVE_CHUNK):
+            rows = members[begin:begin + _RECEIVE_CHUNK]
+            dx = signals['x'][rows, None] - layout.x[None, swards]
+            dy = signals['y'][rows, None] - layout.y[None, swards]
+            distance = np.maximum(np.hypot(dx, dy) * config.meters_per_pixel, 1.0)
+            rssi = (config.tx_power - 10 * config.path_loss_exponent * np.log10(distance)
+                    + rng.normal(0, config.rssi_noise, distance.shape).astype(np.float32))
+            if k < len(swards):
+                top = np.argpartition(-rssi, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(len(swards)), rssi.shape)
+            top_rssi = np.take_along_axis(rssi, top, axis=1)
+            detected = rng.random(top_rssi.shape) < config.detection_rate
+            row, col = np.nonzero((top_rssi >= config.rssi_floor) & detected)
+            signal_idx.append(rows[row])
+            sward_idx.append(swards[top[row, col]])
+            rssi_out.append(top_rssi[row, col])
+    if not signal_idx:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return np.concatenate(signal_idx), np.concatenate(sward_idx), np.concatenate(rssi_out)
+
+
+def _window_frame(stream: str, signals, layout, config, rng, day_start: np.datetime64,
+                  entity_macs: Optional[np.ndarray], entity_types: Optional[np.ndarray]) -> pd.DataFrame:
+    signal_idx, sward_idx, rssi = _receive(signals, layout, config, rng)
+    order = np.argsort(signals['time'][signal_idx], kind='stable')
+    signal_idx, sward_idx, rssi = signal_idx[order], sward_idx[order], rssi[order]
+    entity = signals['entity'][signal_idx]
+    seconds = signals['time'][signal_idx]
+
+    if stream == 'flow':
+        # 휴대폰 MAC randomization: (phone, day, rotation 창)마다 새 주소
+        rotation = config.mac_rotation_minutes * 60
+        phase = _mix64(entity.astype(np.uint64)) % np.uint64(int(rotation))
+        window = ((seconds + phase.astype(np.float64)) // rotation).astype(np.int64)
+        day_key = (day_start.astype('datetime64[D]').astype(np.int64))
+        keys = (entity << 24) ^ (day_key << 8) ^ window
+        mac = _mac_strings(_mac_ints(config, stream, keys, random_static=False))
+        type_values = entity_types[entity]
+    else:
+        mac = entity_macs[entity]
+        type_values = np.full(len(entity), TYPE_T41 if stream == 't41' else TYPE_T31, dtype=np.int64)
+
+    return pd.DataFrame({
+        'sward_id': layout.sward_id[sward_idx],
+        'mac': mac,
+        'type': type_values,
+        'rssi': np.clip(np.round(rssi), -110, -30).astype(np.int64),
+        'time': day_start + (seconds * 1000).astype('timedelta64[ms]'),
+    }, columns=RAW_COLUMNS)
+
+
+def generate_day(config: SyntheticConfig, day: date, streams: Sequence[str] = STREAMS,
+                 layout: Optional[SwardLayout] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """하루치 raw 데이터를 (stream, 시간 창 DataFrame) 순서로 생성 (stream별 시간순)"""
+    layout = layout or load_sward_layout()
+    day_key = day.toordinal()
+    day_start = np.datetime64(day.isoformat(), 'ms')
+    counts = {'t41': config.n_workers, 't31': config.n_equipment, 'flow': config.n_phones}
+    for stream in streams:
+        n = counts[stream]
+        if n <= 0:
+            continue
+        segments = _SEGMENT_BUILDERS[stream](config, layout, day_key)
+        entity_macs = entity_types = None
+        if stream == 'flow':
+            apple = _rng(config, stream).random(n) < config.apple_ratio
+            entity_types = np.where(apple, FLOW_TYPE_APPLE, FLOW_TYPE_ANDROID).astype(np.int64)
+        else:
+            entity_macs = _mac_strings(_mac_ints(config, stream, np.arange(n)))
+        for window, t0 in enumerate(range(0, _DAY_SECONDS, WINDOW_SECONDS)):
+            rng = _rng(config, stream, day_key, window + 1)
+            signals = _emit(segments, t0, t0 + WINDOW_SECONDS, rng)
+            if len(signals['time']):
+                yield stream, _window_frame(stream, signals, layout, config, rng, day_start,
+                                            entity_macs, entity_types)
+
+
+def generate_frames(config: SyntheticConfig, day: Optional[date] = None,
+                    streams: Sequence[str] = STREAMS) -> Dict[str, pd.DataFrame]:
+    """하루치 raw 데이터 → stream별 DataFrame (벤치마크 / 소규모 테스트용)"""
+    day = day or config.day_list()[0]
+    chunks: Dict[str, List[pd.DataFrame]] = {stream: [] for stream in streams}
+    for stream, frame in generate_day(config, day, streams):
+        chunks[stream].append(frame)
+    return {
+        stream: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RAW_COLUMNS)
+        for stream, frames in chunks.items()
+    }
+
+
+# ========== 파일 기록 ==========
+
+class _StreamWriter:
+    """시간 창 chunk를 CSV (header 없음) / parquet 파일에 이어서 기록 (tmp → atomic rename)"""
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self._tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}")
+        self._handle = None
+        self.rows = 0
+
+    def write(self, frame: pd.DataFrame):
+        if self.fmt == 'csv':
+            if self._handle is None:
+                self._handle = open(self._tmp_path, 'w', newline='')
+            frame.to_csv(self._handle, header=False, index=False, date_format='%Y-%m-%d %H:%M:%S.%f')
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._handle is None:
+                self._handle = pq.ParquetWriter(self._tmp_path, table.schema)
+            self._handle.write_table(table)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            os.replace(self._tmp_path, self.path)
+
+
+def dataset_name(config: SyntheticConfig, day: date) -> str:
+    """데이터셋 폴더명 (batch_reports.split_dataset_name과 같은 <site>_<YYYYMMDD> 형식)"""
+    return f"{config.site}_{day.strftime('%Y%m%d')}"
+
+
+def write_dataset(config: SyntheticConfig, output_dir=None, fmt: str = 'csv',
+                  streams: Sequence[str] = STREAMS, sward_config=None) -> List[Dict]:
+    """일자별 raw 파일 생성 → 일자별 manifest 목록"""
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported format: {fmt}")
+    output_dir = Path(output_dir) if output_dir is not None else DEFAULT_OUTPUT_DIR
+    layout = load_sward_layout(sward_config)
+    manifests = []
+    for day in config.day_list():
+        started = time.perf_counter()
+        folder = output_dir / dataset_name(config, day)
+        folder.mkdir(parents=True, exist_ok=True)
+        writers: Dict[str, _StreamWriter] = {}
+        try:
+            for stream, frame in generate_day(config, day, streams, layout):
+                if stream not in writers:
+                    filename = f"{STREAM_FILE_PREFIX[stream]}_{dataset_name(config, day)}.{fmt}"
+                    writers[stream] = _StreamWriter(folder / filename, fmt)
+                writers[stream].write(frame)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        manifest = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'day': day.strftime('%Y%m%d'),
+            'format': fmt,
+            'config': config._asdict(),
+            'files': {stream: writer.path.name for stream, writer in writers.items()},
+            'records': {f"{stream}_records": writer.rows for stream, writer in writers.items()},
+            'seconds': round(time.perf_counter() - started, 2),
+        }
+        with open(folder / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        rows = ', '.join(f"{stream} {writer.rows:,}" for stream, writer in writers.items())
+        print(f"🧪 {folder.name}: {rows} rows ({manifest['seconds']:.1f}s)")
+        manifests.append(manifest)
+    return manifests
+
+
+# ========== CLI ==========
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.synthetic_data',
+        description='Generate seeded synthetic T31 / T41 / Flow raw data from sward_configuration.csv',
+    )
+    parser.add_argument('--site', default=SyntheticConfig._field_defaults['site'], help='Site name (folder prefix)')
+    parser.add_argument('--start', default=SyntheticConfig._field_defaults['start_day'], help='First day (YYYYMMDD)')
+    parser.add_argument('--days', type=int, default=1, help='Number of days')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplier of the reference site size (1900 workers, 54 equipment, 20000 phones)')
+    parser.add_argument('--n-workers', type=int, default=None, help='T41 worker tags (overrides --scale)')
+    parser.add_argument('--n-equipment', type=int, default=None, help='T31 equipment tags (overrides --scale)')
+    parser.add_argument('--n-phones', type=int, default=None, help='Flow phone visits per day (overrides --scale)')
+    parser.add_argument('--signal-rate', type=float, default=SyntheticConfig._field_defaults['signal_rate'],
+                        help='T41 advertisements per minute while the helmet is worn')
+    parser.add_argument('--seed', type=int, default=SyntheticConfig._field_defaults['seed'], help='Random seed')
+    parser.add_argument('--streams', nargs='+', choices=STREAMS, default=list(STREAMS), help='Streams to generate')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='Output file format')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT_DIR), help='Output folder')
+    parser.add_argument('--sward-config', default=None, help='sward_configuration.csv path')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    overrides = {
+        key: value for key, value in (
+            ('n_workers', args.n_workers), ('n_equipment', args.n_equipment), ('n_phones', args.n_phones),
+        ) if value is not None
+    }
+    config = SyntheticConfig.scaled(
+        args.scale, site=args.site, start_day=args.start, days=args.days,
+        signal_rate=args.signal_rate, seed=args.seed, **overrides,
+    )
+    print(f"🧪 Synthetic {config.site}: {config.days} day(s) from {config.start_day}, "
+          f"{config.n_workers:,} workers / {config.n_equipment:,} equipment / {config.n_phones:,} phones "
+          f"(seed {config.seed})")
+    write_dataset(config, args.output, args.format, args.streams, args.sward_config)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
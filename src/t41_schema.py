@@ -0,0 +1,148 @@
+"""
+T41 Compact Schema Module
+T41 activity_analysis / journey heatmap 압축 스키마 및 변환 유틸리티
+
+activity_analysis는 작업자당 1,440행 (대부분 'Absent' / None)이므로 문자열 object 컬럼으로
+보관하면 세션 메모리를 크게 차지합니다. 아래 스키마로 보관하고, 필요한 경우에만 경계에서 변환합니다.
+
+    - mac: category (정수 MAC id = cat.codes, 결측 MAC 행은 제외하므로 -1 없음)
+    - building / level / space_type: category
+    - activity_status: category ['Absent', 'Present', 'Active'] (code 0 / 1 / 2)
+    - minute_bin: int16 (정수 minute_bin인 경우)
+    - signal_count: uint8 (255 초과는 255로 제한)
+
+Categorical groupby는 pandas 버전에 따라 관측되지 않은 카테고리를 포함할 수 있으므로
+하위 모듈에서는 `groupby(..., observed=True)`를 사용합니다.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# ========== 활동 상태 코드 ==========
+
+ACTIVITY_STATUS_CATEGORIES = ['Absent', 'Present', 'Active']
+ACTIVITY_STATUS_DTYPE = pd.CategoricalDtype(ACTIVITY_STATUS_CATEGORIES)
+
+STATUS_ABSENT = 0
+STATUS_PRESENT = 1
+STATUS_ACTIVE = 2
+
+LOCATION_COLUMNS = ['building', 'level', 'space_type']
+JOURNEY_LOCATION_COLUMNS = ['building_level', 'building', 'level']
+
+
+# ========== 변환 ==========
+
+def _to_category(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype(object).astype('category')
+
+
+def _drop_missing_mac(df: pd.DataFrame) -> pd.DataFrame:
+    """결측 MAC 행 제외 (category 코드 -1이 배열 index로 쓰이지 않도록)"""
+    if 'mac' not in df.columns:
+        return df.copy()
+    return df[df['mac'].notna()].copy()
+
+
+def _to_int(series: pd.Series, dtype, upper=None) -> pd.Series:
+    """정수 값만 가진 숫자 컬럼이면 지정 dtype으로 변환 (아니면 그대로)"""
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return series
+    values = series.to_numpy()
+    if not np.array_equal(values, np.floor(values)):
+        return series
+    if upper is not None:
+        values = np.clip(values, 0, upper)
+    info = np.iinfo(dtype)
+    if values.size and (values.min() < info.min or values.max() > info.max):
+        return series
+    return pd.Series(values.astype(dtype), index=series.index, name=series.name)
+
+
+def compact_activity_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """activity_analysis → 압축 스키마 (새 DataFrame 반환)"""
+    if df is None or df.empty:
+        return df
+
+    result = _drop_missing_mac(df)
+    if 'mac' in result.columns:
+        result['mac'] = _to_category(result['mac'])
+    for col in LOCATION_COLUMNS:
+        if col in result.columns:
+            result[col] = _to_category(result[col])
+    if 'activity_status' in result.columns and result['activity_status'].dtype != ACTIVITY_STATUS_DTYPE:
+        result['activity_status'] = result['activity_status'].astype(object).astype(ACTIVITY_STATUS_DTYPE)
+    if 'minute_bin' in result.columns:
+        result['minute_bin'] = _to_int(result['minute_bin'], np.int16)
+    if 'signal_count' in result.columns:
+        result['signal_count'] = _to_int(result['signal_count'], np.uint8, upper=255)
+    return result
+
+
+def compact_journey_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """journey heatmap 캐시 → 압축 스키마 (새 DataFrame 반환)"""
+    if df is None or df.empty:
+        return df
+
+    result = _drop_missing_mac(df)
+    if 'mac' in result.columns:
+        result['mac'] = _to_category(result['mac'])
+    for col in JOURNEY_LOCATION_COLUMNS:
+        if col in result.columns:
+            result[col] = _to_category(result[col])
+    for col, dtype in [('bin_index', np.int16), ('color_code', np.uint8),
+                       ('signal_count', np.int32), ('worker_order', np.int32)]:
+        if col in result.columns:
+            result[col] = _to_int(result[col], dtype)
+    return result
+
+
+def expand_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """압축 스키마 → 문자열 object / int64 컬럼 (CSV 내보내기 등 경계용)"""
+    if df is None or df.empty:
+        return df
+
+    result = df.copy()
+    for col in result.columns:
+        if isinstance(result[col].dtype, pd.CategoricalDtype):
+            result[col] = result[col].astype(object).where(result[col].notna(), None)
+        elif pd.api.types.is_integer_dtype(result[col]):
+            result[col] = result[col].astype(np.int64)
+    return result
+
+
+# ========== 코드 접근 ==========
+
+def category_codes(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """(codes, categories) 반환 - 결측은 code -1
+
+    category 컬럼이면 저장된 코드를 그대로 사용하고, 아니면 첫 등장 순서로 factorize합니다.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), np.asarray(series.cat.categories, dtype=object)
+    codes, uniques = pd.factorize(series, sort=False)
+    return np.asarray(codes), np.asarray(uniques, dtype=object)
+
+
+def status_codes(series: pd.Series) -> np.ndarray:
+    """activity_status → 상태 코드 (Absent 0 / Present 1 / Active 2, 알 수 없음 -1)"""
+    if series.dtype == ACTIVITY_STATUS_DTYPE:
+        return series.cat.codes.to_numpy()
+    return pd.Categorical(series.astype(object), categories=ACTIVITY_STATUS_CATEGORIES).codes
+
+
+def category_mask(codes: np.ndarray, categories: np.ndarray, predicate) -> np.ndarray:
+    """카테고리 단위로 조건을 평가하여 행 마스크 생성 (결측 code -1은 False)"""
+    ok = np.array([bool(predicate(c)) for c in categories] + [False], dtype=bool)
+    return ok[codes]
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """DataFrame 메모리 사용량 (MB, deep)"""
+    if df is None:
+        return 0.0
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
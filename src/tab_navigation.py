@@ -0,0 +1,82 @@
+"""
+Tab Navigation Module
+선택된 탭만 실행하는 Dashboard 탭 네비게이션
+
+`st.tabs`는 모든 탭 본문을 매 rerun마다 실행합니다 (보이지 않는 탭의 차트까지 계산 / 직렬화).
+Lazy 모드에서는 탭 목록을 가로 radio로 표시하고 선택된 탭의 render 함수만 호출합니다.
+
+    render_tabs(["📊 Overview", "📍 Location"], [render_overview, render_location], key="t31_nav")
+
+필터 위젯이 있는 패널은 `@fragment`로 감싸면 위젯 변경 시 해당 패널만 다시 실행됩니다.
+(Streamlit 1.37+ `st.fragment`, 1.33+ `st.experimental_fragment`, 그 이전 버전은 일반 함수로 동작)
+"""
+
+from typing import Callable, Optional, Sequence
+
+import streamlit as st
+
+from src.tracing import span
+
+LAZY_TABS_SESSION_KEY = 'lazy_tab_rendering'
+
+
+# ========== Fragment (부분 rerun) ==========
+
+_st_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+
+def fragment(func: Callable) -> Callable:
+    """위젯 변경 시 함수 본문만 다시 실행 (fragment 미지원 버전은 그대로 반환)
+
+    fragment 안에서는 st.sidebar에 쓰지 않아야 합니다.
+    """
+    if _st_fragment is None:
+        return func
+    return _st_fragment(func)
+
+
+# ========== 탭 렌더링 ==========
+
+def is_lazy_tabs_enabled() -> bool:
+    return st.session_state.get(LAZY_TABS_SESSION_KEY, True)
+
+
+def render_lazy_tabs_toggle():
+    """사이드바 네비게이션 모드 설정"""
+    st.sidebar.checkbox(
+        "⚡ Render selected tab only",
+        value=True,
+        key=LAZY_TABS_SESSION_KEY,
+        help="Only the selected tab is computed on each rerun (faster). Uncheck to use classic tabs."
+    )
+
+
+def render_tabs(labels: Sequence[str], renderers: Sequence[Callable[[], None]], key: str,
+                lazy: Optional[bool] = None) -> int:
+    """탭 렌더링 - lazy 모드면 선택된 탭만 실행
+
+    Args:
+        labels: 탭 이름
+        renderers: 탭별 render 함수 (인자 없음)
+        key: 선택 상태 session_state key (탭 그룹마다 고유)
+        lazy: None이면 사이드바 설정 사용
+
+    Returns:
+        선택된 탭 index (classic 모드는 -1, 모든 탭이 실행됨)
+    """
+    if lazy is None:
+        lazy = is_lazy_tabs_enabled()
+
+    if not lazy:
+        for label, tab, render in zip(labels, st.tabs(list(labels)), renderers):
+            with tab, span(f"tab:{label}"):
+                render()
+        return -1
+
+    selected = st.radio(
+        "Tab", list(labels), horizontal=True, key=key, label_visibility="collapsed"
+    )
+    index = list(labels).index(selected)
+    with span(f"tab:{selected}"):
+        renderers[index]()
+    return index
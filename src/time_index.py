@@ -0,0 +1,100 @@
+"""
+Time Index Module
+정수 시간 컬럼 (day / sec_of_day / minute_of_day) 및 bin index 유틸리티
+
+데이터 입력 시점에 한 번만 datetime 연산을 수행하여 아래 컬럼을 저장합니다.
+    - day: 해당 일자 (datetime64, 00:00:00)
+    - sec_of_day: 0시 기준 초 (int32, 0~86399)
+    - minute_of_day: 0시 기준 분 (int16, 0~1439)
+
+이후 모든 bin index (10초, 1분, UnitTime, 10분)는 정수 나눗셈으로 계산합니다.
+기존 `((df['time'] - df['time'].dt.normalize()) / pd.Timedelta(...)).astype(int)` 패턴을 대체합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+NS_PER_SECOND = 1_000_000_000
+SECONDS_PER_DAY = 86400
+
+TIME_COLUMNS = ['day', 'sec_of_day', 'minute_of_day']
+
+
+def add_time_columns(df: pd.DataFrame, time_col: str = 'time') -> pd.DataFrame:
+    """day / sec_of_day / minute_of_day 컬럼 추가 (in-place, 이미 있으면 건너뜀)
+
+    시간 값이 없는 행(NaT)은 입력 단계에서 제거합니다 (bin -1이 유효한 bin으로 쓰이지 않도록).
+    """
+    if df is None or time_col not in df.columns or has_time_columns(df):
+        return df
+
+    if not pd.api.types.is_datetime64_any_dtype(df[time_col]):
+        df[time_col] = pd.to_datetime(df[time_col])
+    if df[time_col].isna().any():
+        df.drop(index=df.index[df[time_col].isna().to_numpy()], inplace=True)
+
+    # datetime64[ns] → int64 나노초 (tz-aware면 로컬 시각 기준)
+    times = df[time_col]
+    if getattr(times.dt, 'tz', None) is not None:
+        times = times.dt.tz_localize(None)
+    ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+    seconds = ns // NS_PER_SECOND
+    sec_of_day = (seconds % SECONDS_PER_DAY).astype(np.int32)
+    day_seconds = seconds - sec_of_day
+
+    df['day'] = (day_seconds * NS_PER_SECOND).view('datetime64[ns]')
+    df['sec_of_day'] = sec_of_day
+    df['minute_of_day'] = (sec_of_day // 60).astype(np.int16)
+    return df
+
+
+def has_time_columns(df: pd.DataFrame) -> bool:
+    """정수 시간 컬럼이 모두 있는지 확인"""
+    return df is not None and all(col in df.columns for col in TIME_COLUMNS)
+
+
+def sec_of_day(df: pd.DataFrame, time_col: str = 'time') -> np.ndarray:
+    """0시 기준 초 (저장된 컬럼 우선, 없으면 계산 - 원본 DataFrame은 수정하지 않음)
+
+    계산 경로에서 NaT 행은 -1 (bin index가 음수 / 0이 되므로 호출부에서 제외)
+    """
+    if 'sec_of_day' in df.columns:
+        return df['sec_of_day'].to_numpy()
+    times = df[time_col]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times)
+    if getattr(times.dt, 'tz', None) is not None:
+        times = times.dt.tz_localize(None)
+    ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    seconds = (ns // NS_PER_SECOND) % SECONDS_PER_DAY
+    return np.where(ns == np.iinfo(np.int64).min, -1, seconds).astype(np.int32)
+
+
+def minute_of_day(df: pd.DataFrame, time_col: str = 'time') -> np.ndarray:
+    """0시 기준 분 (0~1439)"""
+    if 'minute_of_day' in df.columns:
+        return df['minute_of_day'].to_numpy()
+    return (sec_of_day(df, time_col) // 60).astype(np.int16)
+
+
+# ========== Bin index (정수 나눗셈) ==========
+
+def time_index_10s(df: pd.DataFrame, time_col: str = 'time') -> np.ndarray:
+    """10초 단위 time_index (1~8640)"""
+    return sec_of_day(df, time_col).astype(np.int32) // 10 + 1
+
+
+def minute_bin(df: pd.DataFrame, time_col: str = 'time') -> np.ndarray:
+    """1분 단위 minute_bin (1~1440)"""
+    return minute_of_day(df, time_col).astype(np.int16) + 1
+
+
+def unit_time_bin(df: pd.DataFrame, unit_minutes: int, time_col: str = 'time') -> np.ndarray:
+    """UnitTime 단위 bin index (0부터)"""
+    return minute_of_day(df, time_col).astype(np.int16) // unit_minutes
+
+
+def ten_minute_bin(df: pd.DataFrame, time_col: str = 'time') -> np.ndarray:
+    """10분 단위 bin index (0~143)"""
+    return unit_time_bin(df, 10, time_col)
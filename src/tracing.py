@@ -0,0 +1,416 @@
+"""
+Tracing Module
+파이프라인 단계별 구조화 tracing (span) + 레벨 기반 logger
+
+performance_timer의 print와 디버그 print 대신, rerun 1회를 trace로 묶고
+단계마다 중첩 span을 기록합니다.
+
+    with trace_rerun('dashboard'):                      # main()에서 rerun마다
+        with span('t41_activity', rows_in=len(df)) as s:
+            result = analyze(df)
+            s.set_rows(rows_out=len(result))
+
+    @traced('작업자 활동 상태 분석')                      # 함수 단위 (DataFrame 인자/결과 행 수 자동 기록)
+    def analyze_worker_activity(...): ...
+
+span 기록 항목: wall time, CPU time (thread), peak RSS 증가량, rows in/out, cache hit/miss, 속성.
+완료된 trace는 output/traces/traces.jsonl에 span 1개 = 1줄로 추가되고
+(IRFM_TRACE_MAX_MB 초과 시 traces.jsonl.1 ... 로 rotate), render_trace_panel(st)이
+현재 세션의 최근 trace를 flame 형태 timeline으로 보여줍니다.
+
+활성화: 환경 변수 IRFM_TRACE=1 (프로세스 전체) 또는 trace 패널의 토글 (해당 세션만)
+비활성 시 span()은 공유 no-op 객체를 반환하므로 비용이 거의 없습니다.
+
+디버그 출력은 get_logger(__name__)를 사용합니다 (IRFM_LOG_LEVEL, 기본 WARNING).
+DataFrame 출력처럼 인자 계산이 무거운 경우 log.isEnabledFor(logging.DEBUG)로 감쌉니다.
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+TRACE_ENV = 'IRFM_TRACE'
+LOG_LEVEL_ENV = 'IRFM_LOG_LEVEL'
+TRACE_MAX_MB_ENV = 'IRFM_TRACE_MAX_MB'
+TRACE_DIR = Path('./output/traces')
+TRACE_FILE = 'traces.jsonl'
+TRACE_BACKUPS = 3               # traces.jsonl.1 ~ .3 보관
+RECENT_TRACES = 20
+SESSION_TOGGLE_KEY = '_trace_enabled'
+
+_enabled = os.environ.get(TRACE_ENV, '').lower() in ('1', 'true', 'yes')
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('irfm_trace', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('irfm_span', default=None)
+_recent: Deque['Trace'] = deque(maxlen=RECENT_TRACES)
+_recent_lock = threading.Lock()
+_export_lock = threading.Lock()
+_span_ids = itertools.count(1)
+
+
+def is_tracing_enabled() -> bool:
+    return _enabled
+
+
+def set_tracing_enabled(enabled: bool):
+    """프로세스 전체 tracing 설정 (스크립트 / 배치용, 세션별 설정은 trace 패널 토글)"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def current_session_id() -> str:
+    """Streamlit 세션 id (실행 context 밖이면 'local')"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        ctx = None
+    return ctx.session_id if ctx is not None else 'local'
+
+
+def _max_trace_bytes() -> int:
+    try:
+        return int(float(os.environ.get(TRACE_MAX_MB_ENV, '20')) * 1048576)
+    except ValueError:
+        return 20 * 1048576
+
+
+# ========== Logger ==========
+
+_logging_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """irfm.* logger (IRFM_LOG_LEVEL: DEBUG / INFO / WARNING(기본) / ERROR)"""
+    global _logging_configured
+    if not _logging_configured:
+        root = logging.getLogger('irfm')
+        if not root.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            root.addHandler(handler)
+        root.setLevel(os.environ.get(LOG_LEVEL_ENV, 'WARNING').upper())
+        root.propagate = False
+        _logging_configured = True
+    return logging.getLogger(f"irfm.{name.rsplit('.', 1)[-1]}")
+
+
+# ========== Span ==========
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024     # Linux: KB
+
+
+class Span:
+    """파이프라인 단계 1개"""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'depth', 'offset', 'wall', 'cpu', 'rss_delta',
+                 'rows_in', 'rows_out', 'cache', 'attrs', 'error',
+                 '_start', '_cpu_start', '_rss_start')
+
+    def __init__(self, name: str, parent: Optional['Span'], trace_start: float,
+                 rows_in: Optional[int] = None, attrs: Optional[Dict] = None):
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.cache: Optional[str] = None
+        self.attrs = dict(attrs or {})
+        self.error: Optional[str] = None
+        self.wall = self.cpu = 0.0
+        self.rss_delta = 0
+        self._rss_start = _peak_rss_bytes()
+        self._cpu_start = time.thread_time()
+        self._start = time.perf_counter()
+        self.offset = self._start - trace_start
+
+    def set_rows(self, rows_in: Optional[int] = None, rows_out: Optional[int] = None):
+        if rows_in is not None:
+            self.rows_in = int(rows_in)
+        if rows_out is not None:
+            self.rows_out = int(rows_out)
+
+    def cache_hit(self):
+        self.cache = 'hit'
+
+    def cache_miss(self):
+        self.cache = 'miss'
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def _finish(self):
+        self.wall = time.perf_counter() - self._start
+        self.cpu = time.thread_time() - self._cpu_start
+        self.rss_delta = _peak_rss_bytes() - self._rss_start
+
+    def to_record(self) -> Dict:
+        return {
+            'span_id': self.span_id, 'parent_id': self.parent_id, 'name': self.name, 'depth': self.depth,
+            'offset_ms': round(self.offset * 1000, 3), 'wall_ms': round(self.wall * 1000, 3),
+            'cpu_ms': round(self.cpu * 1000, 3), 'peak_rss_delta': self.rss_delta,
+            'rows_in': self.rows_in, 'rows_out': self.rows_out, 'cache': self.cache,
+            'attrs': {k: v if isinstance(v, (bool, int, float, str)) or v is None else str(v)
+                      for k, v in self.attrs.items()},
+            'error': self.error,
+        }
+
+
+class _NullSpan:
+    """tracing 비활성 시 반환되는 no-op span"""
+
+    __slots__ = ()
+
+    def set_rows(self, rows_in=None, rows_out=None):
+        pass
+
+    def cache_hit(self):
+        pass
+
+    def cache_miss(self):
+        pass
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """rerun 1회의 span 모음"""
+
+    def __init__(self, name: str, session_id: Optional[str] = None):
+        self.trace_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{next(_span_ids)}"
+        self.name = name
+        self.session_id = session_id
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.start = time.perf_counter()
+        self.spans: List[Span] = []
+
+    @property
+    def wall(self) -> float:
+        return max((s.offset + s.wall for s in self.spans), default=0.0)
+
+    def records(self) -> List[Dict]:
+        return [{'trace_id': self.trace_id, 'trace': self.name, 'started_at': self.started_at,
+                 **s.to_record()} for s in sorted(self.spans, key=lambda s: s.offset)]
+
+
+class _SpanContext:
+    __slots__ = ('_trace', '_name', '_rows_in', '_attrs', '_span', '_token')
+
+    def __init__(self, trace: Trace, name: str, rows_in: Optional[int], attrs: Dict):
+        self._trace = trace
+        self._name = name
+        self._rows_in = rows_in
+        self._attrs = attrs
+
+    def __enter__(self) -> Span:
+        self._span = Span(self._name, _current_span.get(), self._trace.start, self._rows_in, self._attrs)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span._finish()
+        if exc_type is not None:
+            self._span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self._trace.spans.append(self._span)
+        return False
+
+
+def span(name: str, rows_in: Optional[int] = None, **attrs):
+    """현재 trace에 중첩 span 추가 (trace가 없으면 no-op)"""
+    trace = _current_trace.get()
+    if trace is None:
+        return NULL_SPAN
+    return _SpanContext(trace, name, rows_in, attrs)
+
+
+def _row_count(value: Any) -> Optional[int]:
+    if hasattr(value, 'shape') and hasattr(value, 'columns'):    # DataFrame
+        return int(value.shape[0])
+    return None
+
+
+def traced(name: Optional[str] = None, log_level: int = logging.DEBUG):
+    """함수 실행을 span으로 기록 (첫 DataFrame 인자 → rows_in, DataFrame 결과 → rows_out)
+
+    log_level의 logger가 활성화되어 있으면 시작 / 완료 시간을 출력합니다.
+    """
+    def decorator(fn: Callable):
+        label = name or fn.__qualname__
+        log = get_logger(fn.__module__)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            logging_on = log.isEnabledFor(log_level)
+            if _current_trace.get() is None and not logging_on:
+                return fn(*args, **kwargs)
+            rows_in = next((r for r in map(_row_count, list(args) + list(kwargs.values())) if r is not None), None)
+            if logging_on:
+                log.log(log_level, f"🚀 {label} 시작...")
+            start = time.perf_counter()
+            with span(label, rows_in=rows_in) as s:
+                result = fn(*args, **kwargs)
+                s.set_rows(rows_out=_row_count(result))
+            if logging_on:
+                log.log(log_level, f"✅ {label} 완료: {time.perf_counter() - start:.2f}초")
+            return result
+        return wrapper
+    return decorator
+
+
+# ========== Trace (rerun 단위) ==========
+
+@contextmanager
+def trace_rerun(name: str = 'rerun', enabled: Optional[bool] = None, **attrs):
+    """rerun 1회를 trace로 기록 (tracing 비활성 시 아무것도 하지 않음)
+
+    Args:
+        enabled: 이 rerun의 tracing 여부 (None이면 프로세스 설정 - IRFM_TRACE)
+    """
+    if not (_enabled if enabled is None else enabled) or _current_trace.get() is not None:
+        yield None
+        return
+    trace = Trace(name, current_session_id())
+    trace_token = _current_trace.set(trace)
+    try:
+        with span(name, **attrs):
+            yield trace
+    finally:
+        _current_trace.reset(trace_token)
+        with _recent_lock:
+            _recent.append(trace)
+        export_trace(trace)
+
+
+def _rotate(path: Path, backups: int = TRACE_BACKUPS):
+    """traces.jsonl → .1 → .2 ... (가장 오래된 파일 삭제)"""
+    for index in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{index}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{index + 1}"))
+    if backups > 0:
+        os.replace(path, path.with_name(f"{path.name}.1"))
+    else:
+        path.unlink()
+
+
+def export_trace(trace: Trace, trace_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+    """trace → JSON lines (span 1개 = 1줄) 추가, 파일이 max_bytes를 넘으면 rotate"""
+    trace_dir = Path(trace_dir) if trace_dir is not None else TRACE_DIR
+    max_bytes = _max_trace_bytes() if max_bytes is None else max_bytes
+    path = trace_dir / TRACE_FILE
+    try:
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        with _export_lock:
+            if max_bytes > 0 and path.exists() and path.stat().st_size >= max_bytes:
+                _rotate(path)
+            with open(path, 'a', encoding='utf-8') as f:
+                for record in trace.records():
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError as e:
+        get_logger(__name__).warning(f"⚠️ Trace export failed: {e}")
+
+
+def recent_traces(session_id: Optional[str] = None) -> List[Trace]:
+    """최근 trace (session_id를 지정하면 해당 세션의 trace만)"""
+    with _recent_lock:
+        return [t for t in _recent if session_id is None or t.session_id == session_id]
+
+
+def is_session_tracing_enabled(session_state) -> bool:
+    """이 세션의 rerun을 기록할지 (IRFM_TRACE 또는 세션 토글)"""
+    return _enabled or bool(session_state.get(SESSION_TOGGLE_KEY, False))
+
+
+# ========== Admin panel ==========
+
+def trace_timeline_figure(trace: Trace):
+    """flame 형태 timeline (x: 시작 offset ~ 종료, y: 중첩 깊이)"""
+    import plotly.graph_objects as go
+
+    records = trace.records()
+    hover = [
+        f"<b>{r['name']}</b><br>wall {r['wall_ms']:.1f}ms · cpu {r['cpu_ms']:.1f}ms"
+        f"<br>peak RSS +{r['peak_rss_delta'] / 1048576:.1f}MB"
+        + (f"<br>rows {r['rows_in']} → {r['rows_out']}" if r['rows_in'] is not None or r['rows_out'] is not None else "")
+        + (f"<br>cache {r['cache']}" if r['cache'] else "")
+        + (f"<br>error {r['error']}" if r['error'] else "")
+        for r in records
+    ]
+    colors = ['#E74C3C' if r['error'] else '#2ECC71' if r['cache'] == 'hit' else '#3498DB' for r in records]
+    fig = go.Figure(go.Bar(
+        base=[r['offset_ms'] for r in records],
+        x=[max(r['wall_ms'], 0.05) for r in records],
+        y=[r['depth'] for r in records],
+        orientation='h',
+        text=[r['name'] for r in records],
+        textposition='inside',
+        insidetextanchor='start',
+        hovertext=hover,
+        hoverinfo='text',
+        marker=dict(color=colors, line=dict(color='white', width=1)),
+    ))
+    max_depth = max((r['depth'] for r in records), default=0)
+    fig.update_layout(
+        height=120 + 28 * (max_depth + 1),
+        margin=dict(l=10, r=10, t=30, b=30),
+        xaxis_title='ms',
+        yaxis=dict(autorange='reversed', tickmode='linear', title='depth'),
+        bargap=0.05,
+        showlegend=False,
+        title=f"{trace.name} · {trace.wall * 1000:.0f}ms · {len(records)} spans",
+    )
+    return fig
+
+
+def render_trace_panel(st):
+    """Pipeline trace 패널: 세션별 토글 + 이 세션의 최근 rerun flame timeline / 느린 span 표"""
+    with st.expander("🧭 Pipeline traces (admin)", expanded=False):
+        st.toggle("Enable tracing for this session", value=_enabled, key=SESSION_TOGGLE_KEY,
+                  disabled=_enabled, help=f"{TRACE_ENV}=1 enables tracing for every session.")
+        traces = recent_traces(current_session_id())
+        if not traces:
+            st.caption(f"No traces yet. Traces are recorded from the next rerun → {TRACE_DIR / TRACE_FILE}")
+            return
+        labels = [f"{t.started_at} · {t.name} · {t.wall * 1000:.0f}ms" for t in reversed(traces)]
+        selected = st.selectbox("Rerun", range(len(labels)), format_func=lambda i: labels[i], key="_trace_selected")
+        trace = list(reversed(traces))[selected]
+        st.plotly_chart(trace_timeline_figure(trace), use_container_width=True)
+
+        import pandas as pd
+        table = pd.DataFrame(trace.records())[
+            ['name', 'depth', 'wall_ms', 'cpu_ms', 'peak_rss_delta', 'rows_in', 'rows_out', 'cache']
+        ].sort_values('wall_ms', ascending=False).head(20)
+        table['peak_rss_delta'] = (table['peak_rss_delta'] / 1048576).round(1)
+        st.dataframe(table.rename(columns={'peak_rss_delta': 'peak_rss_MB'}), use_container_width=True, hide_index=True)
+        st.caption(f"JSON lines: {TRACE_DIR / TRACE_FILE}")
@@ -8,10 +8,16 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # 백엔드를 명시적으로 설정
 import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
 import streamlit as st
 import os
 from src import tward_type31_processing
+from src.chart_render import ChartRequest, render_charts
+from src.operation_intervals import OperationIntervalStore
+from src.result_cache import cached_result
+import logging
+from src.tracing import get_logger
+
+log = get_logger(__name__)
 
 # Building-Level별 색상 매핑 (사용자 지정)
 OPERATION_COLORS = {
@@ -48,24 +54,24 @@ COLOR_MAP = [
 def render_integrated_operation_heatmap():
     """전체 T-Ward 통합 Operation Heatmap 렌더링"""
     
-    print("🎯 render_integrated_operation_heatmap 함수 시작")
+    log.debug("🎯 render_integrated_operation_heatmap 함수 시작")
     
     st.subheader("🔥 T-Ward Type 31 Integrated Operation Heatmap")
     st.write("**All T-Ward Operation Patterns by Building-Level (Sorted by Operation Time)**")
     
-    print("🎯 제목 표시 완료")
+    log.info("🎯 제목 표시 완료")
     
     # 데이터 로드
     tward31_path = st.session_state.get('tward31_path', None)
-    print(f"🎯 tward31_path: {tward31_path}")
+    log.debug(f"🎯 tward31_path: {tward31_path}")
     
     if not tward31_path:
         st.error("⚠️ T-Ward Type 31 data not loaded. Please upload data first.")
-        print("❌ tward31_path가 없음")
+        log.error("❌ tward31_path가 없음")
         return
     
     # 데이터 전처리
-    print("🎯 데이터 전처리 시작")
+    log.debug("🎯 데이터 전처리 시작")
     with st.spinner("🔄 Loading and processing T-Ward Type 31 data..."):
         df = pd.read_csv(tward31_path, header=None)
         df = tward_type31_processing.preprocess_tward31(df)
@@ -76,29 +82,30 @@ def render_integrated_operation_heatmap():
         analysis_results = tward_type31_processing.unified_tward31_analysis(df, sward_config)
         op_rate_df = analysis_results['operation_data']
     
-    print(f"🎯 데이터 로드 완료: {len(df)} records")
+    log.info(f"🎯 데이터 로드 완료: {len(df)} records")
     st.success(f"✅ Data Loaded: {len(df):,} records, {len(op_rate_df):,} operation records")
     
     # 통합 Operation Heatmap 생성
-    print("🎯 히트맵 생성 시작")
+    log.debug("🎯 히트맵 생성 시작")
     with st.spinner("🎨 Generating Integrated Operation Heatmap..."):
         heatmap_result = generate_integrated_operation_heatmap(df, sward_config)
         
         if heatmap_result:
-            print("🎯 히트맵 결과 있음, display 함수 호출")
+            log.debug("🎯 히트맵 결과 있음, display 함수 호출")
             display_integrated_operation_heatmap(heatmap_result)
-            print("🎯 display 함수 완료")
+            log.info("🎯 display 함수 완료")
         else:
-            print("❌ 히트맵 결과 없음")
+            log.error("❌ 히트맵 결과 없음")
             st.error("⚠️ Failed to generate operation heatmap.")
 
+@cached_result
 def generate_integrated_operation_heatmap(df, sward_config):
     """전체 T-Ward 통합 Operation Heatmap 데이터 생성 - 모든 T-Ward를 하나의 히트맵에 표시"""
     
     if df is None or df.empty:
         return None
     
-    print(f"\n🌟 통합 Operation Heatmap 생성 시작 - 모든 T-Ward 통합")
+    log.debug(f"\n🌟 통합 Operation Heatmap 생성 시작 - 모든 T-Ward 통합")
     
     # S-Ward 설정과 DataFrame 병합하여 Building-Level 정보 추가
     df_with_location = df.merge(sward_config[['sward_id', 'building', 'level']], on='sward_id', how='left')
@@ -107,81 +114,49 @@ def generate_integrated_operation_heatmap(df, sward_config):
     idx = df_with_location.groupby(['mac', 'time_index'])['rssi'].idxmax()
     df_max_rssi = df_with_location.loc[idx].copy()
     
+    # MAC별 가동 구간 (time_index 단위 slot, 위치 포함)
+    interval_store = OperationIntervalStore.from_bins(df_max_rssi, bin_col='time_index', active_col=None,
+                                                      bin_origin=1, unit_minutes=1 / 6)
+    
     # MAC별 가동시간 계산
-    mac_operation_time = df_max_rssi.groupby('mac')['time_index'].nunique().reset_index()
-    mac_operation_time.columns = ['mac', 'operation_minutes']
+    mac_operation_time = pd.DataFrame({
+        'mac': interval_store.devices,
+        'operation_minutes': interval_store.operating_slots()
+    }).sort_values('mac').reset_index(drop=True)
     
     # 가동시간 기준 내림차순 정렬
     mac_operation_time = mac_operation_time.sort_values('operation_minutes', ascending=False).reset_index(drop=True)
     
-    print(f"🎯 전체 T-Ward 수: {len(mac_operation_time)}")
-    print(f"   가동시간 범위: {mac_operation_time['operation_minutes'].min()}~{mac_operation_time['operation_minutes'].max()}분")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"🎯 전체 T-Ward 수: {len(mac_operation_time)}")
+        log.debug(f"   가동시간 범위: {mac_operation_time['operation_minutes'].min()}~{mac_operation_time['operation_minutes'].max()}분")
     
     if mac_operation_time.empty:
         return None
     
     # 144개 10분 bins에 대한 히트맵 데이터 생성
-    heatmap_data = []
+    # 10분 구간(time_index bin_idx * 10 + 1 ~ (bin_idx + 1) * 10)에서 가장 많이 나타난 Building-Level
+    dominant = interval_store.dominant_locations(n_bins=144, slots_per_bin=10)
     
-    for _, row in mac_operation_time.iterrows():
-        mac = row['mac']
-        tward_row = []
-        
-        # 해당 T-Ward의 위치 결정된 데이터 추출
-        mac_data = df_max_rssi[df_max_rssi['mac'] == mac]
-        
-        # 144개 10분 bin에 대해 색상 결정
-        for bin_idx in range(144):
-            # 10분 구간 계산 (bin_idx * 10 + 1 ~ (bin_idx + 1) * 10)
-            start_minute = bin_idx * 10 + 1
-            end_minute = (bin_idx + 1) * 10
-            
-            # 해당 10분 구간의 데이터
-            time_data = mac_data[
-                (mac_data['time_index'] >= start_minute) & 
-                (mac_data['time_index'] <= end_minute)
-            ]
-            
-            if time_data.empty:
-                # 10분 동안 데이터 없음 - 신호 미수신 (검정색)
-                tward_row.append(OPERATION_COLORS['no_signal'])
-            else:
-                # 10분 구간에서 가장 많이 나타난 Building-Level 찾기
-                building_level_counts = {}
-                for _, data_row in time_data.iterrows():
-                    building = data_row.get('building', 'Unknown')
-                    level = data_row.get('level', 'Unknown')
-                    bl_key = f"{building}-{level}"
-                    building_level_counts[bl_key] = building_level_counts.get(bl_key, 0) + 1
-                
-                if building_level_counts:
-                    # 가장 많이 나타난 Building-Level 선택
-                    dominant_bl = max(building_level_counts, key=building_level_counts.get)
-                    
-                    if dominant_bl in OPERATION_COLORS:
-                        color_value = OPERATION_COLORS[dominant_bl]
-                    else:
-                        color_value = OPERATION_COLORS['inactive']  # 미정의 공간은 회색
-                        print(f"🚨 Unknown Building-Level: {dominant_bl} - using gray")
-                    
-                    tward_row.append(color_value)
-                else:
-                    # Building-Level을 결정할 수 없는 경우 - 회색
-                    tward_row.append(OPERATION_COLORS['inactive'])
-        
-        heatmap_data.append(tward_row)
+    location_colors = []
+    for building_level in interval_store.location_labels():
+        if building_level in OPERATION_COLORS:
+            location_colors.append(OPERATION_COLORS[building_level])
+        else:
+            location_colors.append(OPERATION_COLORS['inactive'])  # 미정의 공간은 회색
+            log.error(f"🚨 Unknown Building-Level: {building_level} - using gray")
+    
+    # 위치 코드 → 색상 (-1: 신호 미수신)
+    color_lookup = np.array(location_colors + [OPERATION_COLORS['no_signal']], dtype=np.int64)
+    device_ids = interval_store.device_ids(mac_operation_time['mac'])
+    heatmap_data = color_lookup[dominant[device_ids]]
     
     # DataFrame 생성
     columns = ['MAC Address', 'Operation Time (min)'] + [f"T{i:03d}" for i in range(144)]
     
-    final_data = []
-    for i, (_, row) in enumerate(mac_operation_time.iterrows()):
-        mac = row['mac']
-        operation_minutes = int(row['operation_minutes'])
-        data_row = [mac, operation_minutes] + heatmap_data[i]
-        final_data.append(data_row)
-    
-    heatmap_df = pd.DataFrame(final_data, columns=columns)
+    heatmap_df = pd.DataFrame(heatmap_data, columns=columns[2:])
+    heatmap_df.insert(0, 'MAC Address', mac_operation_time['mac'].to_numpy())
+    heatmap_df.insert(1, 'Operation Time (min)', mac_operation_time['operation_minutes'].to_numpy().astype(int))
     
     # 디버깅: 색상 분포 확인
     time_cols = [col for col in heatmap_df.columns if col.startswith('T')]
@@ -192,10 +167,10 @@ def generate_integrated_operation_heatmap(df, sward_config):
         count = (heatmap_matrix == color_value).sum().sum()
         color_distribution[color_name] = count
     
-    print("🎨 색상별 분포:")
+    log.debug("🎨 색상별 분포:")
     for color_name, count in color_distribution.items():
         if count > 0:
-            print(f"   {color_name}: {count}개 셀")
+            log.debug(f"   {color_name}: {count}개 셀")
     
     return {
         'heatmap_df': heatmap_df,
@@ -226,16 +201,17 @@ def determine_building_level_from_rssi(data_row, sward_config):
 def display_integrated_operation_heatmap(heatmap_result):
     """통합 Operation Heatmap 시각화"""
     
-    print("🎯 display_integrated_operation_heatmap 시작")
+    log.debug("🎯 display_integrated_operation_heatmap 시작")
     
     heatmap_df = heatmap_result['heatmap_df']
     tward_count = heatmap_result['tward_count']
     operation_time_range = heatmap_result['operation_time_range']
     
-    print(f"🎯 데이터 정보: {tward_count}개 T-Ward, 범위: {operation_time_range}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"🎯 데이터 정보: {tward_count}개 T-Ward, 범위: {operation_time_range}")
     
-    # 기본 통계 정보
-    print("🎯 통계 정보 표시 시작")
+        # 기본 통계 정보
+        log.debug("🎯 통계 정보 표시 시작")
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Total T-Ward", f"{tward_count:,}")
@@ -244,12 +220,12 @@ def display_integrated_operation_heatmap(heatmap_result):
     with col3:
         st.metric("Max Operation Time", f"{operation_time_range[1]}min")
     
-    print("🎯 통계 정보 표시 완료")
+    log.info("🎯 통계 정보 표시 완료")
     
     # 히트맵 시각화 (50개씩 10개 그룹)
     if not heatmap_df.empty:
         
-        print("🎯 히트맵 시각화 시작")
+        log.debug("🎯 히트맵 시각화 시작")
         
         time_cols = [col for col in heatmap_df.columns if col.startswith('T')]
         
@@ -257,10 +233,11 @@ def display_integrated_operation_heatmap(heatmap_result):
         max_twards = min(500, len(heatmap_df))
         top_twards_df = heatmap_df.head(max_twards)
         
-        print(f"🎯 시각화 대상: {max_twards}개 T-Ward")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🎯 시각화 대상: {max_twards}개 T-Ward")
         
-        # 테스트 그래프 먼저 표시
-        print("🔍 테스트 그래프 생성")
+            # 테스트 그래프 먼저 표시
+            log.debug("🔍 테스트 그래프 생성")
         test_fig, test_ax = plt.subplots(figsize=(8, 4))
         test_ax.plot([1, 2, 3, 4], [1, 4, 2, 3])
         test_ax.set_title("Test Graph - If you see this, matplotlib works")
@@ -271,87 +248,50 @@ def display_integrated_operation_heatmap(heatmap_result):
             test_fig.savefig(buf, format='png')
             buf.seek(0)
             st.image(buf, caption="Test Graph via st.image()", use_column_width=True)
-            print("✅ 테스트 그래프 이미지로 표시 성공")
+            log.info("✅ 테스트 그래프 이미지로 표시 성공")
         except Exception as e:
-            print(f"🚨 테스트 그래프 이미지 실패: {e}")
+            log.error(f"🚨 테스트 그래프 이미지 실패: {e}")
             # 기존 방식 시도
             try:
                 st.pyplot(test_fig, clear_figure=True)
-                print("✅ 테스트 그래프 pyplot으로 표시 성공")
+                log.info("✅ 테스트 그래프 pyplot으로 표시 성공")
             except Exception as e2:
-                print(f"🚨 테스트 그래프 pyplot 실패: {e2}")
+                log.error(f"🚨 테스트 그래프 pyplot 실패: {e2}")
         finally:
             plt.close(test_fig)
         
         st.write(f"**📊 Top {max_twards} T-Ward Operation Heatmap (50 T-Wards per Group)**")
         
-        # 50개씩 10개 그룹으로 분할
-        for group_idx in range(10):
-            start_idx = group_idx * 50
-            end_idx = min((group_idx + 1) * 50, max_twards)
-            
-            if start_idx >= max_twards:
-                break
-                
+        # 50개씩 10개 그룹으로 분할 - 그룹 히트맵은 worker 프로세스에서 동시에 렌더링 (캐시 재사용)
+        group_ranges = [(group_idx, group_idx * 50, min((group_idx + 1) * 50, max_twards))
+                        for group_idx in range(10) if group_idx * 50 < max_twards]
+        group_requests = []
+        for group_idx, start_idx, end_idx in group_ranges:
+            group_df = top_twards_df.iloc[start_idx:end_idx]
+            y_labels = [f"#{start_idx + i + 1} ({group_df.iloc[i]['Operation Time (min)']}min)" for i in range(len(group_df))]
+            group_requests.append(ChartRequest(
+                'integrated_operation_heatmap_group',
+                {'matrix': group_df[time_cols].values, 'y_labels': y_labels},
+                (20, max(8, len(group_df) * 0.4)), 150, 'png',
+                {'group_idx': group_idx, 'start_idx': start_idx, 'end_idx': end_idx, 'colors': COLOR_MAP}
+            ))
+        try:
+            group_images = render_charts(group_requests)
+        except Exception as e:
+            log.error(f"🚨 그룹 히트맵 렌더링 실패: {e}")
+            group_images = [None] * len(group_requests)
+        
+        for (group_idx, start_idx, end_idx), png_bytes in zip(group_ranges, group_images):
             group_df = top_twards_df.iloc[start_idx:end_idx]
-            group_matrix = group_df[time_cols].values
-            group_size = len(group_df)
             
-            print(f"🎯 그룹 {group_idx + 1} 생성 중: {start_idx + 1} ~ {end_idx}")
-            print(f"🔍 그룹 매트릭스 크기: {group_matrix.shape}")
-            print(f"🔍 매트릭스 값 범위: {group_matrix.min()} ~ {group_matrix.max()}")
-            print(f"🔍 매트릭스 고유값: {np.unique(group_matrix)}")
+            log.debug(f"🎯 그룹 {group_idx + 1} 표시: {start_idx + 1} ~ {end_idx}")
             
             st.write(f"**Group {group_idx + 1}: T-Ward #{start_idx + 1} ~ #{end_idx} (Operation Time Ranking)**")
             
-            # 히트맵 생성
-            fig, ax = plt.subplots(figsize=(20, max(8, group_size * 0.4)))
-            
-            cmap = ListedColormap(COLOR_MAP)
-            
-            # 히트맵 그리기
-            im = ax.imshow(group_matrix, cmap=cmap, aspect='auto', interpolation='nearest', vmin=0, vmax=7)
-            
-            # 축 설정
-            ax.set_xlabel('Time (10min intervals)', fontsize=12)
-            ax.set_ylabel(f'T-Ward Rank #{start_idx + 1} ~ #{end_idx}', fontsize=12)
-            ax.set_title(f'T-Ward Operation Heatmap - Group {group_idx + 1}\n(Black: No Signal, Gray: Inactive, Colors: Building-Level)', fontsize=14, pad=20)
-            
-            # X축 시간 레이블
-            x_ticks = list(range(0, 144, 12))
-            x_labels = [f"{i*2:02d}:00" for i in range(0, 12)]
-            ax.set_xticks(x_ticks)
-            ax.set_xticklabels(x_labels)
-            
-            # Y축 T-Ward 레이블
-            y_ticks = list(range(group_size))
-            y_labels = [f"#{start_idx + i + 1} ({group_df.iloc[i]['Operation Time (min)']}min)" for i in range(group_size)]
-            ax.set_yticks(y_ticks)
-            ax.set_yticklabels(y_labels, fontsize=9)
-            
-            ax.grid(True, alpha=0.3)
-            plt.tight_layout()
-            
-            print(f"🎯 그룹 {group_idx + 1} Streamlit에 표시 중")
-            try:
-                # 이미지로 저장 후 표시
-                import io
-                buf = io.BytesIO()
-                fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-                buf.seek(0)
-                st.image(buf, caption=f"Group {group_idx + 1}: T-Ward Operation Heatmap", use_column_width=True)
-                print(f"✅ 그룹 {group_idx + 1} 이미지로 표시 완료")
-            except Exception as e:
-                print(f"🚨 그룹 {group_idx + 1} 이미지 표시 실패: {e}")
-                # 기존 방식으로 재시도
-                try:
-                    st.pyplot(fig, clear_figure=True)
-                    print(f"✅ 그룹 {group_idx + 1} pyplot으로 표시 완료")
-                except Exception as e2:
-                    print(f"🚨 그룹 {group_idx + 1} pyplot 표시도 실패: {e2}")
-                    st.error(f"Failed to display group {group_idx + 1}: {e}")
-            finally:
-                plt.close(fig)  # 메모리 정리
+            if png_bytes is not None:
+                st.image(png_bytes, caption=f"Group {group_idx + 1}: T-Ward Operation Heatmap", use_column_width=True)
+            else:
+                st.error(f"Failed to display group {group_idx + 1}")
             
             # 그룹별 통계
             col1, col2, col3 = st.columns(3)
@@ -367,7 +307,7 @@ def display_integrated_operation_heatmap(heatmap_result):
             
             st.write("---")
         
-        print("✅ 모든 히트맵 그룹 표시 완료")
+        log.info("✅ 모든 히트맵 그룹 표시 완료")
         
         # 색상 범례 (Journey Heatmap 스타일 - 흰색 박스 안에 표시)
         st.markdown("#### 🎨 Color Legend")
@@ -397,10 +337,10 @@ def display_integrated_operation_heatmap(heatmap_result):
                 mime="text/csv"
             )
     else:
-        print("🚨 히트맵 데이터가 비어있음")
+        log.error("🚨 히트맵 데이터가 비어있음")
         st.warning("No data to display.")
         
-    print("🎯 display_integrated_operation_heatmap 완료")
+    log.info("🎯 display_integrated_operation_heatmap 완료")
 
 if __name__ == "__main__":
-    print("T-Ward Type 31 Integrated Operation Heatmap Module loaded")# Force redeploy Sun Dec  7 21:27:36 KST 2025
+    log.debug("T-Ward Type 31 Integrated Operation Heatmap Module loaded")
@@ -8,6 +8,9 @@ import io
 import os
 from src import tward_type31_processing
 from src.building_setup import load_building_config
+from src.chart_render import render_chart
+from src.event_store import MacEventStore
+from src.time_index import time_index_10s
 
 def render_location_operation_analysis_tward31(st):
     """Location & Operation Analysis 탭 렌더링"""
@@ -303,20 +306,18 @@ def calculate_positions_by_timebin(location_data, sward_config):
     
     # Generate time_bin from raw data (use existing if available)
     if 'time_bin' not in location_data.columns:
-        # Generate 10-second unit time_index based on 0:00:00
-        location_data['time_index'] = ((location_data['time'] - location_data['time'].dt.normalize()) / pd.Timedelta(seconds=10)).astype(int) + 1
+        # Generate 10-second unit time_index based on 0:00:00 (sec_of_day integer division)
+        location_data['time_index'] = time_index_10s(location_data)
         location_data['time_bin'] = ((location_data['time_index'] - 1) // 60) + 1  # 10-minute bin index (1~144)
     
-    # Process by MAC
-    unique_macs = location_data['mac'].unique()
-    st.write(f"- MACs to process: {len(unique_macs)}")
+    # Process by MAC - (mac, time) 정렬 1회 후 MAC별 슬라이스
+    store = MacEventStore.from_frame(location_data, time_col='time_bin')
+    st.write(f"- MACs to process: {len(store)}")
     
     processed_positions = 0
     valid_positions = 0
     
-    for mac_idx, mac in enumerate(unique_macs):
-        mac_data = location_data[location_data['mac'] == mac]
-        
+    for mac_idx, (mac, mac_data) in enumerate(store.iter_macs()):
         if not mac_data.empty:
             # Building/Level 결정 (각 MAC별로)
             mac_sward_counts = mac_data.groupby('sward_id').size()
@@ -340,17 +341,17 @@ def calculate_positions_by_timebin(location_data, sward_config):
             # Step 1: 신호가 있는 time index에서만 위치 계산
             calculated_positions = {}  # {time_bin: (x, y)}
             
-            for time_bin in range(1, 145):
-                time_data = mac_data[mac_data['time_bin'] == time_bin]
-                
-                if not time_data.empty:
+            # time_bin 내에서 S-Ward별 평균 RSSI 계산 (MAC당 groupby 1회)
+            timebin_rssi = mac_data.groupby(['time_bin', 'sward_id'])['rssi'].mean()
+            
+            for time_bin, time_rssi in timebin_rssi.groupby(level='time_bin'):
+                time_bin = int(time_bin)
+                if 1 <= time_bin <= 144:
                     # 해당 시간대의 모든 S-Ward RSSI 데이터 수집
                     sward_data_list = []
                     
-                    # time_bin 내에서 S-Ward별 평균 RSSI 계산
-                    for sward_id, sward_group in time_data.groupby('sward_id'):
+                    for (_, sward_id), avg_rssi in time_rssi.items():
                         if sward_id in sward_dict:
-                            avg_rssi = sward_group['rssi'].mean()
                             if avg_rssi < 0:  # 유효한 RSSI 값
                                 sward_data_list.append({
                                     'sward_id': sward_id,
@@ -530,18 +531,20 @@ def fill_missing_positions(position_data):
     
     result_data = position_data.copy()
     
-    for mac in result_data['mac'].unique():
-        mask = result_data['mac'] == mac
-        mac_data = result_data[mask].copy().sort_values('time_bin')
+    # (mac, time_bin) 정렬 1회 후 MAC별 구간에서 보간
+    store = MacEventStore.from_frame(result_data, time_col='time_bin')
+    source_positions = store.source_positions()
+    
+    for col in ['calculated_x', 'calculated_y']:
+        sorted_values = store.column(col).astype(float)
+        for mac_id in range(len(store)):
+            start, end = store.bounds(mac_id)
+            sorted_values[start:end] = pd.Series(sorted_values[start:end]).interpolate(method='linear').to_numpy()
         
-        if len(mac_data) > 0:
-            # x, y 좌표 보간
-            mac_data['calculated_x'] = mac_data['calculated_x'].interpolate(method='linear')
-            mac_data['calculated_y'] = mac_data['calculated_y'].interpolate(method='linear')
-            
-            # 원본 데이터 업데이트
-            result_data.loc[mask, 'calculated_x'] = mac_data['calculated_x'].values
-            result_data.loc[mask, 'calculated_y'] = mac_data['calculated_y'].values
+        # 원본 데이터 업데이트
+        values = result_data[col].to_numpy(dtype=float, copy=True)
+        values[source_positions] = sorted_values
+        result_data[col] = values
     
     return result_data
 
@@ -554,30 +557,32 @@ def smooth_positions_advanced(position_data, alpha=0.95):
     result_data['smoothed_x'] = result_data['calculated_x'].copy()
     result_data['smoothed_y'] = result_data['calculated_y'].copy()
     
-    for mac in result_data['mac'].unique():
-        mask = result_data['mac'] == mac
-        mac_data = result_data[mask].copy().sort_values('time_bin')
-        
-        if len(mac_data) > 1:
-            smoothed_x = [mac_data.iloc[0]['calculated_x']]
-            smoothed_y = [mac_data.iloc[0]['calculated_y']]
-            
-            for i in range(1, len(mac_data)):
-                if pd.notna(mac_data.iloc[i]['calculated_x']):
-                    # 지수 평활
-                    new_x = alpha * smoothed_x[-1] + (1 - alpha) * mac_data.iloc[i]['calculated_x']
-                    new_y = alpha * smoothed_y[-1] + (1 - alpha) * mac_data.iloc[i]['calculated_y']
-                else:
-                    # 이전 값 유지
-                    new_x = smoothed_x[-1] if smoothed_x else mac_data.iloc[i]['calculated_x']
-                    new_y = smoothed_y[-1] if smoothed_y else mac_data.iloc[i]['calculated_y']
-                
-                smoothed_x.append(new_x)
-                smoothed_y.append(new_y)
-            
-            # 원본 데이터 업데이트
-            result_data.loc[mask, 'smoothed_x'] = smoothed_x
-            result_data.loc[mask, 'smoothed_y'] = smoothed_y
+    # (mac, time_bin) 정렬 1회 후 MAC별 구간 순회
+    store = MacEventStore.from_frame(result_data, time_col='time_bin')
+    calc_x = store.column('calculated_x').astype(float)
+    calc_y = store.column('calculated_y').astype(float)
+    smoothed_x = calc_x.copy()
+    smoothed_y = calc_y.copy()
+    
+    for mac_id in range(len(store)):
+        start, end = store.bounds(mac_id)
+        
+        for i in range(start + 1, end):
+            if not np.isnan(calc_x[i]):
+                # 지수 평활
+                smoothed_x[i] = alpha * smoothed_x[i - 1] + (1 - alpha) * calc_x[i]
+                smoothed_y[i] = alpha * smoothed_y[i - 1] + (1 - alpha) * calc_y[i]
+            else:
+                # 이전 값 유지
+                smoothed_x[i] = smoothed_x[i - 1]
+                smoothed_y[i] = smoothed_y[i - 1]
+    
+    # 원본 데이터 업데이트
+    source_positions = store.source_positions()
+    for col, sorted_values in [('smoothed_x', smoothed_x), ('smoothed_y', smoothed_y)]:
+        values = result_data[col].to_numpy(dtype=float, copy=True)
+        values[source_positions] = sorted_values
+        result_data[col] = values
     
     return result_data
 
@@ -865,57 +870,25 @@ def create_tward_average_position_image(position_data, sward_config, building_co
             st.error(f"지도 이미지를 찾을 수 없습니다: {map_image_path}")
             return None
         
-        import cv2
-        map_image = cv2.imread(map_image_path)
-        map_image = cv2.cvtColor(map_image, cv2.COLOR_BGR2RGB)
-        
-        # 플롯 생성
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # 지도 표시
-        ax.imshow(map_image, extent=[0, map_image.shape[1], map_image.shape[0], 0])
-        
-        # S-Ward 위치 표시 (노란색 네모 박스)
+        # S-Ward 위치 (노란색 네모 박스)
         building_swards = sward_config[
             (sward_config['building'] == target_building) &
             (sward_config['level'] == target_level)
-        ]
-        for _, sward in building_swards.iterrows():
-            # 노란색 네모 박스로 표시
-            ax.scatter(sward['x'], sward['y'], c='yellow', s=80, marker='s', 
-                      alpha=0.8, edgecolors='orange', linewidth=1,
-                      label='S-Ward' if _ == building_swards.index[0] else "")
-            # 텍스트만 간단하게 (박스 없이, 작은 크기)
-            ax.annotate(f"S-{int(sward['sward_id'])}", 
-                       (sward['x'], sward['y']),
-                       xytext=(5, -12), textcoords='offset points',
-                       fontsize=5, color='darkorange', fontweight='bold')
-        
-        # T-Ward 평균 위치 표시 (파란색 원)
-        for i, (_, row) in enumerate(avg_positions.iterrows()):
-            # 파란색 원으로 표시
-            ax.scatter(row['calculated_x'], row['calculated_y'], 
-                      c='blue', s=120, alpha=0.8, 
-                      edgecolors='navy', linewidth=1,
-                      label='T-Ward Average' if i == 0 else "")
-            # MAC 주소 전체 표시 (박스 없이, 작은 크기)
-            ax.annotate(f"{row['mac']}", 
-                       (row['calculated_x'], row['calculated_y']),
-                       xytext=(8, 8), textcoords='offset points',
-                       fontsize=4.5, fontweight='bold', color='navy')
-        
-        ax.set_title(f"T-Ward Average Positions - {target_building} {target_level}\n(Total {len(avg_positions)} T-Wards)")
-        ax.set_xlabel('X Position (pixels)')
-        ax.set_ylabel('Y Position (pixels)')
-        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        ax.grid(True, alpha=0.3)
+        ][['sward_id', 'x', 'y']]
         
-        plt.tight_layout()
+        # 플롯 생성 / 저장 (chart_render: 같은 입력이면 캐시된 PNG 재사용)
+        png_bytes = render_chart(
+            'tward_average_positions',
+            {'avg_positions': avg_positions[['mac', 'calculated_x', 'calculated_y']], 'swards': building_swards,
+             'map_mtime': os.path.getmtime(map_image_path)},
+            (12, 8), dpi=300,
+            map_image_path=map_image_path, building=target_building, level=target_level
+        )
         
         # 이미지 저장
         output_path = f"tward_avg_positions_{target_building}_{target_level}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close(fig)
+        with open(output_path, 'wb') as f:
+            f.write(png_bytes)
         
         return output_path
         
@@ -4,12 +4,39 @@ import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
-from matplotlib.backends.backend_pdf import PdfPages
-import io
-import base64
 import streamlit as st
 from src import tward_type31_processing
 from src import tward_type31_integrated_heatmap
+from src.chart_render import ChartRequest, add_image_page, render_charts
+from src.frame_fingerprint import fingerprint
+from src.job_runner import STATE_DONE, run_job_once
+from src.operation_intervals import OperationIntervalStore
+from src.report_writer import PREVIEW_MAX_BYTES, StreamingPdfPages, open_report
+import logging
+from src.tracing import get_logger
+
+log = get_logger(__name__)
+
+def compute_tward31_operation(tward31_path, job=None):
+    """T-Ward Type 31 통합 분석 (st 미사용 - background job에서도 실행)"""
+    if job is not None:
+        job.progress(0.1, "Loading T-Ward Type 31 data")
+    
+    # 데이터 전처리
+    df = pd.read_csv(tward31_path, header=None)
+    df = tward_type31_processing.preprocess_tward31(df)
+    df = tward_type31_processing.add_time_index(df)
+    sward_config = tward_type31_processing.load_sward_config()
+    
+    if job is not None:
+        job.progress(0.4, "Running unified operation analysis")
+    
+    # 통합 분석 수행
+    analysis_results = tward_type31_processing.unified_tward31_analysis(df, sward_config)
+    
+    # T-Ward별 가동 구간 (Operation Heatmap / Integrated Heatmap 공용)
+    analysis_results['interval_store'] = OperationIntervalStore.from_bins(analysis_results['location_data'])
+    return analysis_results
 
 def render_operation_analysis_tward31(st):
     # 파일 경로: 세션 또는 output 폴더에서 최신 파일 자동 탐색
@@ -26,14 +53,17 @@ def render_operation_analysis_tward31(st):
         st.info("Please upload a T-Ward type 31 file in the 'Input data files' menu.")
         return
     
-    # 데이터 전처리
-    df = pd.read_csv(tward31_path, header=None)
-    df = tward_type31_processing.preprocess_tward31(df)
-    df = tward_type31_processing.add_time_index(df)
-    sward_config = tward_type31_processing.load_sward_config()
-    
-    # 통합 분석 수행
-    analysis_results = tward_type31_processing.unified_tward31_analysis(df, sward_config)
+    if st.session_state.get('processing_background_jobs', True):
+        # Background job: 파일이 바뀐 경우에만 다시 분석 (rerun마다 재계산하지 않음)
+        source = [os.path.abspath(tward31_path), os.path.getmtime(tward31_path)]
+        state, analysis_results = run_job_once(
+            st, 'tward31_job', source, 't31_operation', __name__, 'compute_tward31_operation',
+            params={'tward31_path': source[0]}, label='T-Ward Type 31 Operation Analysis'
+        )
+        if state != STATE_DONE or not analysis_results:
+            return
+    else:
+        analysis_results = compute_tward31_operation(tward31_path)
     
     # 결과에서 필요한 데이터 추출
     summary_stats = analysis_results['summary_stats']
@@ -53,24 +83,26 @@ def render_operation_analysis_tward31(st):
     count_arr = {}
     
     # 디버깅: op_rate_df 데이터 확인
-    print("=== DEBUG: op_rate_df 정보 ===")
-    print(f"op_rate_df shape: {op_rate_df.shape}")
-    print(f"op_rate_df columns: {op_rate_df.columns.tolist()}")
-    print("op_rate_df sample:")
-    print(op_rate_df.head(10))
-    print(f"time_bin range: {op_rate_df['time_bin'].min()} ~ {op_rate_df['time_bin'].max()}")
-    print("building/level 조합:")
-    print(op_rate_df.groupby(['building', 'level']).size())
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("=== DEBUG: op_rate_df 정보 ===")
+        log.debug(f"op_rate_df shape: {op_rate_df.shape}")
+        log.debug(f"op_rate_df columns: {op_rate_df.columns.tolist()}")
+        log.debug("op_rate_df sample:")
+        log.debug(op_rate_df.head(10))
+        log.debug(f"time_bin range: {op_rate_df['time_bin'].min()} ~ {op_rate_df['time_bin'].max()}")
+        log.debug("building/level 조합:")
+        log.debug(op_rate_df.groupby(['building', 'level']).size())
     
     # Building/Level별로 144개 time bin 배열 생성
     for (bldg, lvl), sub in op_rate_df.groupby(['building', 'level']):
         rate_arr = [0.0] * 144
         cnt_arr = [0] * 144
         
-        print(f"\n=== DEBUG: {bldg}-{lvl} 데이터 ===")
-        print(f"sub shape: {sub.shape}")
-        print("sub sample:")
-        print(sub[['time_bin', 'Active T-Ward Count', 'Operation Rate (%)']].head())
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"\n=== DEBUG: {bldg}-{lvl} 데이터 ===")
+            log.debug(f"sub shape: {sub.shape}")
+            log.debug("sub sample:")
+            log.debug(sub[['time_bin', 'Active T-Ward Count', 'Operation Rate (%)']].head())
         
         for _, row in sub.iterrows():
             if row['time_bin'] > 0:  # time_bin이 0이 아닌 경우만
@@ -82,9 +114,10 @@ def render_operation_analysis_tward31(st):
         # 배열에 0이 아닌 값이 몇 개나 있는지 확인
         non_zero_rate = sum(1 for x in rate_arr if x > 0)
         non_zero_count = sum(1 for x in cnt_arr if x > 0)
-        print(f"Non-zero rate values: {non_zero_rate}, Non-zero count values: {non_zero_count}")
-        print(f"Rate array sample: {rate_arr[:10]}...")
-        print(f"Count array sample: {cnt_arr[:10]}...")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"Non-zero rate values: {non_zero_rate}, Non-zero count values: {non_zero_count}")
+            log.debug(f"Rate array sample: {rate_arr[:10]}...")
+            log.debug(f"Count array sample: {cnt_arr[:10]}...")
         
         op_rate_arr[(bldg, lvl)] = rate_arr
         count_arr[(bldg, lvl)] = cnt_arr
@@ -102,11 +135,12 @@ def render_operation_analysis_tward31(st):
             minute = (i % 6) * 10
             time_labels.append(f"{hour:02d}:{minute:02d}")
         
-        print(f"\n=== DEBUG: 시간 라벨 확인 ===")
-        print(f"X indices length: {len(x_indices)}")
-        print(f"Time labels length: {len(time_labels)}")
-        print(f"First 10 indices: {x_indices[:10]}")
-        print(f"First 10 time labels: {time_labels[:10]}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"\n=== DEBUG: 시간 라벨 확인 ===")
+            log.debug(f"X indices length: {len(x_indices)}")
+            log.debug(f"Time labels length: {len(time_labels)}")
+            log.debug(f"First 10 indices: {x_indices[:10]}")
+            log.debug(f"First 10 time labels: {time_labels[:10]}")
         
         # --- Operation Rate(%) 그래프 (matplotlib) ---
         fig1, ax1 = plt.subplots(figsize=(15, 6))
@@ -120,11 +154,12 @@ def render_operation_analysis_tward31(st):
                 else:
                     y_values.append(0.0)
             
-            print(f"\n=== DEBUG: Operation Rate {bldg}-{lvl} ===")
-            print(f"Y values length: {len(y_values)}")
-            print(f"Non-zero count: {sum(1 for x in y_values if x > 0)}")
-            print(f"Max value: {max(y_values)}")
-            print(f"First 10 values: {y_values[:10]}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"\n=== DEBUG: Operation Rate {bldg}-{lvl} ===")
+                log.debug(f"Y values length: {len(y_values)}")
+                log.debug(f"Non-zero count: {sum(1 for x in y_values if x > 0)}")
+                log.debug(f"Max value: {max(y_values)}")
+                log.debug(f"First 10 values: {y_values[:10]}")
             
             # matplotlib로 그래프 그리기
             ax1.plot(x_indices, y_values, marker='o', markersize=2, linewidth=1.5, 
@@ -157,12 +192,13 @@ def render_operation_analysis_tward31(st):
                 else:
                     y_values.append(0)
             
-            print(f"\n=== DEBUG: Active Count {bldg}-{lvl} ===")
-            print(f"Y values length: {len(y_values)}")
-            print(f"Non-zero count: {sum(1 for x in y_values if x > 0)}")
-            print(f"Max value: {max(y_values)}")
-            print(f"First 10 values: {y_values[:10]}")
-            print(f"Sum of all values: {sum(y_values)}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"\n=== DEBUG: Active Count {bldg}-{lvl} ===")
+                log.debug(f"Y values length: {len(y_values)}")
+                log.debug(f"Non-zero count: {sum(1 for x in y_values if x > 0)}")
+                log.debug(f"Max value: {max(y_values)}")
+                log.debug(f"First 10 values: {y_values[:10]}")
+                log.debug(f"Sum of all values: {sum(y_values)}")
             
             # matplotlib로 그래프 그리기
             ax2.plot(x_indices, y_values, marker='o', markersize=2, linewidth=1.5, 
@@ -192,6 +228,9 @@ def render_operation_analysis_tward31(st):
     else:
         st.info('Unable to generate time-binned Operation Rate data. (No data available)')
     
+    # T-Ward별 가동 구간 (Operation Heatmap / Integrated Heatmap 공용)
+    interval_store = analysis_results['interval_store']
+    
     # 통합 분석 결과를 세션에 저장 (Location Analysis에서 재사용)
     st.session_state['tward31_analysis_results'] = analysis_results
     
@@ -199,7 +238,7 @@ def render_operation_analysis_tward31(st):
     st.markdown('<span style="font-size:13px;font-weight:bold">Operation Heatmap - T-Ward Activity Overview</span>', unsafe_allow_html=True)
     
     # 각 Building/Level별로 Operation Heatmap 생성
-    render_operation_heatmap(location_data, summary_stats)
+    render_operation_heatmap(location_data, summary_stats, interval_store)
     
     # === Integrated T-Ward Type 31 Operation Heatmap ===
     st.markdown("---")
@@ -207,32 +246,31 @@ def render_operation_analysis_tward31(st):
     st.markdown("**All T-Wards in one heatmap with Building-Level color coding**")
     
     try:
-        print("🔍 Starting integrated heatmap generation")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🔍 Starting integrated heatmap generation")
         
-        # Use location_data which already has is_active information (like existing heatmaps)
-        print(f"🔍 Using location_data with {len(location_data)} records")
-        print(f"🔍 Location data columns: {location_data.columns.tolist()}")
-        print(f"🔍 Active records in location_data: {len(location_data[location_data['is_active'] == True])}")
+            # Use location_data which already has is_active information (like existing heatmaps)
+            log.debug(f"🔍 Using location_data with {len(location_data)} records")
+            log.debug(f"🔍 Location data columns: {location_data.columns.tolist()}")
+            log.debug(f"🔍 Active records in location_data: {len(location_data[location_data['is_active'] == True])}")
         
         df_integrated = location_data.copy()
         
         # location_data already has building, level, and is_active columns
         # Debug: Building-Level distribution
-        print("🔍 Building-Level distribution:")
+        log.debug("🔍 Building-Level distribution:")
         building_level_counts = df_integrated.groupby(['building', 'level']).size()
         for (building, level), count in building_level_counts.items():
-            print(f"   {building}-{level}: {count} records")
+            log.debug(f"   {building}-{level}: {count} records")
         
         # Debug: Active vs inactive records
         active_records = len(df_integrated[df_integrated['is_active'] == True])
         total_records = len(df_integrated)
-        print(f"🔍 Active records: {active_records}/{total_records} ({active_records/total_records*100:.1f}%)")
+        log.debug(f"🔍 Active records: {active_records}/{total_records} ({active_records/total_records*100:.1f}%)")
         
-        # Calculate operation time per MAC using is_active data
-        active_data = df_integrated[df_integrated['is_active'] == True]
-        mac_operation_time = active_data.groupby('mac')['time_bin'].count().sort_values(ascending=False)
-        # Convert to minutes (each time_bin is 10 minutes)
-        mac_operation_time = mac_operation_time * 10
+        # Calculate operation time per MAC from the operation interval store (each time_bin is 10 minutes)
+        operation_minutes = pd.Series(interval_store.operating_minutes(), index=interval_store.devices)
+        mac_operation_time = operation_minutes[operation_minutes > 0].sort_index().sort_values(ascending=False)
         
         # Simple color mapping like existing heatmaps (0: inactive, 1: active)
         # Create custom colormap based on Building-Level
@@ -258,54 +296,37 @@ def render_operation_analysis_tward31(st):
         final_data = []
         building_level_counts = {}
         
-        for mac, operation_time in mac_operation_time.items():
-            # Determine Building-Level for each MAC
-            mac_data = df_integrated[df_integrated['mac'] == mac]
-            if len(mac_data) > 0:
-                # Find most frequent building and level for this MAC
-                building = mac_data['building'].mode().iloc[0] if not mac_data['building'].mode().empty else 'Unknown'
-                level = mac_data['level'].mode().iloc[0] if not mac_data['level'].mode().empty else 'Unknown'
-                building_level = f"{building}-{level}"
-                
-                # Count building-level distribution
-                building_level_counts[building_level] = building_level_counts.get(building_level, 0) + 1
-                
-                # Calculate activity status by time (0: inactive, 1: active)
-                operation_minutes = operation_time if mac in mac_operation_time else 0
-                data_row = [mac, building_level, operation_minutes]
-                
-                active_count = 0
-                for time_bin in time_bins:
-                    # Check if this MAC was active in this time bin
-                    active_in_bin = mac_data[
-                        (mac_data['time_bin'] == time_bin) & 
-                        (mac_data['is_active'] == True)
-                    ]
-                    
-                    if len(active_in_bin) > 0:
-                        # Active in this time bin
-                        data_row.append(1)
-                        active_count += 1
-                    else:
-                        # Inactive in this time bin  
-                        data_row.append(0)
-                
-                if active_count > 0:
-                    print(f"   MAC {mac}: {building_level}, active in {active_count}/144 time bins")
-                    final_data.append(data_row)
-                else:
-                    # Skip T-Wards with no activity
-                    continue
-                final_data.append(data_row)
+        # Most frequent building and level for each MAC (all records)
+        mac_building = _modal_values(df_integrated, 'building')
+        mac_level = _modal_values(df_integrated, 'level')
+        
+        # Activity status by time (0: inactive, 1: active)
+        activity_matrix = interval_store.active_matrix(len(time_bins), devices=mac_operation_time.index)
+        
+        for row_idx, (mac, operation_time) in enumerate(mac_operation_time.items()):
+            building = mac_building.get(mac, 'Unknown')
+            level = mac_level.get(mac, 'Unknown')
+            building_level = f"{building}-{level}"
+            
+            active_count = int(activity_matrix[row_idx].sum())
+            if active_count == 0:
+                # Skip T-Wards with no activity
+                continue
+            
+            # Count building-level distribution
+            building_level_counts[building_level] = building_level_counts.get(building_level, 0) + 1
+            
+            log.debug(f"   MAC {mac}: {building_level}, active in {active_count}/144 time bins")
+            final_data.append([mac, building_level, operation_time] + activity_matrix[row_idx].astype(int).tolist())
         
         # Debug: Building-Level statistics
-        print("🔍 Building-Level distribution in heatmap:")
+        log.debug("🔍 Building-Level distribution in heatmap:")
         for building_level, count in building_level_counts.items():
-            print(f"   {building_level}: {count} T-Wards")
+            log.debug(f"   {building_level}: {count} T-Wards")
         
         heatmap_df = pd.DataFrame(final_data, columns=columns)
         
-        print(f"🎯 Integrated heatmap data: {len(heatmap_df)} T-Wards")
+        log.debug(f"🎯 Integrated heatmap data: {len(heatmap_df)} T-Wards")
         
         # Create separate heatmaps for each Building-Level (like existing approach)
         unique_building_levels = heatmap_df['Building-Level'].unique()
@@ -328,9 +349,10 @@ def render_operation_analysis_tward31(st):
             time_cols = [f'T{i}' for i in range(1, 145)]
             heatmap_matrix = display_df[time_cols].values
             
-            print(f"🎯 {building_level}: {len(display_df)} T-Wards")
-            print(f"   Matrix shape: {heatmap_matrix.shape}")
-            print(f"   Active cells: {np.sum(heatmap_matrix == 1)}/{heatmap_matrix.size}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"🎯 {building_level}: {len(display_df)} T-Wards")
+                log.debug(f"   Matrix shape: {heatmap_matrix.shape}")
+                log.debug(f"   Active cells: {np.sum(heatmap_matrix == 1)}/{heatmap_matrix.size}")
             
             if np.sum(heatmap_matrix) == 0:
                 st.warning(f"No active data for {building_level}")
@@ -429,9 +451,10 @@ def render_operation_analysis_tward31(st):
             time_cols = [f'T{i}' for i in range(1, 145)]
             unified_matrix = top_twards[time_cols].values
             
-            print(f"🎯 Unified heatmap: {len(top_twards)} T-Wards")
-            print(f"   Matrix shape: {unified_matrix.shape}")
-            print(f"   Active cells: {np.sum(unified_matrix == 1)}/{unified_matrix.size}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"🎯 Unified heatmap: {len(top_twards)} T-Wards")
+                log.debug(f"   Matrix shape: {unified_matrix.shape}")
+                log.debug(f"   Active cells: {np.sum(unified_matrix == 1)}/{unified_matrix.size}")
             
             # Create Building-Level color mapping for Y-axis labels
             building_level_colors = {
@@ -572,59 +595,56 @@ def render_operation_analysis_tward31(st):
             top_10_summary = top_twards[['MAC Address', 'Building-Level', 'Operation Time (min)']].head(10)
             st.dataframe(top_10_summary, use_container_width=True)
         
-        print("✅ Integrated heatmap generation completed")
+        log.info("✅ Integrated heatmap generation completed")
         
     except Exception as e:
         st.error(f"❌ Error generating integrated heatmap: {str(e)}")
-        print(f"❌ Integrated heatmap error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ Integrated heatmap error: {e}")
     
     # --- PDF Export 기능 추가 ---
     st.markdown("---")
     
     # 분석 완료 메시지
     st.success("✅ Operation Analysis completed! Check the Report Generation tab to download PDF report.")
-    # Debugging: Check if 'level' column exists after merging
-    if 'level' not in df.columns:
-        print("Debug: 'level' column is missing after merging with sward_config.")
-        print("Available columns:", df.columns)
-        print("Sample data:", df.head())
-    # Debugging: Check df after merging and before groupby
-    print("Debug: df sample data after merging:", df.head())
-    print("Debug: df columns after merging:", df.columns)
 
-    # Debugging: Check groupby target columns
-    if 'mac' not in df.columns or 'level' not in df.columns:
-        print("Debug: 'mac' or 'level' column is missing before groupby.")
-    
-    # Debugging: Check if 'level' column exists in groupby target
-    if 'level' not in df.columns:
-        print("Debug: 'level' column is missing in df before groupby.")
-        print("Debug: df columns:", df.columns)
-        print("Debug: df sample data:", df.head())
-    else:
-        print("Debug: 'level' column exists in df before groupby.")
 
-    # Estimate 'level' if missing after merging
-    if 'level' not in df.columns:
-        print("Debug: 'level' column is missing. Estimating 'level' based on RSSI.")
-        # Assuming 'sward_id' and 'rssi' exist in df
-        df = df.merge(sward_config[['sward_id', 'level']], on='sward_id', how='left')
-        df['level'] = df.groupby('mac')['rssi'].transform(lambda x: x.idxmax())
-        print("Debug: 'level' column estimated.")
+def _modal_values(data, col):
+    """MAC별 최빈값 (동률이면 정렬 순 첫 값, Series.mode().iloc[0]과 동일)"""
+    counts = data.groupby(['mac', col]).size().reset_index(name='count')
+    counts = counts.sort_values(['mac', 'count', col], ascending=[True, False, True]).drop_duplicates('mac')
+    return dict(zip(counts['mac'], counts[col]))
+
+def _tward_operation_summary(interval_store, filtered_data, building, level):
+    """Building/Level별 T-Ward 가동 시간 (가동되지 않은 T-Ward 포함, 가동 시간 내림차순)"""
+    level_filter = None if level == '(All)' else level
+    operation_minutes = interval_store.operating_minutes(building, level_filter)
+    all_twards = filtered_data['mac'].unique()
+    tward_summary = pd.DataFrame({
+        'mac': all_twards,
+        'operation_minutes': operation_minutes[interval_store.device_ids(all_twards)]
+    })
+    return tward_summary.sort_values('operation_minutes', ascending=False)
 
+def _tward_activity_matrix(interval_store, tward_summary, building, level):
+    """T-Ward × 144 time bin 가동 여부 (1: 가동, 0: 비가동)"""
+    level_filter = None if level == '(All)' else level
+    return interval_store.active_matrix(144, building, level_filter, devices=tward_summary['mac'])
 
-def render_operation_heatmap(location_data, summary_stats):
+def render_operation_heatmap(location_data, summary_stats, interval_store=None):
     """
     T-Ward Operation Heatmap을 생성하여 각 T-Ward의 10분 단위 가동 현황을 시각화
     
     Args:
         location_data: T-Ward 위치 및 활성화 데이터
         summary_stats: Building/Level별 요약 통계
+        interval_store: T-Ward별 가동 구간 (없으면 location_data로부터 생성)
     """
     import streamlit as st
     
+    # T-Ward별 가동 구간 (Building/Level 공용)
+    if interval_store is None:
+        interval_store = OperationIntervalStore.from_bins(location_data)
+    
     # 각 Building/Level 조합에 대해 히트맵 생성
     locations = [(row['building'], row['level']) for _, row in summary_stats.iterrows() 
                 if row['level'] != '(All)']  # Building 전체는 제외
@@ -652,47 +672,21 @@ def render_operation_heatmap(location_data, summary_stats):
             st.warning(f"No data found for {building}-{level}")
             continue
             
-        # T-Ward별 가동 시간 계산 (분 단위)
-        tward_operation_time = filtered_data[filtered_data['is_active'] == True].groupby('mac')['time_bin'].count().reset_index()
-        tward_operation_time.columns = ['mac', 'operation_minutes']
-        tward_operation_time['operation_minutes'] = tward_operation_time['operation_minutes'] * 10  # 10분 단위
-        
-        # 모든 T-Ward 목록 (가동되지 않은 것도 포함)
-        all_twards = filtered_data['mac'].unique()
-        tward_list = []
-        for mac in all_twards:
-            op_time = tward_operation_time[tward_operation_time['mac'] == mac]['operation_minutes']
-            op_time = op_time.values[0] if len(op_time) > 0 else 0
-            tward_list.append({'mac': mac, 'operation_minutes': op_time})
-        
-        tward_summary = pd.DataFrame(tward_list)
-        tward_summary = tward_summary.sort_values('operation_minutes', ascending=False)
+        # T-Ward별 가동 시간 계산 (분 단위, 가동되지 않은 T-Ward 포함)
+        tward_summary = _tward_operation_summary(interval_store, filtered_data, building, level)
         
         if tward_summary.empty:
             st.warning(f"No T-Ward data found for {building}-{level}")
             continue
         
-        # 히트맵 데이터 생성 (T-Ward x Time Bin)
-        heatmap_data = []
-        
-        for _, tward_row in tward_summary.iterrows():
-            mac = tward_row['mac']
-            row_data = [mac, int(tward_row['operation_minutes'])]  # MAC주소와 총 가동시간
-            
-            # 144개 time bin에 대한 가동 상태
-            for time_bin in range(1, 145):
-                active = filtered_data[
-                    (filtered_data['mac'] == mac) & 
-                    (filtered_data['time_bin'] == time_bin) & 
-                    (filtered_data['is_active'] == True)
-                ]
-                row_data.append(1 if not active.empty else 0)  # 1: 가동, 0: 비가동
-            
-            heatmap_data.append(row_data)
+        # 히트맵 데이터 생성 (T-Ward x Time Bin, 1: 가동, 0: 비가동)
+        activity_matrix = _tward_activity_matrix(interval_store, tward_summary, building, level)
         
         # DataFrame 생성 (Time Bin은 10분 단위: T1=00:00-00:10, T2=00:10-00:20, ...)
         columns = ['MAC Address', 'Operation Time (min)'] + [f"T{i}" for i in range(1, 145)]
-        heatmap_df = pd.DataFrame(heatmap_data, columns=columns)
+        heatmap_df = pd.DataFrame(activity_matrix.astype(int), columns=columns[2:])
+        heatmap_df.insert(0, 'MAC Address', tward_summary['mac'].to_numpy())
+        heatmap_df.insert(1, 'Operation Time (min)', tward_summary['operation_minutes'].to_numpy().astype(int))
         
         # 히트맵 시각화
         fig, ax = plt.subplots(figsize=(20, max(8, len(heatmap_df) * 0.3)))
@@ -789,6 +783,7 @@ def render_operation_heatmap(location_data, summary_stats):
 def _calculate_enriched_statistics(location_data, summary_stats):
     """Calculate enriched statistics for better reporting"""
     enriched_data = []
+    interval_store = OperationIntervalStore.from_bins(location_data)
     
     for _, row in summary_stats.iterrows():
         building = row['building']
@@ -803,9 +798,11 @@ def _calculate_enriched_statistics(location_data, summary_stats):
             ]
         
         if not filtered_data.empty:
-            # Calculate T-Ward operation times
-            tward_operation_time = filtered_data[filtered_data['is_active'] == True].groupby('mac')['time_bin'].count().reset_index()
-            tward_operation_time['operation_minutes'] = tward_operation_time['time_bin'] * 10
+            # Calculate T-Ward operation times (operating T-Wards only, MAC order)
+            operation_minutes = interval_store.operating_minutes(building, None if level == '(All)' else level)
+            tward_operation_time = pd.DataFrame({'mac': interval_store.devices, 'operation_minutes': operation_minutes})
+            tward_operation_time = tward_operation_time[tward_operation_time['operation_minutes'] > 0]
+            tward_operation_time = tward_operation_time.sort_values('mac').reset_index(drop=True)
             
             if not tward_operation_time.empty:
                 # Find longest operating device
@@ -841,13 +838,15 @@ def _calculate_enriched_statistics(location_data, summary_stats):
     
     return pd.DataFrame(enriched_data)
 
-@st.cache_data(ttl=300)  # 5분 캐시
+@st.cache_data(ttl=300, hash_funcs={pd.DataFrame: fingerprint})  # 5분 캐시 (DataFrame은 content id로 key 생성)
 def generate_cached_pdf_report(summary_stats, op_rate_df, location_data):
     """
     Generate PDF report with flexible layout and English text
+    
+    Returns:
+        (pdf_path, filename) - PDF is streamed to disk page by page (src.report_writer)
     """
     from datetime import datetime
-    import io
     
     try:
         # Data collection date extraction
@@ -869,10 +868,11 @@ def generate_cached_pdf_report(summary_stats, op_rate_df, location_data):
         # Calculate enriched statistics
         enriched_stats = _calculate_enriched_statistics(location_data, summary_stats)
         
-        # Create PDF buffer with flexible size
-        pdf_buffer = io.BytesIO()
+        # 페이지 단위로 디스크에 기록 (전체 문서를 메모리에 쌓지 않음)
+        current_date = datetime.now().strftime("%Y%m%d_%H%M")
+        filename = f"TableLift_TL_Operation_Analysis_Report_{data_collection_date}_{current_date}.pdf"
         
-        with PdfPages(pdf_buffer) as pdf:
+        with StreamingPdfPages(filename) as pdf:
             # Page 1: Professional Cover + Summary Statistics (optimized layout)
             fig_cover = plt.figure(figsize=(11, 14))  # Taller for better spacing
             
@@ -1116,7 +1116,9 @@ Key Features: 144 intervals (10-min bins), peak identification, multi-level comp
                 plt.close(fig_combined)
             
             # Page 3-N: Operation Heatmap for each level (flexible size)
+            interval_store = OperationIntervalStore.from_bins(location_data)
             locations = [(row['building'], row['level']) for _, row in summary_stats.iterrows()]
+            heatmap_requests = []
             
             for building, level in locations:
                 if level == '(All)':
@@ -1133,25 +1135,16 @@ Key Features: 144 intervals (10-min bins), peak identification, multi-level comp
                 
                 if not filtered_data.empty:
                     # T-Ward별 가동 시간 계산
-                    tward_operation_time = filtered_data[filtered_data['is_active'] == True].groupby('mac')['time_bin'].count().reset_index()
-                    tward_operation_time.columns = ['mac', 'operation_minutes']
-                    tward_operation_time['operation_minutes'] = tward_operation_time['operation_minutes'] * 10
-                    
-                    all_twards = filtered_data['mac'].unique()
-                    tward_list = []
-                    for mac in all_twards:
-                        op_time = tward_operation_time[tward_operation_time['mac'] == mac]['operation_minutes']
-                        op_time = op_time.values[0] if len(op_time) > 0 else 0
-                        tward_list.append({'mac': mac, 'operation_minutes': op_time})
-                    
-                    tward_summary = pd.DataFrame(tward_list)
-                    tward_summary = tward_summary.sort_values('operation_minutes', ascending=False)
+                    tward_summary = _tward_operation_summary(interval_store, filtered_data, building, level)
                     
                     if not tward_summary.empty:
                         # 모든 T-Ward를 한 페이지에 표시 (가독성 향상)
-                        _create_heatmap_page(pdf, filtered_data, tward_summary, 
-                                           f'Operation Heatmap - {title_suffix}', 
-                                           data_collection_date)
+                        activity_matrix = _tward_activity_matrix(interval_store, tward_summary, building, level)
+                        heatmap_requests.append(_heatmap_page_request(
+                            activity_matrix, tward_summary, f'Operation Heatmap - {title_suffix}'))
+            
+            # 레벨별 히트맵 페이지를 worker 프로세스에서 동시에 렌더링 (캐시된 페이지는 재사용)
+            _add_heatmap_pages(pdf, heatmap_requests)
             
             # T-Ward Location Page: Add T-Ward location images before Time Bin Reference Guide
             _create_tward_location_page(pdf, building_name, data_collection_date)
@@ -1176,127 +1169,64 @@ Analysis System: Hy-con & IRFM by TJLABS"""
             pdf.savefig(fig_summary, bbox_inches='tight')
             plt.close(fig_summary)
         
-        # PDF 버퍼에서 데이터 가져하기
-        pdf_buffer.seek(0)
-        pdf_data = pdf_buffer.getvalue()
-        
-        current_date = datetime.now().strftime("%Y%m%d_%H%M")
-        filename = f"TableLift_TL_Operation_Analysis_Report_{data_collection_date}_{current_date}.pdf"
-        
-        return pdf_data, filename
+        if pdf.page_count == 0:
+            # 기록된 페이지가 없으면 파일이 만들어지지 않음
+            log.warning("PDF generation produced no pages")
+            return None, None
+        return str(pdf.path), filename
         
     except Exception as e:
-        print(f"PDF generation error: {str(e)}")
+        log.error(f"PDF generation error: {str(e)}")
         return None, None
 
-def _create_heatmap_page(pdf, filtered_data, tward_summary, title, data_collection_date):
-    """Create heatmap page with natural proportions and flexible sizing"""
-    try:
-        # Generate heatmap data (same logic as current dashboard)
-        heatmap_data = []
-        for _, tward_row in tward_summary.iterrows():
-            mac = tward_row['mac']
-            row_data = []
-            # Operation status for 144 time bins
-            for time_bin in range(1, 145):
-                active = filtered_data[
-                    (filtered_data['mac'] == mac) & 
-                    (filtered_data['time_bin'] == time_bin) & 
-                    (filtered_data['is_active'] == True)
-                ]
-                row_data.append(1 if not active.empty else 0)  # 1: active, 0: inactive
-            heatmap_data.append(row_data)
-        
-        if heatmap_data:
-            # Dynamic size adjustment - natural proportions based on T-Ward count
-            num_twards = len(tward_summary)
-            
-            # Optimized sizing for better proportions
-            if num_twards <= 10:
-                height = max(8, num_twards * 0.6 + 3)
-                fig_width = 12
-            else:
-                height = max(10, min(18, num_twards * 0.4 + 3))
-                fig_width = 14
-            
-            # Create figure with better subplot proportions
-            fig = plt.figure(figsize=(fig_width, height))
-            
-            # Main heatmap subplot (adjusted for better spacing)
-            ax = plt.subplot2grid((14, 1), (0, 0), rowspan=9, fig=fig)
-            
-            # Increased space between heatmap and explanation (2 rows gap)
-            # Explanation area subplot (bottom 3 rows with better separation)
-            ax_explanation = plt.subplot2grid((14, 1), (11, 0), rowspan=3, fig=fig)
-            ax_explanation.axis('off')
-            
-            activity_matrix = np.array(heatmap_data)
-            
-            # Custom colormap (same as dashboard)
-            from matplotlib.colors import ListedColormap
-            colors = ['#D3D3D3', '#32CD32']  # Light gray, lime green
-            custom_cmap = ListedColormap(colors)
-            
-            # Create heatmap
-            im = ax.imshow(activity_matrix, cmap=custom_cmap, aspect='auto', vmin=0, vmax=1)
-            
-            # Y-axis labels (MAC Address + Operation Time)
-            y_labels = [f"{row['mac']} ({row['operation_minutes']} min)" 
-                       for _, row in tward_summary.iterrows()]
-            ax.set_yticks(range(len(y_labels)))
-            ax.set_yticklabels(y_labels, fontsize=max(8, min(12, 150/num_twards)))  # Dynamic font size
-            
-            # X-axis labels (time)
-            time_labels = []
-            tick_positions = []
-            for i in range(0, 144, 6):  # Every hour
-                hour = i // 6
-                time_labels.append(f"{hour:02d}:00")
-                tick_positions.append(i)
-            
-            ax.set_xticks(tick_positions)
-            ax.set_xticklabels(time_labels, rotation=45, fontsize=11)
-            ax.set_xlabel('Time (Hours)', fontsize=14)
-            ax.set_ylabel('T-Ward MAC Address', fontsize=14)
-            
-            # Vertical grid lines (every 2 hours)
-            for i in range(12, 144, 12):  # Every 2 hours
-                ax.axvline(x=i-0.5, color='black', linestyle='--', alpha=0.3, linewidth=0.8)
-            
-            # Thicker grid lines (every 6 hours)
-            for i in range(36, 144, 36):  # Every 6 hours
-                ax.axvline(x=i-0.5, color='black', linestyle='--', alpha=0.6, linewidth=1.2)
-            
-            # Horizontal grid lines for T-Ward separation
-            for i in range(1, len(tward_summary)):
-                ax.axhline(y=i-0.5, color='gray', linestyle='-', alpha=0.2, linewidth=0.5)
-            
-            # Title
-            ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-            
-            # Colorbar
-            cbar = plt.colorbar(im, ax=ax)
-            cbar.set_label('Operation Status', fontsize=12)
-            cbar.set_ticks([0, 1])
-            cbar.set_ticklabels(['Inactive (Gray)', 'Active (Green)'])
-            
-            # Concise heatmap explanation
-            explanation_text = f"""Operation Heatmap - {title} ({num_twards} devices):
+HEATMAP_PAGE_DPI = 200  # PDF 히트맵 페이지 raster 해상도
 
-Y-axis: MAC addresses (ranked by operation time) | X-axis: Time (hourly intervals)
-Colors: Green = Active | Gray = Inactive | Grid: 2hr/6hr reference lines
-Analysis: Horizontal patterns = device operation, Vertical patterns = simultaneous usage"""
-            
-            ax_explanation.text(0.0, 0.8, explanation_text, fontsize=11, alpha=0.8,
-                              verticalalignment='top', transform=ax_explanation.transAxes,
-                              bbox=dict(boxstyle="round,pad=0.8", facecolor="lightgreen", alpha=0.2))
-            
-            pdf.savefig(fig, bbox_inches='tight', pad_inches=0.5)
-            plt.close(fig)
-        
+
+def _heatmap_page_request(activity_matrix, tward_summary, title):
+    """Heatmap page chart request (rendered by src.chart_render, None if empty)
+
+    Args:
+        activity_matrix: T-Ward x 144 time bin operation status (1: active, 0: inactive)
+    """
+    heatmap_data = np.asarray(activity_matrix).astype(int)
+    if heatmap_data.size == 0:
+        return None
+
+    # Dynamic size adjustment - natural proportions based on T-Ward count
+    num_twards = len(tward_summary)
+    if num_twards <= 10:
+        height = max(8, num_twards * 0.6 + 3)
+        fig_width = 12
+    else:
+        height = max(10, min(18, num_twards * 0.4 + 3))
+        fig_width = 14
+
+    # Y-axis labels (MAC Address + Operation Time)
+    y_labels = [f"{mac} ({minutes} min)"
+                for mac, minutes in zip(tward_summary['mac'], tward_summary['operation_minutes'])]
+    return ChartRequest('t31_operation_heatmap_page', {'matrix': heatmap_data, 'y_labels': y_labels},
+                        (fig_width, height), HEATMAP_PAGE_DPI, 'png', {'title': title})
+
+
+def _add_heatmap_pages(pdf, requests):
+    """Heatmap pages: render concurrently (cached), then append in order"""
+    requests = [r for r in requests if r is not None]
+    if not requests:
+        return
+    try:
+        for png_bytes in render_charts(requests):
+            add_image_page(pdf, png_bytes, HEATMAP_PAGE_DPI)
     except Exception as e:
-        print(f"Error creating heatmap page: {str(e)}")
-        pass
+        log.error(f"Error creating heatmap page: {str(e)}")
+
+
+def _create_heatmap_page(pdf, activity_matrix, tward_summary, title, data_collection_date):
+    """Create heatmap page with natural proportions and flexible sizing
+    
+    Args:
+        activity_matrix: T-Ward x 144 time bin operation status (1: active, 0: inactive)
+    """
+    _add_heatmap_pages(pdf, [_heatmap_page_request(activity_matrix, tward_summary, title)])
 
 
 def _create_tward_location_page(pdf, building_name, data_collection_date):
@@ -1323,7 +1253,7 @@ def _create_tward_location_page(pdf, building_name, data_collection_date):
                 found_images.append(latest_file)
         
         if not found_images:
-            print("No T-Ward location images found for PDF report")
+            log.warning("No T-Ward location images found for PDF report")
             return
         
         # Create figure for T-Ward location page with more space
@@ -1364,7 +1294,7 @@ def _create_tward_location_page(pdf, building_name, data_collection_date):
                             fontsize=14, fontweight='bold', pad=15)
                 
             except Exception as img_error:
-                print(f"Error loading first image: {str(img_error)}")
+                log.error(f"Error loading first image: {str(img_error)}")
             
             # Second image (WWT-B1F) - positioned in lower half
             try:
@@ -1384,7 +1314,7 @@ def _create_tward_location_page(pdf, building_name, data_collection_date):
                             fontsize=14, fontweight='bold', pad=15)
                 
             except Exception as img_error:
-                print(f"Error loading second image: {str(img_error)}")
+                log.error(f"Error loading second image: {str(img_error)}")
         
         elif len(found_images) == 1:
             # Single image - centered
@@ -1406,7 +1336,7 @@ def _create_tward_location_page(pdf, building_name, data_collection_date):
                            fontsize=14, fontweight='bold', pad=15)
                 
             except Exception as img_error:
-                print(f"Error loading single image: {str(img_error)}")
+                log.error(f"Error loading single image: {str(img_error)}")
         
         # Add explanation at the bottom with proper spacing
         explanation_text = """Position Analysis Legend:
@@ -1432,10 +1362,10 @@ Positioning Method: RSSI-based trilateration with smoothing (α=0.99)"""
         pdf.savefig(fig, bbox_inches='tight', pad_inches=0.5)
         plt.close(fig)
         
-        print("T-Ward location page added to PDF report successfully")
+        log.info("T-Ward location page added to PDF report successfully")
         
     except Exception as e:
-        print(f"Error creating T-Ward location page: {str(e)}")
+        log.error(f"Error creating T-Ward location page: {str(e)}")
         pass
 
 
@@ -1451,10 +1381,11 @@ def generate_operation_pdf_report(summary_stats, op_rate_df, location_data, st):
         st.write("Debug - Summary Stats Columns:", summary_stats.columns.tolist())
         st.write("Debug - Summary Stats Sample:", summary_stats.head())
         
-        # PDF 파일 생성
-        pdf_buffer = io.BytesIO()
+        # PDF 파일 생성 (페이지 단위로 디스크에 기록)
+        current_date = datetime.now().strftime("%Y%m%d_%H%M")
+        filename = f"T-Ward_Operation_Analysis_Report_{current_date}.pdf"
         
-        with PdfPages(pdf_buffer) as pdf:
+        with StreamingPdfPages(filename) as pdf:
             # 페이지 1: 요약 통계
             fig1, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
             fig1.suptitle('T-Ward Operation Analysis Report', fontsize=20, fontweight='bold')
@@ -1546,7 +1477,8 @@ def generate_operation_pdf_report(summary_stats, op_rate_df, location_data, st):
             
             # 페이지 2: Operation Heatmap들
             # Building/Level별 히트맵 생성
-            locations = [(row['building'], row['level']) for _, row in summary_stats.iterrows() 
+            interval_store = OperationIntervalStore.from_bins(location_data)
+            locations = [(row['building'], row['level']) for _, row in summary_stats.iterrows()
                         if row['level'] != '(All)']
             
             for building, level in locations:
@@ -1562,19 +1494,7 @@ def generate_operation_pdf_report(summary_stats, op_rate_df, location_data, st):
                     continue
                 
                 # T-Ward별 가동 시간 계산
-                tward_operation_time = filtered_data[filtered_data['is_active'] == True].groupby('mac')['time_bin'].count().reset_index()
-                tward_operation_time.columns = ['mac', 'operation_minutes']
-                tward_operation_time['operation_minutes'] = tward_operation_time['operation_minutes'] * 10
-                
-                all_twards = filtered_data['mac'].unique()
-                tward_list = []
-                for mac in all_twards:
-                    op_time = tward_operation_time[tward_operation_time['mac'] == mac]['operation_minutes']
-                    op_time = op_time.values[0] if len(op_time) > 0 else 0
-                    tward_list.append({'mac': mac, 'operation_minutes': op_time})
-                
-                tward_summary = pd.DataFrame(tward_list)
-                tward_summary = tward_summary.sort_values('operation_minutes', ascending=False)
+                tward_summary = _tward_operation_summary(interval_store, filtered_data, building, level)
                 
                 if tward_summary.empty:
                     continue
@@ -1583,18 +1503,7 @@ def generate_operation_pdf_report(summary_stats, op_rate_df, location_data, st):
                 tward_summary = tward_summary.head(20)
                 
                 # 히트맵 데이터 생성
-                heatmap_data = []
-                for _, tward_row in tward_summary.iterrows():
-                    mac = tward_row['mac']
-                    row_data = []
-                    for time_bin in range(1, 145):
-                        active = filtered_data[
-                            (filtered_data['mac'] == mac) & 
-                            (filtered_data['time_bin'] == time_bin) & 
-                            (filtered_data['is_active'] == True)
-                        ]
-                        row_data.append(1 if not active.empty else 0)
-                    heatmap_data.append(row_data)
+                heatmap_data = _tward_activity_matrix(interval_store, tward_summary, building, level).astype(int).tolist()
                 
                 if not heatmap_data:
                     continue
@@ -1649,24 +1558,24 @@ def generate_operation_pdf_report(summary_stats, op_rate_df, location_data, st):
                 pdf.savefig(fig, bbox_inches='tight')
                 plt.close(fig)
         
-        # PDF 다운로드 제공
-        pdf_buffer.seek(0)
-        
-        current_date = datetime.now().strftime("%Y%m%d_%H%M")
-        filename = f"T-Ward_Operation_Analysis_Report_{current_date}.pdf"
+        if pdf.page_count == 0:
+            st.warning("No report pages were generated.")
+            return
         
-        st.download_button(
-            label="📥 Download PDF Report",
-            data=pdf_buffer.getvalue(),
-            file_name=filename,
-            mime="application/pdf"
-        )
+        # PDF 다운로드 제공 (디스크 파일 handle)
+        with open_report(pdf.path) as pdf_file:
+            st.download_button(
+                label="📥 Download PDF Report",
+                data=pdf_file,
+                file_name=filename,
+                mime="application/pdf"
+            )
         
         st.success(f"✅ PDF report generated successfully! Click the download button above.")
         
     except Exception as e:
         st.error(f"❌ Error generating PDF report: {str(e)}")
-        print(f"PDF generation error: {str(e)}")
+        log.error(f"PDF generation error: {str(e)}")
 
 def render_report_generation_tward31(st):
     """
@@ -1693,40 +1602,53 @@ def render_report_generation_tward31(st):
     
     # PDF 리포트 자동 생성
     with st.spinner("Generating PDF report..."):
-        pdf_data, pdf_filename = generate_cached_pdf_report(
+        pdf_path, pdf_filename = generate_cached_pdf_report(
             summary_stats, op_rate_df, location_data
         )
+        if pdf_path and not os.path.exists(pdf_path):
+            # 캐시된 경로의 파일이 정리된 경우 다시 생성
+            generate_cached_pdf_report.clear()
+            pdf_path, pdf_filename = generate_cached_pdf_report(
+                summary_stats, op_rate_df, location_data
+            )
         
-        if pdf_data:
+        if pdf_path and os.path.exists(pdf_path):
             st.success(f"✅ PDF report generated successfully: **{pdf_filename}**")
+            pdf_size = os.path.getsize(pdf_path)
             
-            # PDF 미리보기 (Base64 인코딩)
-            import base64
-            base64_pdf = base64.b64encode(pdf_data).decode('utf-8')
-            
-            # PDF 뷰어 임베드
+            # PDF 미리보기 (Base64 인코딩) - 대용량 PDF는 생략
             st.markdown("### 📖 PDF Preview")
-            pdf_display = f"""
-            <iframe src="data:application/pdf;base64,{base64_pdf}" 
-                    width="100%" height="800" type="application/pdf">
-                <p>Your browser does not support PDFs. 
-                   <a href="data:application/pdf;base64,{base64_pdf}">Download the PDF</a>.</p>
-            </iframe>
-            """
-            st.markdown(pdf_display, unsafe_allow_html=True)
-            
-            # 다운로드 버튼
+            if pdf_size <= PREVIEW_MAX_BYTES:
+                import base64
+                with open_report(pdf_path) as pdf_file:
+                    base64_pdf = base64.b64encode(pdf_file.read()).decode('utf-8')
+                
+                # PDF 뷰어 임베드
+                pdf_display = f"""
+                <iframe src="data:application/pdf;base64,{base64_pdf}" 
+                        width="100%" height="800" type="application/pdf">
+                    <p>Your browser does not support PDFs. 
+                       <a href="data:application/pdf;base64,{base64_pdf}">Download the PDF</a>.</p>
+                </iframe>
+                """
+                st.markdown(pdf_display, unsafe_allow_html=True)
+                del base64_pdf
+            else:
+                st.info(f"Preview skipped for large report ({pdf_size / (1024 * 1024):.1f} MB). Please download the PDF.")
+            
+            # 다운로드 버튼 (디스크 파일 handle)
             st.markdown("### 💾 Download Report")
-            st.download_button(
-                label="📥 Download PDF Report",
-                data=pdf_data,
-                file_name=pdf_filename,
-                mime="application/pdf"
-            )
+            with open_report(pdf_path) as pdf_file:
+                st.download_button(
+                    label="📥 Download PDF Report",
+                    data=pdf_file,
+                    file_name=pdf_filename,
+                    mime="application/pdf"
+                )
             
             # 리포트 정보
             st.markdown("### 📋 Report Information")
-            file_size = len(pdf_data) / 1024  # KB
+            file_size = pdf_size / 1024  # KB
             st.info(f"""
             **File Name:** {pdf_filename}  
             **File Size:** {file_size:.1f} KB  
@@ -1735,6 +1657,8 @@ def render_report_generation_tward31(st):
             """)
             
         else:
+            # 실패 결과가 캐시에 남지 않도록 (다시 시도하면 새로 생성)
+            generate_cached_pdf_report.clear()
             st.error("❌ Failed to generate PDF report. Please try again.")
     
 
@@ -2,8 +2,8 @@ def timebin_operation_rate_indexed(df, sward_config):
     # time_bin을 index(1,2,3...)로 변환, 각 인덱스별 Operation Rate(%) 배열 반환
     df = df.merge(sward_config[['sward_id', 'building', 'level']], on='sward_id', how='left')
     if 'time_bin' not in df.columns:
-        # 0시 0분 0초 기준 10초 단위 time_index 생성
-        df['time_index'] = ((df['time'] - df['time'].dt.normalize()) / pd.Timedelta(seconds=10)).astype(int) + 1
+        # 0시 0분 0초 기준 10초 단위 time_index 생성 (sec_of_day 정수 나눗셈)
+        df['time_index'] = time_index_10s(df)
         df['time_bin'] = ((df['time_index'] - 1) // 60) + 1  # 10분 bin index (1~144)
     # 각 time_bin, mac별로 가장 큰 RSSI의 S-Ward의 building/level로 인식
     idx = df.groupby(['time_bin', 'mac'])['rssi'].idxmax()
@@ -160,6 +160,23 @@ import numpy as np
 from datetime import datetime, timedelta
 import numpy as np
 
+from src.time_index import add_time_columns, time_index_10s
+
+def modal_level_by_mac(df):
+    """MAC별 최빈 층 (동률이면 먼저 수신된 층) - MAC별 value_counts().idxmax()와 같은 결과
+    
+    (mac, level) 조합 단위 벡터 집계로 MAC마다 value_counts를 호출하지 않습니다.
+    층 값이 하나도 없는 MAC은 결과에 포함되지 않습니다.
+    """
+    valid = (df['mac'].notna() & df['level'].notna()).to_numpy()
+    counts = pd.DataFrame({
+        'mac': df['mac'].to_numpy()[valid],
+        'level': df['level'].to_numpy()[valid],
+        'pos': np.flatnonzero(valid)
+    }).groupby(['mac', 'level'], sort=False).agg(n=('pos', 'size'), first=('pos', 'min')).reset_index()
+    modal = counts.sort_values(['mac', 'n', 'first'], ascending=[True, False, True]).drop_duplicates('mac')
+    return pd.Series(modal['level'].to_numpy(), index=modal['mac'].to_numpy(), name='fixed_level')
+
 def unified_tward31_analysis(df, sward_config):
     """
     Type 31 T-Ward 데이터에 대한 통합 분석 함수
@@ -175,26 +192,11 @@ def unified_tward31_analysis(df, sward_config):
     
     # Time bin 생성 (10분 단위)
     if 'time_bin' not in df.columns:
-        df['time_index'] = ((df['time'] - df['time'].dt.normalize()) / pd.Timedelta(seconds=10)).astype(int) + 1
+        df['time_index'] = time_index_10s(df)
         df['time_bin'] = ((df['time_index'] - 1) // 60) + 1  # 10분 bin index (1~144)
     
-    # Type 31 장비 층 고정: 하루 동안 가장 빈번한 층으로 설정
-    def get_most_frequent_level(x):
-        """안전하게 가장 빈번한 층을 찾는 함수"""
-        if len(x) == 0:
-            return None
-        value_counts = x.value_counts()
-        if len(value_counts) == 0:
-            return None
-        return value_counts.idxmax()
-    
-    floor_fix = df.groupby('mac')['level'].agg(get_most_frequent_level).reset_index()
-    floor_fix.columns = ['mac', 'fixed_level']
-    
-    # None 값이 있는 경우 원본 level 값을 유지
-    df = df.merge(floor_fix, on='mac', how='left')
-    df['level'] = df['fixed_level'].fillna(df['level'])
-    df = df.drop(columns=['fixed_level'])
+    # Type 31 장비 층 고정: 하루 동안 가장 빈번한 층으로 설정 (층 값이 없는 MAC은 원본 level 유지)
+    df['level'] = df['mac'].map(modal_level_by_mac(df)).fillna(df['level'])
     
     # 가동률 판단: 10분 동안 2회 이상 수신되면 가동
     activity_check = df.groupby(['time_bin', 'mac']).size().reset_index(name='signal_count')
@@ -277,6 +279,8 @@ def preprocess_tward31(df):
     df.columns = ["sward_id", "mac", "type", "rssi", "time"]
     # 시간 파싱
     df["time"] = pd.to_datetime(df["time"])
+    # 정수 시간 컬럼 (day / sec_of_day / minute_of_day)
+    add_time_columns(df)
     return df
 
 def get_time_index(dt):
@@ -286,7 +290,8 @@ def get_time_index(dt):
     return int(delta // 10) + 1
 
 def add_time_index(df):
-    df["time_index"] = df["time"].apply(get_time_index)
+    # 0시 0분 0초 기준 10초 단위 time_index (sec_of_day 정수 나눗셈)
+    df["time_index"] = time_index_10s(df)
     return df
 
 def operation_stats(df):
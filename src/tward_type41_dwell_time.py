@@ -9,8 +9,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 
+from src.event_store import MacEventStore
+from src.result_cache import cached_result
+from src.t41_schema import STATUS_ACTIVE, category_codes, category_mask, status_codes
+import logging
+from src.tracing import get_logger
+
+log = get_logger(__name__)
+
 def render_tward41_dwell_time(st):
-    print("🏠 >>> render_tward41_dwell_time called - NEW VERSION")
+    log.debug("🏠 >>> render_tward41_dwell_time called - NEW VERSION")
     """T-Ward Type 41 Dwell Time Analysis 탭 렌더링"""
     
     st.markdown("### ⏱️ T-Ward Type 41 Dwell Time Analysis")
@@ -75,126 +83,117 @@ def display_dwell_filtering_info(st):
         
         st.info(f"📊 The above analysis includes only T-Wards with ≥{min_dwell_time} minutes dwell time")
 
+@cached_result(session_keys=('tward41_min_dwell_time',))
 def analyze_dwell_times(activity_analysis):
     """체류시간 분석"""
     
     try:
-        print("=== Dwell Time Analysis Debug ===")
-        print(f"Total activity records: {len(activity_analysis)}")
-        print(f"Activity status distribution: {activity_analysis['activity_status'].value_counts().to_dict()}")
-        
-        # T-Ward별 체류시간 계산
-        dwell_data = []
-        
-        # 각 T-Ward별로 처리
-        tward_count = 0
-        for mac in activity_analysis['mac'].unique():
-            tward_count += 1
-            mac_data = activity_analysis[activity_analysis['mac'] == mac]
-            
-            # Active 상태인 데이터만 체류시간에 포함 (비활성화 상태 제외)
-            try:
-                # pandas Series 비교를 명시적으로 처리
-                activity_mask = mac_data['activity_status'] == 'Active'
-                occupied_data = mac_data[activity_mask]
-            except Exception as e:
-                print(f"Error filtering activity_status for {mac}: {e}")
-                print(f"Activity status unique values: {mac_data['activity_status'].unique()}")
-                occupied_data = pd.DataFrame()  # 빈 DataFrame
-            
-            if tward_count <= 3:  # 처음 3개 T-Ward만 디버깅
-                print(f"\nT-Ward {mac}:")
-                print(f"  Total records: {len(mac_data)}")
-                print(f"  Occupied records: {len(occupied_data)}")
-                if not occupied_data.empty:
-                    building_counts = occupied_data['building'].value_counts().to_dict()
-                    print(f"  Building distribution: {building_counts}")
-            
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("=== Dwell Time Analysis Debug ===")
+            log.debug(f"Total activity records: {len(activity_analysis)}")
+            log.debug(f"Activity status distribution: {activity_analysis['activity_status'].value_counts().to_dict()}")
+        
+        # T-Ward별 체류시간 계산 - MAC별 CSR 저장소에서 한 번에 집계
+        store = MacEventStore.ensure(activity_analysis)
+        events = store.frame
+        
+        # Active 상태인 데이터만 체류시간에 포함 (비활성화 상태 제외) - 상태 코드 비교
+        active_mask = status_codes(events['activity_status']) == STATUS_ACTIVE
+        
+        # 처음 3개 T-Ward만 디버깅
+        for mac_id in range(min(3, len(store))):
+            mac = store.macs[mac_id]
+            mac_data = store.slice(mac_id)
+            start, end = store.bounds(mac_id)
+            occupied_data = mac_data[active_mask[start:end]]
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"\nT-Ward {mac}:")
+                log.debug(f"  Total records: {len(mac_data)}")
+                log.debug(f"  Occupied records: {len(occupied_data)}")
             if not occupied_data.empty:
-                # Building별 체류시간 계산
-                building_dwell = {}
-                level_dwell = {}
-                spacetype_dwell = {}  # 공간 유형별 체류시간 (Rest Area, Smoking Area 등)
-                
-                for _, row in occupied_data.iterrows():
-                    building = row['building']
-                    level = row['level']
-                    space_type = row.get('space_type', 'Unknown')  # 공간 유형 정보
-                    
-                    # Building 체류시간 누적 (1분 = 1분)
-                    if pd.notna(building) and str(building) != 'Unknown':
-                        if building not in building_dwell:
-                            building_dwell[building] = 0
-                        building_dwell[building] += 1
-                    
-                    # Level 체류시간 누적
-                    if pd.notna(building) and pd.notna(level) and str(building) != 'Unknown' and str(level) != 'Unknown':
-                        level_key = f"{building}-{level}"
-                        if level_key not in level_dwell:
-                            level_dwell[level_key] = 0
-                        level_dwell[level_key] += 1
-                    
-                    # Space Type 체류시간 누적 (Cluster의 특별한 공간들)
-                    if pd.notna(space_type) and str(space_type) != 'Unknown' and building == 'Cluster':
-                        spacetype_key = f"{building}-{space_type}"
-                        if spacetype_key not in spacetype_dwell:
-                            spacetype_dwell[spacetype_key] = 0
-                        spacetype_dwell[spacetype_key] += 1
-                
-                if tward_count <= 3:
-                    print(f"  Building dwell times: {building_dwell}")
-                    print(f"  Level dwell times: {level_dwell}")
-                
-                # T-Ward별 체류시간 데이터 저장
-                for building, minutes in building_dwell.items():
-                    dwell_data.append({
-                        'mac': mac,
-                        'space': building,
-                        'space_type': 'Building',
-                        'dwell_minutes': minutes,
-                        'dwell_hours': round(minutes / 60, 2)
-                    })
-                
-                for level_key, minutes in level_dwell.items():
-                    dwell_data.append({
-                        'mac': mac,
-                        'space': level_key,
-                        'space_type': 'Level',
-                        'dwell_minutes': minutes,
-                        'dwell_hours': round(minutes / 60, 2)
-                    })
-                
-                for spacetype_key, minutes in spacetype_dwell.items():
-                    dwell_data.append({
-                        'mac': mac,
-                        'space': spacetype_key,
-                        'space_type': 'Space_Type',
-                        'dwell_minutes': minutes,
-                        'dwell_hours': round(minutes / 60, 2)
-                    })
-        
-        dwell_df = pd.DataFrame(dwell_data)
+                building_counts = occupied_data['building'].value_counts()
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(f"  Building distribution: {building_counts[building_counts > 0].to_dict()}")
+        
+        occupied = events[active_mask]
+        occupied_mac_ids = store.mac_ids[active_mask]
+        
+        # 카테고리 코드로 집계 (문자열 비교는 카테고리 단위로만 수행)
+        building_codes, building_cats = category_codes(occupied['building'])
+        level_codes, level_cats = category_codes(occupied['level'])
+        if 'space_type' in occupied.columns:
+            space_codes, space_cats = category_codes(occupied['space_type'])
+        else:
+            # 공간 유형 정보 없음 → 'Unknown'
+            space_codes, space_cats = np.zeros(len(occupied), dtype=np.int64), np.array(['Unknown'], dtype=object)
+        
+        is_known = lambda value: str(value) != 'Unknown'
+        # Building 체류시간 (1분 = 1분)
+        building_valid = category_mask(building_codes, building_cats, is_known)
+        # Level 체류시간
+        level_valid = building_valid & category_mask(level_codes, level_cats, is_known)
+        # Space Type 체류시간 (Cluster의 특별한 공간들)
+        spacetype_valid = (category_mask(space_codes, space_cats, is_known) &
+                           category_mask(building_codes, building_cats, lambda value: value == 'Cluster'))
+        
+        building_labels = building_cats
+        building_str = np.array([str(value) for value in building_cats], dtype=object)
+        level_str = np.array([str(value) for value in level_cats], dtype=object)
+        space_str = np.array([str(value) for value in space_cats], dtype=object)
+        
+        dwell_parts = []
+        for rank, (space_label, valid, code_columns, make_space) in enumerate([
+            ('Building', building_valid, [building_codes],
+             lambda g: building_labels[g['c0'].to_numpy()]),
+            ('Level', level_valid, [building_codes, level_codes],
+             lambda g: building_str[g['c0'].to_numpy()] + '-' + level_str[g['c1'].to_numpy()]),
+            ('Space_Type', spacetype_valid, [building_codes, space_codes],
+             lambda g: building_str[g['c0'].to_numpy()] + '-' + space_str[g['c1'].to_numpy()]),
+        ]):
+            if not valid.any():
+                continue
+            # MAC 순으로 정렬된 행에서 sort=False 그룹핑 → MAC 내 첫 등장 순서 유지
+            keys = {'mac_id': occupied_mac_ids[valid]}
+            keys.update({f'c{i}': codes[valid] for i, codes in enumerate(code_columns)})
+            counts = pd.DataFrame(keys).groupby(list(keys), sort=False).size().reset_index(name='dwell_minutes')
+            counts['space'] = make_space(counts)
+            # 같은 문자열 키(예: Building-Level)는 합산
+            counts = counts.groupby(['mac_id', 'space'], sort=False)['dwell_minutes'].sum().reset_index()
+            counts['rank'] = rank
+            counts['space_type'] = space_label
+            dwell_parts.append(counts)
+        
+        if dwell_parts:
+            dwell_df = pd.concat(dwell_parts, ignore_index=True)
+            dwell_df = dwell_df.sort_values(['mac_id', 'rank'], kind='stable').reset_index(drop=True)
+            dwell_df['mac'] = store.macs[dwell_df['mac_id'].to_numpy()]
+            dwell_df['dwell_hours'] = (dwell_df['dwell_minutes'] / 60).round(2)
+            dwell_df = dwell_df[['mac', 'space', 'space_type', 'dwell_minutes', 'dwell_hours']]
+        else:
+            dwell_df = pd.DataFrame()
         
         if dwell_df.empty:
-            print("No dwell data generated!")
+            log.debug("No dwell data generated!")
             return None
         
-        print(f"\nDwell DataFrame created: {len(dwell_df)} records")
-        print("Space type distribution:", dwell_df['space_type'].value_counts().to_dict())
-        print("Space distribution:", dwell_df['space'].value_counts().to_dict())
-        print(f"Dwell minutes range: {dwell_df['dwell_minutes'].min()} - {dwell_df['dwell_minutes'].max()}")
-        print(f"Sample dwell data:\n{dwell_df.head(10)}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"\nDwell DataFrame created: {len(dwell_df)} records")
+            log.debug("Space type distribution: %s", dwell_df['space_type'].value_counts().to_dict())
+            log.debug("Space distribution: %s", dwell_df['space'].value_counts().to_dict())
+            log.debug(f"Dwell minutes range: {dwell_df['dwell_minutes'].min()} - {dwell_df['dwell_minutes'].max()}")
+            log.debug(f"Sample dwell data:\n{dwell_df.head(10)}")
         
         # 최소 체류시간 필터링 적용
         min_dwell_time = st.session_state.get('tward41_min_dwell_time', 0)
         
-        print(f"🔍 Minimum dwell time filter: {min_dwell_time} minutes")
-        print(f"Before filtering: {len(dwell_df)} records")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🔍 Minimum dwell time filter: {min_dwell_time} minutes")
+            log.debug(f"Before filtering: {len(dwell_df)} records")
         
         # 최소 체류시간 이상인 데이터만 필터링
         if min_dwell_time > 0:
             dwell_df_filtered = dwell_df[dwell_df['dwell_minutes'] >= min_dwell_time]
-            print(f"After filtering: {len(dwell_df_filtered)} records")
+            log.debug(f"After filtering: {len(dwell_df_filtered)} records")
         else:
             dwell_df_filtered = dwell_df
             
@@ -253,12 +252,13 @@ def generate_dwell_histogram(dwell_df):
         for space in type_data['space'].unique():
             space_data = type_data[type_data['space'] == space]
             
-            print(f"Debug: {space_type}_{space} - 체류시간 데이터")
-            print(f"  최소값: {space_data['dwell_minutes'].min()}")
-            print(f"  최대값: {space_data['dwell_minutes'].max()}")
-            print(f"  평균값: {space_data['dwell_minutes'].mean():.1f}")
-            print(f"  데이터 개수: {len(space_data)}")
-            print(f"  샘플 데이터: {sorted(space_data['dwell_minutes'].tolist())[:10]}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"Debug: {space_type}_{space} - 체류시간 데이터")
+                log.debug(f"  최소값: {space_data['dwell_minutes'].min()}")
+                log.debug(f"  최대값: {space_data['dwell_minutes'].max()}")
+                log.debug(f"  평균값: {space_data['dwell_minutes'].mean():.1f}")
+                log.debug(f"  데이터 개수: {len(space_data)}")
+                log.debug(f"  샘플 데이터: {sorted(space_data['dwell_minutes'].tolist())[:10]}")
             
             # 30분 단위 구간 생성 (올바른 구간 설정)
             max_minutes = space_data['dwell_minutes'].max()
@@ -268,13 +268,14 @@ def generate_dwell_histogram(dwell_df):
             if bins[-1] < max_minutes:
                 bins.append(bins[-1] + 30)
             
-            print(f"  Bins: {bins}")
+            log.debug(f"  Bins: {bins}")
             
             # 구간별 카운트
             counts, bin_edges = np.histogram(space_data['dwell_minutes'], bins=bins)
             
-            print(f"  Counts: {counts}")
-            print(f"  Bin edges: {bin_edges}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"  Counts: {counts}")
+                log.debug(f"  Bin edges: {bin_edges}")
             
             # 구간 레이블 생성 (정확한 구간 표시)
             labels = []
@@ -286,7 +287,7 @@ def generate_dwell_histogram(dwell_df):
                 else:
                     labels.append(f"{start}-{end} min")
             
-            print(f"  Labels: {labels}")
+            log.debug(f"  Labels: {labels}")
             
             histogram_data[f"{space_type}_{space}"] = {
                 'labels': labels,
@@ -646,7 +647,7 @@ def display_filtered_dwell_time_results(st, activity_analysis):
     
     try:
         # T-Ward별 체류시간 계산 (분 단위)
-        mac_dwell_times = activity_analysis.groupby('mac')['minute_bin'].nunique()
+        mac_dwell_times = activity_analysis.groupby('mac', observed=True)['minute_bin'].nunique()
         
         # 30분 이상 체류한 T-Ward만 필터링
         filtered_macs = mac_dwell_times[mac_dwell_times >= 30].index.tolist()
@@ -7,8 +7,15 @@ Fixed inactive (Present) state when helmet is removed
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
+
+from src.event_store import MacEventStore
+from src.heatmap_raster import render_code_heatmap
+from src.result_cache import cached_result
+from src.t41_schema import category_codes
+import logging
+from src.tracing import get_logger
+
+log = get_logger(__name__)
 
 # Journey Heatmap Color System - Building-Level based (all combinations)
 JOURNEY_COLORS = {
@@ -198,6 +205,7 @@ def render_tward41_journey_map():
             st.text(traceback.format_exc())
 
 
+@cached_result(session_keys=('journey_sort_option',))
 def generate_journey_heatmap_from_cache(journey_data: pd.DataFrame, max_workers: int = 200, show_details: bool = False):
     """
     Generate Journey Heatmap from precomputed cache data (FAST)
@@ -227,7 +235,7 @@ def generate_journey_heatmap_from_cache(journey_data: pd.DataFrame, max_workers:
     }
     sort_key = sort_key_map.get(sort_option, 'ai')
     
-    print(f"\n🚀 Generating Journey Heatmap from cache (max: {max_workers}, sort: {sort_option})")
+    log.info(f"\n🚀 Generating Journey Heatmap from cache (max: {max_workers}, sort: {sort_option})")
     
     # =========================================================================
     # Try to load pre-sorted cache (FAST PATH)
@@ -240,20 +248,20 @@ def generate_journey_heatmap_from_cache(journey_data: pd.DataFrame, max_workers:
         try:
             pre_sorted_data = cache_loader.load_journey_heatmap_sorted(sort_key, max_workers)
             if pre_sorted_data is not None and len(pre_sorted_data) > 0 and 'worker_order' in pre_sorted_data.columns:
-                print(f"   ✅ Using pre-sorted cache (instant load)")
+                log.info(f"   ✅ Using pre-sorted cache (instant load)")
                 # Use worker_order for ordering
                 selected_macs = pre_sorted_data.drop_duplicates('mac').sort_values('worker_order')['mac'].tolist()
                 filtered_data = pre_sorted_data
         except Exception as e:
-            print(f"   ⚠️ Pre-sorted cache not available: {e}")
+            log.warning(f"   ⚠️ Pre-sorted cache not available: {e}")
     
     # =========================================================================
     # Fallback: Calculate sorting on the fly (SLOW PATH)
     # =========================================================================
     if selected_macs is None:
-        print(f"   ⚙️ Calculating sorting on the fly...")
+        log.debug(f"   ⚙️ Calculating sorting on the fly...")
         # Calculate worker activity statistics
-        worker_stats = journey_data.groupby('mac').agg({
+        worker_stats = journey_data.groupby('mac', observed=True).agg({
             'signal_count': 'sum',
             'color_code': lambda x: (x > 1).sum()  # Active time bins
         }).reset_index()
@@ -261,7 +269,7 @@ def generate_journey_heatmap_from_cache(journey_data: pd.DataFrame, max_workers:
         
         # Add building info for building-based sorting
         if 'building' in journey_data.columns:
-            worker_building = journey_data.groupby('mac')['building'].agg(lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'Unknown').reset_index()
+            worker_building = journey_data.groupby('mac', observed=True)['building'].agg(lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'Unknown').reset_index()
             worker_stats = worker_stats.merge(worker_building, on='mac', how='left')
         
         # Apply sorting based on option
@@ -287,39 +295,44 @@ def generate_journey_heatmap_from_cache(journey_data: pd.DataFrame, max_workers:
         filtered_data = journey_data[journey_data['mac'].isin(selected_macs)]
     
     if show_details:
-        print(f"   Selected {len(selected_macs)} workers (sorted by {sort_option})")
-        print(f"   Total bins: {len(filtered_data)}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"   Selected {len(selected_macs)} workers (sorted by {sort_option})")
+            log.debug(f"   Total bins: {len(filtered_data)}")
     
     # Determine number of bins from data (dynamic: 288 for 5-min, 144 for 10-min)
     max_bin = int(filtered_data['bin_index'].max()) if not filtered_data.empty else 287
     num_bins = max_bin + 1  # 0-indexed
     
-    # Create 2D matrix: workers × num_bins
-    heatmap_matrix = []
+    # Create 2D matrix: workers × num_bins (MAC별 CSR 슬라이스로 채움)
+    store = MacEventStore.ensure(filtered_data)
+    bin_values = store.column('bin_index').astype(np.int64)
+    # color_code를 0-7 범위로 클램핑
+    color_values = np.clip(store.column('color_code').astype(np.int64), 0, 7)
+    
+    heatmap_matrix = np.zeros((len(selected_macs), num_bins), dtype=np.int64)
     mac_order = []
     
-    for mac in selected_macs:
-        mac_data = filtered_data[filtered_data['mac'] == mac]
-        
-        # Initialize row with no_signal (0)
-        row = [0] * num_bins
+    for row_idx, mac in enumerate(selected_macs):
+        mac_order.append(mac)
+        mac_id = store.mac_index(mac)
+        if mac_id is None:
+            continue  # no_signal (0) 유지
         
-        # Fill in the color codes for bins where data exists
-        for _, record in mac_data.iterrows():
-            bin_idx = int(record['bin_index'])
-            if 0 <= bin_idx < num_bins:
-                # color_code를 0-7 범위로 클램핑
-                color_code = min(max(int(record['color_code']), 0), 7)
-                row[bin_idx] = color_code
+        start, end = store.bounds(mac_id)
+        mac_bins = bin_values[start:end]
+        valid = (mac_bins >= 0) & (mac_bins < num_bins)
         
-        heatmap_matrix.append(row)
-        mac_order.append(mac)
+        # 같은 bin에 레코드가 여러 개면 마지막 레코드 우선
+        mac_bins = mac_bins[valid][::-1]
+        mac_colors = color_values[start:end][valid][::-1]
+        unique_bins, last_idx = np.unique(mac_bins, return_index=True)
+        heatmap_matrix[row_idx, unique_bins] = mac_colors[last_idx]
     
-    if not heatmap_matrix:
+    if not mac_order:
         return None
     
     return {
-        'heatmap_data': np.array(heatmap_matrix),
+        'heatmap_data': heatmap_matrix,
         'mac_order': mac_order,
         'time_bins': list(range(num_bins)),
         'tward_count': len(mac_order)
@@ -346,6 +359,124 @@ def filter_data_by_space(data, analysis_level, space_name):
         building, level = space_name.split('-', 1)
         return data[(data['building'] == building) & (data['level'] == level)]
 
+def calculate_minute_colors(data, macs, n_minutes):
+    """작업자 × 1분 색상 매트릭스 계산
+    
+    - 신호 없음 → 검정 (0)
+    - signal_count >= 3 (없으면 activity_status == 'Active') 데이터가 없으면 → 회색 (1)
+    - 활성 데이터의 최다 Building-Level: Cluster는 90% 이상, 그 외는 60% 이상이면 해당 색상
+      (동률이면 먼저 등장한 Building-Level 우선)
+    """
+    minute_colors = np.zeros((len(macs), n_minutes), dtype=np.int64)
+    if not macs:
+        return minute_colors
+    
+    store = MacEventStore.ensure(data)
+    events = store.frame
+    
+    # MAC id → 매트릭스 행
+    row_of_mac = np.full(len(store), -1, dtype=np.int64)
+    for row_idx, mac in enumerate(macs):
+        mac_id = store.mac_index(mac)
+        if mac_id is not None:
+            row_of_mac[mac_id] = row_idx
+    rows = row_of_mac[store.mac_ids]
+    
+    # minute_bin 정수 매칭 (정확한 분 단위 매칭)
+    if not pd.api.types.is_numeric_dtype(events['minute_bin']):
+        return minute_colors
+    minute_values = events['minute_bin'].to_numpy(dtype=float)
+    matched = (rows >= 0) & np.isfinite(minute_values)
+    matched &= (minute_values == np.floor(minute_values)) & (minute_values >= 0) & (minute_values < n_minutes)
+    minutes = np.where(matched, minute_values, 0).astype(np.int64)
+    
+    # 신호 수신 → 회색
+    minute_colors[rows[matched], minutes[matched]] = JOURNEY_COLORS['present_inactive']
+    
+    # signal_count 기반으로 활성화 판정 (없으면 activity_status 사용 - 하위 호환성)
+    if 'signal_count' in events.columns:
+        active = (events['signal_count'] >= 3).to_numpy(dtype=bool, na_value=False)
+    else:
+        active = (events['activity_status'] == 'Active').to_numpy(dtype=bool, na_value=False)
+    active = active & matched
+    if not active.any():
+        return minute_colors
+    
+    # Building-Level 조합은 카테고리 코드로 집계하고 문자열은 조합 단위로만 생성
+    active_events = events[active]
+    if 'building' in events.columns:
+        building_codes, building_cats = category_codes(active_events['building'])
+    else:
+        building_codes, building_cats = np.zeros(len(active_events), dtype=np.int64), np.array(['Unknown'], dtype=object)
+    if 'level' in events.columns:
+        level_codes, level_cats = category_codes(active_events['level'])
+    else:
+        level_codes, level_cats = np.zeros(len(active_events), dtype=np.int64), np.array(['Unknown'], dtype=object)
+    # 결측(code -1)은 마지막 'nan' 라벨
+    building_labels = np.array([str(value) for value in building_cats] + ['nan'], dtype=object)
+    level_labels = np.array([str(value) for value in level_cats] + ['nan'], dtype=object)
+    
+    counts = pd.DataFrame({
+        'row': rows[active],
+        'minute': minutes[active],
+        'building_code': building_codes,
+        'level_code': level_codes,
+        'pos': np.flatnonzero(active)
+    }).groupby(['row', 'minute', 'building_code', 'level_code'], sort=False).agg(
+        count=('pos', 'size'), first=('pos', 'min')).reset_index()
+    counts['bl'] = building_labels[counts['building_code'].to_numpy()] + '-' + level_labels[counts['level_code'].to_numpy()]
+    counts['total'] = counts.groupby(['row', 'minute'])['count'].transform('sum')
+    
+    # 분별 최다 Building-Level (동률이면 먼저 등장한 것)
+    dominant = counts.sort_values(['row', 'minute', 'count', 'first'],
+                                  ascending=[True, True, False, True]).drop_duplicates(['row', 'minute'])
+    
+    # Cluster 매우 엄격 조건: 90% 이상 확실해야만 보라색 적용, 다른 Building-Level은 60% 이상
+    dominant_color = dominant['bl'].map(JOURNEY_COLORS)
+    threshold = np.where(dominant['bl'].str.contains('Cluster', regex=False), 0.9, 0.6)
+    confident = (dominant['count'] >= dominant['total'] * threshold) & dominant_color.notna()
+    colors = np.where(confident, dominant_color.fillna(JOURNEY_COLORS['present_inactive']),
+                      JOURNEY_COLORS['present_inactive']).astype(np.int64)
+    
+    minute_colors[dominant['row'].to_numpy(), dominant['minute'].to_numpy()] = colors
+    return minute_colors
+
+def aggregate_minute_colors(minute_colors, unit_time_minutes):
+    """1분 색상 매트릭스를 UnitTime bin 색상으로 집계
+    
+    1단계: 검정색이 7분 이상이면 검정색
+    2단계: Building-Level 색상 중 가장 많은 색상 (동률이면 먼저 등장한 색상)
+           Cluster는 최소 5분 이상 활성화되어야 함
+    3단계: Building-Level 색상이 없으면 회색
+    """
+    n_workers, n_minutes = minute_colors.shape
+    num_bins = n_minutes // unit_time_minutes
+    blocks = minute_colors[:, :num_bins * unit_time_minutes].reshape(n_workers, num_bins, unit_time_minutes)
+    
+    no_signal = JOURNEY_COLORS['no_signal']
+    present_inactive = JOURNEY_COLORS['present_inactive']
+    cluster_color = JOURNEY_COLORS['Cluster-1F']
+    
+    black_count = (blocks == no_signal).sum(axis=2)
+    
+    best_color = np.full((n_workers, num_bins), present_inactive, dtype=np.int64)
+    best_count = np.zeros((n_workers, num_bins), dtype=np.int64)
+    best_first = np.full((n_workers, num_bins), unit_time_minutes, dtype=np.int64)
+    
+    for color in sorted(set(JOURNEY_COLORS.values()) - {no_signal, present_inactive}):
+        is_color = blocks == color
+        count = is_color.sum(axis=2)
+        first = np.where(count > 0, is_color.argmax(axis=2), unit_time_minutes)
+        better = (count > best_count) | ((count == best_count) & (count > 0) & (first < best_first))
+        best_color = np.where(better, color, best_color)
+        best_count = np.where(better, count, best_count)
+        best_first = np.where(better, first, best_first)
+    
+    final_color = np.where((best_color == cluster_color) & (best_count < 5), present_inactive, best_color)
+    final_color = np.where(black_count >= 7, no_signal, final_color)
+    return final_color
+
+@cached_result
 def generate_integrated_journey_heatmap(data, analysis_level, show_details=False, max_workers=200):
     """Generate integrated Journey Heatmap for all workers
     
@@ -359,11 +490,11 @@ def generate_integrated_journey_heatmap(data, analysis_level, show_details=False
     if data is None or data.empty:
         return None
     
-    print(f"\n🌟 Generating Journey Heatmap (level: {analysis_level}, max: {max_workers})")
+    log.debug(f"\n🌟 Generating Journey Heatmap (level: {analysis_level}, max: {max_workers})")
     
     # Calculate active dwell time for each worker
     active_data = data[data['activity_status'] == 'Active']
-    tward_activity_time = active_data.groupby('mac')['minute_bin'].nunique().reset_index()
+    tward_activity_time = active_data.groupby('mac', observed=True)['minute_bin'].nunique().reset_index()
     tward_activity_time.columns = ['mac', 'active_minutes']
     
     # Exclude workers with 0 active minutes
@@ -376,9 +507,10 @@ def generate_integrated_journey_heatmap(data, analysis_level, show_details=False
     if len(tward_activity_time) > max_workers:
         tward_activity_time = tward_activity_time.head(max_workers)
     
-    print(f"🎯 Total workers: {len(tward_activity_time)}")
+    log.debug(f"🎯 Total workers: {len(tward_activity_time)}")
     if not tward_activity_time.empty:
-        print(f"   Active time range: {tward_activity_time['active_minutes'].min()}~{tward_activity_time['active_minutes'].max()} min")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"   Active time range: {tward_activity_time['active_minutes'].min()}~{tward_activity_time['active_minutes'].max()} min")
     
     if tward_activity_time.empty:
         return None
@@ -388,170 +520,27 @@ def generate_integrated_journey_heatmap(data, analysis_level, show_details=False
     unit_time_minutes = global_config.UNIT_TIME_MINUTES
     num_bins = global_config.bins_per_day()
     
-    # Generate heatmap data for num_bins
-    heatmap_data = []
+    # 1분 단위 색상 계산 (MAC별 CSR 저장소, 원본 행 순서 유지)
+    minute_colors = calculate_minute_colors(data, tward_activity_time['mac'].tolist(),
+                                            num_bins * unit_time_minutes)
     
-    for _, row in tward_activity_time.iterrows():
-        mac = row['mac']
-        tward_row = []
-        
-        # 해당 T-Ward의 데이터 추출
-        mac_data = data[data['mac'] == mac]
-        
-        # num_bins에 대해 색상 결정 (수정된 로직 - signal_count 기반)
-        for bin_idx in range(num_bins):
-            # 🔧 올바른 시간 계산: UnitTime 기준
-            start_minute = bin_idx * unit_time_minutes
-            end_minute = start_minute + unit_time_minutes - 1
-            
-            # ✅ 순차적 판단 로직: 검정 → 회색 → 색상 (Building-Level)
-            minute_colors = []  # UnitTime 동안의 1분별 색상 저장
-            
-            # UnitTime 구간을 1분씩 분석하여 각 1분의 색상 결정
-            for minute_offset in range(unit_time_minutes):
-                current_minute = start_minute + minute_offset
-                # 🔧 minute_bin 매칭 수정 (정확한 분 단위 매칭)
-                minute_data = mac_data[mac_data['minute_bin'] == current_minute]
-                
-                if minute_data.empty:
-                    # 해당 1분 동안 신호 없음 → 검정색
-                    minute_colors.append(JOURNEY_COLORS['no_signal'])
-                else:
-                    # 🔥 핵심 수정: signal_count 기반으로 활성화 판정
-                    # signal_count가 없으면 activity_status 사용 (하위 호환성)
-                    if 'signal_count' in minute_data.columns:
-                        # signal_count >= 3인 데이터만 활성화로 간주
-                        active_data_minute = minute_data[minute_data['signal_count'] >= 3]
-                        
-                        if active_data_minute.empty:
-                            # 1-2회 수신 또는 0회 수신 → 회색 (비활성화)
-                            minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                        else:
-                            # 활성화 데이터(3회+)에서 Building-Level 추정
-                            building_level_counts = {}
-                            for _, data_row in active_data_minute.iterrows():
-                                building = data_row.get('building', 'Unknown')
-                                level = data_row.get('level', 'Unknown')
-                                bl_key = f"{building}-{level}"
-                                building_level_counts[bl_key] = building_level_counts.get(bl_key, 0) + 1
-                            
-                            if building_level_counts:
-                                dominant_bl = max(building_level_counts, key=building_level_counts.get)
-                                dominant_count = building_level_counts[dominant_bl]
-                                total_count = sum(building_level_counts.values())
-                                
-                                # 🔥 Cluster 매우 엄격 조건: 90% 이상 확실해야만 보라색 적용
-                                if 'Cluster' in dominant_bl:
-                                    if dominant_count >= total_count * 0.9:
-                                        minute_colors.append(JOURNEY_COLORS[dominant_bl])
-                                    else:
-                                        minute_colors.append(JOURNEY_COLORS['present_inactive'])  # 불확실한 Cluster는 회색
-                                elif dominant_bl in JOURNEY_COLORS:
-                                    # 다른 Building-Level은 60% 이상이면 색상 적용
-                                    if dominant_count >= total_count * 0.6:
-                                        minute_colors.append(JOURNEY_COLORS[dominant_bl])
-                                    else:
-                                        minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                                else:
-                                    minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                            else:
-                                minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                    else:
-                        # signal_count가 없으면 기존 로직 사용 (Active만)
-                        status_counts = minute_data['activity_status'].value_counts()
-                        has_active = 'Active' in status_counts and status_counts['Active'] > 0
-                        
-                        if has_active:
-                            # Active 데이터만 사용하여 Building-Level 분석
-                            building_level_counts = {}
-                            active_rows = minute_data[minute_data['activity_status'] == 'Active']
-                            for _, data_row in active_rows.iterrows():
-                                building = data_row.get('building', 'Unknown')
-                                level = data_row.get('level', 'Unknown')
-                                bl_key = f"{building}-{level}"
-                                building_level_counts[bl_key] = building_level_counts.get(bl_key, 0) + 1
-                            
-                            if building_level_counts:
-                                dominant_bl = max(building_level_counts, key=building_level_counts.get)
-                                dominant_count = building_level_counts[dominant_bl]
-                                total_count = sum(building_level_counts.values())
-                                
-                                # Cluster 매우 엄격 조건
-                                if 'Cluster' in dominant_bl:
-                                    if dominant_count >= total_count * 0.9:
-                                        minute_colors.append(JOURNEY_COLORS[dominant_bl])
-                                    else:
-                                        minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                                elif dominant_bl in JOURNEY_COLORS:
-                                    if dominant_count >= total_count * 0.6:
-                                        minute_colors.append(JOURNEY_COLORS[dominant_bl])
-                                    else:
-                                        minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                                else:
-                                    minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                            else:
-                                minute_colors.append(JOURNEY_COLORS['present_inactive'])
-                        else:
-                            # Active가 없으면 비활성화 (회색)
-                            minute_colors.append(JOURNEY_COLORS['present_inactive'])
-            
-            # 🎯 순차적 판단: 검정 → 회색 → 가장 많은 Building-Level
-            if minute_colors:
-                from collections import Counter
-                color_counter = Counter(minute_colors)
-                
-                # 1단계: 검정색이 7분 이상이면 검정색 (10분 중 대부분)
-                black_count = color_counter.get(JOURNEY_COLORS['no_signal'], 0)
-                if black_count >= 7:
-                    final_color = JOURNEY_COLORS['no_signal']
-                else:
-                    # 2단계: Building-Level 색상이 있는지 확인 (활성화 우선)
-                    non_inactive_colors = {color: count for color, count in color_counter.items() 
-                                         if color not in [JOURNEY_COLORS['no_signal'], JOURNEY_COLORS['present_inactive']]}
-                    
-                    if non_inactive_colors:
-                        # Building-Level 색상이 있으면, 가장 많은 색상 선택
-                        final_color = max(non_inactive_colors, key=non_inactive_colors.get)
-                        
-                        # 🔥 추가 검증: Cluster 색상인 경우 더 엄격하게
-                        if final_color == JOURNEY_COLORS['Cluster-1F'] or final_color == JOURNEY_COLORS.get('Cluster-2F', -1) or final_color == JOURNEY_COLORS.get('Cluster-B1F', -1):
-                            # Cluster는 최소 5분 이상 활성화되어야 함
-                            cluster_minutes = non_inactive_colors[final_color]  # ✅ 변경 전에 저장
-                            if cluster_minutes < 5:
-                                final_color = JOURNEY_COLORS['present_inactive']
-                    else:
-                        # Building-Level 색상이 없으면 회색 (비활성화)
-                        final_color = JOURNEY_COLORS['present_inactive']
-                
-                tward_row.append(final_color)
-            else:
-                # 데이터가 없으면 검정색
-                tward_row.append(JOURNEY_COLORS['no_signal'])
-        
-        heatmap_data.append(tward_row)
+    # UnitTime 단위 색상 결정: 검정 → 회색 → 가장 많은 Building-Level
+    heatmap_data = aggregate_minute_colors(minute_colors, unit_time_minutes)
     
     # Determine number of bins from data
     num_bins = heatmap_data.shape[1] if len(heatmap_data) > 0 else 288
     
     # DataFrame 생성 (T-Ward + num_bins)
-    columns = ['MAC Address', 'Activity Time (min)'] + [f"T{i:03d}" for i in range(num_bins)]
-    
-    # MAC과 Active Time 정보 추가
-    final_data = []
-    for i, (_, row) in enumerate(tward_activity_time.iterrows()):
-        mac = row['mac']
-        active_minutes = int(row['active_minutes'])
-        data_row = [mac, active_minutes] + heatmap_data[i]
-        final_data.append(data_row)
-    
-    heatmap_df = pd.DataFrame(final_data, columns=columns)
+    heatmap_df = pd.DataFrame(heatmap_data, columns=[f"T{i:03d}" for i in range(num_bins)])
+    heatmap_df.insert(0, 'Activity Time (min)', tward_activity_time['active_minutes'].astype(int).to_numpy())
+    heatmap_df.insert(0, 'MAC Address', tward_activity_time['mac'].to_numpy())
     
     # 디버깅: 히트맵 데이터 분포 확인
     if not heatmap_df.empty and show_details:
         time_cols = [col for col in heatmap_df.columns if col.startswith('T')]
         heatmap_matrix = heatmap_df[time_cols]
         
-        print(f"🎯 히트맵 매트릭스 생성 완료: {heatmap_matrix.shape} (144개 10분 bins)")
+        log.info(f"🎯 히트맵 매트릭스 생성 완료: {heatmap_matrix.shape} (144개 10분 bins)")
         
         # 색상별 분포 확인
         color_distribution = {}
@@ -559,10 +548,10 @@ def generate_integrated_journey_heatmap(data, analysis_level, show_details=False
             count = (heatmap_matrix == color_value).sum().sum()
             color_distribution[color_name] = count
         
-        print("🎨 색상별 분포:")
+        log.debug("🎨 색상별 분포:")
         for color_name, count in color_distribution.items():
             if count > 0:
-                print(f"   {color_name}: {count}개 셀")
+                log.debug(f"   {color_name}: {count}개 셀")
     
     return {
         'heatmap_df': heatmap_df,
@@ -579,7 +568,7 @@ def generate_tward_heatmap_data(space_data, space_name, analysis_level, show_det
     
     # Active 상태만의 체류시간 계산
     active_data = space_data[space_data['activity_status'] == 'Active']
-    tward_activity_time = active_data.groupby('mac')['minute_bin'].nunique().reset_index()
+    tward_activity_time = active_data.groupby('mac', observed=True)['minute_bin'].nunique().reset_index()
     tward_activity_time.columns = ['mac', 'active_minutes']
     
     # active_minutes가 0인 T-Ward 제외
@@ -997,45 +986,55 @@ def display_journey_heatmap(heatmap_result, title, show_details=False):
         [7/7, COLOR_HEX_MAP[7]],  # 7: Cluster - Purple
     ]
     
-    # Create Plotly heatmap
-    import plotly.graph_objects as go
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=heatmap_data,
-        x=time_labels,
-        y=y_labels,
-        colorscale=colorscale,
-        zmin=0,
-        zmax=7,
-        showscale=True,
-        colorbar=dict(
-            tickvals=[0, 1, 2, 3, 4, 5, 6, 7],
-            ticktext=['No Signal', 'Inactive', 'WWT-1F', 'WWT-B1F', 'FAB', 'CUB-1F', 'CUB-B1F', 'Cluster']
-        ),
-        hovertemplate='Time: %{x}<br>Worker: %{y}<br>Location Code: %{z}<extra></extra>'
-    ))
-    
     # 행 높이 고정: 각 행당 12px로 설정 (기존 4px의 3배)
     # MaxWorkers=200 기준 → 총 2400px
     ROW_HEIGHT_PX = 12  # 각 행당 픽셀 수 (3배 증가)
     MIN_HEIGHT = 600    # 최소 높이
     MAX_HEIGHT = 3000   # 최대 높이
     
-    # 실제 작업자 수 기반 높이 계산
-    calculated_height = tward_count * ROW_HEIGHT_PX
-    fixed_height = max(MIN_HEIGHT, min(MAX_HEIGHT, calculated_height))
-    
-    fig.update_layout(
+    def build_interactive_figure():
+        # Create Plotly heatmap
+        import plotly.graph_objects as go
+        
+        fig = go.Figure(data=go.Heatmap(
+            z=heatmap_data,
+            x=time_labels,
+            y=y_labels,
+            colorscale=colorscale,
+            zmin=0,
+            zmax=7,
+            showscale=True,
+            colorbar=dict(
+                tickvals=[0, 1, 2, 3, 4, 5, 6, 7],
+                ticktext=['No Signal', 'Inactive', 'WWT-1F', 'WWT-B1F', 'FAB', 'CUB-1F', 'CUB-B1F', 'Cluster']
+            ),
+            hovertemplate='Time: %{x}<br>Worker: %{y}<br>Location Code: %{z}<extra></extra>'
+        ))
+        
+        # 실제 작업자 수 기반 높이 계산
+        calculated_height = tward_count * ROW_HEIGHT_PX
+        fixed_height = max(MIN_HEIGHT, min(MAX_HEIGHT, calculated_height))
+        
+        fig.update_layout(
+            title=f'{title} ({tward_count} workers)',
+            xaxis_title='Time (10-min bins)',
+            yaxis_title='Workers',
+            height=fixed_height,
+            xaxis=dict(tickangle=45, dtick=6),  # Show label every hour
+            yaxis=dict(tickmode='linear', dtick=max(1, tward_count // 30))  # 레이블 간격 조정
+        )
+        return fig
+    
+    # 대형 히트맵은 서버 측 PNG로 렌더링 (행 단위 hover, 행렬 fingerprint별 캐시)
+    render_code_heatmap(
+        heatmap_data, y_labels, time_labels,
         title=f'{title} ({tward_count} workers)',
-        xaxis_title='Time (10-min bins)',
-        yaxis_title='Workers',
-        height=fixed_height,
-        xaxis=dict(tickangle=45, dtick=6),  # Show label every hour
-        yaxis=dict(tickmode='linear', dtick=max(1, tward_count // 30))  # 레이블 간격 조정
+        key="journey_heatmap",
+        interactive_figure=build_interactive_figure,
+        row_height_px=ROW_HEIGHT_PX, min_height=MIN_HEIGHT, max_height=MAX_HEIGHT,
+        xaxis_title='Time (10-min bins)', yaxis_title='Workers'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
-    
     # =========================================================================
     # Statistics
     # =========================================================================
@@ -1073,11 +1072,11 @@ render_tward41_journey_analysis = render_tward41_journey_map
 
 if __name__ == "__main__":
     # 테스트 실행
-    print("T-Ward Type 41 Journey Map Analysis Module (Fixed Version) 로드됨")
+    log.debug("T-Ward Type 41 Journey Map Analysis Module (Fixed Version) 로드됨")
 
 # 이전 render_tward41_journey_analysis 함수와의 호환성을 위한 별칭
 render_tward41_journey_analysis = render_tward41_journey_map
 
 if __name__ == "__main__":
     # 테스트 실행
-    print("T-Ward Type 41 Journey Map Analysis Module (Fixed Version) 로드됨")
+    log.debug("T-Ward Type 41 Journey Map Analysis Module (Fixed Version) 로드됨")
@@ -15,6 +15,8 @@ import base64
 import tempfile
 import os
 from datetime import datetime, timedelta
+
+from src.time_index import time_index_10s
 from PIL import Image
 import plotly.express as px
 import plotly.graph_objects as go
@@ -323,8 +325,8 @@ def load_tward41_data():
             if not pd.api.types.is_datetime64_any_dtype(data['time']):
                 data['time'] = pd.to_datetime(data['time'])
             
-            # time_index 생성 (10초 단위)
-            data['time_index'] = ((data['time'] - data['time'].dt.normalize()) / pd.Timedelta(seconds=10)).astype(int) + 1
+            # time_index 생성 (10초 단위) - sec_of_day 정수 나눗셈
+            data['time_index'] = time_index_10s(data)
             
             return data
         else:
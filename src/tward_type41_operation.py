@@ -10,26 +10,21 @@ import numpy as np
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 from src.building_setup import load_sward_config
-import hashlib
-import time
+from src.time_index import add_time_columns, minute_bin, time_index_10s
+from src.frame_fingerprint import fingerprint, register_derived
+from src.job_runner import STATE_DONE, run_job_once
+from src.presence_bitset import PresenceIndex
+from src.t41_schema import (ACTIVITY_STATUS_DTYPE, STATUS_ABSENT, STATUS_ACTIVE,
+                            STATUS_PRESENT, category_codes, status_codes)
 import gc  # Garbage collection for memory management
+import logging
+from src.tracing import get_logger, traced
+
+log = get_logger(__name__)
 
 def performance_timer(func_name):
-    """성능 측정 데코레이터"""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            print(f"🚀 {func_name} 시작...")
-            
-            result = func(*args, **kwargs)
-            
-            end_time = time.time()
-            elapsed = end_time - start_time
-            print(f"✅ {func_name} 완료: {elapsed:.2f}초")
-            
-            return result
-        return wrapper
-    return decorator
+    """성능 측정 데코레이터 (tracing span + INFO 로그)"""
+    return traced(func_name, log_level=logging.INFO)
 
 # 성능 최적화를 위한 캐싱 시스템
 def cached_sward_processing(sward_config_hash):
@@ -44,8 +39,15 @@ def cached_sward_processing(sward_config_hash):
     if sward_config is None:
         return None
     
-    # S-Ward 딕셔너리 생성 (벡터화)
-    sward_dict = {
+    sward_dict = build_sward_dict(sward_config)
+    
+    # 세션에 캐싱
+    st.session_state[cache_key] = sward_dict
+    return sward_dict
+
+def build_sward_dict(sward_config):
+    """S-Ward 딕셔너리 생성 (sward_id → building / level / x / y / space_type)"""
+    return {
         row['sward_id']: {
             'building': row['building'],
             'level': row['level'], 
@@ -55,10 +57,6 @@ def cached_sward_processing(sward_config_hash):
         }
         for _, row in sward_config.iterrows()
     }
-    
-    # 세션에 캐싱
-    st.session_state[cache_key] = sward_dict
-    return sward_dict
 
 def load_and_process_data_tward41():
     """T-Ward Type 41 데이터 로드 및 기본 처리 (성능 최적화)"""
@@ -89,9 +87,11 @@ def load_and_process_data_tward41():
             if not pd.api.types.is_datetime64_any_dtype(data['time']):
                 data['time'] = pd.to_datetime(data['time'])
             
-            # time_index 생성 (10초 단위) - 벡터화 연산
-            time_normalized = data['time'].dt.normalize()
-            data['time_index'] = ((data['time'] - time_normalized) / pd.Timedelta(seconds=10)).astype(int) + 1
+            # 정수 시간 컬럼 (day / sec_of_day / minute_of_day) - 입력 시 저장되지 않았으면 1회 계산
+            add_time_columns(data)
+            
+            # time_index 생성 (10초 단위) - sec_of_day 정수 나눗셈
+            data['time_index'] = time_index_10s(data)
             
             # 처리된 데이터 캐싱
             st.session_state['tward41_processed_data'] = data
@@ -111,33 +111,35 @@ def apply_dwell_time_filter(data, min_dwell_time):
     Only include T-Wards that have minimum dwell time in minutes
     """
     try:
-        print(f"🔍 Applying dwell time filter: min_dwell_time={min_dwell_time} minutes")
-        print(f"🔍 Original data records: {len(data)}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🔍 Applying dwell time filter: min_dwell_time={min_dwell_time} minutes")
+            log.debug(f"🔍 Original data records: {len(data)}")
         
         # Create minute bins for dwell time calculation (in-place to save memory)
         minute_bins = data['time'].dt.floor('1T')
         
         # Calculate dwell time per T-Ward (number of unique minute bins)
         mac_dwell_times = pd.DataFrame({'mac': data['mac'], 'minute_bin': minute_bins}).groupby('mac')['minute_bin'].nunique()
-        print(f"🔍 T-Ward dwell times calculated. Range: {mac_dwell_times.min()}-{mac_dwell_times.max()} minutes")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🔍 T-Ward dwell times calculated. Range: {mac_dwell_times.min()}-{mac_dwell_times.max()} minutes")
         
         # Filter T-Wards with minimum dwell time
         filtered_macs = mac_dwell_times[mac_dwell_times >= min_dwell_time].index.tolist()
-        print(f"🔍 T-Wards meeting criteria (≥{min_dwell_time}min): {len(filtered_macs)} out of {len(mac_dwell_times)}")
+        log.debug(f"🔍 T-Wards meeting criteria (≥{min_dwell_time}min): {len(filtered_macs)} out of {len(mac_dwell_times)}")
         
         # Return filtered data (use boolean indexing without copy for memory efficiency)
         mac_filter = data['mac'].isin(filtered_macs)
         filtered_data = data[mac_filter]
-        print(f"🔍 Filtered data records: {len(filtered_data)}")
+        log.debug(f"🔍 Filtered data records: {len(filtered_data)}")
         
         return filtered_data
         
     except Exception as e:
-        print(f"🔍 Error in apply_dwell_time_filter: {str(e)}")
+        log.error(f"🔍 Error in apply_dwell_time_filter: {str(e)}")
         return data  # Return original data on error
 
 def render_tward41_operation(st):
-    print("🔧 >>> render_tward41_operation called - NEW VERSION")
+    log.debug("🔧 >>> render_tward41_operation called - NEW VERSION")
     """T-Ward Type 41 Operation Analysis 탭 렌더링"""
     
     st.markdown("### 👷 T-Ward Type 41 Operation Analysis")
@@ -146,6 +148,15 @@ def render_tward41_operation(st):
     # Run Analysis 버튼 체크
     should_run = st.session_state.get('tward41_should_run', False)
     
+    # Background job 모드: 분석은 별도 프로세스에서 실행, rerun마다 진행률만 조회
+    if st.session_state.get('processing_background_jobs', True):
+        if should_run:
+            st.session_state['tward41_should_run'] = False
+            st.session_state['tward41_run_id'] = st.session_state.get('tward41_run_id', 0) + 1
+        if 'tward41_run_id' in st.session_state:
+            render_tward41_background_run(st)
+            return
+    
     if not should_run:
         st.info("👈 Please configure analysis settings in the sidebar and click 'Run Analysis' to start.")
         
@@ -216,77 +227,154 @@ def analyze_tward41_operation(location_data, sward_config):
     
     try:
         # S-Ward 설정 캐싱 사용 (성능 최적화)
-        sward_config_hash = hashlib.md5(str(sward_config.values.tolist()).encode()).hexdigest()
+        sward_config_hash = fingerprint(sward_config)
         sward_dict = cached_sward_processing(sward_config_hash)
         
         if sward_dict is None:
             st.error("Failed to load S-Ward configuration")
             return None
         
-        # Building/Level 인지 (Type 41은 실시간 인지)
-        location_data_with_space = recognize_building_level_type41(location_data, sward_dict)
-        
-        # 1분 단위 활동 상태 분석
-        activity_analysis = analyze_worker_activity(location_data_with_space)
-        
-        # 메모리 정리 (중간 처리 데이터 해제)
-        gc.collect()
-        
         # 사이드바 설정에 따른 필터링 적용
         filter_enabled = st.session_state.get('tward41_filter_enabled', False)
         min_dwell_time = st.session_state.get('tward41_min_dwell_time', 0)
         
-        print(f"🔍 Filtering Debug: enabled={filter_enabled}, min_time={min_dwell_time}")
-        
-        # 전체 T-Ward 개수 계산 (필터링 여부와 관계없이)
-        all_mac_count = activity_analysis['mac'].nunique()
-        print(f"🔍 Total unique T-Wards in data: {all_mac_count}")
-        
-        if filter_enabled and min_dwell_time > 0:
-            # T-Ward별 실제 체류시간 계산 (Active 또는 Present 상태인 분만 계산)
-            occupied_activity = activity_analysis[activity_analysis['activity_status'].isin(['Active', 'Present'])]
-            mac_dwell_times = occupied_activity.groupby('mac')['minute_bin'].nunique()
-            print(f"🔍 Original T-Wards: {len(mac_dwell_times)}")
-            print(f"🔍 Actual dwell times range: {mac_dwell_times.min()}-{mac_dwell_times.max()} minutes")
-            
-            # 최소 체류시간 이상인 T-Ward만 필터링
-            filtered_macs = mac_dwell_times[mac_dwell_times >= min_dwell_time].index.tolist()
-            print(f"🔍 Filtered T-Wards (≥{min_dwell_time}min): {len(filtered_macs)}")
-            
-            # 필터링된 활동 데이터만 사용
-            original_records = len(activity_analysis)
-            activity_analysis = activity_analysis[activity_analysis['mac'].isin(filtered_macs)]
-            filtered_records = len(activity_analysis)
-            print(f"🔍 Activity records: {original_records} → {filtered_records}")
-            
-            # 필터링 정보 저장
-            st.session_state['tward41_filtering_applied'] = True
-            st.session_state['tward41_original_twards'] = all_mac_count
-            st.session_state['tward41_filtered_twards'] = len(filtered_macs)
-            st.session_state['tward41_removed_twards'] = all_mac_count - len(filtered_macs)
-        else:
-            print(f"🔍 No filtering applied")
-            st.session_state['tward41_filtering_applied'] = False
+        analysis_results = compute_tward41_operation(
+            location_data, sward_config,
+            min_dwell_time=min_dwell_time if filter_enabled else 0,
+            sward_dict=sward_dict
+        )
+        apply_tward41_results(analysis_results)
+        return analysis_results
         
-        # 공간별 통계 생성 (필터링된 데이터 사용)
-        summary_stats = generate_space_statistics(activity_analysis)
+    except Exception as e:
+        st.error(f"Error in T-Ward Type 41 analysis: {str(e)}")
+        return None
+
+def render_tward41_background_run(st):
+    """Background job으로 T41 분석 실행 / 진행률 표시 / 완료 결과 표시"""
+    filter_enabled = st.session_state.get('tward41_filter_enabled', False)
+    min_dwell_time = st.session_state.get('tward41_min_dwell_time', 0) if filter_enabled else 0
+    signature = (st.session_state['tward41_run_id'], min_dwell_time)
+    
+    # 제출할 때만 데이터 로드 (검증한 같은 frame을 job 입력으로 전달)
+    job_inputs = None
+    entry = st.session_state.get('tward41_job')
+    if entry is None or entry['signature'] != signature:
+        location_data = load_and_process_data_tward41()
+        sward_config = load_sward_config()
+        if location_data is None or location_data.empty:
+            st.error("No T-Ward Type 41 data available for analysis.")
+            del st.session_state['tward41_run_id']
+            return
+        if sward_config is None or sward_config.empty:
+            st.error("S-Ward configuration not found. Please complete Setup first.")
+            del st.session_state['tward41_run_id']
+            return
+        job_inputs = {'location_data': location_data, 'sward_config': sward_config}
+    
+    state, analysis_results = run_job_once(
+        st, 'tward41_job', signature, 't41_operation', __name__, 'compute_tward41_operation',
+        inputs=job_inputs, params={'min_dwell_time': min_dwell_time},
+        label='T-Ward Type 41 Operation Analysis'
+    )
+    if state != STATE_DONE or not analysis_results:
+        return
+    
+    apply_tward41_results(analysis_results)
+    st.session_state['tward41_analysis_results'] = analysis_results
+    display_tward41_operation_results(st, analysis_results)
+    if st.session_state.get('tward41_filtering_applied', False):
+        display_filtering_summary(st)
+
+def apply_tward41_results(analysis_results):
+    """분석 결과를 세션 상태에 반영 (다른 모듈에서 사용)"""
+    st.session_state.update(analysis_results['filtering'])
+    st.session_state['type41_activity_analysis'] = analysis_results['activity_analysis']
+    st.session_state['type41_presence_index'] = analysis_results['presence_index']
+
+def compute_tward41_operation(location_data, sward_config, min_dwell_time=0, sward_dict=None, job=None):
+    """T-Ward Type 41 작업 현황 계산 (st 미사용 - background job에서도 실행)
+    
+    Args:
+        min_dwell_time: 누적 체류시간 필터 (분, 0이면 필터 없음)
+        sward_dict: 미리 만든 S-Ward 딕셔너리 (없으면 sward_config로 생성)
+        job: JobContext (background job 진행률 기록)
+    """
+    if sward_dict is None:
+        sward_dict = build_sward_dict(sward_config)
+    if job is not None:
+        job.progress(0.1, "Recognizing building/level")
+    
+    # Building/Level 인지 (Type 41은 실시간 인지)
+    location_data_with_space = recognize_building_level_type41(location_data, sward_dict)
+    
+    if job is not None:
+        job.progress(0.3, "Analyzing 1-minute worker activity")
+    
+    # 1분 단위 활동 상태 분석
+    activity_analysis = analyze_worker_activity(location_data_with_space)
+    
+    # 메모리 정리 (중간 처리 데이터 해제)
+    gc.collect()
+    
+    log.debug(f"🔍 Filtering Debug: min_time={min_dwell_time}")
+    
+    # 전체 T-Ward 개수 계산 (필터링 여부와 관계없이)
+    all_mac_count = activity_analysis['mac'].nunique()
+    log.debug(f"🔍 Total unique T-Wards in data: {all_mac_count}")
+    
+    if min_dwell_time > 0:
+        # T-Ward별 실제 체류시간 계산 (Active 또는 Present 상태인 분만 계산)
+        occupied_activity = activity_analysis[activity_analysis['activity_status'].isin(['Active', 'Present'])]
+        mac_dwell_times = occupied_activity.groupby('mac', observed=True)['minute_bin'].nunique()
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🔍 Original T-Wards: {len(mac_dwell_times)}")
+            log.debug(f"🔍 Actual dwell times range: {mac_dwell_times.min()}-{mac_dwell_times.max()} minutes")
         
-        # 1분 단위 활동 데이터 생성 (필터링된 데이터 사용)
-        minute_activity = generate_minute_activity(activity_analysis)
+        # 최소 체류시간 이상인 T-Ward만 필터링
+        filtered_macs = mac_dwell_times[mac_dwell_times >= min_dwell_time].index.tolist()
+        log.debug(f"🔍 Filtered T-Wards (≥{min_dwell_time}min): {len(filtered_macs)}")
         
-        # 세션 상태에 저장 (다른 모듈에서 사용)
-        st.session_state['type41_activity_analysis'] = activity_analysis
+        # 필터링된 활동 데이터만 사용
+        original_records = len(activity_analysis)
+        activity_analysis = register_derived(
+            activity_analysis[activity_analysis['mac'].isin(filtered_macs)],
+            activity_analysis, 'dwell_time_filter', min_dwell_time=min_dwell_time
+        )
+        filtered_records = len(activity_analysis)
+        log.debug(f"🔍 Activity records: {original_records} → {filtered_records}")
         
-        return {
-            'location_data': location_data_with_space,
-            'activity_analysis': activity_analysis,
-            'summary_stats': summary_stats,
-            'minute_activity': minute_activity
+        # 필터링 정보 (세션 상태에 반영됨)
+        filtering = {
+            'tward41_filtering_applied': True,
+            'tward41_original_twards': all_mac_count,
+            'tward41_filtered_twards': len(filtered_macs),
+            'tward41_removed_twards': all_mac_count - len(filtered_macs)
         }
-        
-    except Exception as e:
-        st.error(f"Error in T-Ward Type 41 analysis: {str(e)}")
-        return None
+    else:
+        log.debug(f"🔍 No filtering applied")
+        filtering = {'tward41_filtering_applied': False}
+    
+    if job is not None:
+        job.progress(0.7, "Building presence index and space statistics")
+    
+    # 작업자 × 공간 × 상태 presence bitset (공간 통계 / 1분 통계 공용)
+    presence_index = PresenceIndex.from_activity(activity_analysis)
+    
+    # 공간별 통계 생성 (필터링된 데이터 사용)
+    summary_stats = generate_space_statistics(activity_analysis, presence_index)
+    
+    # 1분 단위 활동 데이터 생성 (필터링된 데이터 사용)
+    minute_activity = generate_minute_activity(activity_analysis, presence_index)
+    
+    return {
+        'location_data': location_data_with_space,
+        'activity_analysis': activity_analysis,
+        'summary_stats': summary_stats,
+        'minute_activity': minute_activity,
+        'presence_index': presence_index,
+        'filtering': filtering
+    }
 
 def recognize_building_level_type41(location_data, sward_dict):
     """Type 41 Building/Level/Space Type 인지 (벡터화 최적화)"""
@@ -306,272 +394,210 @@ def recognize_building_level_type41(location_data, sward_dict):
 
 @performance_timer("작업자 활동 상태 분석")
 def analyze_worker_activity(location_data):
-    """작업자 활동 상태 분석 (1분 단위, 고성능 최적화)"""
+    """작업자 활동 상태 분석 (1분 단위, 고성능 최적화)
     
-    # 1분 단위 time_bin 생성 (1440개)
-    location_data['minute_bin'] = ((location_data['time'] - location_data['time'].dt.normalize()) / pd.Timedelta(minutes=1)).astype(int) + 1
+    MAC × 1440분 그리드를 벡터 연산으로 생성하며 결과는 압축 스키마(src.t41_schema)로 반환합니다.
+    - building / level / space_type: 해당 1분의 최빈값 (동률이면 먼저 수신된 값)
+    - signal_count >= 3: Active (헬멧 착용), >= 1: Present (헬멧 미착용하지만 현장에 있음), 0: Absent
+    """
     
-    # 벡터화 연산으로 전체 처리 속도 대폭 개선
-    activity_results = []
+    # 1분 단위 time_bin 생성 (1440개) - minute_of_day 정수 연산
+    location_data['minute_bin'] = minute_bin(location_data)
     
-    # MAC별로 그룹화하고 각 그룹을 병렬 처리 방식으로 최적화
-    mac_groups = location_data.groupby('mac')
+    # 결측 MAC은 factorize 코드 -1 → 음수 셀 index가 되므로 제외 (NaT 시간의 minute_bin 0도 제외)
+    location_data = location_data[location_data['mac'].notna() & (location_data['minute_bin'] >= 1)]
     
-    for mac, mac_data in mac_groups:
-        # 해당 MAC이 활동한 minute_bin만 추출 (메모리 효율성)
-        minute_groups = mac_data.groupby('minute_bin')
-        
-        # 빈 minute_bin을 위한 전체 범위 생성 (1440개)
-        mac_activity = {}
+    if location_data.empty:
+        return pd.DataFrame()
+    
+    # MAC별 정렬 순서 (기존 groupby('mac') 순서와 동일)
+    mac_codes, macs = pd.factorize(location_data['mac'], sort=True)
+    n_macs = len(macs)
+    n_cells = n_macs * 1440
+    
+    # (MAC, 1분) 셀 index
+    cells = mac_codes.astype(np.int64) * 1440 + (location_data['minute_bin'].to_numpy().astype(np.int64) - 1)
+    signal_counts = np.bincount(cells, minlength=n_cells)
+    
+    result = pd.DataFrame({
+        'mac': pd.Categorical.from_codes(np.repeat(np.arange(n_macs), 1440), categories=macs),
+        'minute_bin': np.tile(np.arange(1, 1441, dtype=np.int16), n_macs)
+    })
+    
+    # 셀별 최빈 Building / Level / Space Type
+    positions = np.arange(len(cells))
+    for col in ['building', 'level', 'space_type']:
+        codes, categories = category_codes(location_data[col])
+        has_value = codes >= 0
+        counts = pd.DataFrame({
+            'cell': cells[has_value],
+            'code': codes[has_value],
+            'pos': positions[has_value]
+        }).groupby(['cell', 'code'], sort=False).agg(n=('pos', 'size'), first=('pos', 'min')).reset_index()
+        modal = counts.sort_values(['cell', 'n', 'first'], ascending=[True, False, True]).drop_duplicates('cell')
         
-        # 실제 데이터가 있는 minute_bin 처리
-        for minute_bin, minute_data in minute_groups:
-            # 최빈값 계산 최적화
-            building_counts = minute_data['building'].value_counts()
-            level_counts = minute_data['level'].value_counts()
-            space_type_counts = minute_data['space_type'].value_counts()
-            
-            building = building_counts.index[0] if not building_counts.empty else 'Unknown'
-            level = level_counts.index[0] if not level_counts.empty else 'Unknown'
-            space_type = space_type_counts.index[0] if not space_type_counts.empty else 'Unknown'
-            
-            signal_count = len(minute_data)
-            
-            # 활동 상태 판단
-            if signal_count >= 3:
-                activity_status = 'Active'  # 헬멧 착용 상태
-            elif signal_count >= 1:
-                activity_status = 'Present'  # 헬멧 미착용하지만 현장에 있음
-            else:
-                activity_status = 'Absent'
-            
-            mac_activity[minute_bin] = {
-                'building': building,
-                'level': level,
-                'space_type': space_type,
-                'signal_count': signal_count,
-                'activity_status': activity_status
-            }
+        cell_codes = np.full(n_cells, -1, dtype=np.int64)
+        cell_codes[modal['cell'].to_numpy()] = modal['code'].to_numpy()
         
-        # 전체 1440개 minute_bin에 대해 결과 생성 (누락된 구간은 Absent)
-        for minute_bin in range(1, 1441):
-            if minute_bin in mac_activity:
-                data = mac_activity[minute_bin]
-                activity_results.append({
-                    'mac': mac,
-                    'minute_bin': minute_bin,
-                    'building': data['building'],
-                    'level': data['level'],
-                    'space_type': data['space_type'],
-                    'signal_count': data['signal_count'],
-                    'activity_status': data['activity_status']
-                })
-            else:
-                # 데이터가 없는 경우
-                activity_results.append({
-                    'mac': mac,
-                    'minute_bin': minute_bin,
-                    'building': None,
-                    'level': None,
-                    'space_type': None,
-                    'signal_count': 0,
-                    'activity_status': 'Absent'
-                })
-    
-    return pd.DataFrame(activity_results)
+        # 신호는 있으나 값이 없는 셀은 'Unknown'
+        missing = (signal_counts > 0) & (cell_codes < 0)
+        if missing.any():
+            categories = np.append(categories, 'Unknown') if 'Unknown' not in categories else categories
+            cell_codes[missing] = list(categories).index('Unknown')
+        result[col] = pd.Categorical.from_codes(cell_codes, categories=pd.Index(categories, dtype=object))
+    
+    result['signal_count'] = np.minimum(signal_counts, 255).astype(np.uint8)
+    
+    # 활동 상태 판단
+    status = np.where(signal_counts >= 3, STATUS_ACTIVE,
+                      np.where(signal_counts >= 1, STATUS_PRESENT, STATUS_ABSENT))
+    result['activity_status'] = pd.Categorical.from_codes(status, dtype=ACTIVITY_STATUS_DTYPE)
+    
+    return result
+
+def generate_space_statistics(activity_analysis, presence_index=None):
+    """공간별 작업자 통계 생성
 
-def generate_space_statistics(activity_analysis):
-    """공간별 작업자 통계 생성"""
+    공간 × 1분 재실 인원은 presence bitset 인덱스(src.presence_bitset)의 popcount로 계산합니다.
+    """
+    
+    if presence_index is None:
+        presence_index = PresenceIndex.from_activity(activity_analysis)
     
     stats_list = []
     
-    # 전체 공간에 대한 통계
+    # 전체 공간에 대한 통계 (Building → Level, 첫 등장 순서)
     spaces = []
-    
-    # Building별 통계
-    for building in activity_analysis['building'].dropna().unique():
+    pairs = activity_analysis[['building', 'level']].drop_duplicates()
+    pairs = pairs[pairs['building'].notna()]
+    for building in pairs['building'].unique():
         spaces.append((building, None))
-        
-        # Level별 통계
-        building_data = activity_analysis[activity_analysis['building'] == building]
-        for level in building_data['level'].dropna().unique():
+        for level in pairs.loc[pairs['building'] == building, 'level'].dropna().unique():
             spaces.append((building, level))
     
     for building, level in spaces:
-        if level is None:
-            # Building 전체
-            space_data = activity_analysis[activity_analysis['building'] == building]
-            space_name = building
-        else:
-            # 특정 Level
-            space_data = activity_analysis[
-                (activity_analysis['building'] == building) & 
-                (activity_analysis['level'] == level)
-            ]
-            space_name = f"{building}-{level}"
+        space_name = building if level is None else f"{building}-{level}"
         
-        if not space_data.empty:
-            # 통계 계산
-            total_workers = space_data['mac'].nunique()
-            
-            # 시간대별 최대 활성 작업자 수
-            active_by_time = space_data[space_data['activity_status'] == 'Active'].groupby('minute_bin')['mac'].nunique()
-            max_active_workers = active_by_time.max() if not active_by_time.empty else 0
-            
-            # 평균 활성 작업자 수
-            avg_active_workers = active_by_time.mean() if not active_by_time.empty else 0
-            
-            # 시간대별 전체 작업자 수 (Present + Active)
-            present_by_time = space_data[space_data['activity_status'].isin(['Active', 'Present'])].groupby('minute_bin')['mac'].nunique()
-            max_present_workers = present_by_time.max() if not present_by_time.empty else 0
-            avg_present_workers = present_by_time.mean() if not present_by_time.empty else 0
-            
-            stats_list.append({
-                'building': building,
-                'level': level if level else '(All)',
-                'space_name': space_name,
-                'total_workers': total_workers,
-                'max_active_workers': int(max_active_workers),
-                'avg_active_workers': round(avg_active_workers, 1),
-                'max_present_workers': int(max_present_workers),
-                'avg_present_workers': round(avg_present_workers, 1)
-            })
+        worker_ids, _ = presence_index.worker_bits(presence_index.select(building, level, statuses=None))
+        if len(worker_ids) == 0:
+            continue
+        
+        # 통계 계산
+        total_workers = len(worker_ids)
+        
+        # 시간대별 활성 작업자 수 (작업자가 있는 분만 평균)
+        active_by_time = presence_index.occupancy_curve(building, level, statuses=['Active'])
+        active_by_time = active_by_time[active_by_time > 0]
+        max_active_workers = active_by_time.max() if active_by_time.size else 0
+        avg_active_workers = active_by_time.mean() if active_by_time.size else 0
+        
+        # 시간대별 전체 작업자 수 (Present + Active)
+        present_by_time = presence_index.occupancy_curve(building, level, statuses=['Active', 'Present'])
+        present_by_time = present_by_time[present_by_time > 0]
+        max_present_workers = present_by_time.max() if present_by_time.size else 0
+        avg_present_workers = present_by_time.mean() if present_by_time.size else 0
+        
+        stats_list.append({
+            'building': building,
+            'level': level if level else '(All)',
+            'space_name': space_name,
+            'total_workers': total_workers,
+            'max_active_workers': int(max_active_workers),
+            'avg_active_workers': round(avg_active_workers, 1),
+            'max_present_workers': int(max_present_workers),
+            'avg_present_workers': round(avg_present_workers, 1)
+        })
     
     return pd.DataFrame(stats_list)
 
-def generate_minute_activity(activity_analysis):
-    """1분 단위 활동 데이터 생성 (최적화된 계산)"""
+def generate_minute_activity(activity_analysis, presence_index=None):
+    """1분 단위 활동 데이터 생성 (presence bitset 기반)"""
     
-    # 계산 효율성을 위해 numpy와 groupby 최적화 사용
-    minute_data = []
+    if presence_index is None:
+        presence_index = PresenceIndex.from_activity(activity_analysis)
     
-    # 공간별 사전 필터링으로 중복 계산 방지
-    # Building별로 그룹화하여 처리 (더 효율적)
-    building_groups = activity_analysis.groupby('building')
+    minute_data = []
     
-    for building, building_data in building_groups:
-        # Building 전체 통계
-        building_stats = calculate_minute_stats(building_data, building, '(All)')
-        minute_data.extend(building_stats)
+    # Building 전체 → Level 순 (이름 순)
+    buildings = sorted({b for b, _ in presence_index.locations if b is not None})
+    for building in buildings:
+        minute_data.extend(calculate_minute_stats(presence_index, building, '(All)'))
         
-        # Level별 통계  
-        level_groups = building_data.groupby('level')
-        for level, level_data in level_groups:
-            level_stats = calculate_minute_stats(level_data, building, level)
-            minute_data.extend(level_stats)
+        levels = sorted({l for b, l in presence_index.locations if b == building and l is not None})
+        for level in levels:
+            minute_data.extend(calculate_minute_stats(presence_index, building, level))
     
     return pd.DataFrame(minute_data)
 
 def calculate_minute_stats(space_data, building, level):
-    """공간별 1분 단위 통계 계산 (벡터화 연산 사용)"""
+    """공간별 1분 단위 통계 계산
+
+    Args:
+        space_data: PresenceIndex 또는 해당 공간의 activity_analysis DataFrame
+    """
     
+    presence_index = space_data if isinstance(space_data, PresenceIndex) else PresenceIndex.from_activity(space_data)
     space_name = building if level == '(All)' else f"{building}-{level}"
-    stats_list = []
+    level_filter = None if level == '(All)' else level
     
-    # 벡터화된 groupby 연산으로 효율성 극대화
-    minute_groups = space_data.groupby('minute_bin')
+    # 1440분 점유 곡선 (popcount)
+    active_workers = presence_index.occupancy_curve(building, level_filter, statuses=['Active'])
+    present_workers = presence_index.occupancy_curve(building, level_filter, statuses=['Active', 'Present'])
+    total_workers = presence_index.occupancy_curve(building, level_filter, statuses=None)  # 모든 상태 포함
     
-    for minute_bin, group in minute_groups:
-        # 각 활동 상태별 고유 MAC 개수 계산
-        active_workers = group[group['activity_status'] == 'Active']['mac'].nunique()
-        present_workers = group[group['activity_status'].isin(['Active', 'Present'])]['mac'].nunique()
-        total_workers = group['mac'].nunique()  # 모든 상태 포함 (Active, Present, Absent)
-        
-        stats_list.append({
-            'building': building,
-            'level': level,
-            'space_name': space_name,
-            'minute_bin': minute_bin,
-            'active_workers': active_workers,
-            'present_workers': present_workers,
-            'total_workers': total_workers
-        })
+    minutes = np.flatnonzero(total_workers > 0)
+    minute_bins = presence_index.minute_bin_values(minutes)
     
-    return stats_list
+    return [{
+        'building': building,
+        'level': level,
+        'space_name': space_name,
+        'minute_bin': minute_bin_value,
+        'active_workers': int(active_workers[minute]),
+        'present_workers': int(present_workers[minute]),
+        'total_workers': int(total_workers[minute])
+    } for minute, minute_bin_value in zip(minutes, minute_bins)]
 
 def generate_building_level_statistics(activity_analysis):
-    """Building별 및 Level별 통계 생성"""
+    """Building별 및 Level별 통계 생성
+    
+    분(minute_bin)별 조건부 고유 MAC 수를 minute_bin groupby 1회로 계산 (1..1440, 데이터 없는 분은 0)
+    """
     
     if activity_analysis is None or activity_analysis.empty:
         return None, None
     
-    # Building별 통계
-    building_stats = []
-    level_stats = []
+    status = status_codes(activity_analysis['activity_status'])
+    is_active = status == STATUS_ACTIVE
+    is_present = (status == STATUS_ACTIVE) | (status == STATUS_PRESENT)
+    is_inactive = status == STATUS_PRESENT  # Present만 (Active 제외)
+    building = activity_analysis['building'].astype(object).to_numpy()
+    level = activity_analysis['level'].astype(object).to_numpy()
+    mac_codes = category_codes(activity_analysis['mac'])[0].astype(np.float64)
     
-    # 전체 minute_bin 범위 (1-1440)
-    for minute_bin in range(1, 1441):
-        minute_data = activity_analysis[activity_analysis['minute_bin'] == minute_bin]
-        
-        if minute_data.empty:
-            # 데이터가 없는 분에 대해서는 0으로 처리
-            building_stats.append({
-                'minute_bin': minute_bin,
-                'total_active': 0, 'total_present': 0, 'total_inactive': 0,
-                'cluster_active': 0, 'cluster_present': 0, 'cluster_inactive': 0,
-                'wwt_active': 0, 'wwt_present': 0, 'wwt_inactive': 0,
-                'fab_active': 0, 'fab_present': 0, 'fab_inactive': 0,
-                'cub_active': 0, 'cub_present': 0, 'cub_inactive': 0
-            })
-            
-            level_stats.append({
-                'minute_bin': minute_bin,
-                'total_active': 0,
-                'cluster_1f_active': 0, 'wwt_1f_active': 0, 'wwt_b1f_active': 0,
-                'fab_1f_active': 0, 'cub_1f_active': 0, 'cub_b1f_active': 0
-            })
-            continue
-        
-        # Building별 집계
-        total_active = minute_data[minute_data['activity_status'] == 'Active']['mac'].nunique()
-        total_present = minute_data[minute_data['activity_status'].isin(['Active', 'Present'])]['mac'].nunique()
-        total_inactive = minute_data[minute_data['activity_status'] == 'Present']['mac'].nunique()  # Present만 (Active 제외)
-        
-        # 각 Building별
-        cluster_data = minute_data[minute_data['building'] == 'Cluster']
-        wwt_data = minute_data[minute_data['building'] == 'WWT']
-        fab_data = minute_data[minute_data['building'] == 'FAB']
-        cub_data = minute_data[minute_data['building'] == 'CUB']
-        
-        building_stats.append({
-            'minute_bin': minute_bin,
-            'total_active': total_active,
-            'total_present': total_present,
-            'total_inactive': total_inactive,
-            'cluster_active': cluster_data[cluster_data['activity_status'] == 'Active']['mac'].nunique(),
-            'cluster_present': cluster_data[cluster_data['activity_status'].isin(['Active', 'Present'])]['mac'].nunique(),
-            'cluster_inactive': cluster_data[cluster_data['activity_status'] == 'Present']['mac'].nunique(),
-            'wwt_active': wwt_data[wwt_data['activity_status'] == 'Active']['mac'].nunique(),
-            'wwt_present': wwt_data[wwt_data['activity_status'].isin(['Active', 'Present'])]['mac'].nunique(),
-            'wwt_inactive': wwt_data[wwt_data['activity_status'] == 'Present']['mac'].nunique(),
-            'fab_active': fab_data[fab_data['activity_status'] == 'Active']['mac'].nunique(),
-            'fab_present': fab_data[fab_data['activity_status'].isin(['Active', 'Present'])]['mac'].nunique(),
-            'fab_inactive': fab_data[fab_data['activity_status'] == 'Present']['mac'].nunique(),
-            'cub_active': cub_data[cub_data['activity_status'] == 'Active']['mac'].nunique(),
-            'cub_present': cub_data[cub_data['activity_status'].isin(['Active', 'Present'])]['mac'].nunique(),
-            'cub_inactive': cub_data[cub_data['activity_status'] == 'Present']['mac'].nunique()
-        })
-        
-        # Level별 집계 (Active만)
-        cluster_1f_data = minute_data[(minute_data['building'] == 'Cluster') & (minute_data['level'] == '1F')]
-        wwt_1f_data = minute_data[(minute_data['building'] == 'WWT') & (minute_data['level'] == '1F')]
-        wwt_b1f_data = minute_data[(minute_data['building'] == 'WWT') & (minute_data['level'] == 'B1F')]
-        fab_1f_data = minute_data[(minute_data['building'] == 'FAB') & (minute_data['level'] == '1F')]
-        cub_1f_data = minute_data[(minute_data['building'] == 'CUB') & (minute_data['level'] == '1F')]
-        cub_b1f_data = minute_data[(minute_data['building'] == 'CUB') & (minute_data['level'] == 'B1F')]
-        
-        level_stats.append({
-            'minute_bin': minute_bin,
-            'total_active': total_active,
-            'cluster_1f_active': cluster_1f_data[cluster_1f_data['activity_status'] == 'Active']['mac'].nunique(),
-            'wwt_1f_active': wwt_1f_data[wwt_1f_data['activity_status'] == 'Active']['mac'].nunique(),
-            'wwt_b1f_active': wwt_b1f_data[wwt_b1f_data['activity_status'] == 'Active']['mac'].nunique(),
-            'fab_1f_active': fab_1f_data[fab_1f_data['activity_status'] == 'Active']['mac'].nunique(),
-            'cub_1f_active': cub_1f_data[cub_1f_data['activity_status'] == 'Active']['mac'].nunique(),
-            'cub_b1f_active': cub_b1f_data[cub_b1f_data['activity_status'] == 'Active']['mac'].nunique()
-        })
+    # 통계 컬럼별 조건 (조건에 맞지 않는 행의 MAC은 NaN → nunique에서 제외)
+    conditions = {
+        'total_active': is_active, 'total_present': is_present, 'total_inactive': is_inactive,
+    }
+    for name in ['Cluster', 'WWT', 'FAB', 'CUB']:
+        in_building = building == name
+        conditions[f"{name.lower()}_active"] = in_building & is_active
+        conditions[f"{name.lower()}_present"] = in_building & is_present
+        conditions[f"{name.lower()}_inactive"] = in_building & is_inactive
+    level_columns = ['total_active']
+    for name, floor in [('Cluster', '1F'), ('WWT', '1F'), ('WWT', 'B1F'), ('FAB', '1F'), ('CUB', '1F'), ('CUB', 'B1F')]:
+        column = f"{name.lower()}_{floor.lower()}_active"
+        conditions[column] = (building == name) & (level == floor) & is_active
+        level_columns.append(column)
+    
+    masked = pd.DataFrame({column: np.where(mask, mac_codes, np.nan) for column, mask in conditions.items()})
+    masked['minute_bin'] = activity_analysis['minute_bin'].to_numpy()
+    counts = (masked.groupby('minute_bin').nunique()
+              .reindex(pd.RangeIndex(1, 1441, name='minute_bin'), fill_value=0)
+              .astype(np.int64).reset_index())
     
-    return pd.DataFrame(building_stats), pd.DataFrame(level_stats)
+    building_columns = ['minute_bin'] + [column for column in conditions if column not in level_columns[1:]]
+    return counts[building_columns], counts[['minute_bin'] + level_columns]
 
 def display_tward41_operation_results(st, analysis_results):
     """T-Ward Type 41 분석 결과 표시 (1분 단위 최적화)"""
@@ -611,22 +637,25 @@ def display_tward41_operation_results(st, analysis_results):
         st.markdown("### 📈 Worker Activity by Minute (1-minute resolution)")
         
         # Building별 및 Level별 통계 데이터 생성
-        print(f"🔍 Activity analysis shape: {activity_analysis.shape}")
-        print(f"🔍 Activity analysis columns: {activity_analysis.columns.tolist()}")
-        print(f"🔍 Sample activity data:\n{activity_analysis.head()}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🔍 Activity analysis shape: {activity_analysis.shape}")
+            log.debug(f"🔍 Activity analysis columns: {activity_analysis.columns.tolist()}")
+            log.debug(f"🔍 Sample activity data:\n{activity_analysis.head()}")
         
         building_stats, level_stats = generate_building_level_statistics(activity_analysis)
         
-        print(f"🔍 Building stats generated: {building_stats is not None}")
-        print(f"🔍 Level stats generated: {level_stats is not None}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"🔍 Building stats generated: {building_stats is not None}")
+            log.debug(f"🔍 Level stats generated: {level_stats is not None}")
         if building_stats is not None:
-            print(f"🔍 Building stats shape: {building_stats.shape}")
-            print(f"🔍 Building stats sample:\n{building_stats.head()}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"🔍 Building stats shape: {building_stats.shape}")
+                log.debug(f"🔍 Building stats sample:\n{building_stats.head()}")
         
         if building_stats is not None and not building_stats.empty:
             # 4개의 서브플롯: Present, Active, Inactive (Building별), Active (Level별)
             fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
-            print("🔍 Subplots created successfully")
+            log.info("🔍 Subplots created successfully")
             
             # 시간 축 생성 (copy 없이 직접 계산)
             building_stats = building_stats.copy()  # 한 번만 복사
@@ -735,7 +764,7 @@ def display_tward41_operation_results(st, analysis_results):
             plt.tight_layout()
             st.pyplot(fig)
             plt.close()
-            print("🔍 Charts displayed successfully")
+            log.info("🔍 Charts displayed successfully")
             
 
             
@@ -880,7 +909,7 @@ def display_filtered_operation_results(st, analysis_results):
         return
     
     # 각 T-Ward별 체류시간 계산 (분 단위)
-    mac_dwell_times = activity_analysis.groupby('mac')['minute_bin'].nunique().reset_index()
+    mac_dwell_times = activity_analysis.groupby('mac', observed=True)['minute_bin'].nunique().reset_index()
     mac_dwell_times.columns = ['mac', 'dwell_minutes']
     
     # 30분 이상 체류한 T-Ward 필터링
@@ -896,8 +925,9 @@ def display_filtered_operation_results(st, analysis_results):
     filtered_activity = activity_analysis[activity_analysis['mac'].isin(filtered_macs)]
     
     # 필터링된 통계 생성
-    filtered_summary = generate_space_statistics(filtered_activity)
-    filtered_minute_activity = generate_minute_activity(filtered_activity)
+    filtered_presence = PresenceIndex.from_activity(filtered_activity)
+    filtered_summary = generate_space_statistics(filtered_activity, filtered_presence)
+    filtered_minute_activity = generate_minute_activity(filtered_activity, filtered_presence)
     
     # 필터링된 결과 표시
     st.markdown("#### 📊 Filtered Worker Activity Summary")
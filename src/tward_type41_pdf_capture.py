@@ -19,6 +19,10 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import io
 from reportlab.platypus import Image
+import logging
+from .tracing import get_logger
+
+log = get_logger(__name__)
 
 
 def generate_report_page_pdf_v2(activity_analysis, analysis_results):
@@ -37,7 +41,8 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
             def _log_call(self, method, *args, **kwargs):
                 """모든 streamlit 호출을 로깅"""
                 self.debug_calls.append(f"{method}({args}, {kwargs})")
-                print(f"🔍 PDFCapture: {method} called with {len(str(args))} chars")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(f"🔍 PDFCapture: {method} called with {len(str(args))} chars")
                 
             def markdown(self, text, unsafe_allow_html=False):
                 self._log_call("markdown", text[:50] + "..." if len(str(text)) > 50 else text)
@@ -90,7 +95,7 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
                             if clear_figure:
                                 plt.close(current_fig)
                 except Exception as e:
-                    print(f"⚠️ pyplot 캡처 실패: {e}")
+                    log.error(f"⚠️ pyplot 캡처 실패: {e}")
                     self.content.append(("matplotlib_chart", "Chart (capture failed)"))
                     
             def success(self, text):
@@ -201,7 +206,7 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
         # PDF 캡처 객체 생성
         pdf_capture = PDFContentCapture()
         
-        print("� PDF Capture: Starting Report Generation page execution...")
+        log.debug("� PDF Capture: Starting Report Generation page execution...")
         
         # Execute actual Report Generation page sections in order
         from .tward_type41_report_generation import (
@@ -211,42 +216,36 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
         )
         
         try:
-            print("� PDF Capture: Executing display_occupancy_analysis_section...")
+            log.debug("� PDF Capture: Executing display_occupancy_analysis_section...")
             initial_count = len(pdf_capture.content)
             display_occupancy_analysis_section(pdf_capture, analysis_results)
             new_count = len(pdf_capture.content)
-            print(f"   📊 Occupancy Analysis: {new_count - initial_count} items captured")
+            log.debug(f"   📊 Occupancy Analysis: {new_count - initial_count} items captured")
         except Exception as e:
-            print(f"⚠️ Occupancy Analysis section capture failed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"⚠️ Occupancy Analysis section capture failed: {e}")
             pdf_capture.content.append(("error", f"Occupancy Analysis section error: {e}"))
         
         try:
-            print("⏱️ PDF Capture: Executing display_dwell_time_analysis_section...")
+            log.debug("⏱️ PDF Capture: Executing display_dwell_time_analysis_section...")
             initial_count = len(pdf_capture.content)
             display_dwell_time_analysis_section(pdf_capture, activity_analysis)
             new_count = len(pdf_capture.content)
-            print(f"   ⏱️ Dwell Time Analysis: {new_count - initial_count} items captured")
+            log.debug(f"   ⏱️ Dwell Time Analysis: {new_count - initial_count} items captured")
         except Exception as e:
-            print(f"⚠️ Dwell Time Analysis section capture failed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"⚠️ Dwell Time Analysis section capture failed: {e}")
             pdf_capture.content.append(("error", f"Dwell Time Analysis section error: {e}"))
         
         try:
-            print("�️ PDF Capture: Executing display_journey_analysis_section...")
+            log.debug("�️ PDF Capture: Executing display_journey_analysis_section...")
             initial_count = len(pdf_capture.content)
             display_journey_analysis_section(pdf_capture, activity_analysis)
             new_count = len(pdf_capture.content)
-            print(f"   🗺️ Journey Analysis: {new_count - initial_count} items captured")
+            log.debug(f"   🗺️ Journey Analysis: {new_count - initial_count} items captured")
         except Exception as e:
-            print(f"⚠️ Journey Analysis section capture failed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"⚠️ Journey Analysis section capture failed: {e}")
             pdf_capture.content.append(("error", f"Journey Analysis section error: {e}"))
         
-        print(f"✅ PDF Capture: Total {len(pdf_capture.content)} content items captured")
+        log.info(f"✅ PDF Capture: Total {len(pdf_capture.content)} content items captured")
         
         # 캡처된 콘텐츠 요약 출력
         content_summary = {}
@@ -254,12 +253,12 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
             item_type = item[0]
             content_summary[item_type] = content_summary.get(item_type, 0) + 1
         
-        print("📋 캡처된 콘텐츠 요약:")
+        log.debug("📋 캡처된 콘텐츠 요약:")
         for content_type, count in content_summary.items():
-            print(f"   • {content_type}: {count}개")
+            log.debug(f"   • {content_type}: {count}개")
             
         # 디버그 호출 정보도 출력
-        print(f"🔧 디버그: 총 {len(pdf_capture.debug_calls)}개 streamlit 메서드 호출됨")
+        log.debug(f"🔧 디버그: 총 {len(pdf_capture.debug_calls)}개 streamlit 메서드 호출됨")
         
         # 캡처된 내용을 PDF로 변환
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
@@ -350,12 +349,12 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
         story.append(Spacer(1, 50))
         
         # Convert captured content to PDF elements  
-        print(f"📄 Converting PDF content... Total {len(pdf_capture.content)} items")
+        log.info(f"📄 Converting PDF content... Total {len(pdf_capture.content)} items")
         
         for i, item in enumerate(pdf_capture.content):
             try:
                 item_type = item[0]
-                print(f"  📝 Processing: {item_type} ({i+1}/{len(pdf_capture.content)})")
+                log.debug(f"  📝 Processing: {item_type} ({i+1}/{len(pdf_capture.content)})")
                 
                 if item_type == "markdown":
                     text = item[1]
@@ -512,9 +511,9 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
                             story.append(Spacer(1, 10))
                             story.append(img)
                             story.append(Spacer(1, 25))
-                            print(f"  ✅ 차트 이미지 추가됨")
+                            log.info(f"  ✅ 차트 이미지 추가됨")
                         except Exception as e:
-                            print(f"  ⚠️ 차트 이미지 처리 실패: {e}")
+                            log.error(f"  ⚠️ 차트 이미지 처리 실패: {e}")
                             story.append(Paragraph("📈 Chart (이미지 처리 실패)", body_style))
                             story.append(Spacer(1, 10))
                     else:
@@ -552,12 +551,12 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
                     story.append(Spacer(1, 6))
                     
             except Exception as e:
-                print(f"⚠️ PDF 아이템 {i} ({item_type}) 처리 중 오류: {e}")
+                log.error(f"⚠️ PDF 아이템 {i} ({item_type}) 처리 중 오류: {e}")
                 story.append(Paragraph(f"Content processing error ({item_type}): {e}", body_style))
                 story.append(Spacer(1, 6))
         
         # Generate PDF
-        print("📄 Building PDF document...")
+        log.info("📄 Building PDF document...")
         doc.build(story)
         
         # Encode PDF file to base64 (Type 31 style)
@@ -572,7 +571,7 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
         # Delete temporary file
         os.unlink(pdf_filename)
         
-        print(f"✅ PDF generation complete! Size: {pdf_size_mb:.2f}MB, Content: {len(pdf_capture.content)} items")
+        log.info(f"✅ PDF generation complete! Size: {pdf_size_mb:.2f}MB, Content: {len(pdf_capture.content)} items")
         
         return {
             'pdf_base64': pdf_base64,
@@ -582,9 +581,7 @@ def generate_report_page_pdf_v2(activity_analysis, analysis_results):
         }
     
     except Exception as e:
-        print(f"❌ PDF generation error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ PDF generation error: {e}")
         return None
 
 
@@ -23,9 +23,14 @@ from reportlab.lib.colors import HexColor
 import tempfile
 import os
 from .tward_type41_dwell_time import display_tward_dwell_charts
+from .report_writer import report_file_path
+import logging
+from src.tracing import get_logger
+
+log = get_logger(__name__)
 
 def render_tward41_report_generation(st):
-    print("📊 >>> render_tward41_report_generation called - NEW VERSION")
+    log.debug("📊 >>> render_tward41_report_generation called - NEW VERSION")
     """T-Ward Type 41 Report Generation 탭 렌더링"""
     
     st.markdown("### 📊 T-Ward Type 41 Report Generation")
@@ -984,9 +989,10 @@ def render_report_single_heatmap(st, heatmap_df, space_name, group_num, start_id
         # Extract only numeric heatmap data (exclude MAC address and other non-numeric columns)
         try:
             # Debug: print DataFrame structure
-            print(f"DEBUG: heatmap_df columns: {list(heatmap_df.columns)}")
-            print(f"DEBUG: heatmap_df shape: {heatmap_df.shape}")
-            print(f"DEBUG: First few rows:\n{heatmap_df.head()}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"DEBUG: heatmap_df columns: {list(heatmap_df.columns)}")
+                log.debug(f"DEBUG: heatmap_df shape: {heatmap_df.shape}")
+                log.debug(f"DEBUG: First few rows:\n{heatmap_df.head()}")
             
             # heatmap_df structure may have: [MAC Address, Activity Time (min), T000, T001, ..., T143]
             # We want only the time bin columns (T000~T143)
@@ -995,13 +1001,15 @@ def render_report_single_heatmap(st, heatmap_df, space_name, group_num, start_id
             time_cols = [col for col in heatmap_df.columns if col.startswith('T') and len(col) == 4 and col[1:].isdigit()]
             
             if len(time_cols) > 0:
-                print(f"DEBUG: Found {len(time_cols)} time columns: {time_cols[:5]}...{time_cols[-5:]}")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(f"DEBUG: Found {len(time_cols)} time columns: {time_cols[:5]}...{time_cols[-5:]}")
                 heatmap_values = heatmap_df[time_cols].values.astype(int)
             else:
                 # Fallback: exclude known non-numeric columns
                 exclude_cols = ['MAC Address', 'Activity Time (min)', 'mac', 'activity_minutes']
                 numeric_cols = [col for col in heatmap_df.columns if col not in exclude_cols]
-                print(f"DEBUG: Using fallback columns: {numeric_cols[:10] if len(numeric_cols) > 10 else numeric_cols}")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(f"DEBUG: Using fallback columns: {numeric_cols[:10] if len(numeric_cols) > 10 else numeric_cols}")
                 
                 if len(numeric_cols) > 0:
                     # Verify these are numeric
@@ -1014,7 +1022,7 @@ def render_report_single_heatmap(st, heatmap_df, space_name, group_num, start_id
                     st.error(f"No suitable columns found in heatmap for {space_name}")
                     return
                 
-            print(f"DEBUG: Final heatmap_values shape: {heatmap_values.shape}")
+            log.debug(f"DEBUG: Final heatmap_values shape: {heatmap_values.shape}")
         except Exception as e:
             st.error(f"Error processing heatmap data for {space_name}: {str(e)}")
             import traceback
@@ -1221,7 +1229,7 @@ def generate_csv_report(activity_analysis):
         if not activity_analysis.empty:
             occupied_activity = activity_analysis[activity_analysis['activity_status'].isin(['Active', 'Present'])]
             if not occupied_activity.empty:
-                mac_dwell_times = occupied_activity.groupby('mac')['minute_bin'].nunique()
+                mac_dwell_times = occupied_activity.groupby('mac', observed=True)['minute_bin'].nunique()
                 report_data.append(['Dwell Time', 'Average Dwell Time (min)', f'{mac_dwell_times.mean():.1f}', 'Average actual occupancy time'])
                 report_data.append(['Dwell Time', 'Max Dwell Time (min)', mac_dwell_times.max(), 'Maximum occupancy time'])
                 report_data.append(['Dwell Time', 'Min Dwell Time (min)', mac_dwell_times.min(), 'Minimum occupancy time'])
@@ -1229,7 +1237,7 @@ def generate_csv_report(activity_analysis):
         
         # 공간별 통계
         if 'space' in activity_analysis.columns:
-            space_stats = activity_analysis.groupby('space').agg({
+            space_stats = activity_analysis.groupby('space', observed=True).agg({
                 'mac': 'nunique',
                 'activity_status': lambda x: (x.isin(['Active', 'Present'])).sum()
             }).round(1)
@@ -1239,7 +1247,7 @@ def generate_csv_report(activity_analysis):
                 report_data.append(['Space Activity', f'{space} - Activity Records', stats['activity_status'], f'Active/Present records in {space}'])
         
         # 활동 상태 분포
-        status_dist = activity_analysis['activity_status'].value_counts()
+        status_dist = activity_analysis['activity_status'].value_counts().loc[lambda counts: counts > 0]
         for status, count in status_dist.items():
             percentage = (count / len(activity_analysis)) * 100
             report_data.append(['Activity Status', f'{status} Count', count, f'{percentage:.1f}% of total records'])
@@ -1394,13 +1402,14 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         
     except Exception as e:
         import traceback
-        print(f"Error generating PDF report: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        log.error(f"Error generating PDF report: {str(e)}")
+        log.error(f"Traceback: {traceback.format_exc()}")
         return None
     
-    print("Starting PDF generation...")
-    print(f"Activity analysis type: {type(activity_analysis)}")
-    print(f"Analysis results type: {type(analysis_results)}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Starting PDF generation...")
+        log.debug(f"Activity analysis type: {type(activity_analysis)}")
+        log.debug(f"Analysis results type: {type(analysis_results)}")
     
     # Required imports
     try:
@@ -1414,19 +1423,18 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         from reportlab.lib.colors import HexColor
         import matplotlib.pyplot as plt
         import numpy as np
-        import streamlit as st
-        print("All imports successful")
+        log.info("All imports successful")
     except ImportError as e:
-        print(f"Import error: {e}")
+        log.error(f"Import error: {e}")
         return None
     
     try:
         if activity_analysis is None or activity_analysis.empty:
-            print("Activity analysis is None or empty")
+            log.debug("Activity analysis is None or empty")
             return None
             
         # Report Generation 페이지의 실제 컨텐츠 생성 (generate_comprehensive_report 함수 사용)
-        print("Generating report content using existing function...")
+        log.debug("Generating report content using existing function...")
         
         # Mock streamlit object for content generation
         class MockStreamlit:
@@ -1462,7 +1470,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         # Report Generation의 실제 컨텐츠 생성
         report_content = generate_comprehensive_report(mock_st, activity_analysis, analysis_results)
         
-        print(f"Generated content items: {len(mock_st.content)}")
+        log.debug(f"Generated content items: {len(mock_st.content)}")
             
         # save_chart_as_image 함수 정의
         def save_chart_as_image(fig):
@@ -1478,16 +1486,17 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
                     return img
             except Exception as e:
                 plt.close(fig)  # 에러 발생 시에도 figure 닫기
-                print(f"Chart image generation error: {e}")
+                log.error(f"Chart image generation error: {e}")
                 return None
         
-        print("Creating temporary file...")
+        log.debug("Creating temporary file...")
         # 임시 파일 생성
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
             pdf_filename = tmp_file.name
             
-        print(f"Temporary PDF file created: {pdf_filename}")
-        print("Creating PDF document...")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"Temporary PDF file created: {pdf_filename}")
+            log.debug("Creating PDF document...")
         # PDF 문서 생성
         doc = SimpleDocTemplate(
             pdf_filename,
@@ -1498,7 +1507,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
             bottomMargin=2*cm
         )
         
-        print("Setting up PDF styles...")
+        log.debug("Setting up PDF styles...")
         # 스타일 정의
         styles = getSampleStyleSheet()
         title_style = ParagraphStyle(
@@ -1542,7 +1551,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         
 
         
-        print("Converting report content to PDF...")
+        log.debug("Converting report content to PDF...")
         # PDF 내용 구성 - Report Generation 페이지의 실제 내용 사용
         story = []
         
@@ -1628,7 +1637,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         story.append(Paragraph(report_info, normal_style))
         story.append(Spacer(1, 0.4*inch))
         
-        print("Report content conversion completed.")
+        log.info("Report content conversion completed.")
         
         # PDF 푸터 추가
         footer_text = """
@@ -1638,7 +1647,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         
         story.append(Paragraph(footer_text, ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9, textColor=colors.grey)))
         
-        print("Building PDF document...")
+        log.debug("Building PDF document...")
         # PDF 빌드
         doc.build(story)
         unique_twards = activity_analysis['mac'].nunique()
@@ -1680,7 +1689,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         story.append(Paragraph(analysis_info, normal_style))
         
         # Occupancy Analysis 24시간 차트 추가 (Report Generation과 동일) - 임시 비활성화
-        print("Skipping charts for basic PDF test...")
+        log.debug("Skipping charts for basic PDF test...")
         story.append(Paragraph("📊 24-Hour Activity Pattern", subheader_style))
         story.append(Paragraph("Chart generation temporarily disabled for testing", normal_style))
         
@@ -1745,7 +1754,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         story.append(Spacer(1, 0.3*inch))
         
         # 2. Dwell Time Analysis (Report Generation 페이지와 완전히 동일 - 차트 포함) - 임시 간소화
-        print("Adding Dwell Time Analysis section...")
+        log.debug("Adding Dwell Time Analysis section...")
         story.append(Paragraph("⏱️ 2. Dwell Time Analysis", header_style))
         story.append(Paragraph("Dwell time analysis temporarily simplified for testing", normal_style))
         
@@ -1943,7 +1952,7 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         story.append(Spacer(1, 0.3*inch))
         
         # 3. Journey Heatmap Analysis (Report Generation 페이지와 완전히 동일 - 히트맵 차트 포함) - 임시 간소화
-        print("Adding Journey Heatmap Analysis section...")
+        log.debug("Adding Journey Heatmap Analysis section...")
         story.append(Paragraph("🗺️ 3. Journey Heatmap Analysis", header_style))
         story.append(Paragraph("Journey heatmap analysis temporarily simplified for testing", normal_style))
         
@@ -2098,16 +2107,16 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         
         story.append(Paragraph(footer_text, ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9, textColor=colors.grey)))
         
-        print("Building PDF document...")
+        log.debug("Building PDF document...")
         # PDF 빌드
         doc.build(story)
         
-        print("Reading PDF file...")
+        log.debug("Reading PDF file...")
         # PDF 파일 읽기
         with open(pdf_filename, 'rb') as f:
             pdf_data = f.read()
         
-        print(f"PDF generated successfully, size: {len(pdf_data)} bytes")
+        log.info(f"PDF generated successfully, size: {len(pdf_data)} bytes")
         
         # 임시 파일 삭제
         os.unlink(pdf_filename)
@@ -2116,23 +2125,24 @@ def generate_professional_pdf_report(activity_analysis, analysis_results):
         
     except Exception as e:
         import traceback
-        print(f"Error generating PDF report: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        log.error(f"Error generating PDF report: {str(e)}")
+        log.error(f"Traceback: {traceback.format_exc()}")
         return None
 
 
 def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
-    """Report Generation 페이지 전체 내용을 그대로 PDF로 출력"""
+    """Report Generation 페이지 전체 내용을 그대로 PDF로 출력
+    
+    PDF는 output/report_files/에 바로 기록되며 bytes 대신 파일 경로를 반환합니다
+    (다운로드는 src.report_writer.open_report 파일 handle 사용).
+    """
     try:
-        import tempfile
-        import os
         from reportlab.lib.pagesizes import A4
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import inch, cm
         from reportlab.lib import colors
         from reportlab.lib.colors import HexColor
-        import streamlit as st
         
         if activity_analysis is None or activity_analysis.empty:
             return None
@@ -2198,7 +2208,7 @@ def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
         try:
             report_content = generate_comprehensive_report(mock_st, activity_analysis, analysis_results)
         except Exception as e:
-            print(f"Error generating report content: {e}")
+            log.error(f"Error generating report content: {e}")
             # 동적 건물 정보 감지
             detected_buildings = []
             if activity_analysis is not None and not activity_analysis.empty:
@@ -2221,9 +2231,9 @@ def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
                 ("header", "🗺️ 3. Journey Heatmap Analysis")
             ]
         
-        # 임시 PDF 파일 생성
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            pdf_filename = tmp_file.name
+        # PDF 출력 파일 (메모리로 다시 읽지 않고 경로 반환)
+        pdf_filename = str(report_file_path(
+            f"T41_Comprehensive_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"))
             
         # PDF 문서 설정
         doc = SimpleDocTemplate(pdf_filename, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
@@ -2335,7 +2345,7 @@ def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
         try:
             # 30분 이상 체류 필터링된 데이터 정보
             filtered_records = activity_analysis[activity_analysis['activity_status'].isin(['Active', 'Present'])]
-            dwell_summary = filtered_records.groupby(['mac', 'space_name']).agg({
+            dwell_summary = filtered_records.groupby(['mac', 'space_name'], observed=True).agg({
                 'timestamp': ['count', 'min', 'max']
             }).reset_index()
             
@@ -2351,7 +2361,7 @@ def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
                 story.append(Spacer(1, 0.15*inch))
                 
                 # 공간별 체류 분포
-                space_stats = filtered_records.groupby('space_name').agg({
+                space_stats = filtered_records.groupby('space_name', observed=True).agg({
                     'mac': 'nunique',
                     'timestamp': 'count'
                 }).reset_index()
@@ -2387,7 +2397,7 @@ def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
         
         try:
             # Journey 패턴 분석
-            journey_stats = activity_analysis.groupby(['mac', 'space_name']).agg({
+            journey_stats = activity_analysis.groupby(['mac', 'space_name'], observed=True).agg({
                 'timestamp': ['count', 'min', 'max'],
                 'activity_status': lambda x: x.mode().iloc[0] if len(x) > 0 else 'Unknown'
             }).reset_index()
@@ -2481,22 +2491,15 @@ def generate_comprehensive_pdf_report(activity_analysis, analysis_results):
         """
         story.append(Paragraph(footer_text, ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9, textColor=colors.grey, alignment=1)))
         
-        # PDF 빌드
+        # PDF 빌드 (build가 story의 flowable을 소비하며 페이지를 배치)
         doc.build(story)
         
-        # PDF 파일 읽기
-        with open(pdf_filename, 'rb') as f:
-            pdf_data = f.read()
-            
-        # 임시 파일 삭제
-        os.unlink(pdf_filename)
-        
-        return pdf_data
+        return pdf_filename
         
     except Exception as e:
         import traceback
-        print(f"Enhanced PDF generation error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        log.error(f"Enhanced PDF generation error: {str(e)}")
+        log.error(f"Traceback: {traceback.format_exc()}")
         return None
 
 def generate_report_page_pdf(activity_analysis, analysis_results):
@@ -2583,16 +2586,16 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
         pdf_capture = PDFContentCapture()
         
         # Report Generation 페이지의 실제 섹션들을 순서대로 실행
-        print("🔍 PDF Capture: Executing display_occupancy_analysis_section...")
+        log.debug("🔍 PDF Capture: Executing display_occupancy_analysis_section...")
         display_occupancy_analysis_section(pdf_capture, analysis_results)
         
-        print("🔍 PDF Capture: Executing display_dwell_time_analysis_section...")  
+        log.debug("🔍 PDF Capture: Executing display_dwell_time_analysis_section...")
         display_dwell_time_analysis_section(pdf_capture, activity_analysis)
         
-        print("🔍 PDF Capture: Executing display_journey_analysis_section...")
+        log.debug("🔍 PDF Capture: Executing display_journey_analysis_section...")
         display_journey_analysis_section(pdf_capture, activity_analysis)
         
-        print(f"🔍 PDF Capture: Captured {len(pdf_capture.content)} content items")
+        log.debug(f"🔍 PDF Capture: Captured {len(pdf_capture.content)} content items")
         
         # 캡처된 내용을 PDF로 변환
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
@@ -2735,9 +2738,7 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
         }
     
     except Exception as e:
-        print(f"❌ PDF 생성 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ PDF 생성 중 오류 발생: {e}")
         return None
         story.append(Paragraph("⏱️ 2. Dwell Time Analysis", header_style))
         
@@ -2773,7 +2774,7 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
                     count_col = [col for col in filtered_data.columns if col not in ['mac', available_group_col]][0]
                 
                 if count_col:
-                    space_stats = filtered_data.groupby(available_group_col).agg({
+                    space_stats = filtered_data.groupby(available_group_col, observed=True).agg({
                         'mac': 'nunique',
                         count_col: 'count'
                     }).reset_index()
@@ -2817,7 +2818,8 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
         story.append(Paragraph("🗺️ 3. Journey Heatmap Analysis", header_style))
         
         # Journey 패턴 분석 (안전한 컬럼 체크)
-        print(f"DEBUG: activity_analysis columns: {list(activity_analysis.columns)}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"DEBUG: activity_analysis columns: {list(activity_analysis.columns)}")
         
         # 사용 가능한 컬럼들 확인
         has_timestamp = 'timestamp' in activity_analysis.columns
@@ -2865,7 +2867,7 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
                 story.append(space_top_table)
         elif has_building:
             # building 컬럼이 있는 경우
-            building_stats = activity_analysis['building'].value_counts()
+            building_stats = activity_analysis['building'].value_counts().loc[lambda counts: counts > 0]
             if not building_stats.empty:
                 story.append(Paragraph("<b>빌딩별 활동 분포:</b>", normal_style))
                 for building, count in building_stats.items():
@@ -2873,7 +2875,7 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
                     story.append(Paragraph(f"• {building}: {count:,} 레코드 ({percentage:.1f}%)", normal_style))
         elif has_level:
             # level 컬럼이 있는 경우
-            level_stats = activity_analysis['level'].value_counts()
+            level_stats = activity_analysis['level'].value_counts().loc[lambda counts: counts > 0]
             if not level_stats.empty:
                 story.append(Paragraph("<b>레벨별 활동 분포:</b>", normal_style))
                 for level, count in level_stats.items():
@@ -2906,6 +2908,6 @@ def generate_report_page_pdf(activity_analysis, analysis_results):
         
     except Exception as e:
         import traceback
-        print(f"Report PDF generation error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        log.error(f"Report PDF generation error: {str(e)}")
+        log.error(f"Traceback: {traceback.format_exc()}")
         return None
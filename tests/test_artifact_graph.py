@@ -0,0 +1,111 @@
+"""artifact_graph: metadata.json 갱신 lock (여러 프로세스), recipe 선택 / 없는 artifact 계산 (derive-on-miss)"""
+
+import json
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+from src import dataset_catalog
+from src.artifact_graph import (build_flow_hourly_devices, build_flow_hourly_devices_from_raw, plan_recipes,
+                                update_metadata)
+from src.cached_data_loader import CachedDataLoader
+
+HOURLY_FLOW = 'flow_results_hourly_flow.parquet'
+HOURLY_DEVICES = 'dashboard_results_flow_hourly_devices.parquet'
+
+
+def _append_entries(cache_folder: str, worker: int, count: int):
+    for i in range(count):
+        def update(metadata, name=f"w{worker}_{i}.parquet"):
+            metadata.setdefault('saved_files', []).append(name)
+            metadata.setdefault('derived_artifacts', {})[name] = {'builder': f"worker{worker}"}
+        update_metadata(cache_folder, update)
+
+
+def test_update_metadata_is_serialized_across_processes(tmp_path):
+    with open(tmp_path / 'metadata.json', 'w') as f:
+        json.dump({'saved_files': []}, f)
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_append_entries, args=(str(tmp_path), w, 25)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    with open(tmp_path / 'metadata.json') as f:
+        metadata = json.load(f)
+    assert len(metadata['saved_files']) == 100
+    assert len(metadata['derived_artifacts']) == 100
+
+
+def _raw_flow(days=('2025-09-09',)):
+    rows = []
+    for day in days:
+        for i, t in enumerate(pd.date_range(f"{day} 08:00:00", periods=180, freq='1min')):
+            rows.append({'time': t, 'mac': f"M{i % 7}", 'type': 1 + i % 2, 'rssi': -70})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    folder = tmp_path / 'Rawdata' / 'Site_A' / 'cache'
+    folder.mkdir(parents=True)
+    with open(folder / 'metadata.json', 'w') as f:
+        json.dump({'saved_files': ['raw_flow.parquet'], 'config': {}}, f)
+    yield folder
+    with dataset_catalog._lock:
+        dataset_catalog._catalogs.clear()
+        dataset_catalog._folder_index.clear()
+
+
+def test_plan_prefers_nearest_parent(cache):
+    assert plan_recipes(cache, HOURLY_DEVICES) == []
+    _raw_flow().to_parquet(cache / 'raw_flow.parquet', index=False)
+    # hourly_flow는 raw에서 계산 가능 → 가까운 parent recipe가 먼저
+    assert [r.build for r in plan_recipes(cache, HOURLY_DEVICES)] == \
+        [build_flow_hourly_devices, build_flow_hourly_devices_from_raw]
+    assert plan_recipes(cache, 'unknown_artifact.parquet') == []
+
+
+def test_missing_artifact_is_derived_through_intermediate(cache):
+    _raw_flow().to_parquet(cache / 'raw_flow.parquet', index=False)
+    devices = CachedDataLoader(str(cache)).load_flow_hourly_devices()
+
+    assert list(devices['hour']) == [8, 9, 10]
+    assert list(devices['unique_devices']) == [7, 7, 7]
+    assert (cache / HOURLY_FLOW).exists() and (cache / HOURLY_DEVICES).exists()
+    with open(cache / 'metadata.json') as f:
+        metadata = json.load(f)
+    assert metadata['derived_artifacts'][HOURLY_FLOW]['builder'] == 'build_flow_hourly_flow'
+    assert metadata['derived_artifacts'][HOURLY_DEVICES]['inputs'] == [HOURLY_FLOW]
+    assert metadata['derived_artifacts'][HOURLY_DEVICES]['builder'] == 'build_flow_hourly_devices'
+    assert {HOURLY_FLOW, HOURLY_DEVICES} <= set(metadata['saved_files'])
+    # catalog에도 바로 반영
+    assert HOURLY_DEVICES in dataset_catalog.cache_folder_index(cache)['artifacts']
+
+    # 저장된 파일은 다음 loader에서 그대로 읽음
+    pd.testing.assert_frame_equal(CachedDataLoader(str(cache)).load_flow_hourly_devices(), devices,
+                                  check_dtype=False)
+
+
+def test_multi_day_cache_falls_back_to_raw_recipe(cache):
+    _raw_flow(days=('2025-09-09', '2025-09-10')).to_parquet(cache / 'raw_flow.parquet', index=False)
+    devices = CachedDataLoader(str(cache)).load_flow_hourly_devices()
+
+    assert list(devices['hour']) == [8, 9, 10]
+    assert list(devices['unique_devices']) == [7, 7, 7]
+    with open(cache / 'metadata.json') as f:
+        derived = json.load(f)['derived_artifacts']
+    assert derived[HOURLY_DEVICES]['builder'] == 'build_flow_hourly_devices_from_raw'
+    assert derived[HOURLY_FLOW]['builder'] == 'build_flow_hourly_flow'
+
+
+def test_underivable_artifact_is_empty_and_not_written(cache):
+    loader = CachedDataLoader(str(cache))
+    assert loader.load_flow_hourly_devices().empty
+    assert not (cache / HOURLY_DEVICES).exists()
+    with open(cache / 'metadata.json') as f:
+        assert 'derived_artifacts' not in json.load(f)
@@ -0,0 +1,119 @@
+"""artifact_prefetch: 우선순위 plan, 첫 화면 대기 / 완료 / 실패 집계, 취소 시 대기 task 건너뜀"""
+
+import threading
+
+import pytest
+
+from src.artifact_prefetch import (PRIORITY_FILTERS, PRIORITY_INITIAL, PRIORITY_TABS, ArtifactPrefetcher,
+                                   build_prefetch_plan)
+
+
+class FakeLoader:
+    """CachedDataLoader의 일부 load_* 함수만 가진 loader (호출 기록)"""
+
+    def __init__(self, gate=None, fail=()):
+        self.calls = []
+        self.gate = gate
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def _load(self, name, *args):
+        if self.gate is not None and name == 'raw_t31':
+            self.gate.wait(5)
+        with self._lock:
+            self.calls.append((name,) + args)
+        if name in self.fail:
+            raise ValueError(f"{name} is broken")
+        return name
+
+    def load_raw_t31(self):
+        return self._load('raw_t31')
+
+    def load_raw_t41(self):
+        return self._load('raw_t41')
+
+    def load_t41_stats_10min(self, building, level):
+        return self._load('t41_stats_10min', building, level)
+
+    def load_t41_worker_dwell(self):
+        return self._load('t41_worker_dwell')
+
+    def load_tvm_comparison(self, building, level):
+        return self._load('tvm_comparison', building, level)
+
+    def load_ai_insights(self, data_type):
+        return self._load('ai_insights', data_type)
+
+    def get_available_t41_stats_filters(self):
+        return ['All', 'WWT-1F', 'FAB']
+
+
+@pytest.fixture
+def prefetcher():
+    return ArtifactPrefetcher(max_workers=1)
+
+
+def test_plan_is_ordered_by_priority_with_filter_tasks():
+    plan = build_prefetch_plan(FakeLoader())
+    labels = [(priority, label) for priority, label, _ in plan]
+    assert labels[:3] == [(PRIORITY_INITIAL, 'raw_t31'), (PRIORITY_INITIAL, 'raw_t41'),
+                          (PRIORITY_INITIAL, 't41_stats_10min')]
+    assert [label for priority, label in labels if priority == PRIORITY_TABS] == ['t41_worker_dwell', 'tvm_comparison']
+    assert [label for priority, label in labels if priority == PRIORITY_FILTERS] == [
+        't41_stats_10min:WWT-1F', 'tvm_comparison:WWT-1F', 't41_stats_10min:FAB', 'tvm_comparison:FAB',
+        'ai_insights:t31', 'ai_insights:t41', 'ai_insights:flow',
+    ]
+    assert [p for p, _ in labels] == sorted(p for p, _ in labels)
+
+    loader = FakeLoader()
+    for _, _, task in build_prefetch_plan(loader)[-7:-3]:
+        task()
+    assert loader.calls == [('t41_stats_10min', 'WWT', '1F'), ('tvm_comparison', 'WWT', '1F'),
+                            ('t41_stats_10min', 'FAB', 'All'), ('tvm_comparison', 'FAB', 'All')]
+
+
+def test_job_counts_completed_and_failed_tasks(prefetcher):
+    loader = FakeLoader(fail={'tvm_comparison'})
+    job = prefetcher.start('Site_A', loader)
+    assert job.wait_initial(5)
+    prefetcher._queue.join()
+
+    status = job.status()
+    assert job.done and not job.cancelled
+    assert status['total'] == 12
+    assert status['completed'] == 9
+    assert status['failed'] == 3
+    assert job.failed['tvm_comparison:FAB'] == 'tvm_comparison is broken'
+    # worker 1개 → plan 순서대로 실행
+    assert [call[0] for call in loader.calls[:3]] == ['raw_t31', 'raw_t41', 't41_stats_10min']
+    assert ('t41_stats_10min', 'FAB', 'All') in loader.calls
+
+
+def test_cancel_skips_queued_tasks(prefetcher):
+    gate = threading.Event()
+    loader = FakeLoader(gate=gate)
+    job = prefetcher.start('Site_A', loader)
+    job.cancel()
+    assert job.cancelled and job.done
+    assert job.wait_initial(0)          # 취소되면 첫 화면 대기도 풀림
+    gate.set()
+    prefetcher._queue.join()
+
+    status = job.status()
+    assert status['completed'] + status['skipped'] == status['total']
+    assert status['completed'] <= 1     # 취소 전에 이미 읽기 시작한 task만 실행
+    assert [call[0] for call in loader.calls] in (['raw_t31'], [])
+
+
+def test_loader_without_initial_artifacts_does_not_block(prefetcher):
+    class InsightsOnly:
+        def get_available_t41_stats_filters(self):
+            raise OSError("no cache")
+
+        def load_ai_insights(self, data_type):
+            return data_type
+
+    job = prefetcher.start('Insights', InsightsOnly())
+    assert job.wait_initial(0)          # 첫 화면 artifact 없음
+    prefetcher._queue.join()
+    assert job.status()['completed'] == 3
@@ -0,0 +1,46 @@
+"""chart_downsample: 포인트 예산 / 여러 trace가 공유하는 decimation 위치"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from src.chart_downsample import add_downsampled_trace, point_budget, shared_indices
+
+
+def test_point_budget_follows_plot_width():
+    assert point_budget(width_px=1400) == 1240
+    assert point_budget(width_px=1400, method='minmax') == 2480
+    fig = go.Figure()
+    fig.update_layout(width=600, margin=dict(l=50, r=50))
+    assert point_budget(fig) == 500
+    assert point_budget(width_px=50) == 100      # 최소 예산
+
+
+def test_shared_indices_give_every_trace_the_same_x_samples():
+    minutes = np.arange(1440)
+    present = 50 + 40 * np.sin(minutes / 90)
+    active = present * 0.6
+    labels = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in minutes])
+
+    fig = go.Figure()
+    fig.update_layout(width=600, margin=dict(l=50, r=50))
+    positions = shared_indices(present, fig=fig)
+    assert len(positions) == 500
+    assert positions[0] == 0 and positions[-1] == 1439
+    for curve in (present, active):
+        assert add_downsampled_trace(fig, labels, curve, indices=positions, mode='lines')
+    assert list(fig.data[0].x) == list(fig.data[1].x) == list(labels[positions])
+    np.testing.assert_allclose(fig.data[1].y, active[positions])
+
+
+def test_shared_indices_inside_zoom_window():
+    y = np.random.default_rng(0).random(5000)
+    positions = shared_indices(y, max_points=200, window=(1000, 3000))
+    assert positions.min() == 1000 and positions.max() == 2999
+    assert len(positions) == 200
+
+    small = shared_indices(y, max_points=500, window=(10, 110))
+    np.testing.assert_array_equal(small, np.arange(10, 110))
+    fig = go.Figure()
+    assert not add_downsampled_trace(fig, np.arange(5000), y, window=(10, 110), indices=small,
+                                     mode='lines+markers')
+    assert fig.data[0].mode == 'lines+markers'
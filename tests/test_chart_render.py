@@ -0,0 +1,94 @@
+"""chart_render: ChartCache 메모리 LRU / 디스크 캐시 상한, 캐시 key, render_charts 캐시 hit"""
+
+import os
+import time
+
+import pandas as pd
+
+from src import chart_render
+from src.chart_render import ChartCache, ChartRequest, chart_key, register_chart, render_chart, render_charts
+
+REQUEST = ChartRequest('test_chart', None, (4, 3))
+
+
+def _files(cache_dir):
+    return sorted(path.stem for path in (cache_dir / 'test_chart').glob('*.png'))
+
+
+def test_memory_lru_is_bounded_and_disk_hits_refill(tmp_path):
+    cache = ChartCache(tmp_path, max_bytes=250)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, REQUEST, key.encode() * 100)
+    assert cache.stats()['entries'] == 2            # 300 bytes > 250 → 가장 오래된 'a' 제외
+    assert cache.get('a', REQUEST) == b'a' * 100    # 디스크에서 다시 읽음
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.get('missing', REQUEST) is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_prune_disk_keeps_recent_files_within_cap(tmp_path):
+    cache = ChartCache(tmp_path, max_disk_bytes=10_000)
+    now = time.time()
+    for i, key in enumerate(['old', 'mid', 'new']):
+        cache.put(key, REQUEST, b'x' * 400)
+        os.utime(tmp_path / 'test_chart' / f"{key}.png", (now - 100 + i, now - 100 + i))
+    cache.get('old', REQUEST)     # 메모리 hit → 디스크 mtime은 그대로
+    cache.clear()
+    cache.get('mid', REQUEST)     # 디스크 hit → 최근 사용으로 표시
+
+    assert cache.prune_disk(max_bytes=800) == 1
+    assert _files(tmp_path) == ['mid', 'new']
+    assert cache.prune_disk(max_bytes=10_000, max_age_sec=50) == 1
+    assert _files(tmp_path) == ['mid']
+
+
+def test_put_prunes_when_disk_cap_is_exceeded(tmp_path):
+    cache = ChartCache(tmp_path, max_disk_bytes=1000)
+    for i in range(10):
+        cache.put(f"k{i}", REQUEST, b'x' * 300)
+        time.sleep(0.01)
+    total = sum(path.stat().st_size for path in (tmp_path / 'test_chart').glob('*.png'))
+    assert total <= 1000
+    assert 'k9' in _files(tmp_path)
+
+
+renders = []
+
+
+@register_chart('test_line')
+def _test_line(data, figsize, color='k'):
+    import matplotlib.pyplot as plt
+
+    renders.append((len(data), color))
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.plot(data['x'], data['y'], color=color)
+    return fig
+
+
+def test_chart_key_depends_on_data_size_dpi_and_params():
+    frame = pd.DataFrame({'x': [1, 2, 3], 'y': [3, 1, 2]})
+    key = chart_key(ChartRequest('test_line', frame, (4, 3)))
+    assert key == chart_key(ChartRequest('test_line', frame.copy(), (4.0, 3.0)))
+    assert key != chart_key(ChartRequest('test_line', frame, (4, 3), dpi=72))
+    assert key != chart_key(ChartRequest('test_line', frame, (4, 3), params={'color': 'r'}))
+    assert key != chart_key(ChartRequest('test_line', frame.assign(y=[3, 1, 9]), (4, 3)))
+    assert key != chart_key(ChartRequest('other_chart', frame, (4, 3)))
+
+
+def test_render_charts_reuses_cached_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(chart_render, 'chart_cache', ChartCache(tmp_path))
+    renders.clear()
+    frame = pd.DataFrame({'x': [1, 2, 3], 'y': [3, 1, 2]})
+    requests = [ChartRequest('test_line', frame, (2, 2), dpi=50),
+                ChartRequest('test_line', frame, (2, 2), dpi=50),          # 같은 key → 1번만 렌더링
+                ChartRequest('test_line', frame, (2, 2), dpi=50, params={'color': 'r'})]
+
+    first = render_charts(requests, parallel=False)
+    assert renders == [(3, 'k'), (3, 'r')]
+    assert first[0] == first[1] != first[2]
+    assert first[0].startswith(b'\x89PNG')
+
+    assert render_charts(requests, parallel=False) == first
+    assert render_chart('test_line', frame, (2, 2), dpi=50, color='r') == first[2]
+    assert len(renders) == 2
+    assert chart_render.chart_cache.stats()['entries'] == 2
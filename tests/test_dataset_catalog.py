@@ -0,0 +1,111 @@
+"""dataset_catalog: mtime 기반 무효화 (데이터셋 / artifact / metadata / pending 캐시), 디스크 catalog 재사용"""
+
+import json
+import os
+
+import pytest
+
+from src import dataset_catalog
+from src.dataset_catalog import (CATALOG_DIR, CATALOG_FILENAME, cache_folder_index, list_datasets, load_catalog,
+                                 refresh_dataset)
+
+
+def _bump(path, seconds=5):
+    """mtime을 확실히 바꿈 (파일 시스템 mtime 해상도와 무관하게)"""
+    mtime = os.stat(path).st_mtime + seconds
+    os.utime(path, (mtime, mtime))
+
+
+def _dataset(base, name, records=10, artifacts=('t41_results_worker_dwell.parquet',)):
+    cache = base / name / 'cache'
+    cache.mkdir(parents=True)
+    for artifact in artifacts:
+        (cache / artifact).write_bytes(b'x' * 16)
+    with open(cache / 'metadata.json', 'w') as f:
+        json.dump({'created_at': '2025-09-09', 't41_records': records}, f)
+    return cache
+
+
+@pytest.fixture
+def base(tmp_path):
+    folder = tmp_path / 'Rawdata'
+    folder.mkdir()
+    _dataset(folder, 'Site_A')
+    yield folder
+    with dataset_catalog._lock:
+        dataset_catalog._catalogs.clear()
+        dataset_catalog._folder_index.clear()
+
+
+def test_new_dataset_folder_is_listed(base):
+    assert [d['name'] for d in list_datasets(base)] == ['Site_A']
+    _dataset(base, 'Site_B')
+    _bump(base)
+    assert [d['name'] for d in list_datasets(base)] == ['Site_A', 'Site_B']
+
+
+def test_artifact_and_metadata_changes_invalidate_index(base):
+    cache = base / 'Site_A' / 'cache'
+    index = cache_folder_index(cache)
+    assert index['t41_stats_filters'] == ['All']
+
+    mtime = os.stat(cache).st_mtime
+    (cache / 'dashboard_results_t41_stats_10min_WWT_1F.parquet').write_bytes(b'x')
+    os.utime(cache, (mtime, mtime))
+    assert cache_folder_index(cache) is index        # mtime이 같으면 이전 index
+    _bump(cache)
+    assert cache_folder_index(cache)['t41_stats_filters'] == ['All', 'WWT-1F']
+    assert list_datasets(base)[0]['artifact_count'] == 3      # metadata.json 포함
+
+    with open(cache / 'metadata.json', 'w') as f:
+        json.dump({'created_at': '2025-09-10', 't41_records': 99}, f)
+    _bump(cache / 'metadata.json')
+    assert list_datasets(base)[0]['t41_records'] == 99
+
+
+def test_unchanged_catalog_is_not_rescanned(base, monkeypatch):
+    load_catalog(base)
+    scans = []
+    original = dataset_catalog.scan_cache_folder
+    monkeypatch.setattr(dataset_catalog, 'scan_cache_folder', lambda folder: scans.append(folder) or original(folder))
+
+    load_catalog(base)
+    assert scans == []
+    # 프로세스 재시작 (memo 없음) → 디스크 catalog 재사용
+    dataset_catalog._catalogs.clear()
+    dataset_catalog._folder_index.clear()
+    assert [d['name'] for d in list_datasets(base)] == ['Site_A']
+    assert scans == []
+    assert (base / CATALOG_DIR / CATALOG_FILENAME).exists()
+
+    _bump(base / 'Site_A' / 'cache')
+    load_catalog(base)
+    assert len(scans) == 1
+
+
+def test_pending_folder_is_listed_once_its_cache_is_written(base):
+    pending_cache = base / 'Site_B' / 'cache'
+    pending_cache.mkdir(parents=True)
+    _bump(base)
+    assert [d['name'] for d in list_datasets(base)] == ['Site_A']
+
+    # Rawdata mtime은 그대로, 캐시 폴더에만 metadata.json이 생김
+    base_mtime = os.stat(base).st_mtime
+    with open(pending_cache / 'metadata.json', 'w') as f:
+        json.dump({'t41_records': 5}, f)
+    os.utime(base, (base_mtime, base_mtime))
+    _bump(pending_cache)
+    assert [d['name'] for d in list_datasets(base)] == ['Site_A', 'Site_B']
+
+
+def test_refresh_dataset_updates_catalog_immediately(base):
+    cache = base / 'Site_A' / 'cache'
+    load_catalog(base)
+    mtime = os.stat(cache).st_mtime
+    (cache / 'flow_results_hourly_flow.parquet').write_bytes(b'x' * 32)
+    os.utime(cache, (mtime, mtime))       # mtime 해상도 안에서 생긴 변경
+
+    refresh_dataset(cache)
+    assert 'flow_results_hourly_flow.parquet' in load_catalog(base)['datasets']['Site_A']['index']['artifacts']
+    with open(base / CATALOG_DIR / CATALOG_FILENAME) as f:
+        assert 'flow_results_hourly_flow.parquet' in json.load(f)['datasets']['Site_A']['index']['artifacts']
@@ -0,0 +1,123 @@
+"""date_partitions: site rollup 증분 갱신 (바뀐 일자만 요약, 삭제 / 실패 일자) 및 기간 고유 MAC 수"""
+
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.date_partitions import (ROLLUP_FILES, ROLLUP_MANIFEST, STATUS_DONE, SUMMARY_MACS_ARTIFACT,
+                                 _period_distinct, ingest_raw, load_site_rollups, partition_name,
+                                 rollup_folder, update_site_rollups)
+
+SITE = 'Test_Site'
+DAYS = ['2025-09-08', '2025-09-09', '2025-09-15']      # 월 / 화 (같은 주) + 다음 주 월
+
+
+def _write_raw(path, day: str, macs, count: int = 40):
+    times = pd.date_range(f"{day} 09:00:00", periods=count, freq='30s')
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, t in enumerate(times):
+            f.write(f"{101 + i % 3},{macs[i % len(macs)]},41,-65,{t:%Y-%m-%d %H:%M:%S}\n")
+    return path
+
+
+def _ingest(base, path, replace=False):
+    return ingest_raw([path], SITE, base, sward_config=base / 'no_sward_config.csv', replace=replace)
+
+
+def _manifest(base):
+    with open(rollup_folder(SITE, base) / ROLLUP_MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def base(tmp_path):
+    folder = tmp_path / 'Rawdata'
+    folder.mkdir()
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    for day, macs in zip(DAYS, [('AA', 'BB'), ('BB', 'CC'), ('DD',)]):
+        _ingest(folder, _write_raw(raw / f"T41_{day}.csv", day, macs))
+    return folder
+
+
+def test_rerun_summarizes_only_changed_day(base, tmp_path):
+    first = update_site_rollups(SITE, base, workers=1)
+    assert first['summarized'] == ['20250908', '20250909', '20250915']
+    assert all(e['status'] == STATUS_DONE for e in first['entries'])
+
+    assert update_site_rollups(SITE, base, workers=1)['summarized'] == []
+
+    _ingest(base, _write_raw(tmp_path / 'raw' / 'T41_2025-09-09.csv', DAYS[1], ('BB', 'CC', 'EE')), replace=True)
+    second = update_site_rollups(SITE, base, workers=1)
+    assert second['summarized'] == ['20250909']
+    assert [e['dataset'] for e in second['entries']] == [partition_name(SITE, DAYS[1])]
+
+    weekly = load_site_rollups(SITE, base)['weekly'].set_index('period')
+    assert weekly.loc['2025-09-08/2025-09-14', 'distinct_macs'] == 4      # AA BB CC EE
+    assert weekly.loc['2025-09-15/2025-09-21', 'distinct_macs'] == 1
+
+
+def test_removed_day_is_dropped_from_rollups(base):
+    update_site_rollups(SITE, base, workers=1)
+    shutil.rmtree(base / partition_name(SITE, DAYS[2]))
+
+    report = update_site_rollups(SITE, base, workers=1)
+    assert report['removed'] == ['20250915']
+    assert report['summarized'] == []
+    rollups = load_site_rollups(SITE, base)
+    assert sorted(rollups['daily_trends']['date'].unique()) == DAYS[:2]
+    assert list(rollups['weekly']['period']) == ['2025-09-08/2025-09-14']
+    assert '20250915' not in _manifest(base)['days']
+
+
+def test_rollup_files_removed_when_every_day_is_gone(base):
+    update_site_rollups(SITE, base, workers=1)
+    assert set(load_site_rollups(SITE, base)) == set(ROLLUP_FILES)
+    for day in DAYS:
+        shutil.rmtree(base / partition_name(SITE, day))
+
+    report = update_site_rollups(SITE, base, workers=1)
+    assert report['removed'] == ['20250908', '20250909', '20250915']
+    assert load_site_rollups(SITE, base) == {}
+    assert _manifest(base)['days'] == {}
+
+
+def test_failed_day_keeps_previous_stamp(base):
+    update_site_rollups(SITE, base, workers=1)
+    stamp = _manifest(base)['days']['20250909']
+    raw_path = base / partition_name(SITE, DAYS[1]) / 'cache' / 'raw_t41.parquet'
+    raw_path.write_bytes(b'not a parquet file')
+
+    report = update_site_rollups(SITE, base, workers=1)
+    assert [e['dataset'] for e in report['failed']] == [partition_name(SITE, DAYS[1])]
+    assert report['summarized'] == []
+    assert _manifest(base)['days']['20250909'] == stamp
+    # 이전 요약은 rollup에 남고, 다음 실행에서 다시 시도
+    assert '2025-09-09' in set(load_site_rollups(SITE, base)['daily_trends']['date'])
+    assert [e['dataset'] for e in update_site_rollups(SITE, base, workers=1)['failed']] == \
+        [partition_name(SITE, DAYS[1])]
+
+
+def test_period_distinct_counts_union_of_daily_macs(tmp_path):
+    partitions = {}
+    for day, t41, t31 in [('20250908', ['AA', 'BB'], ['X1']), ('20250909', ['BB', 'CC'], ['X1', 'X2']),
+                          ('20250915', ['AA'], [])]:
+        cache = tmp_path / day
+        cache.mkdir()
+        pd.DataFrame({'stream': ['t41'] * len(t41) + ['t31'] * len(t31), 'mac': t41 + t31}) \
+            .to_parquet(cache / SUMMARY_MACS_ARTIFACT, index=False)
+        partitions[day] = {'cache_path': str(cache)}
+    partitions['20250910'] = {'cache_path': str(tmp_path / 'no_summary')}     # 요약 MAC 목록 없는 일자
+
+    periods = sorted({pd.Timestamp(day).to_period('W-SUN') for day in partitions})
+    distinct = _period_distinct(partitions, 'weekly', periods).set_index(['period', 'stream'])
+    assert distinct.loc[('2025-09-08/2025-09-14', 't41'), 'distinct_macs'] == 3
+    assert distinct.loc[('2025-09-08/2025-09-14', 't31'), 'distinct_macs'] == 2
+    assert distinct.loc[('2025-09-08/2025-09-14', 't41'), 'distinct_days'] == 2
+    assert distinct.loc[('2025-09-15/2025-09-21', 't41'), 'distinct_macs'] == 1
+    assert ('2025-09-15/2025-09-21', 't31') not in distinct.index
+
+    monthly = _period_distinct(partitions, 'monthly', [pd.Period('2025-09', 'M')])
+    assert monthly.set_index('stream').loc['t41', 'distinct_macs'] == 3
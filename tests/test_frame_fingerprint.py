@@ -0,0 +1,47 @@
+"""frame_fingerprint: 등록된 DataFrame을 수정하면 등록 id가 무효화되는지 확인"""
+
+import numpy as np
+import pandas as pd
+
+from src.frame_fingerprint import fingerprint, register, registered_fingerprint
+
+
+def _frame(n=1000):
+    return pd.DataFrame({'mac': [f"M{i % 7}" for i in range(n)], 'rssi': np.arange(n, dtype=np.int64) % 90,
+                         'time': pd.date_range('2025-09-09', periods=n, freq='10s')})
+
+
+def test_registered_id_is_reused_until_mutation():
+    df = register(_frame(), 'file-id')
+    assert fingerprint(df) == 'file-id'
+
+    df.loc[0, 'rssi'] = 99                  # 같은 dtype in-place 수정 (표본 행)
+    assert registered_fingerprint(df) is None
+    mutated = fingerprint(df)
+    assert mutated != 'file-id'
+    assert fingerprint(df) == mutated       # 다시 해시한 id로 재등록
+
+
+def test_column_replacement_invalidates():
+    df = register(_frame(), 'file-id')
+    df['rssi'] = df['rssi'].to_numpy()[::-1].copy()
+    assert registered_fingerprint(df) is None
+
+    df = register(_frame(), 'file-id')
+    df['mac'] = df['mac'].str.lower()
+    assert registered_fingerprint(df) is None
+
+
+def test_structure_change_invalidates_and_content_id_is_stable():
+    df = register(_frame(), 'file-id')
+    df['minute_bin'] = 1
+    assert registered_fingerprint(df) is None
+    assert fingerprint(_frame()) == fingerprint(_frame())
+    assert fingerprint(_frame()) != fingerprint(_frame(999))
+
+
+def test_series_registration():
+    series = register(_frame()['rssi'], 'series-id')
+    assert registered_fingerprint(series) == 'series-id'
+    series.iloc[-1] = -1
+    assert registered_fingerprint(series) is None
@@ -0,0 +1,168 @@
+"""incremental_append: 증분 append 결과가 전체 재계산과 같은지, 파일별 watermark / 늦은 행 / 상태 불일치 처리"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.artifact_graph import ARTIFACT_GRAPH, derive_artifact
+from src.cached_data_loader import CachedDataLoader
+from src.date_partitions import STATUS_FAILED, partition_name
+from src.incremental_append import (STAT_ARTIFACTS, STATUS_APPENDED, STATUS_UNCHANGED, append_raw,
+                                    build_state, load_state, save_state, stats_from_state)
+
+SITE = 'Test_Site'
+DAY = pd.Timestamp('2025-09-10')
+
+
+def _rows(start: str, count: int, macs=('AA', 'BB', 'CC'), step_seconds: int = 20) -> list:
+    times = pd.date_range(start, periods=count, freq=f"{step_seconds}s")
+    return [(101 + i % 4, macs[i % len(macs)], 41, -60 - i % 20, f"{t:%Y-%m-%d %H:%M:%S}")
+            for i, t in enumerate(times)]
+
+
+def _write_raw(path, rows, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        for row in rows:
+            f.write(','.join(map(str, row)) + '\n')
+    return path
+
+
+def _append(paths, base):
+    return append_raw(paths, SITE, base, sward_config=base / 'no_sward_config.csv')
+
+
+def _cache(base):
+    return base / partition_name(SITE, DAY) / 'cache'
+
+
+def _watermark(base):
+    with open(_cache(base) / 'metadata.json', 'r', encoding='utf-8') as f:
+        return json.load(f)['watermarks']['t41']
+
+
+def _assert_matches_rebuild(base):
+    """저장된 상태 / MAC별 통계 == raw 전체에서 다시 만든 결과"""
+    cache = _cache(base)
+    raw = pd.read_parquet(cache / 'raw_t41.parquet')
+    assert raw['time'].is_monotonic_increasing
+    rebuilt = build_state(raw, 't41')
+    state = load_state(cache, 't41')
+    pd.testing.assert_frame_equal(stats_from_state(state, 't41'), stats_from_state(rebuilt, 't41'))
+    for part in ('hourly', 'bins'):
+        key = ['hour'] if part == 'hourly' else ['mac', 'bin']
+        pd.testing.assert_frame_equal(state[part].sort_values(key).reset_index(drop=True),
+                                      rebuilt[part].sort_values(key).reset_index(drop=True),
+                                      check_dtype=False)
+    stats = pd.read_parquet(cache / STAT_ARTIFACTS['t41'])
+    pd.testing.assert_frame_equal(stats, stats_from_state(rebuilt, 't41'), check_dtype=False)
+
+
+@pytest.fixture
+def base(tmp_path):
+    folder = tmp_path / 'Rawdata'
+    folder.mkdir()
+    return folder
+
+
+def test_append_then_append_equals_full_rebuild(base, tmp_path):
+    first = _rows('2025-09-10 08:00:00', 120)
+    second = _rows('2025-09-10 13:00:00', 90, macs=('BB', 'DD'))
+    results = _append([_write_raw(tmp_path / 'T41_a.csv', first)], base)
+    results += _append([_write_raw(tmp_path / 'T41_b.csv', second)], base)
+    assert [r['status'] for r in results] == [STATUS_APPENDED, STATUS_APPENDED]
+    assert results[1]['state'] == 'merged'
+    assert results[1]['hours'] == [13]
+    _assert_matches_rebuild(base)
+
+    # 같은 행을 한 번에 append한 파티션과 같은 결과
+    single = tmp_path / 'single'
+    single.mkdir()
+    _append([_write_raw(tmp_path / 'T41_all.csv', first + second)], single)
+    pd.testing.assert_frame_equal(pd.read_parquet(_cache(base) / STAT_ARTIFACTS['t41']),
+                                  pd.read_parquet(_cache(single) / STAT_ARTIFACTS['t41']))
+    assert _watermark(base)['rows'] == _watermark(single)['rows'] == 210
+
+
+def test_hour_local_artifacts_are_spliced(base, tmp_path):
+    _append([_write_raw(tmp_path / 'T41_a.csv', _rows('2025-09-10 08:00:00', 200))], base)
+    one_min, hourly = 't41_results_one_min_unique_mac.parquet', 't41_results_hourly_avg_from_1min.parquet'
+    loader = CachedDataLoader(str(_cache(base)))
+    assert derive_artifact(loader, one_min) is not None
+    assert derive_artifact(loader, hourly) is not None
+
+    results = _append([_write_raw(tmp_path / 'T41_b.csv', _rows('2025-09-10 08:30:00', 120, macs=('DD',)))], base)
+    assert sorted(results[0]['spliced']) == sorted([one_min, hourly])
+    assert results[0]['stale'] == []
+
+    # 끼워 넣은 결과 == 합쳐진 raw 전체에서 다시 계산한 결과
+    cache = _cache(base)
+    raw = pd.read_parquet(cache / 'raw_t41.parquet')
+    expected_one_min = ARTIFACT_GRAPH[one_min][0].build(raw, {})
+    pd.testing.assert_frame_equal(pd.read_parquet(cache / one_min), expected_one_min, check_dtype=False)
+    pd.testing.assert_frame_equal(pd.read_parquet(cache / hourly),
+                                  ARTIFACT_GRAPH[hourly][0].build(expected_one_min, {}), check_dtype=False)
+
+
+def test_unchanged_file_is_not_appended_twice(base, tmp_path):
+    path = _write_raw(tmp_path / 'T41_a.csv', _rows('2025-09-10 08:00:00', 60))
+    assert _append([path], base)[0]['status'] == STATUS_APPENDED
+    results = _append([path], base)
+    assert [r['status'] for r in results] == [STATUS_UNCHANGED]
+    assert _watermark(base)['rows'] == 60
+    assert _watermark(base)['appends'] == 1
+
+
+def test_grown_file_appends_only_new_rows(base, tmp_path):
+    path = _write_raw(tmp_path / 'T41_live.csv', _rows('2025-09-10 08:00:00', 60))
+    _append([path], base)
+    _write_raw(path, _rows('2025-09-10 09:00:00', 25, macs=('EE',)), mode='a')
+
+    results = _append([path], base)
+    assert results[0]['status'] == STATUS_APPENDED
+    assert results[0]['rows'] == 25
+    assert results[0]['hours'] == [9]
+    watermark = _watermark(base)
+    assert watermark['rows'] == 85
+    assert watermark['files'][str(path.resolve())]['rows'] == 85
+    assert len(pd.read_parquet(_cache(base) / 'raw_t41.parquet')) == 85
+    _assert_matches_rebuild(base)
+
+
+def test_late_rows_before_previous_max_are_sorted_in(base, tmp_path):
+    _append([_write_raw(tmp_path / 'T41_a.csv', _rows('2025-09-10 10:00:00', 60))], base)
+    late = _rows('2025-09-10 07:30:00', 30, macs=('AA', 'ZZ'))
+    results = _append([_write_raw(tmp_path / 'T41_late.csv', late)], base)
+
+    assert results[0]['state'] == 'merged'
+    assert results[0]['hours'] == [7]
+    watermark = _watermark(base)
+    assert watermark['late_rows'] == 30
+    assert watermark['min_time'].startswith('2025-09-10T07:30')
+    _assert_matches_rebuild(base)
+
+
+def test_state_raw_mismatch_triggers_rebuild(base, tmp_path):
+    _append([_write_raw(tmp_path / 'T41_a.csv', _rows('2025-09-10 08:00:00', 60))], base)
+    cache = _cache(base)
+    state = load_state(cache, 't41')
+    state['macs']['record_count'] = state['macs']['record_count'] + 1     # raw와 맞지 않는 상태
+    save_state(cache, 't41', state)
+
+    results = _append([_write_raw(tmp_path / 'T41_b.csv', _rows('2025-09-10 12:00:00', 30))], base)
+    assert results[0]['status'] == STATUS_APPENDED
+    assert results[0]['state'] == 'rebuilt'
+    assert results[0]['state_rows'] == 90
+    _assert_matches_rebuild(base)
+
+
+def test_precomputed_partition_without_raw_fails(base, tmp_path):
+    cache = _cache(base)
+    cache.mkdir(parents=True)
+    with open(cache / 'metadata.json', 'w', encoding='utf-8') as f:
+        json.dump({'t41_records': 10, 'partition': {'site': SITE, 'day': f"{DAY:%Y%m%d}"}}, f)
+    results = _append([_write_raw(tmp_path / 'T41_a.csv', _rows('2025-09-10 08:00:00', 10))], base)
+    assert results[0]['status'] == STATUS_FAILED
+    assert 'ingest --replace' in results[0]['error']
+    assert not np.any([(cache / name).exists() for name in ('raw_t41.parquet', STAT_ARTIFACTS['t41'])])
@@ -0,0 +1,124 @@
+"""job_runner: worker 프로세스 실행 / 실패 기록, job table 원자적 갱신, 완료 job 정리"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+import pytest
+
+from src.job_runner import (INPUTS_DIR, JOB_FILE, STATE_DONE, STATE_FAILED, STATE_QUEUED, STATE_RUNNING,
+                            JobRunner, _read_job, _update_job, _write_job)
+
+
+def scale_values(frame, factor, job=None):
+    """worker에서 실행되는 job 함수 (module-level)"""
+    job.progress(0.5, "Scaling")
+    print(f"scaling {len(frame)} rows")
+    return frame.assign(value=frame['value'] * factor)
+
+
+def fail_job():
+    raise ValueError("bad input")
+
+
+def _wait(runner, job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        record = runner.get(job_id)
+        if record['state'] in (STATE_DONE, STATE_FAILED):
+            return record
+        time.sleep(0.1)
+    raise AssertionError(f"job {job_id} did not finish: {record}")
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = JobRunner(tmp_path / 'jobs', max_workers=1)
+    yield runner
+    if runner._executor is not None:
+        runner._executor.shutdown(wait=True)
+
+
+def test_job_runs_in_worker_and_result_is_loadable(runner):
+    frame = pd.DataFrame({'value': [1, 2, 3]})
+    job_id = runner.submit('scale', 'test_job_runner', 'scale_values', inputs={'frame': frame},
+                           params={'factor': 10})
+    record = _wait(runner, job_id)
+
+    assert record['state'] == STATE_DONE and record['progress'] == 1.0
+    assert record['pid'] != os.getpid()
+    pd.testing.assert_frame_equal(runner.load_result(job_id), frame.assign(value=[10, 20, 30]))
+    log = runner.read_log(job_id)
+    assert 'Scaling' in log and 'scaling 3 rows' in log
+    assert not (runner.jobs_dir / job_id / INPUTS_DIR).exists()
+    assert [r['job_id'] for r in runner.list_jobs('scale')] == [job_id]
+
+
+def test_failed_job_records_error_and_traceback(runner):
+    job_id = runner.submit('broken', 'test_job_runner', 'fail_job')
+    record = _wait(runner, job_id)
+    assert record['state'] == STATE_FAILED
+    assert record['message'] == "ValueError: bad input"
+    assert 'Traceback' in runner.read_log(job_id)
+    assert runner.load_result(job_id) is None
+
+
+def test_job_table_updates_are_atomic(tmp_path):
+    _write_job(tmp_path, {'state': STATE_QUEUED})
+    stop = threading.Event()
+    torn_reads = []
+
+    def read_loop():
+        while not stop.is_set():
+            if _read_job(tmp_path) is None:
+                torn_reads.append(1)
+
+    def write_loop(worker):
+        for i in range(100):
+            _update_job(tmp_path, progress=i / 100, message=f"worker {worker}")
+
+    reader = threading.Thread(target=read_loop)
+    reader.start()
+    writers = [threading.Thread(target=write_loop, args=(w,)) for w in range(4)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    reader.join()
+
+    assert torn_reads == []
+    assert sorted(os.listdir(tmp_path)) == [JOB_FILE]      # tmp 파일 없음
+    with open(tmp_path / JOB_FILE) as f:
+        assert json.load(f)['state'] == STATE_QUEUED
+
+
+def _finished_job(runner, job_id, age_sec, state=STATE_DONE):
+    job_dir = runner.jobs_dir / job_id
+    job_dir.mkdir(parents=True)
+    _write_job(job_dir, {'job_id': job_id, 'state': state, 'created_at': job_id})
+    mtime = time.time() - age_sec
+    os.utime(job_dir, (mtime, mtime))
+
+
+def test_cleanup_keeps_recent_finished_jobs_and_running_ones(runner):
+    for i in range(5):
+        _finished_job(runner, f"done-{i}", age_sec=100 - i)       # done-4가 가장 최근
+    _finished_job(runner, 'failed-old', age_sec=10 * 24 * 3600, state=STATE_FAILED)
+    _finished_job(runner, 'running-old', age_sec=10 * 24 * 3600, state=STATE_RUNNING)
+    runner._futures['running-old'] = Future()      # 이 프로세스가 실행 중인 job
+
+    assert runner.cleanup(max_finished=3) == 3
+    assert sorted(p.name for p in runner.jobs_dir.iterdir()) == ['done-2', 'done-3', 'done-4', 'running-old']
+    assert runner.cleanup(max_finished=3, max_age_sec=97.5) == 1
+    assert sorted(p.name for p in runner.jobs_dir.iterdir()) == ['done-3', 'done-4', 'running-old']
+
+
+def test_unknown_running_job_is_reported_as_interrupted(runner):
+    _finished_job(runner, 'orphan', age_sec=0, state=STATE_RUNNING)
+    record = runner.get('orphan')
+    assert record['state'] == STATE_FAILED
+    assert 'Interrupted' in record['message']
@@ -0,0 +1,44 @@
+"""결측 MAC 행이 categorical 코드 -1로 배열 index에 쓰이지 않는지 확인"""
+
+import numpy as np
+import pandas as pd
+
+from src.t41_schema import category_codes, compact_activity_frame, compact_journey_frame
+from src.tward_type41_operation import analyze_worker_activity
+
+
+def _location_frame():
+    return pd.DataFrame({
+        'mac': ['AA', np.nan, 'BB', 'AA'],
+        'time': pd.to_datetime(['2025-09-09 08:00:05', '2025-09-09 08:00:10',
+                                '2025-09-09 08:01:00', '2025-09-09 08:00:20']),
+        'building': ['B1', 'B1', 'B2', 'B1'],
+        'level': ['1F', '1F', '2F', '1F'],
+        'space_type': ['Work', 'Work', 'Rest', 'Work'],
+    })
+
+
+def test_compact_frames_drop_missing_mac():
+    activity = compact_activity_frame(pd.DataFrame({
+        'mac': ['AA', None, 'BB'],
+        'minute_bin': [1, 2, 3],
+        'building': ['B1', 'B1', 'B2'],
+    }))
+    codes, macs = category_codes(activity['mac'])
+    assert len(activity) == 2
+    assert (codes >= 0).all()
+    assert list(macs) == ['AA', 'BB']
+
+    journey = compact_journey_frame(pd.DataFrame({'mac': [np.nan, 'CC'], 'bin_index': [0, 1]}))
+    assert list(journey['mac'].astype(str)) == ['CC']
+
+
+def test_analyze_worker_activity_ignores_missing_mac():
+    result = analyze_worker_activity(_location_frame())
+
+    assert sorted(result['mac'].astype(str).unique()) == ['AA', 'BB']
+    assert len(result) == 2 * 1440
+    counts = result.set_index([result['mac'].astype(str), 'minute_bin'])['signal_count']
+    assert counts[('AA', 481)] == 2
+    assert counts[('BB', 482)] == 1
+    assert int(result['signal_count'].sum()) == 3
@@ -0,0 +1,69 @@
+"""report_writer: 디스크 스트리밍 PDF (atomic rename, 이미지 flush, 실패 시 파일 없음) 및 오래된 보고서 정리"""
+
+import os
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from src.report_writer import StreamingPdfPages, cleanup_old_reports, open_report
+
+
+def _image_page(seed: int):
+    fig, ax = plt.subplots(figsize=(3, 3))
+    ax.imshow(np.random.default_rng(seed).random((40, 40)))
+    return fig
+
+
+def test_pages_are_streamed_to_file(tmp_path):
+    with StreamingPdfPages('report.pdf', output_dir=tmp_path, metadata={'Title': 'Test'}) as pdf:
+        for seed in range(3):
+            pdf.savefig(_image_page(seed))
+        assert not pdf.path.exists()            # 완료 전에는 임시 파일에만 기록
+
+    assert pdf.page_count == 3
+    assert pdf._flusher.flushed == 3            # 이미지는 페이지마다 flush
+    assert plt.get_fignums() == []
+    assert pdf.size > 0
+    assert os.listdir(tmp_path) == ['report.pdf']
+    with open_report(pdf.path) as f:
+        content = f.read()
+    assert content.startswith(b'%PDF') and content.count(b'/Subtype /Image') == 3
+    assert open_report(tmp_path / 'missing.pdf') is None
+
+
+def test_failed_report_leaves_no_file(tmp_path):
+    with pytest.raises(RuntimeError):
+        with StreamingPdfPages('report.pdf', output_dir=tmp_path) as pdf:
+            pdf.savefig(_image_page(0))
+            raise RuntimeError("chart failed")
+    assert os.listdir(tmp_path) == []
+
+    with StreamingPdfPages('empty.pdf', output_dir=tmp_path) as pdf:
+        pass
+    assert pdf.page_count == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_cleanup_removes_only_old_reports(tmp_path):
+    now = time.time()
+    for name, age_hours in (('old.pdf', 30), ('.stale.pdf.tmp1.2', 48), ('recent.pdf', 1)):
+        path = tmp_path / name
+        path.write_bytes(b'%PDF')
+        os.utime(path, (now - age_hours * 3600, now - age_hours * 3600))
+    (tmp_path / 'folder').mkdir()
+
+    assert cleanup_old_reports(tmp_path, max_age_hours=24) == 2
+    assert sorted(os.listdir(tmp_path)) == ['folder', 'recent.pdf']
+    assert cleanup_old_reports(tmp_path / 'missing') == 0
+
+    # 새 보고서를 열 때도 정리
+    os.utime(tmp_path / 'recent.pdf', (now - 30 * 3600, now - 30 * 3600))
+    with StreamingPdfPages('new.pdf', output_dir=tmp_path) as pdf:
+        pdf.savefig(_image_page(1))
+    assert sorted(os.listdir(tmp_path)) == ['folder', 'new.pdf']
@@ -0,0 +1,78 @@
+"""session_memory: 세션별 한도 (session_state), 측정 / eviction 계획"""
+
+import numpy as np
+import pandas as pd
+
+from src.cached_data_loader import CachedDataLoader
+from src.session_memory import (MB, RECONSTRUCTIBLE_KEYS, SCOPE_LOADER, SESSION_LIMIT_KEY, _eviction_units,
+                                get_session_limit_mb, measure_session, plan_eviction, track_session, unique_bytes)
+
+
+def _frame(mb: int) -> pd.DataFrame:
+    return pd.DataFrame({'value': np.zeros(mb * MB // 8)})
+
+
+def test_limit_is_read_per_session():
+    limited = {SESSION_LIMIT_KEY: 1, 'flow_data': _frame(4)}
+    default = {'flow_data': _frame(4)}
+
+    assert get_session_limit_mb(limited) == 1
+    assert get_session_limit_mb(default) == get_session_limit_mb()      # IRFM_SESSION_MEMORY_MB
+
+    report = track_session(limited, 'dashboard')
+    assert [e['group'] for e in report['evicted']] == ['flow_data']
+    assert 'flow_data' not in limited
+    assert report['limit_bytes'] == MB
+
+    report = track_session(default, 'dashboard')
+    assert report['evicted'] == []
+    assert 'flow_data' in default
+
+
+def test_zero_limit_disables_eviction():
+    state = {SESSION_LIMIT_KEY: 0, 'flow_data': _frame(2)}
+    report = track_session(state, 'dashboard')
+    assert report['limit_bytes'] == 0 and not report['over_limit']
+    assert 'flow_data' in state
+
+
+def test_shared_frame_is_counted_once_and_evicted_as_one_unit():
+    shared, own = _frame(4), _frame(2)
+    state = {'tward31_data': shared, 'flow_data': {'raw': shared}, 'tward41_data': own, 'upload': _frame(1)}
+    entries = measure_session(state, RECONSTRUCTIBLE_KEYS['dashboard'])
+    by_key = {e.key: e for e in entries}
+
+    assert by_key['flow_data'].bytes >= 4 * MB and by_key['tward31_data'].bytes >= 4 * MB
+    assert not by_key['upload'].reconstructible
+    assert 7 * MB <= unique_bytes(entries) < 8 * MB         # shared는 1회만
+    assert sorted(_eviction_units(entries)) == [
+        ('flow_data', 'tward31_data'),
+        ('tward41_data+type41_activity_analysis+type41_journey_heatmap',),
+    ]
+
+    # 둘 중 하나만 제거하면 해제되지 않으므로 함께 제거, 실제 해제 크기가 큰 단위부터
+    assert plan_eviction(entries, 5 * MB) == ['flow_data', 'tward31_data']
+    assert plan_eviction(entries, 1 * MB) == ['flow_data', 'tward31_data',
+                                              'tward41_data+type41_activity_analysis+type41_journey_heatmap']
+    assert plan_eviction(entries, 8 * MB) == []
+
+
+def test_loader_cache_entries_are_evicted_with_session_keys(tmp_path):
+    loader = CachedDataLoader(str(tmp_path))
+    activity = _frame(3)
+    loader._cache['compact:t41_results_activity_analysis.parquet'] = activity
+    loader._cache['raw_flow.parquet'] = _frame(1)
+    state = {SESSION_LIMIT_KEY: 2, 'cache_loader': loader, 'type41_activity_analysis': activity}
+
+    entries = measure_session(state, RECONSTRUCTIBLE_KEYS['dashboard'])
+    assert {e.key for e in entries if e.scope == SCOPE_LOADER} == \
+        {'compact:t41_results_activity_analysis.parquet', 'raw_flow.parquet'}
+
+    report = track_session(state, 'dashboard')
+    assert [e['group'] for e in report['evicted']] == [
+        'loader:compact:t41_results_activity_analysis.parquet',
+        'tward41_data+type41_activity_analysis+type41_journey_heatmap',
+    ]
+    assert 'type41_activity_analysis' not in state
+    assert list(loader.cache_entries()) == ['raw_flow.parquet']
+    assert state['cache_loader'] is loader and not report['over_limit']
@@ -0,0 +1,75 @@
+"""T41 분별 Building / Level 통계 (groupby 1회)와 presence bitset 저장 / 로드"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.presence_bitset import PresenceIndex
+from src.t41_schema import compact_activity_frame
+from src.tward_type41_operation import generate_building_level_statistics
+
+
+def _activity(n=3000, seed=1):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'mac': rng.choice([f"M{i}" for i in range(40)], n),
+        'minute_bin': rng.integers(1, 1441, n),
+        'building': rng.choice(['Cluster', 'WWT', 'FAB', 'CUB', 'Unknown'], n),
+        'level': rng.choice(['1F', 'B1F'], n),
+        'activity_status': rng.choice(['Absent', 'Present', 'Active'], n),
+    })
+    return df[df['minute_bin'] != 700].reset_index(drop=True)
+
+
+def _expected(df, minute, building=None, level=None, statuses=('Active',)):
+    rows = df[(df['minute_bin'] == minute) & df['activity_status'].isin(statuses)]
+    if building is not None:
+        rows = rows[rows['building'] == building]
+    if level is not None:
+        rows = rows[rows['level'] == level]
+    return rows['mac'].nunique()
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_building_level_statistics_match_per_minute_scan(compact):
+    df = _activity()
+    building_stats, level_stats = generate_building_level_statistics(compact_activity_frame(df) if compact else df)
+
+    assert list(building_stats['minute_bin']) == list(range(1, 1441))
+    assert list(level_stats.columns) == ['minute_bin', 'total_active', 'cluster_1f_active', 'wwt_1f_active',
+                                         'wwt_b1f_active', 'fab_1f_active', 'cub_1f_active', 'cub_b1f_active']
+    assert building_stats.loc[699].drop('minute_bin').sum() == 0      # 데이터 없는 분 = 0
+    for minute in (1, 360, 701, 1440):
+        row = building_stats.iloc[minute - 1]
+        assert row['total_active'] == _expected(df, minute)
+        assert row['total_present'] == _expected(df, minute, statuses=('Active', 'Present'))
+        assert row['wwt_inactive'] == _expected(df, minute, 'WWT', statuses=('Present',))
+        assert row['cub_present'] == _expected(df, minute, 'CUB', statuses=('Active', 'Present'))
+        level_row = level_stats.iloc[minute - 1]
+        assert level_row['wwt_b1f_active'] == _expected(df, minute, 'WWT', 'B1F')
+        assert level_row['cluster_1f_active'] == _expected(df, minute, 'Cluster', '1F')
+
+
+def test_presence_index_save_is_atomic_and_round_trips(tmp_path):
+    index = PresenceIndex.from_activity(compact_activity_frame(_activity()))
+    saved = index.save(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(saved)     # tmp 파일 없음
+
+    loaded = PresenceIndex.load(tmp_path)
+    np.testing.assert_array_equal(loaded.bits, index.bits)
+    np.testing.assert_array_equal(loaded.occupancy_curve('WWT', '1F'), index.occupancy_curve('WWT', '1F'))
+
+
+def test_presence_index_load_rejects_mismatched_files(tmp_path):
+    PresenceIndex.from_activity(compact_activity_frame(_activity())).save(tmp_path)
+    other = tmp_path / 'other'
+    other.mkdir()
+    PresenceIndex.from_activity(compact_activity_frame(_activity(n=200, seed=2))).save(other)
+    (other / 't41_results_presence_keys.npy').replace(tmp_path / 't41_results_presence_keys.npy')
+
+    with pytest.raises(ValueError):
+        PresenceIndex.load(tmp_path)
+    index_path = tmp_path / 't41_results_presence_index.json'
+    assert json.loads(index_path.read_text(encoding='utf-8'))['n_keys'] > 0
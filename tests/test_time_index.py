@@ -0,0 +1,32 @@
+"""NaT 시간 행이 bin -1로 유효한 bin에 섞이지 않는지 확인"""
+
+import numpy as np
+import pandas as pd
+
+from src.time_index import add_time_columns, minute_bin, sec_of_day, ten_minute_bin, time_index_10s
+
+
+def _frame_with_nat():
+    return pd.DataFrame({
+        'mac': ['AA', 'BB', 'CC'],
+        'time': pd.to_datetime(['2025-09-09 08:00:15', None, '2025-09-09 23:59:59']),
+    })
+
+
+def test_add_time_columns_drops_nat_rows():
+    df = _frame_with_nat()
+    add_time_columns(df)
+
+    assert list(df['mac']) == ['AA', 'CC']
+    assert list(df['sec_of_day']) == [8 * 3600 + 15, 86399]
+    assert list(df['minute_of_day']) == [480, 1439]
+    assert (df['day'] == pd.Timestamp('2025-09-09')).all()
+    assert list(minute_bin(df)) == [481, 1440]
+    assert list(time_index_10s(df)) == [2882, 8640]
+    assert list(ten_minute_bin(df)) == [48, 143]
+
+
+def test_computed_sec_of_day_marks_nat():
+    secs = sec_of_day(_frame_with_nat())
+    assert list(secs) == [8 * 3600 + 15, -1, 86399]
+    assert secs.dtype == np.int32
@@ -0,0 +1,98 @@
+"""tracing: span 중첩 / 오류 기록, traced 행 수, trace export rotate, 세션별 tracing 토글"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src import tracing
+from src.tracing import (NULL_SPAN, SESSION_TOGGLE_KEY, TRACE_FILE, export_trace, is_session_tracing_enabled,
+                         recent_traces, span, trace_rerun, traced)
+
+
+@pytest.fixture(autouse=True)
+def trace_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, 'TRACE_DIR', tmp_path)
+    monkeypatch.setattr(tracing, '_enabled', False)
+    return tmp_path
+
+
+@traced('double')
+def _double(frame, factor=2):
+    return pd.concat([frame] * factor, ignore_index=True)
+
+
+def test_span_outside_trace_is_noop():
+    assert span('load') is NULL_SPAN
+    with span('load', rows_in=3) as s:
+        s.set_rows(rows_out=1)
+        s.cache_hit()
+    with trace_rerun('disabled') as trace:
+        assert trace is None
+        assert span('inner') is NULL_SPAN
+
+
+def test_nested_spans_and_errors_are_recorded(trace_dir):
+    with pytest.raises(KeyError):
+        with trace_rerun('dashboard', enabled=True, dataset='Site_A') as trace:
+            with span('load', artifact='raw_t41.parquet') as s:
+                s.cache_miss()
+                s.set_rows(rows_out=10)
+                with span('decode'):
+                    pass
+            with span('analyze'):
+                raise KeyError('mac')
+
+    records = {r['name']: r for r in trace.records()}
+    root = records['dashboard']
+    assert root['depth'] == 0 and root['parent_id'] is None
+    assert root['attrs'] == {'dataset': 'Site_A'}
+    assert records['load']['parent_id'] == root['span_id']
+    assert records['decode']['parent_id'] == records['load']['span_id']
+    assert records['decode']['depth'] == 2
+    assert records['load']['cache'] == 'miss' and records['load']['rows_out'] == 10
+    assert records['analyze']['error'] == "KeyError: 'mac'"
+    assert root['error'] == "KeyError: 'mac'"
+    assert trace in recent_traces(trace.session_id)
+
+    # 완료된 trace는 span 1개 = 1줄로 export
+    lines = (trace_dir / TRACE_FILE).read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['name'] for line in lines] == [r['name'] for r in trace.records()]
+    assert {json.loads(line)['trace_id'] for line in lines} == {trace.trace_id}
+
+
+def test_traced_records_rows_only_inside_trace():
+    frame = pd.DataFrame({'a': range(4)})
+    assert len(_double(frame)) == 8         # trace 밖 → 함수만 실행
+
+    with trace_rerun('report', enabled=True) as trace:
+        _double(frame, factor=3)
+    record = next(r for r in trace.records() if r['name'] == 'double')
+    assert (record['rows_in'], record['rows_out']) == (4, 12)
+    assert record['depth'] == 1
+
+
+def test_export_rotates_when_file_exceeds_max_bytes(trace_dir):
+    with trace_rerun('rotate', enabled=True) as trace:     # span 1개 → 1줄
+        pass
+    path = trace_dir / TRACE_FILE
+    size = path.stat().st_size
+
+    export_trace(trace, max_bytes=size * 10)          # 상한 이내 → 같은 파일에 추가
+    assert len(path.read_text().splitlines()) == 2
+    for _ in range(5):
+        export_trace(trace, max_bytes=1)
+    assert len(path.read_text().splitlines()) == 1
+    assert sorted(p.name for p in trace_dir.iterdir()) == [TRACE_FILE] + [f"{TRACE_FILE}.{i}" for i in (1, 2, 3)]
+
+    export_trace(trace, max_bytes=0)                  # 0 → rotate 없음
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_session_toggle_enables_tracing_per_session(monkeypatch):
+    assert not is_session_tracing_enabled({})
+    assert is_session_tracing_enabled({SESSION_TOGGLE_KEY: True})
+    monkeypatch.setattr(tracing, '_enabled', True)
+    assert is_session_tracing_enabled({SESSION_TOGGLE_KEY: False})
+    with trace_rerun('env') as trace:
+        assert trace is not None